@@ -71,6 +71,10 @@ def _parse_fecha_extraccion(r: Dict[str, Any]) -> datetime:
     Si no puede, devuelve datetime.min para ir al principio.
     """
     value = r.get("fecha_extraccion") or r.get("fecha_analisis") or ""
+    ordinal = r.get("fecha_ordinal")
+    if ordinal and not r.get("fecha_extraccion"):
+        # Ya calculada en la BD (analisis.fecha_ordinal): sin strptime
+        return datetime.fromordinal(int(ordinal))
     if not value:
         return datetime.min
 
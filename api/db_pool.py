@@ -0,0 +1,187 @@
+# api/db_pool.py
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Set
+
+from db import AnalysisDB
+from db.series_cache import drop_series_cache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(eq=False)
+class _Entry:
+    db: AnalysisDB
+    db_path: str
+    generation: int
+    thread_id: int
+    last_used: float = field(default=0.0)
+
+
+class DbPool:
+    """
+    Pool de conexiones AnalysisDB por fichero de BD (db_path).
+
+    - Cada request toma una conexión en exclusiva y la devuelve al terminar;
+      se prefiere la que usó el mismo hilo del threadpool la última vez, así
+      que en régimen estable hay ~1 conexión por hilo trabajador.
+    - El esquema solo se crea en la primera apertura de cada fichero.
+    - Las conexiones ociosas caducan tras 'ttl' segundos y, como mucho, se
+      mantienen 'max_idle' (se cierran las menos usadas recientemente).
+    - Con series_cache=True las conexiones comparten la caché de series en
+      memoria de su fichero (db/series_cache.py); release la descarta.
+    - 'on_open' (si se asigna) se llama con la conexión tras la primera
+      apertura de cada fichero, justo después de crear el esquema (p.ej.
+      para volcar en la BD configuración que vive en memoria).
+    """
+
+    def __init__(
+        self,
+        ttl: float = 120.0,
+        max_idle: int = 16,
+        clock: Callable[[], float] = time.monotonic,
+        series_cache: bool = False,
+    ) -> None:
+        self.ttl = ttl
+        self.max_idle = max_idle
+        self.series_cache = series_cache
+        self._clock = clock
+        self._lock = threading.RLock()
+        # Orden de inserción = orden LRU (la primera es la más antigua)
+        self._idle: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._busy: Dict[int, _Entry] = {}
+        self._initialized: Set[str] = set()
+        self._generation: Dict[str, int] = {}
+        self.on_open: Optional[Callable[[AnalysisDB], None]] = None
+
+    # --------------------
+    #   API
+    # --------------------
+    @contextmanager
+    def connection(self, db_path: str) -> Iterator[AnalysisDB]:
+        entry = self._acquire(db_path)
+        try:
+            yield entry.db
+        finally:
+            self._checkin(entry)
+
+    def release(self, db_path: str) -> None:
+        """
+        Cierra las conexiones ociosas de 'db_path'; las que estén en uso se
+        cerrarán al devolverse. La siguiente apertura vuelve a crear esquema.
+        """
+        key = os.path.abspath(db_path)
+        with self._lock:
+            self._generation[key] = self._generation.get(key, 0) + 1
+            self._initialized.discard(key)
+            doomed = [e for e in self._idle.values() if e.db_path == key]
+            for e in doomed:
+                del self._idle[id(e)]
+        for e in doomed:
+            self._close(e)
+        if self.series_cache:
+            drop_series_cache(key)
+
+    def close_all(self) -> None:
+        with self._lock:
+            paths = {e.db_path for e in self._idle.values()}
+            paths |= {e.db_path for e in self._busy.values()}
+            paths |= self._initialized
+        for p in paths:
+            self.release(p)
+
+    def paths(self) -> List[str]:
+        """Ficheros abiertos (con esquema ya creado) desde el último release."""
+        with self._lock:
+            return sorted(self._initialized)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"idle": len(self._idle), "busy": len(self._busy)}
+
+    # --------------------
+    #   INTERNOS
+    # --------------------
+    def _acquire(self, db_path: str) -> _Entry:
+        key = os.path.abspath(db_path)
+        tid = threading.get_ident()
+
+        with self._lock:
+            self._evict_expired()
+            entry = self._take_idle(key, tid)
+            generation = self._generation.get(key, 0)
+            create_schema = key not in self._initialized
+
+        if entry is None:
+            db = AnalysisDB(key, series_cache=self.series_cache)
+            db.open(create_schema=create_schema)
+            if create_schema and self.on_open is not None:
+                try:
+                    self.on_open(db)
+                except Exception:
+                    logger.exception("Error en on_open de %s", key)
+            entry = _Entry(db=db, db_path=key, generation=generation, thread_id=tid)
+            with self._lock:
+                if self._generation.get(key, 0) == generation:
+                    self._initialized.add(key)
+        else:
+            entry.thread_id = tid
+
+        with self._lock:
+            self._busy[id(entry)] = entry
+        return entry
+
+    def _take_idle(self, key: str, tid: int) -> Optional[_Entry]:
+        fallback: Optional[_Entry] = None
+        for e in reversed(self._idle.values()):
+            if e.db_path != key:
+                continue
+            if e.thread_id == tid:
+                fallback = e
+                break
+            if fallback is None:
+                fallback = e
+        if fallback is not None:
+            del self._idle[id(fallback)]
+        return fallback
+
+    def _checkin(self, entry: _Entry) -> None:
+        doomed = []
+        with self._lock:
+            self._busy.pop(id(entry), None)
+            stale = entry.generation != self._generation.get(entry.db_path, 0)
+            if stale or not entry.db.is_open:
+                doomed.append(entry)
+            else:
+                # Un request que falló a medias no debe dejar la transacción abierta
+                if entry.db.conn is not None and entry.db.conn.in_transaction:
+                    entry.db.conn.rollback()
+                entry.last_used = self._clock()
+                self._idle[id(entry)] = entry
+                while len(self._idle) > self.max_idle:
+                    _, oldest = self._idle.popitem(last=False)
+                    doomed.append(oldest)
+        for e in doomed:
+            self._close(e)
+
+    def _evict_expired(self) -> None:
+        now = self._clock()
+        expired = [e for e in self._idle.values() if now - e.last_used > self.ttl]
+        for e in expired:
+            del self._idle[id(e)]
+            self._close(e)
+
+    @staticmethod
+    def _close(entry: _Entry) -> None:
+        try:
+            entry.db.close()
+        except Exception:
+            logger.exception("Error cerrando conexión de %s", entry.db_path)
@@ -8,12 +8,21 @@ from typing import Optional, Generator
 
 from fastapi import HTTPException, Query, Request
 
+from api.db_pool import DbPool
+from api.import_jobs import ImportJobManager
 from api.session_store import SessionStore
 from db import AnalysisDB
 
 
+# Pool de conexiones por fichero de BD (compartido por todas las sesiones),
+# con caché de series en memoria por fichero
+db_pool = DbPool(series_cache=True)
+
 # Singleton de sesiones para toda la app
-sessions = SessionStore()
+sessions = SessionStore(on_close=lambda info: db_pool.release(info.db_path))
+
+# Importaciones en segundo plano (pool acotado, un trabajo activo por BD)
+import_jobs = ImportJobManager(db_pool.connection)
 
 
 def set_db_path(app, db_path: str) -> None:
@@ -43,17 +52,10 @@ def get_db(
     request: Request,
     session_id: Optional[str] = Query(default=None),
 ) -> Generator[AnalysisDB, None, None]:
-    """Dependency: abre DB y la cierra siempre al terminar el request."""
+    """Dependency: toma una conexión del pool y la devuelve al terminar el request."""
     db_path = resolve_db_path(request, session_id)
-    db = AnalysisDB(db_path)
-    db.open()
-    try:
+    with db_pool.connection(db_path) as db:
         yield db
-    finally:
-        try:
-            db.close()
-        except Exception:
-            pass
 
 
 def data_dir() -> Path:
@@ -0,0 +1,45 @@
+# api/etag.py
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+
+from db import AnalysisDB
+from db.data_version import get_data_version
+
+
+def data_etag(db: AnalysisDB, extra: str = "") -> str:
+    """
+    ETag de un endpoint de lectura: epoch + versión de datos del fichero.
+    Solo cambia cuando alguna escritura de db/* se confirma. 'extra' añade
+    estado que no vive en la BD y también afecta a la respuesta.
+    """
+    epoch, version = get_data_version(db.conn)
+    return f'"{epoch}-{version}{extra}"'
+
+
+def static_etag(payload: Any) -> str:
+    """ETag para payloads que no dependen de la BD (p.ej. /meta)."""
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return f'"{hashlib.sha1(raw).hexdigest()[:16]}"'
+
+
+def etag_headers(etag: str) -> Dict[str, str]:
+    # no-cache = el navegador puede guardar la respuesta pero revalida siempre
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Respuesta 304 si If-None-Match coincide con 'etag'; None si no."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    candidates = [c.strip() for c in header.split(",")]
+    # Comparación débil (RFC 9110): se ignora el prefijo W/
+    if "*" in candidates or etag in (c[2:] if c.startswith("W/") else c for c in candidates):
+        return Response(status_code=304, headers=etag_headers(etag))
+    return None
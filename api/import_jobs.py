@@ -0,0 +1,233 @@
+# api/import_jobs.py
+# -*- coding: utf-8 -*-
+"""
+Importaciones en segundo plano.
+
+Los endpoints de /imports ya no parsean dentro del request: crean un
+trabajo, lo encolan en un pool acotado de hilos y devuelven su id. El
+cliente consulta /imports/jobs/{id} para ver el progreso (procesados, ok,
+errores, tiempos por fichero) y el ImportResult final.
+
+- Como mucho 'max_running' trabajos se ejecutan a la vez (cada uno usa ya
+  su propio pool de procesos para parsear); el resto espera en cola.
+- Como mucho 'max_per_db' trabajos activos (en cola o en marcha) por BD:
+  SQLite admite un único escritor, más trabajos sobre el mismo fichero solo
+  competirían por el bloqueo.
+- cancel() detiene el trabajo entre ficheros; lo ya parseado se guarda.
+- Se conservan los últimos 'keep_finished' trabajos terminados (sin sus
+  PDFs en memoria: al terminar solo queda el nombre de cada uno).
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from importer import MemoryPdf, import_pdfs
+from importer.batch import PdfInput
+from lab_pdf.parse_cache import get_default_cache
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+FAILED = "failed"
+ACTIVE_STATES = (QUEUED, RUNNING)
+
+
+class JobLimitError(Exception):
+    """Ya hay demasiados trabajos activos sobre la misma BD."""
+
+
+@dataclass
+class FileTiming:
+    name: str
+    status: str  # ok | skipped | error | failed
+    seconds: float
+    error: Optional[str] = None
+
+
+@dataclass
+class ImportJob:
+    job_id: str
+    db_path: str
+    paths: List[PdfInput]
+    names: Dict[str, str] = field(default_factory=dict)  # ruta -> nombre mostrado
+    pre_errors: List[str] = field(default_factory=list)  # p.ej. fallos al guardar la subida
+    skip_existing: bool = False  # omitir informes ya importados (ver import_pdfs)
+    state: str = QUEUED
+    processed: int = 0
+    ok: int = 0
+    skipped: int = 0
+    errors: List[str] = field(default_factory=list)
+    files: List[FileTiming] = field(default_factory=list)
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+    done_event: threading.Event = field(default_factory=threading.Event)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def total(self) -> int:
+        return len(self.paths)
+
+    def record(self, path: str, status: str, error: Optional[str], seconds: float) -> None:
+        name = self.names.get(path) or Path(path).name
+        with self._lock:
+            self.processed += 1
+            if status == "ok":
+                self.ok += 1
+            elif status == "skipped":
+                self.skipped += 1
+            else:
+                self.errors.append(f"{name}: {error}")
+            self.files.append(FileTiming(name, status, round(seconds, 4), error))
+
+    def result(self) -> Optional[Dict[str, Any]]:
+        if self.state in ACTIVE_STATES:
+            return None
+        return {"ok": self.ok, "errors": self.pre_errors + self.errors, "skipped": self.skipped}
+
+    def snapshot(self, include_files: bool = True) -> Dict[str, Any]:
+        with self._lock:
+            snap = {
+                "job_id": self.job_id,
+                "state": self.state,
+                "total": self.total,
+                "processed": self.processed,
+                "ok": self.ok,
+                "skipped": self.skipped,
+                "error_count": len(self.pre_errors) + len(self.errors),
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "result": self.result(),
+            }
+            if include_files:
+                snap["files"] = [f.__dict__.copy() for f in self.files]
+        return snap
+
+
+# connect(db_path) -> context manager que entrega un AnalysisDB (p.ej. DbPool.connection)
+Connector = Callable[[str], AbstractContextManager]
+
+
+class ImportJobManager:
+    def __init__(
+        self,
+        connect: Connector,
+        *,
+        max_running: int = 2,
+        max_per_db: int = 1,
+        keep_finished: int = 50,
+    ) -> None:
+        self._connect = connect
+        self.max_per_db = max_per_db
+        self.keep_finished = keep_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_running, thread_name_prefix="import-job")
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, ImportJob]" = OrderedDict()
+
+    # --------------------
+    #   API
+    # --------------------
+    def submit(
+        self,
+        db_path: str,
+        paths: List[PdfInput],
+        pre_errors: Optional[List[str]] = None,
+        names: Optional[Dict[str, str]] = None,
+        skip_existing: bool = False,
+    ) -> ImportJob:
+        job = ImportJob(job_id=uuid.uuid4().hex, db_path=db_path, paths=list(paths),
+                        names=dict(names or {}), pre_errors=list(pre_errors or []),
+                        skip_existing=skip_existing)
+        with self._lock:
+            active = sum(1 for j in self._jobs.values()
+                         if j.db_path == db_path and j.state in ACTIVE_STATES)
+            if active >= self.max_per_db:
+                raise JobLimitError(
+                    f"Ya hay {active} importación(es) en curso para esta base de datos"
+                )
+            self._jobs[job.job_id] = job
+            self._trim()
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[ImportJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self, db_path: Optional[str] = None) -> List[ImportJob]:
+        with self._lock:
+            return [j for j in self._jobs.values() if db_path is None or j.db_path == db_path]
+
+    def cancel(self, job_id: str) -> Optional[ImportJob]:
+        job = self.get(job_id)
+        if job is None:
+            return None
+        job.cancel_event.set()
+        with job._lock:
+            if job.state == QUEUED:
+                # Aún no ha empezado: _run lo verá y no hará nada
+                job.state = CANCELLED
+                job.finished_at = time.time()
+                job.done_event.set()
+        return job
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[ImportJob]:
+        """Espera a que el trabajo termine (tests y herramientas)."""
+        job = self.get(job_id)
+        if job is not None:
+            job.done_event.wait(timeout)
+        return job
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for j in jobs:
+            j.cancel_event.set()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    # --------------------
+    #   INTERNOS
+    # --------------------
+    def _run(self, job: ImportJob) -> None:
+        with job._lock:
+            if job.state != QUEUED:
+                return
+            job.state = RUNNING
+            job.started_at = time.time()
+        try:
+            with self._connect(job.db_path) as db:
+                res = import_pdfs(
+                    db, job.paths, cache=get_default_cache(), skip_existing=job.skip_existing,
+                    on_result=job.record, cancel=job.cancel_event,
+                )
+            final = CANCELLED if res.cancelled else DONE
+        except Exception as e:
+            logger.exception("Trabajo de importación %s fallido", job.job_id)
+            with job._lock:
+                job.errors.append(f"{type(e).__name__}: {e}")
+            final = FAILED
+        with job._lock:
+            job.state = final
+            job.finished_at = time.time()
+            # Los trabajos terminados se conservan un tiempo: sin los bytes
+            job.paths = [p.name if isinstance(p, MemoryPdf) else p for p in job.paths]
+        job.done_event.set()
+
+    def _trim(self) -> None:
+        finished = [jid for jid, j in self._jobs.items() if j.state not in ACTIVE_STATES]
+        for jid in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[jid]
@@ -23,11 +23,41 @@ class NewSessionRequest(BaseModel):
 class ImportPathsRequest(BaseModel):
     session_id: str
     pdf_paths: List[str]
+    skip_existing: bool = False  # omitir informes ya importados (sin reimportar)
 
 
 class ImportResult(BaseModel):
     ok: int
     errors: List[str]
+    skipped: int = 0  # informes ya importados (no se vuelven a parsear)
+
+
+class ImportJobCreated(BaseModel):
+    job_id: str
+    state: str
+    total: int
+
+
+class ImportFileTiming(BaseModel):
+    name: str
+    status: str  # ok | skipped | error | failed
+    seconds: float
+    error: Optional[str] = None
+
+
+class ImportJobStatus(BaseModel):
+    job_id: str
+    state: str  # queued | running | done | cancelled | failed
+    total: int
+    processed: int
+    ok: int
+    skipped: int
+    error_count: int
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[ImportResult] = None  # solo cuando el trabajo ha terminado
+    files: List[ImportFileTiming] = Field(default_factory=list)
 
 
 class TreatmentCreate(BaseModel):
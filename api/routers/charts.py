@@ -2,16 +2,18 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-from typing import Any, Dict, List
-from fastapi import APIRouter, Depends, Query
+import logging
+from typing import Any, Dict, List, Tuple
+from fastapi import APIRouter, Depends, Query, Request, Response
 from fastapi.responses import JSONResponse
 
 from api.models import RangeUpdate
 from charts.defs import PARAM_DEFS, PARAM_GROUPS
-from charts.series_provider import DbSeriesProvider
+from charts.series_provider import DbSeriesProvider, Series
 from ranges import RangesManager
 from db import AnalysisDB
-from api.deps import get_db
+from api.deps import db_pool, get_db
+from api.etag import data_etag, etag_headers, not_modified, static_etag
 from pydantic import BaseModel
 from typing import Optional
 
@@ -20,21 +22,61 @@ router = APIRouter(tags=["charts"])
 from threading import RLock
 _RM_LOCK = RLock()
 _RM = RangesManager()
+# Revisión de _RM: los rangos no están en la BD pero deciden qué puntos
+# conserva el downsampling, así que forman parte del ETag de /series.
+_RM_REV = 0
 
+logger = logging.getLogger(__name__)
+
+
+
+_META: Dict[str, Any] = {
+    "defs": PARAM_DEFS,
+    "groups": [{"name": name, "params": params} for (name, params) in PARAM_GROUPS],
+}
+_META_ETAG = static_etag(_META)
 
 
 @router.get("/meta")
-def meta() -> Dict[str, Any]:
-    return {
-        "defs": PARAM_DEFS,
-        "groups": [{"name": name, "params": params} for (name, params) in PARAM_GROUPS],
-    }
+def meta(request: Request, response: Response) -> Any:
+    cached = not_modified(request, _META_ETAG)
+    if cached is not None:
+        return cached
+    response.headers.update(etag_headers(_META_ETAG))
+    return _META
+
+
+def _series_etag(db: AnalysisDB) -> str:
+    with _RM_LOCK:
+        return data_etag(db, extra=f"-r{_RM_REV}")
+
+
+def _downsample(
+    provider: DbSeriesProvider, db: AnalysisDB, param: str, points: Series, max_points: Optional[int]
+):
+    if max_points is None or len(points) <= max_points:
+        return points, False
+    with _RM_LOCK:
+        pr = _RM.get_all().get(param)
+        low = pr.min_value if pr else None
+        high = pr.max_value if pr else None
+    # Los cruces de límites clínicos activos también se conservan
+    thresholds = [
+        float(l["value"])
+        for l in db.limite_parametro.list_param_limits(param_key=param)
+        if l.get("enabled") and l.get("value") is not None
+    ]
+    return provider.downsample(points, max_points, low=low, high=high, thresholds=thresholds)
 
 
 @router.get("/series")
 def series(
+    request: Request,
     param: str = Query(..., description="Nombre de parámetro (key de PARAM_DEFS)"),
-    limit: int = Query(1000, ge=1, le=10000, description="Máximo de puntos"),
+    limit: int = Query(1000, ge=1, le=10000, description="Máximo de puntos (los más recientes)"),
+    date_from: Optional[str] = Query(None, description="Fecha mínima YYYY-MM-DD (inclusive)"),
+    date_to: Optional[str] = Query(None, description="Fecha máxima YYYY-MM-DD (inclusive)"),
+    max_points: Optional[int] = Query(None, ge=3, le=10000, description="Reducir con LTTB a ~N puntos"),
     db: AnalysisDB = Depends(get_db),
 ) -> JSONResponse:
     if param not in PARAM_DEFS:
@@ -44,11 +86,15 @@ def series(
     if not provider.is_ready():
         return JSONResponse({"error": "DB no lista o no abierta"}, status_code=409)
 
-    points = provider.get_series(param, limit=limit)
+    etag = _series_etag(db)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
 
-    payload_points: List[Dict[str, Any]] = [
-        {"date": p.date.strftime("%Y-%m-%d"), "value": p.value} for p in points
-    ]
+    points = provider.get_series(param, limit=limit, date_from=date_from, date_to=date_to)
+    points, downsampled = _downsample(provider, db, param, points, max_points)
+
+    payload_points: List[Dict[str, Any]] = points.to_payload()
 
     return JSONResponse(
         {
@@ -56,10 +102,156 @@ def series(
             "label": PARAM_DEFS[param].get("label", param),
             "table": PARAM_DEFS[param].get("table"),
             "points": payload_points,
+            "downsampled": downsampled,
+        },
+        headers=etag_headers(etag),
+    )
+
+
+@router.get("/series/batch")
+def series_batch(
+    request: Request,
+    params: str = Query(..., description="Parámetros separados por comas (keys de PARAM_DEFS)"),
+    limit: int = Query(1000, ge=1, le=10000, description="Máximo de puntos por serie"),
+    date_from: Optional[str] = Query(None, description="Fecha mínima YYYY-MM-DD (inclusive)"),
+    date_to: Optional[str] = Query(None, description="Fecha máxima YYYY-MM-DD (inclusive)"),
+    max_points: Optional[int] = Query(None, ge=3, le=10000, description="Reducir con LTTB a ~N puntos por serie"),
+    db: AnalysisDB = Depends(get_db),
+) -> JSONResponse:
+    names = [p.strip() for p in params.split(",") if p.strip()]
+    unknown = [p for p in names if p not in PARAM_DEFS]
+    if unknown:
+        return JSONResponse({"error": f"param desconocido: {', '.join(unknown)}"}, status_code=400)
+
+    provider = DbSeriesProvider(db, param_defs=PARAM_DEFS)
+    if not provider.is_ready():
+        return JSONResponse({"error": "DB no lista o no abierta"}, status_code=409)
+
+    etag = _series_etag(db)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    # Una consulta por tabla, no una por parámetro
+    by_param = provider.get_series_batch(names, limit=limit, date_from=date_from, date_to=date_to)
+
+    payload: Dict[str, Any] = {}
+    for p, points in by_param.items():
+        points, downsampled = _downsample(provider, db, p, points, max_points)
+        payload[p] = {
+            "param": p,
+            "label": PARAM_DEFS[p].get("label", p),
+            "table": PARAM_DEFS[p].get("table"),
+            "points": points.to_payload(),
+            "downsampled": downsampled,
         }
+
+    return JSONResponse(
+        {"series": payload},
+        headers=etag_headers(etag),
     )
 
 
+def _out_of_range_flag(value: Optional[float], low: Optional[float], high: Optional[float]) -> Optional[str]:
+    # Mismo criterio que outOfRangeFlag (web/assets/charts/chart.js)
+    if value is None:
+        return None
+    if low is not None and value < low:
+        return "below"
+    if high is not None and value > high:
+        return "above"
+    return None
+
+
+def _summary_payload(param: str, row: Dict[str, Any], low: Optional[float], high: Optional[float]) -> Dict[str, Any]:
+    last, prev = row["last_value"], row["prev_value"]
+    return {
+        "param": param,
+        "label": PARAM_DEFS[param].get("label", param),
+        "table": row["source"],
+        "count": row["n"],
+        "first_date": row["first_date"],
+        "last_date": row["last_date"],
+        "last_value": last,
+        "prev_date": row["prev_date"],
+        "prev_value": prev,
+        "delta": last - prev if last is not None and prev is not None else None,
+        "min": row["min_value"],
+        "max": row["max_value"],
+        "range": {"min": low, "max": high},
+        "out_of_range": row["out_of_range"],
+        "flag": _out_of_range_flag(last, low, high),
+    }
+
+
+def _summary_ranges() -> Dict[Tuple[str, str], Tuple[Optional[float], Optional[float]]]:
+    """Rangos de _RM por (tabla, parámetro) de PARAM_DEFS, como en param_summary."""
+    with _RM_LOCK:
+        return {
+            (PARAM_DEFS[k].get("table"), k): (pr.min_value, pr.max_value)
+            for k, pr in _RM.get_all().items() if k in PARAM_DEFS
+        }
+
+
+def store_summary_ranges(db: AnalysisDB) -> None:
+    """
+    Guarda los rangos de _RM en la BD (param_range + recuento de lo que
+    cambia), para que /summary use el contador que mantienen los triggers.
+    Se llama al abrir cada fichero (DbPool.on_open) y tras /ranges/bulk.
+    """
+    db.param_summary.set_ranges(_summary_ranges())
+
+
+db_pool.on_open = store_summary_ranges
+
+
+@router.get("/summary")
+def summary(request: Request, db: AnalysisDB = Depends(get_db)) -> JSONResponse:
+    """
+    Resumen de todos los parámetros de PARAM_DEFS con datos (último valor,
+    delta, min/max, nº de valores fuera de rango) leído de param_summary en
+    una sola consulta, para pintar los KPIs sin descargar series.
+
+    Solo lee. Los rangos de _RM se guardan al abrir la BD y tras
+    /ranges/bulk (store_summary_ranges), así que normalmente coinciden con
+    los de param_summary; si no (p.ej. un fichero que se abrió sin el pool),
+    los valores fuera de rango se cuentan al vuelo con una consulta por
+    tabla.
+    """
+    etag = _series_etag(db)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    with _RM_LOCK:
+        ranges = {k: (pr.min_value, pr.max_value) for k, pr in _RM.get_all().items()}
+
+    rows = {(r["source"], r["param_key"]): r for r in db.list_param_summary()}
+    found: Dict[str, Dict[str, Any]] = {}
+    stale: Dict[str, Dict[str, Tuple[Optional[float], Optional[float]]]] = {}
+    for param, info in PARAM_DEFS.items():
+        row = rows.get((info.get("table"), param))
+        if row is None:
+            continue
+        found[param] = row
+        rng = ranges.get(param, (None, None))
+        if (row["range_low"], row["range_high"]) != rng:
+            stale.setdefault(row["source"], {})[param] = rng
+
+    counts: Dict[str, int] = {}
+    for source, by_param in stale.items():
+        counts.update(db.param_summary.count_out_of_range(source, by_param))
+
+    payload: Dict[str, Any] = {}
+    for param, row in found.items():
+        if param in counts:
+            row = {**row, "out_of_range": counts[param]}
+        low, high = ranges.get(param, (None, None))
+        payload[param] = _summary_payload(param, row, low, high)
+
+    return JSONResponse({"params": payload}, headers=etag_headers(etag))
+
+
 def _ranges_to_payload(rm: RangesManager) -> Dict[str, Any]:
     out: Dict[str, Any] = {}
     for key, pr in rm.get_all().items():
@@ -92,10 +284,21 @@ class BulkRangeUpdate(BaseModel):
 
 @router.post("/ranges/bulk")
 def update_ranges_bulk(body: BulkRangeUpdate) -> Dict[str, Any]:
+    global _RM_REV
     with _RM_LOCK:
+        _RM_REV += 1
         for key, v in body.ranges.items():
             # min/max pueden venir como null
             _RM.update_range(key, v.get("min"), v.get("max"))
-        return {"ok": True, "ranges": _ranges_to_payload(_RM)}
+        payload = _ranges_to_payload(_RM)
+
+    # Recuento de valores fuera de rango en cada BD abierta (solo lo que cambia)
+    for db_path in db_pool.paths():
+        try:
+            with db_pool.connection(db_path) as db:
+                store_summary_ranges(db)
+        except Exception:
+            logger.exception("No se pudieron guardar los rangos en %s", db_path)
+    return {"ok": True, "ranges": payload}
 
 
@@ -3,7 +3,10 @@
 from __future__ import annotations
 
 from typing import Any, Dict
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
+
+from db.series_cache import series_cache_stats
+from metrics import REGISTRY as TIMERS
 
 router = APIRouter(tags=["core"])
 
@@ -12,10 +15,27 @@ router = APIRouter(tags=["core"])
 def root() -> Dict[str, Any]:
     return {
         "name": "salud_v1 API",
-        "endpoints": ["/health", "/meta", "/series?param=hemoglobina"],
+        "endpoints": ["/health", "/meta", "/metrics", "/series?param=hemoglobina", "/summary", "/rows/hematologia"],
     }
 
 
 @router.get("/health")
 def health() -> Dict[str, str]:
     return {"status": "ok"}
+
+
+@router.get("/metrics")
+def metrics(reset: bool = Query(default=False)) -> Dict[str, Any]:
+    """
+    Tiempos por etapa del pipeline PDF -> BD (count, p50, p95, max...).
+    Vacío si la instrumentación está desactivada (SALUD_V1_TIMINGS).
+    'series_cache': memoria y tasa de aciertos de la caché de series por BD.
+    """
+    snap = {
+        "enabled": TIMERS.enabled,
+        "stages": TIMERS.snapshot(),
+        "series_cache": series_cache_stats(),
+    }
+    if reset:
+        TIMERS.reset()
+    return snap
@@ -2,74 +2,121 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-from pathlib import Path
-from typing import List
-from fastapi import APIRouter, Depends, File, UploadFile, HTTPException
-from db import AnalysisDB
+from typing import Dict, List, Optional
+from fastapi import APIRouter, HTTPException, Query, Request
 
-from api.deps import get_db, uploads_dir
-from api.models import ImportPathsRequest, ImportResult
-
-from lab_pdf import parse_hematology_pdf  # tu parser
+from api.deps import import_jobs, resolve_db_path, uploads_dir
+from api.import_jobs import ImportJob, JobLimitError
+from api.uploads import SMALL_UPLOAD_BYTES, UploadFormError, UploadStore, receive_uploads
+from importer.batch import PdfInput
+from api.models import ImportJobCreated, ImportJobStatus, ImportPathsRequest
 
 router = APIRouter(prefix="/imports", tags=["imports"])
 
 
-def _import_pdf_into_db(
-        pdf_path: str,
-        db: AnalysisDB = Depends(get_db)) -> None:
-    data = parse_hematology_pdf(str(pdf_path))
-
-    paciente = data.get("paciente")
-    if isinstance(paciente, dict):
-        db.save_patient(paciente)
-
-    for d in data.get("hematologia", []):
-        db.insert_hematologia(d)
-    for d in data.get("bioquimica", []):
-        db.insert_bioquimica(d)
-    for d in data.get("gasometria", []):
-        db.insert_gasometria(d)
-    for d in data.get("orina", []):
-        db.insert_orina(d)
-
-
-@router.post("/from_paths", response_model=ImportResult)
-def import_from_paths(
-    req: ImportPathsRequest,
-    db: AnalysisDB = Depends(get_db),
-):
-    ok = 0
-    errors: List[str] = []
-
-    for p in req.pdf_paths:
-        try:
-            _import_pdf_into_db(p, db)
-            ok += 1
-        except Exception as e:
-            errors.append(f"{Path(p).name}: {e}")
-
-    return ImportResult(ok=ok, errors=errors)
-
-
-@router.post("/upload", response_model=ImportResult)
+def _submit(
+    db_path: str,
+    paths: List[PdfInput],
+    pre_errors: Optional[List[str]] = None,
+    names: Optional[Dict[str, str]] = None,
+    skip_existing: bool = False,
+) -> ImportJobCreated:
+    try:
+        job = import_jobs.submit(db_path, paths, pre_errors=pre_errors, names=names,
+                                 skip_existing=skip_existing)
+    except JobLimitError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return ImportJobCreated(job_id=job.job_id, state=job.state, total=job.total)
+
+
+def _job_for(request: Request, job_id: str, session_id: Optional[str]) -> ImportJob:
+    # Un trabajo solo es visible desde una sesión sobre la misma BD
+    db_path = resolve_db_path(request, session_id)
+    job = import_jobs.get(job_id)
+    if job is None or job.db_path != db_path:
+        raise HTTPException(status_code=404, detail="Trabajo de importación no encontrado")
+    return job
+
+
+@router.post("/from_paths", response_model=ImportJobCreated, status_code=202)
+def import_from_paths(request: Request, req: ImportPathsRequest):
+    db_path = resolve_db_path(request, req.session_id)
+    return _submit(db_path, req.pdf_paths, skip_existing=req.skip_existing)
+
+
+# El cuerpo se lee a mano (receive_uploads): se documenta aquí el formulario
+_UPLOAD_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["pdf_files"],
+                    "properties": {
+                        "pdf_files": {"type": "array", "items": {"type": "string", "format": "binary"}},
+                    },
+                },
+            },
+        },
+    },
+}
+
+
+@router.post("/upload", response_model=ImportJobCreated, status_code=202, openapi_extra=_UPLOAD_BODY)
 async def import_upload(
-    pdf_files: List[UploadFile] = File(...),
-    db: AnalysisDB = Depends(get_db),
+    request: Request,
+    session_id: Optional[str] = Query(default=None),
+    in_memory: bool = Query(default=False),
+    skip_existing: bool = Query(default=False, description="Omitir informes ya importados"),
+):
+    """
+    Guarda las subidas ('pdf_files') en ficheros direccionados por contenido
+    según llegan, sin que starlette las bufferice antes (ver
+    api/uploads.py), y encola su importación. Con 'in_memory' los PDFs
+    pequeños se parsean directamente desde memoria, sin escribirlos. Por
+    defecto se reimporta todo; 'skip_existing' omite los informes ya
+    importados.
+    """
+    db_path = resolve_db_path(request, session_id)
+    store = UploadStore(uploads_dir(), memory_limit=SMALL_UPLOAD_BYTES if in_memory else 0)
+    try:
+        stored, errors = await receive_uploads(request, store, "pdf_files")
+    except UploadFormError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not stored and not errors:
+        raise HTTPException(status_code=422, detail="Falta el campo 'pdf_files'")
+
+    # El parseo y la escritura en la BD van en el trabajo
+    sources: List[PdfInput] = [s.source for s in stored]
+    names: Dict[str, str] = {s.source: s.name for s in stored if not s.in_memory}
+    return _submit(db_path, sources, pre_errors=errors, names=names, skip_existing=skip_existing)
+
+
+@router.get("/jobs", response_model=List[ImportJobStatus])
+def list_jobs(request: Request, session_id: Optional[str] = Query(default=None)):
+    db_path = resolve_db_path(request, session_id)
+    return [j.snapshot(include_files=False) for j in import_jobs.list(db_path)]
+
+
+@router.get("/jobs/{job_id}", response_model=ImportJobStatus)
+def get_job(
+    request: Request,
+    job_id: str,
+    session_id: Optional[str] = Query(default=None),
+    files_from: int = Query(default=0, ge=0),
 ):
-    updir = uploads_dir()
-    ok = 0
-    errors: List[str] = []
-
-    for uf in pdf_files:
-        try:
-            dest = updir / uf.filename
-            content = await uf.read()
-            dest.write_bytes(content)
-
-            _import_pdf_into_db(str(dest), db)
-            ok += 1
-        except Exception as e:
-            errors.append(f"{uf.filename}: {e}")
-
-    return ImportResult(ok=ok, errors=errors)
+    """
+    Progreso del trabajo. 'files_from' devuelve solo los tiempos por fichero
+    a partir de esa posición (el cliente pide lo nuevo en cada sondeo).
+    """
+    snap = _job_for(request, job_id, session_id).snapshot()
+    snap["files"] = snap["files"][files_from:]
+    return snap
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=ImportJobStatus)
+def cancel_job(request: Request, job_id: str, session_id: Optional[str] = Query(default=None)):
+    job = _job_for(request, job_id, session_id)
+    import_jobs.cancel(job.job_id)
+    return job.snapshot(include_files=False)
@@ -2,10 +2,11 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
-from fastapi import APIRouter, Depends, Query
+from typing import Any, Optional
+from fastapi import APIRouter, Depends, Query, Request, Response
 from db import AnalysisDB
 from api.deps import get_db
+from api.etag import data_etag, etag_headers, not_modified
 from api.models import ParamLimitCreate, ParamLimitUpdate
 
 router = APIRouter(tags=["limits"])
@@ -13,9 +14,17 @@ router = APIRouter(tags=["limits"])
 
 @router.get("/param_limits")
 def param_limits(
+    request: Request,
+    response: Response,
     param_key: Optional[str] = Query(None),
     db: AnalysisDB = Depends(get_db),
-) -> Dict[str, Any]:
+) -> Any:
+    etag = data_etag(db)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    response.headers.update(etag_headers(etag))
+
     limits = db.limite_parametro.list_param_limits(param_key=param_key)
     return {"limits": limits}
 
@@ -2,16 +2,23 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-from typing import Any, Dict
-from fastapi import APIRouter, Depends
+from typing import Any
+from fastapi import APIRouter, Depends, Request, Response
 from db import AnalysisDB
 from api.deps import get_db
+from api.etag import data_etag, etag_headers, not_modified
 
 router = APIRouter(tags=["patient"])
 
 
 @router.get("/patient")
-def patient(db: AnalysisDB = Depends(get_db)) -> Dict[str, Any]:
+def patient(request: Request, response: Response, db: AnalysisDB = Depends(get_db)) -> Any:
+    etag = data_etag(db)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    response.headers.update(etag_headers(etag))
+
     p = db.paciente.get()
     if not p:
         return {"display_name": ""}
@@ -0,0 +1,73 @@
+# api/routers/rows.py
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Dict, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+
+from api.deps import get_db
+from api.etag import data_etag, etag_headers, not_modified
+from db import AnalysisDB
+
+router = APIRouter(tags=["rows"])
+
+TABLES = ("analisis", "hematologia", "bioquimica", "gasometria", "orina")
+
+
+def _next_cursor(table: str, rows, limit: int, descending: bool) -> Optional[Dict[str, Any]]:
+    """Cursor de la página siguiente (None si esta es la última)."""
+    if len(rows) < limit:
+        return None
+    last = rows[-1]
+    if last.get("fecha_ordinal") is None:
+        return None
+    prefix = "before" if descending else "after"
+    return {
+        f"{prefix}_date": date.fromordinal(last["fecha_ordinal"]).isoformat(),
+        f"{prefix}_id": last["id"] if table == "analisis" else last["analisis_id"],
+    }
+
+
+@router.get("/rows/{table}")
+def rows(
+    request: Request,
+    response: Response,
+    table: str,
+    limit: int = Query(200, ge=1, le=5000, description="Filas por página"),
+    date_from: Optional[str] = Query(None, description="Fecha mínima YYYY-MM-DD (inclusive)"),
+    date_to: Optional[str] = Query(None, description="Fecha máxima YYYY-MM-DD (inclusive)"),
+    after_date: Optional[str] = Query(None, description="Cursor: fecha de la última fila (orden asc)"),
+    after_id: Optional[int] = Query(None, description="Cursor: analisis_id de la última fila (orden asc)"),
+    before_date: Optional[str] = Query(None, description="Cursor: fecha de la última fila (orden desc)"),
+    before_id: Optional[int] = Query(None, description="Cursor: analisis_id de la última fila (orden desc)"),
+    order: Literal["asc", "desc"] = Query("asc", description="'desc' = más recientes primero"),
+    db: AnalysisDB = Depends(get_db),
+) -> Any:
+    """
+    Filas de una tabla por páginas (keyset): cada respuesta trae en 'next'
+    los parámetros de cursor para pedir la siguiente, o null al final.
+    """
+    if table not in TABLES:
+        raise HTTPException(status_code=404, detail=f"Tabla desconocida: {table}")
+
+    etag = data_etag(db)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    descending = order == "desc"
+    try:
+        page = db.list_rows(
+            table, limit,
+            date_from=date_from, date_to=date_to,
+            after_date=after_date, after_id=after_id,
+            before_date=before_date, before_id=before_id,
+            descending=descending,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    response.headers.update(etag_headers(etag))
+    return {"table": table, "rows": page, "next": _next_cursor(table, page, limit, descending)}
@@ -2,12 +2,13 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import os
 import shutil
 from pathlib import Path
 
 from fastapi import APIRouter, HTTPException, UploadFile, File
 
-from api.deps import sessions
+from api.deps import db_pool, sessions
 from api.models import OpenSessionRequest, OpenSessionResponse, NewSessionRequest
 from db import AnalysisDB
 
@@ -39,7 +40,8 @@ def sessions_new(req: NewSessionRequest):
         if not getattr(req, "overwrite", False):
             raise HTTPException(status_code=409, detail="La BD ya existe (no se sobrescribe)")
 
-        # overwrite=True -> borrar y recrear
+        # overwrite=True -> borrar y recrear (antes, soltar conexiones del pool)
+        db_pool.release(os.path.abspath(p))
         try:
             p.unlink()
         except Exception as e:
@@ -86,6 +88,7 @@ def sessions_upload(db_file: UploadFile = File(...)):
     upload_dir.mkdir(parents=True, exist_ok=True)
 
     dest = upload_dir / name
+    db_pool.release(os.path.abspath(dest))
 
     try:
         with dest.open("wb") as f:
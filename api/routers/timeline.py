@@ -2,10 +2,11 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
-from fastapi import APIRouter, Depends
+from typing import Any
+from fastapi import APIRouter, Depends, Request, Response
 from db import AnalysisDB
 from api.deps import get_db
+from api.etag import data_etag, etag_headers, not_modified
 from api.models import (
     TreatmentCreate, TreatmentUpdate,
     HospitalStayCreate, HospitalStayUpdate,
@@ -16,7 +17,13 @@ router = APIRouter(tags=["timeline"])
 
 
 @router.get("/timeline")
-def timeline(db: AnalysisDB = Depends(get_db)) -> Dict[str, Any]:
+def timeline(request: Request, response: Response, db: AnalysisDB = Depends(get_db)) -> Any:
+    etag = data_etag(db)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    response.headers.update(etag_headers(etag))
+
     default_days_raw = None
     if hasattr(db, "config"):
         default_days_raw = db.config.config_get("treatment_default_days")
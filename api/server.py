@@ -12,6 +12,7 @@ from api.routers.charts import router as charts_router
 from api.routers.patient import router as patient_router
 from api.routers.timeline import router as timeline_router
 from api.routers.limits import router as limits_router
+from api.routers.rows import router as rows_router
 from api.deps import sessions  # <- usar el singleton único
 
 
@@ -27,5 +28,6 @@ app.include_router(charts_router)
 app.include_router(patient_router)
 app.include_router(timeline_router)
 app.include_router(limits_router)
+app.include_router(rows_router)
 
 
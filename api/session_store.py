@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from threading import RLock
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional
 from uuid import uuid4
 import os
 import time
@@ -19,11 +19,15 @@ class SessionInfo:
 class SessionStore:
     """
     session_id -> db_path (solo rutas, NUNCA conexiones)
+
+    on_close se invoca al cerrar la última sesión abierta sobre un db_path
+    (p.ej. para liberar las conexiones del pool).
     """
 
-    def __init__(self) -> None:
+    def __init__(self, on_close: Optional[Callable[[SessionInfo], None]] = None) -> None:
         self._lock = RLock()
         self._sessions: Dict[str, SessionInfo] = {}
+        self._on_close = on_close
 
     def open_existing(self, db_path: str) -> SessionInfo:
         db_path = os.path.abspath(db_path)
@@ -50,4 +54,11 @@ class SessionStore:
 
     def close(self, session_id: str) -> bool:
         with self._lock:
-            return self._sessions.pop(session_id, None) is not None
+            info = self._sessions.pop(session_id, None)
+            if info is None:
+                return False
+            still_used = any(s.db_path == info.db_path for s in self._sessions.values())
+
+        if self._on_close is not None and not still_used:
+            self._on_close(info)
+        return True
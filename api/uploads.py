@@ -0,0 +1,276 @@
+# api/uploads.py
+# -*- coding: utf-8 -*-
+"""
+Recepción de PDFs subidos.
+
+El endpoint de subida no declara parámetros File(...): starlette volcaría
+antes de llamarlo cada fichero a un SpooledTemporaryFile (hasta 1 MB en
+memoria por fichero), así que leerlos después por trozos ya no acotaría la
+memoria. receive_uploads parsea el cuerpo multipart de request.stream()
+conforme llega y escribe cada trozo directamente en el UploadStore.
+
+Cada subida se copia así a un temporal de la carpeta de subidas,
+calculando el SHA-256 a la vez, y se renombra a '<sha256>.pdf':
+
+- Memoria acotada: nunca se tiene el fichero entero en memoria, así que el
+  consumo no crece con el tamaño ni con el número de ficheros subidos.
+- Direccionado por contenido: dos subidas con el mismo nombre ya no se
+  pisan, y dos con el mismo contenido comparten fichero. El nombre que
+  envía el cliente solo se usa para mostrarlo (nunca como ruta).
+
+Con 'memory_limit' > 0 los ficheros de hasta ese tamaño se quedan en
+memoria como MemoryPdf y se parsean desde un io.BytesIO, sin pasar por
+disco; 'memory_budget' acota el total retenido así por petición.
+
+Limitación: lo que sí queda en memoria es el trozo que entrega el servidor
+ASGI (uvicorn lee de 64 KiB en 64 KiB), las subidas retenidas como
+MemoryPdf (como mucho 'memory_budget') y la lista de StoredUpload. Lo que
+escriba el trabajo de importación después no se mide aquí.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple, Union
+
+from fastapi import Request, UploadFile
+from python_multipart.multipart import MultipartParseError, MultipartParser, parse_options_header
+
+from importer import MemoryPdf
+
+UPLOAD_CHUNK = 1024 * 1024
+SMALL_UPLOAD_BYTES = 2 * 1024 * 1024
+MEMORY_BUDGET = 32 * 1024 * 1024
+
+
+@dataclass
+class StoredUpload:
+    name: str  # nombre mostrado (el del cliente, sin directorios)
+    digest: str
+    size: int
+    source: Union[str, MemoryPdf]  # ruta en disco o PDF en memoria
+
+    @property
+    def in_memory(self) -> bool:
+        return isinstance(self.source, MemoryPdf)
+
+
+def display_name(filename: Optional[str]) -> str:
+    # "../../x.pdf" o "C:\\a\\x.pdf" -> "x.pdf"
+    name = Path((filename or "").replace("\\", "/")).name
+    return name or "subida.pdf"
+
+
+class UploadFormError(ValueError):
+    """Cuerpo de subida que no es un multipart/form-data válido."""
+
+
+class UploadStore:
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        memory_limit: int = 0,
+        memory_budget: int = MEMORY_BUDGET,
+        chunk_size: int = UPLOAD_CHUNK,
+    ) -> None:
+        self.directory = Path(directory)
+        self.memory_limit = memory_limit
+        self.memory_budget = memory_budget
+        self.chunk_size = chunk_size
+        self.memory_used = 0
+
+    def begin(self, filename: Optional[str]) -> "UploadWriter":
+        """Empieza a recibir un fichero; los trozos se pasan a write()."""
+        return UploadWriter(self, display_name(filename))
+
+    async def save(self, upload: UploadFile) -> StoredUpload:
+        writer = self.begin(upload.filename)
+        try:
+            while True:
+                chunk = await upload.read(self.chunk_size)
+                if not chunk:
+                    break
+                writer.write(chunk)
+        except BaseException:
+            writer.abort()
+            raise
+        return writer.finish()
+
+    def _open_tmp(self):
+        fd, path = tempfile.mkstemp(dir=self.directory, prefix=".subida-", suffix=".part")
+        return os.fdopen(fd, "wb"), path
+
+
+class UploadWriter:
+    """
+    Un fichero en recepción: mientras quepa en memoria se acumula; al
+    pasarse se vuelca a un temporal y el resto va directo a disco.
+    """
+
+    def __init__(self, store: UploadStore, name: str) -> None:
+        self.store = store
+        self.name = name
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._limit = min(store.memory_limit, store.memory_budget - store.memory_used)
+        self._buf: Optional[bytearray] = bytearray() if self._limit > 0 else None
+        self._out: Optional[BinaryIO] = None
+        self._tmp_path: Optional[str] = None
+
+    def write(self, chunk: bytes) -> None:
+        self._hash.update(chunk)
+        self.size += len(chunk)
+        if self._buf is not None and self.size <= self._limit:
+            self._buf += chunk
+            return
+        if self._out is None:
+            self._out, self._tmp_path = self.store._open_tmp()
+            if self._buf:
+                self._out.write(self._buf)
+            self._buf = None
+        self._out.write(chunk)
+
+    def finish(self) -> StoredUpload:
+        try:
+            if self._out is None and self._buf is None:
+                self._out, self._tmp_path = self.store._open_tmp()  # fichero vacío
+            digest = self._hash.hexdigest()
+            if self._out is None:
+                data = bytes(self._buf)
+                self.store.memory_used += len(data)
+                return StoredUpload(self.name, digest, self.size, MemoryPdf(self.name, data, digest))
+
+            self._out.close()
+            dest = self.store.directory / f"{digest}.pdf"
+            if dest.exists():
+                os.unlink(self._tmp_path)  # mismo contenido ya subido
+            else:
+                os.replace(self._tmp_path, dest)
+            self._tmp_path = None
+            return StoredUpload(self.name, digest, self.size, str(dest))
+        except BaseException:
+            self.abort()
+            raise
+
+    def abort(self) -> None:
+        """Descarta lo recibido (subida cortada o error de escritura)."""
+        self._buf = None
+        if self._out is not None:
+            self._out.close()
+        if self._tmp_path is not None and os.path.exists(self._tmp_path):
+            os.unlink(self._tmp_path)
+        self._tmp_path = None
+
+
+class _FormReceiver:
+    """
+    Callbacks de MultipartParser: las partes de fichero del campo 'field'
+    van a un UploadWriter según llegan; el resto de partes se ignoran.
+    """
+
+    def __init__(self, store: UploadStore, field: str) -> None:
+        self.store = store
+        self.field = field
+        self.stored: List[StoredUpload] = []
+        self.errors: List[str] = []
+        self._header_name = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._filename: Optional[str] = None
+        self._writer: Optional[UploadWriter] = None
+
+    def callbacks(self) -> Dict[str, Callable[..., None]]:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        }
+
+    def on_part_begin(self) -> None:
+        self._disposition = b""
+        self._filename = None
+        self._writer = None
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        if self._header_name.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_name = self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._disposition)
+        if options.get(b"name") != self.field.encode() or b"filename" not in options:
+            return
+        self._filename = options[b"filename"].decode("utf-8", "replace")
+        try:
+            self._writer = self.store.begin(self._filename)
+        except OSError as e:
+            self._fail(e)
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._writer is None:
+            return
+        try:
+            self._writer.write(data[start:end])
+        except OSError as e:
+            self._fail(e)
+
+    def on_part_end(self) -> None:
+        writer, self._writer = self._writer, None
+        if writer is None:
+            return
+        try:
+            self.stored.append(writer.finish())
+        except OSError as e:
+            self.errors.append(f"{self._filename}: {e}")
+
+    def close(self) -> None:
+        # Parte a medias (cuerpo cortado o error de parseo)
+        if self._writer is not None:
+            self._writer.abort()
+            self._writer = None
+
+    def _fail(self, e: Exception) -> None:
+        if self._writer is not None:
+            self._writer.abort()
+            self._writer = None
+        self.errors.append(f"{self._filename}: {e}")
+
+
+async def receive_uploads(
+    request: Request, store: UploadStore, field: str = "pdf_files"
+) -> Tuple[List[StoredUpload], List[str]]:
+    """
+    Lee el cuerpo multipart/form-data de 'request' en streaming y guarda en
+    'store' cada fichero del campo 'field'. Devuelve las subidas guardadas y
+    los errores por fichero ("nombre: error"); un cuerpo mal formado lanza
+    UploadFormError.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise UploadFormError("Se esperaba un cuerpo multipart/form-data")
+
+    receiver = _FormReceiver(store, field)
+    parser = MultipartParser(params[b"boundary"], receiver.callbacks())
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+        parser.finalize()
+    except MultipartParseError as e:
+        raise UploadFormError(f"Cuerpo multipart mal formado: {e}") from e
+    finally:
+        receiver.close()
+    return receiver.stored, receiver.errors
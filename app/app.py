@@ -31,7 +31,8 @@ from db import AnalysisDB
 from analisis_view import AnalisisView
 from charts_view import ChartsView
 from ranges_config import RangesManager, RangesDialog
-from lab_pdf import parse_hematology_pdf
+from importer import import_pdfs
+from lab_pdf.parse_cache import get_default_cache
 from webcharts.launcher import WebChartsLauncher
 
 
@@ -112,6 +113,10 @@ class AnalisisSACYLApp(tk.Tk):
             label="Importar análisis desde PDF...",
             command=self.menu_import_pdfs,
         )
+        m_edit.add_command(
+            label="Importar solo informes nuevos desde PDF...",
+            command=lambda: self.menu_import_pdfs(skip_existing=True),
+        )
         menubar.add_cascade(label="Edición", menu=m_edit)
         self.menu_edicion = m_edit
 
@@ -254,7 +259,7 @@ class AnalisisSACYLApp(tk.Tk):
                 return
 
         try:
-            self.db = AnalysisDB(str(path))
+            self.db = AnalysisDB(str(path), series_cache=True)
             self.db.open()
         except Exception as e:
             logger.exception("Error creando nueva base de datos")
@@ -293,7 +298,7 @@ class AnalisisSACYLApp(tk.Tk):
             return
 
         try:
-            self.db = AnalysisDB(str(path))
+            self.db = AnalysisDB(str(path), series_cache=True)
             self.db.open()
         except Exception as e:
             logger.exception("Error abriendo base de datos")
@@ -328,7 +333,12 @@ class AnalisisSACYLApp(tk.Tk):
     # -----------------------------------------------------------------
     #   MENÚ EDICIÓN: IMPORTAR PDF(S)
     # -----------------------------------------------------------------
-    def menu_import_pdfs(self) -> None:
+    def menu_import_pdfs(self, skip_existing: bool = False) -> None:
+        """
+        Importa los PDFs elegidos. Por defecto se reimportan también los ya
+        importados (p.ej. para añadir datos que una versión anterior no
+        extraía); con 'skip_existing' se omiten sin parsearlos.
+        """
         if not self._db_is_open():
             messagebox.showwarning(
                 "Sin base de datos",
@@ -344,22 +354,10 @@ class AnalisisSACYLApp(tk.Tk):
         if not rutas:
             return
 
-        ok_count = 0
-        errores: List[str] = []
-
-        for ruta in rutas:
-            pdf_path = Path(ruta)
-            try:
-                self._import_single_pdf(pdf_path)
-                ok_count += 1
-            except ValueError as e:
-                # Errores esperados: informe no soportado (radiología, alta, microbiología, citometría, etc.)
-                logger.warning("Informe no soportado: %s (%s)", pdf_path, e)
-                errores.append(f"{pdf_path.name}: {e}")
-            except Exception as e:
-                # Errores inesperados del parser u otros
-                logger.exception("Error importando PDF: %s", pdf_path)
-                errores.append(f"{pdf_path.name}: Error inesperado: {e}")
+        logger.info("Importando %d PDF(s)", len(rutas))
+        res = import_pdfs(self.db, rutas, cache=get_default_cache(), skip_existing=skip_existing)
+        ok_count = res.ok
+        errores: List[str] = res.errors
 
         # Refrescamos vistas una sola vez al final
         self.refresh_all()
@@ -378,45 +376,12 @@ class AnalisisSACYLApp(tk.Tk):
                 + "\n".join(errores),
             )
         else:
+            extra = f"\n{res.skipped} ya estaba(n) importado(s)." if res.skipped else ""
             messagebox.showinfo(
                 "Importación completada",
-                f"Se importaron correctamente {ok_count} informe(s) de laboratorio.",
+                f"Se importaron correctamente {ok_count} informe(s) de laboratorio.{extra}",
             )
 
-    def _import_single_pdf(self, pdf_path: Path) -> None:
-        """
-        Importa un único informe PDF en la BD abierta.
-
-        Levanta excepción si algo falla (se gestiona a nivel superior).
-        """
-        if not self._db_is_open():
-            raise RuntimeError("No hay base de datos abierta")
-
-        logger.info("Importando PDF: %s", pdf_path)
-
-        data = parse_hematology_pdf(str(pdf_path))
-
-        # Paciente (si viene)
-        paciente = data.get("paciente")
-        if isinstance(paciente, dict):
-            self.db.save_patient(paciente)
-
-        # Hematología
-        for d in data.get("hematologia", []):
-            self.db.insert_hematologia(d)
-
-        # Bioquímica
-        for d in data.get("bioquimica", []):
-            self.db.insert_bioquimica(d)
-
-        # Gasometría
-        for d in data.get("gasometria", []):
-            self.db.insert_gasometria(d)
-
-        # Orina
-        for d in data.get("orina", []):
-            self.db.insert_orina(d)
-
     # -----------------------------------------------------------------
     #   MENÚ CONFIGURACIÓN: RANGOS
     # -----------------------------------------------------------------
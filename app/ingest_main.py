@@ -0,0 +1,111 @@
+# app/ingest_main.py
+# -*- coding: utf-8 -*-
+"""
+Servicio de ingesta: vigila una carpeta e importa los PDFs nuevos en la BD
+del paciente (ver importer/watcher.py).
+
+Uso:
+    python -m app.ingest_main <paciente.db> <carpeta> [--interval 5] [--batch-size 20]
+                              [--workers 1] [--status-file estado.json] [--once]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+from pathlib import Path
+from typing import List, Optional
+
+from db import AnalysisDB
+from importer.watcher import DEFAULT_BATCH_SIZE, DEFAULT_INTERVAL, DEFAULT_SETTLE, FolderWatcher
+from lab_pdf.parse_cache import ParseCache, default_cache_path
+
+logger = logging.getLogger(__name__)
+
+
+def _write_status(path: Path, watcher: FolderWatcher) -> None:
+    # Escritura atómica: quien lea el fichero nunca ve un JSON a medias
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(watcher.stats.snapshot(), indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.ingest_main",
+        description="Importa de forma continua los PDFs que aparecen en una carpeta.",
+    )
+    parser.add_argument("db_path", help="Fichero SQLite del paciente (se crea si no existe)")
+    parser.add_argument("folder", help="Carpeta vigilada")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL,
+                        help="Segundos entre escaneos")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="PDFs por microlote (una transacción por lote)")
+    parser.add_argument("--settle", type=float, default=DEFAULT_SETTLE,
+                        help="Segundos sin cambios antes de importar un fichero")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Procesos de parseo por microlote")
+    parser.add_argument("--no-recursive", action="store_true",
+                        help="No entrar en subdirectorios")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Parsear siempre, sin caché")
+    parser.add_argument("--status-file", default=None,
+                        help="JSON con backlog y latencias, reescrito tras cada vuelta")
+    parser.add_argument("--once", action="store_true",
+                        help="Una sola vuelta y salir")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if not Path(args.folder).is_dir():
+        print(f"[ERROR] No existe la carpeta: {args.folder}")
+        return 1
+
+    cache = None if args.no_cache else ParseCache(default_cache_path())
+    db = AnalysisDB(args.db_path)
+    db.open()
+    watcher = FolderWatcher(
+        db, args.folder,
+        interval=args.interval, batch_size=args.batch_size, settle=args.settle,
+        workers=args.workers, cache=cache, recursive=not args.no_recursive,
+    )
+    status_file = Path(args.status_file) if args.status_file else None
+
+    def on_cycle(w: FolderWatcher) -> None:
+        if status_file is not None:
+            _write_status(status_file, w)
+
+    stop = threading.Event()
+
+    def _stop(_signum, _frame):
+        logger.info("Deteniendo ingesta...")
+        stop.set()
+
+    previous = {sig: signal.signal(sig, _stop) for sig in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        if args.once:
+            watcher.run_once()
+            on_cycle(watcher)
+        else:
+            watcher.run_forever(stop, on_cycle=on_cycle)
+    finally:
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+        db.close()
+        if cache is not None:
+            cache.close()
+
+    s = watcher.stats
+    print(f"[OK] Importados: {s.imported}  Ya importados: {s.skipped}  Errores: {s.errors}")
+    return 0
+
+
+if __name__ == "__main__":
+    # Necesario para el ProcessPoolExecutor del importador en el .exe (PyInstaller)
+    multiprocessing.freeze_support()
+    sys.exit(main())
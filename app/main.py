@@ -1,5 +1,6 @@
 # app/main.py
 import logging
+import multiprocessing
 from app import AnalisisSACYLApp
 
 
@@ -10,4 +11,6 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    # Necesario para el ProcessPoolExecutor del importador en el .exe (PyInstaller)
+    multiprocessing.freeze_support()
     main()
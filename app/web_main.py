@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import multiprocessing
 import threading
 import time
 import webbrowser
@@ -79,4 +80,6 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    # Necesario para el ProcessPoolExecutor del importador en el .exe (PyInstaller)
+    multiprocessing.freeze_support()
     main()
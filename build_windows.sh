@@ -38,6 +38,7 @@ python -m PyInstaller \
   --paths . \
   --add-data "web;web" \
   --add-data "lab_pdf;lab_pdf" \
+  --add-data "parametros_laboratorio.json;." \
   app/web_main.py
 
 # 5. Build completado
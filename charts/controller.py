@@ -5,7 +5,7 @@ from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from .defs import PARAM_DEFS
 from .plotter_mpl import MatplotlibPlotter, NormalRange
-from .series_provider import DbSeriesProvider, SeriesPoint
+from .series_provider import DbSeriesProvider
 
 
 class ChartsController:
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Reducción de puntos para gráficas: Largest-Triangle-Three-Buckets (LTTB).
+
+LTTB conserva la forma visual de la serie (picos y valles) eligiendo, en cada
+bucket, el punto que forma el triángulo de mayor área con el punto elegido en
+el bucket anterior y la media del siguiente. El recorrido entre buckets es
+secuencial por definición; dentro de cada bucket el cálculo es vectorial.
+"""
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+import numpy as np
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Índices (ordenados) de los n_out puntos que elige LTTB."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # Bucket j = [edges[j], edges[j+1]); el primero y el último punto van
+    # aparte, y el "bucket" n_out-2 es solo el último punto.
+    every = (n - 2) / (n_out - 2)
+    edges = np.empty(n_out, dtype=np.int64)
+    edges[:-1] = np.floor(np.arange(n_out - 1) * every).astype(np.int64) + 1
+    edges[-1] = n
+
+    # Medias de cada bucket con sumas acumuladas (sin bucle)
+    cx = np.concatenate(([0.0], np.cumsum(x)))
+    cy = np.concatenate(([0.0], np.cumsum(y)))
+    sizes = edges[1:] - edges[:-1]
+    mean_x = (cx[edges[1:]] - cx[edges[:-1]]) / sizes
+    mean_y = (cy[edges[1:]] - cy[edges[:-1]]) / sizes
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0] = 0
+    out[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        nx, ny = mean_x[i + 1], mean_y[i + 1]
+        area = np.abs((ax - nx) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (ny - ay))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def downsample_indices(
+    x: np.ndarray,
+    y: np.ndarray,
+    max_points: Optional[int],
+    *,
+    low: Optional[float] = None,
+    high: Optional[float] = None,
+    thresholds: Iterable[float] = (),
+    keep_last: int = 2,
+) -> np.ndarray:
+    """
+    Índices a conservar para dibujar como mucho ~max_points puntos.
+
+    Siempre se conservan, además de lo que elija LTTB:
+      - los valores fuera de rango (< low o > high): alertas de los KPIs;
+      - los dos puntos de cada cruce de un umbral (límites clínicos);
+      - los 'keep_last' últimos (último valor y delta).
+    Por eso el resultado puede superar max_points si hay muchos forzados.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if max_points is None or n <= max_points:
+        return np.arange(n)
+
+    forced = np.zeros(n, dtype=bool)
+    if low is not None:
+        forced |= y < low
+    if high is not None:
+        forced |= y > high
+    for t in thresholds:
+        above = y >= t
+        crossing = np.flatnonzero(above[1:] != above[:-1])
+        forced[crossing] = True
+        forced[crossing + 1] = True
+    if keep_last > 0:
+        forced[-keep_last:] = True
+
+    budget = max(int(max_points) - int(forced.sum()), 3)
+    chosen = lttb_indices(np.asarray(x, dtype=float), y, budget)
+    return np.union1d(chosen, np.flatnonzero(forced))
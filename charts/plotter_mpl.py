@@ -2,12 +2,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional, Sequence, Tuple
+from typing import Optional, Tuple
 
 from matplotlib.figure import Figure
 from matplotlib.dates import AutoDateLocator, ConciseDateFormatter
 
-from .series_provider import SeriesPoint
+from .series_provider import Series
 
 
 @dataclass(frozen=True)
@@ -23,7 +23,7 @@ class MatplotlibPlotter:
         self,
         *,
         title: str,
-        points: Sequence[SeriesPoint],
+        points: Series,
         normal_range: Optional[NormalRange] = None,
         figsize: Tuple[float, float] = (4.5, 2.7),
         dpi: int = 100,
@@ -31,8 +31,9 @@ class MatplotlibPlotter:
         fig = Figure(figsize=figsize, dpi=dpi)
         ax = fig.add_subplot(111)
 
-        fechas = [p.date for p in points]
-        valores = [p.value for p in points]
+        # Arrays directamente (datetime64 lo entiende matplotlib)
+        fechas = points.dates
+        valores = points.values
 
         ax.plot(fechas, valores, marker="o", linestyle="-")
 
@@ -48,8 +49,8 @@ class MatplotlibPlotter:
         ax.set_ylabel("Valor")
 
         if normal_range and (normal_range.min_value is not None or normal_range.max_value is not None):
-            ymin_plot = min(valores)
-            ymax_plot = max(valores)
+            ymin_plot = float(valores.min())
+            ymax_plot = float(valores.max())
             ymin = normal_range.min_value if normal_range.min_value is not None else ymin_plot
             ymax = normal_range.max_value if normal_range.max_value is not None else ymax_plot
             ax.axhspan(ymin, ymax, alpha=0.15)
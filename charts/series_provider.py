@@ -3,15 +3,24 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union, overload
+
+import numpy as np
 
 from .defs import PARAM_DEFS
+from .downsample import downsample_indices
 
 
 def parse_date_yyyy_mm_dd(value: Any) -> Optional[datetime]:
     txt = str(value or "").strip()
     if not txt:
         return None
+    if len(txt) == 10 and txt[4] == "-" and txt[7] == "-":
+        # Camino rápido (formato canónico de la BD): evita strptime
+        try:
+            return datetime(int(txt[0:4]), int(txt[5:7]), int(txt[8:10]))
+        except ValueError:
+            pass
     try:
         return datetime.strptime(txt, "%Y-%m-%d")
     except ValueError:
@@ -35,6 +44,115 @@ class SeriesPoint:
     value: float
 
 
+def _dates_array(fechas: Sequence[Any]) -> np.ndarray:
+    """Fechas YYYY-MM-DD -> datetime64[D] (NaT las inválidas)."""
+    try:
+        return np.array(fechas, dtype="datetime64[D]")
+    except (TypeError, ValueError):
+        out = np.full(len(fechas), np.datetime64("NaT"), dtype="datetime64[D]")
+        for i, f in enumerate(fechas):
+            dt = parse_date_yyyy_mm_dd(f)
+            if dt is not None:
+                out[i] = np.datetime64(dt.date(), "D")
+        return out
+
+
+def _values_array(raw: Sequence[Any]) -> np.ndarray:
+    """Valores -> float64 (NaN los vacíos o no numéricos, '0,4' admitido)."""
+    try:
+        return np.array(raw, dtype=np.float64)
+    except (TypeError, ValueError):
+        return np.array([np.nan if (v := parse_float(r)) is None else v for r in raw], dtype=np.float64)
+
+
+class Series:
+    """
+    Serie temporal como dos arrays paralelos: fechas (datetime64[D]) y
+    valores (float64), ordenada por fecha y sin huecos (NaN/NaT).
+
+    Sustituye a la lista de SeriesPoint: ordenar, filtrar, reducir y
+    formatear son operaciones vectorizadas. La indexación entera sigue
+    dando un SeriesPoint (compatibilidad); con slices o arrays de índices
+    devuelve otra Series.
+    """
+
+    __slots__ = ("dates", "values")
+
+    def __init__(self, dates: np.ndarray, values: np.ndarray):
+        self.dates = dates
+        self.values = values
+
+    @classmethod
+    def empty(cls) -> "Series":
+        return cls(np.empty(0, dtype="datetime64[D]"), np.empty(0, dtype=np.float64))
+
+    @classmethod
+    def from_arrays(cls, dates: np.ndarray, values: np.ndarray) -> "Series":
+        """Arrays ya limpios y ordenados (p.ej. de db.series_arrays): sin copia."""
+        return cls(dates.astype("datetime64[D]", copy=False), values.astype(np.float64, copy=False))
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[Tuple[Any, Any]]) -> "Series":
+        """(fecha, valor) en cualquier orden; descarta fechas o valores inválidos."""
+        pairs = list(pairs)
+        if not pairs:
+            return cls.empty()
+        fechas, raw = zip(*pairs)
+        return cls(_dates_array(fechas), _values_array(raw)).clean()
+
+    def clean(self) -> "Series":
+        """Quita NaN/NaT y ordena por fecha (estable: respeta el orden de empate)."""
+        keep = ~np.isnat(self.dates) & ~np.isnan(self.values)
+        dates, values = self.dates[keep], self.values[keep]
+        if len(dates) > 1 and (np.diff(dates.astype(np.int64)) < 0).any():
+            order = np.argsort(dates, kind="stable")
+            dates, values = dates[order], values[order]
+        return Series(dates, values)
+
+    def between(self, date_from: Optional[str] = None, date_to: Optional[str] = None) -> "Series":
+        """Ventana [date_from, date_to] inclusive (búsqueda binaria)."""
+        lo = np.searchsorted(self.dates, np.datetime64(date_from, "D"), "left") if date_from else 0
+        hi = np.searchsorted(self.dates, np.datetime64(date_to, "D"), "right") if date_to else len(self)
+        return self[int(lo):int(hi)]
+
+    @property
+    def day_numbers(self) -> np.ndarray:
+        """Días desde 1970-01-01 (eje x numérico, p.ej. para LTTB)."""
+        return self.dates.astype(np.int64)
+
+    def iso_dates(self) -> List[str]:
+        return np.datetime_as_string(self.dates, unit="D").tolist()
+
+    def to_payload(self) -> List[Dict[str, Any]]:
+        """[{"date": "YYYY-MM-DD", "value": float}, ...] para JSON."""
+        return [{"date": d, "value": v} for d, v in zip(self.iso_dates(), self.values.tolist())]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @overload
+    def __getitem__(self, key: int) -> SeriesPoint: ...
+    @overload
+    def __getitem__(self, key: Union[slice, np.ndarray, Sequence[int]]) -> "Series": ...
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            d = self.dates[key].item()
+            return SeriesPoint(date=datetime(d.year, d.month, d.day), value=float(self.values[key]))
+        return Series(self.dates[key], self.values[key])
+
+    def __iter__(self) -> Iterator[SeriesPoint]:
+        return (self[i] for i in range(len(self)))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Series):
+            return NotImplemented
+        return np.array_equal(self.dates, other.dates) and np.array_equal(self.values, other.values)
+
+    def __repr__(self) -> str:
+        return f"Series(n={len(self)})"
+
+
 class DbSeriesProvider:
     """
     Obtiene series temporales desde la BD.
@@ -48,24 +166,96 @@ class DbSeriesProvider:
     def is_ready(self) -> bool:
         return self._db is not None and bool(getattr(self._db, "is_open", False))
 
-    def get_series(self, param_name: str, *, limit: int = 1000) -> List[SeriesPoint]:
+    def get_series(
+        self,
+        param_name: str,
+        *,
+        limit: int = 1000,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> Series:
         info = self._param_defs.get(param_name)
         if not info or not self.is_ready():
-            return []
+            return Series.empty()
 
         table = info.get("table")
+        if getattr(self._db, "series_cache", None) is not None:
+            # Caché columnar en memoria (db/series_cache.py): slicing por fecha
+            dates, values = self._db.series_arrays(
+                param_name, date_from=date_from, date_to=date_to, limit=limit, table=table
+            )
+            return Series.from_arrays(dates, values)
+
+        if hasattr(self._db, "series"):
+            # Consulta proyectada: solo (fecha, valor), sin NULLs, ya ordenada
+            pairs = self._db.series(
+                param_name, date_from=date_from, date_to=date_to, limit=limit, table=table
+            )
+            return Series.from_pairs(pairs)
+
         rows = self._list_rows_for_table(table, limit=limit)
-        points: List[SeriesPoint] = []
+        series = Series.from_pairs((r.get("fecha_analisis"), r.get(param_name)) for r in rows)
+        if date_from or date_to:
+            series = series.between(date_from, date_to)
+        return series
+
+    def get_series_batch(
+        self,
+        param_names: Iterable[str],
+        *,
+        limit: int = 1000,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> Dict[str, Series]:
+        """
+        Varias series a la vez: agrupa los parámetros por tabla y hace una
+        consulta por tabla (con la caché de series, cada una es un slicing en
+        memoria). Los parámetros desconocidos no aparecen.
+        """
+        names = [p for p in dict.fromkeys(param_names) if p in self._param_defs]
+        if not names or not self.is_ready():
+            return {}
+
+        if getattr(self._db, "series_cache", None) is not None or not hasattr(self._db, "series_many"):
+            return {
+                p: self.get_series(p, limit=limit, date_from=date_from, date_to=date_to)
+                for p in names
+            }
+
+        by_table: Dict[str, List[str]] = {}
+        for p in names:
+            by_table.setdefault(self._param_defs[p].get("table"), []).append(p)
 
-        for r in rows:
-            dt = parse_date_yyyy_mm_dd(r.get("fecha_analisis"))
-            val = parse_float(r.get(param_name))
-            if dt is None or val is None:
-                continue
-            points.append(SeriesPoint(date=dt, value=val))
+        out: Dict[str, Series] = {}
+        for table, params in by_table.items():
+            pairs_by_param = self._db.series_many(
+                table, params, date_from=date_from, date_to=date_to, limit=limit
+            )
+            for p in params:
+                out[p] = Series.from_pairs(pairs_by_param.get(p, []))
+        return {p: out[p] if p in out else Series.empty() for p in names}
 
-        points.sort(key=lambda p: p.date)
-        return points
+    @staticmethod
+    def downsample(
+        series: Series,
+        max_points: Optional[int],
+        *,
+        low: Optional[float] = None,
+        high: Optional[float] = None,
+        thresholds: Iterable[float] = (),
+    ) -> Tuple[Series, bool]:
+        """
+        Reduce la serie con LTTB a ~max_points (ver charts.downsample).
+        Devuelve (serie, reducida?). Los puntos fuera de [low, high] y los
+        cruces de 'thresholds' se conservan siempre.
+        """
+        if max_points is None or len(series) <= max_points:
+            return series, False
+        x = series.day_numbers.astype(float)
+        idx = downsample_indices(x, series.values, max_points, low=low, high=high, thresholds=thresholds)
+        if len(idx) == len(series):
+            return series, False
+        return series[np.asarray(idx)], True
 
     def _list_rows_for_table(self, table: str, *, limit: int) -> Iterable[Dict[str, Any]]:
         if table == "hematologia":
@@ -2,7 +2,55 @@
 # -*- coding: utf-8 -*-
 
 import sqlite3
-from typing import Any, Dict, List, Optional, Tuple
+from datetime import date
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .data_version import bump_data_version
+
+
+def fecha_ordinal(fecha: Any) -> Optional[int]:
+    """'YYYY-MM-DD' -> número de día (date.toordinal); None si no es una fecha."""
+    try:
+        return date.fromisoformat(str(fecha).strip()[:10]).toordinal()
+    except (TypeError, ValueError):
+        return None
+
+
+def date_range_sql(date_from: Optional[str] = None, date_to: Optional[str] = None) -> Tuple[str, List[Any]]:
+    """
+    Condiciones ' AND ...' (y sus parámetros) para filtrar por fecha
+    [date_from, date_to] inclusive sobre analisis.fecha_ordinal: un recorrido
+    por rango de idx_analisis_fecha_ordinal. Un límite que no sea una fecha
+    YYYY-MM-DD se compara como texto con fecha_analisis (comportamiento
+    anterior).
+    """
+    sql = ""
+    params: List[Any] = []
+    for bound, op in ((date_from, ">="), (date_to, "<=")):
+        if not bound:
+            continue
+        ordinal = fecha_ordinal(bound)
+        if ordinal is not None:
+            sql += f" AND analisis.fecha_ordinal {op} ?"
+            params.append(ordinal)
+        else:
+            sql += f" AND analisis.fecha_analisis {op} ?"
+            params.append(bound)
+    return sql, params
+
+
+def backfill_fecha_ordinal(conn: sqlite3.Connection) -> None:
+    """Migración v9: añade y rellena analisis.fecha_ordinal."""
+    cols = {r[1] for r in conn.execute("PRAGMA table_info(analisis)")}
+    if "fecha_ordinal" not in cols:
+        conn.execute("ALTER TABLE analisis ADD COLUMN fecha_ordinal INTEGER")
+    rows = conn.execute("SELECT id, fecha_analisis FROM analisis").fetchall()
+    conn.executemany(
+        "UPDATE analisis SET fecha_ordinal = ? WHERE id = ?",
+        [(fecha_ordinal(fecha), rid) for rid, fecha in rows],
+    )
+    conn.execute("DROP INDEX IF EXISTS idx_analisis_fecha")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_analisis_fecha_ordinal ON analisis(fecha_ordinal)")
 
 
 class Analisis:
@@ -20,15 +68,16 @@ class Analisis:
         cur = self.conn.cursor()
         cur.execute(
             """
-            INSERT INTO analisis (fecha_analisis, numero_peticion, origen)
-            VALUES (?, ?, ?)
+            INSERT INTO analisis (fecha_analisis, fecha_ordinal, numero_peticion, origen)
+            VALUES (?, ?, ?, ?)
             """,
-            (fecha, numero_peticion, origen),
+            (fecha, fecha_ordinal(fecha), numero_peticion, origen),
         )
+        bump_data_version(self.conn)
         self.conn.commit()
         return int(cur.lastrowid)
 
-    def ensure(self, d: dict) -> int:
+    def ensure(self, d: dict, commit: bool = True) -> int:
         analisis_id = d.get("analisis_id")
         if analisis_id:
             return int(analisis_id)
@@ -56,29 +105,41 @@ class Analisis:
                     "UPDATE analisis SET origen = ? WHERE id = ?",
                     (origen, existing_id),
                 )
-                self.conn.commit()
+                bump_data_version(self.conn)
+                if commit:
+                    self.conn.commit()
 
             return existing_id
 
         # Si no existe, crear (con origen si viene)
         cur.execute(
-            "INSERT INTO analisis (fecha_analisis, numero_peticion, origen) VALUES (?, ?, ?)",
-            (fecha, num, origen),
+            "INSERT INTO analisis (fecha_analisis, fecha_ordinal, numero_peticion, origen) VALUES (?, ?, ?, ?)",
+            (fecha, fecha_ordinal(fecha), num, origen),
         )
-        self.conn.commit()
+        bump_data_version(self.conn)
+        if commit:
+            self.conn.commit()
         return int(cur.lastrowid)
 
-    def list(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
-        cur = self.conn.cursor()
-        sql = """
-            SELECT *
-            FROM analisis
-            ORDER BY fecha_analisis ASC
+    def exists(self, fecha: str, numero_peticion: str) -> bool:
+        row = self.conn.execute(
+            "SELECT 1 FROM analisis WHERE fecha_analisis = ? AND numero_peticion = ?",
+            (fecha, numero_peticion),
+        ).fetchone()
+        return row is not None
+
+    def keys(self) -> Set[Tuple[str, str]]:
+        """
+        Claves naturales (fecha_analisis, numero_peticion) ya importadas.
+        Se leen solo del índice ux_analisis_fecha_peticion.
         """
-        params: Tuple[Any, ...] = ()
-        if limit is not None:
-            sql += " LIMIT ?"
-            params = (limit,)
+        rows = self.conn.execute(
+            "SELECT fecha_analisis, numero_peticion FROM analisis WHERE numero_peticion IS NOT NULL"
+        ).fetchall()
+        return {(r[0], r[1]) for r in rows}
+
+    def list(self, limit: Optional[int] = None, **window: Any) -> List[Dict[str, Any]]:
+        """Ventana de fechas, cursor y orden: ver db.rows.select_rows."""
+        from .rows import select_rows  # db.rows importa fecha_ordinal de aquí
 
-        rows = cur.execute(sql, params).fetchall()
-        return [dict(r) for r in rows]
+        return select_rows(self.conn, "analisis", limit, **window)
@@ -2,52 +2,63 @@
 # -*- coding: utf-8 -*-
 
 import sqlite3
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Sequence
+
+from metrics import timer
 
 from .analisis import Analisis
+from .data_version import bump_data_version
+from .rows import select_rows
+from .series import SeriesRow, select_series, select_series_many
 
 
 class Bioquimica:
+    FIELDS: List[str] = [
+        "glucosa", "urea", "creatinina",
+        "sodio", "potasio", "cloro", "calcio", "fosforo",
+        "colesterol_total", "colesterol_hdl", "colesterol_ldl",
+        "colesterol_no_hdl", "trigliceridos", "indice_riesgo",
+        "hierro", "ferritina", "vitamina_b12",
+    ]
+
     def __init__(self, conn: sqlite3.Connection, analisis: Analisis):
         self.conn = conn
         self.analisis = analisis
 
-    def insert(self, d: Dict[str, Any]) -> None:
-        analisis_id = self.analisis.ensure(d)
-
-        fields = [
-            "analisis_id",
-            "glucosa", "urea", "creatinina",
-            "sodio", "potasio", "cloro", "calcio", "fosforo",
-            "colesterol_total", "colesterol_hdl", "colesterol_ldl",
-            "colesterol_no_hdl", "trigliceridos", "indice_riesgo",
-            "hierro", "ferritina", "vitamina_b12",
-        ]
-        values = [analisis_id] + [d.get(f) for f in fields[1:]]
-
-        cur = self.conn.cursor()
-        cur.execute(
-            f"INSERT INTO bioquimica ({','.join(fields)}) VALUES ({','.join(['?']*len(fields))})",
-            values,
-        )
-        self.conn.commit()
-
-    def list(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
-        cur = self.conn.cursor()
-        sql = """
-            SELECT bioquimica.*,
-                   analisis.fecha_analisis,
-                   analisis.numero_peticion,
-                   analisis.origen
-            FROM bioquimica
-            JOIN analisis ON bioquimica.analisis_id = analisis.id
-            ORDER BY analisis.fecha_analisis ASC
+    def insert(self, d: Dict[str, Any], commit: bool = True) -> None:
+        analisis_id = self.analisis.ensure(d, commit=False)
+        self.insert_rows([self.row(d, analisis_id)], commit=commit)
+
+    def row(self, d: Dict[str, Any], analisis_id: int) -> List[Any]:
+        """Valores de una fila en el orden de ["analisis_id"] + FIELDS."""
+        return [analisis_id] + [d.get(f) for f in self.FIELDS]
+
+    def insert_rows(self, rows: Sequence[Sequence[Any]], commit: bool = True) -> None:
         """
-        params: Tuple[Any, ...] = ()
-        if limit is not None:
-            sql += " LIMIT ?"
-            params = (limit,)
-
-        rows = cur.execute(sql, params).fetchall()
-        aux = [dict(r) for r in rows]
-        return aux
+        Inserta filas ya resueltas (ver row) con un único executemany.
+        Idempotente: si el análisis ya tiene fila en bioquimica, no se duplica.
+        """
+        cols = ["analisis_id"] + self.FIELDS
+        with timer("db.insert.bioquimica"):
+            cur = self.conn.executemany(
+                f"INSERT INTO bioquimica ({','.join(cols)}) VALUES ({','.join(['?'] * len(cols))}) "
+                "ON CONFLICT(analisis_id) DO NOTHING",
+                rows,
+            )
+        if cur.rowcount:
+            bump_data_version(self.conn)
+        if commit:
+            self.conn.commit()
+
+    def list(self, limit: Optional[int] = None, **window: Any) -> List[Dict[str, Any]]:
+        """Filas con su análisis; ventana de fechas, cursor y orden: ver db.rows.select_rows."""
+        return select_rows(self.conn, "bioquimica", limit, **window)
+
+    def series(self, column: str, date_from: Optional[str] = None, date_to: Optional[str] = None,
+               limit: Optional[int] = None) -> List[SeriesRow]:
+        return select_series(self.conn, "bioquimica", self.FIELDS, column, date_from, date_to, limit)
+
+    def series_many(self, columns: Sequence[str], date_from: Optional[str] = None,
+                    date_to: Optional[str] = None,
+                    limit: Optional[int] = None) -> Dict[str, List[SeriesRow]]:
+        return select_series_many(self.conn, "bioquimica", self.FIELDS, columns, date_from, date_to, limit)
@@ -4,6 +4,8 @@
 import sqlite3
 from typing import Optional
 
+from .data_version import bump_data_version
+
 
 class Config:
     def __init__(self, conn: sqlite3.Connection):
@@ -24,5 +26,6 @@ class Config:
             "ON CONFLICT(key) DO UPDATE SET value=excluded.value",
             (key, value),
         )
+        bump_data_version(self.conn)
         self.conn.commit()
 
@@ -0,0 +1,52 @@
+# db/data_version.py
+# -*- coding: utf-8 -*-
+
+import sqlite3
+import uuid
+from typing import Tuple
+
+# Claves en app_config
+DATA_VERSION_KEY = "data_version"
+DATA_EPOCH_KEY = "data_epoch"
+
+
+def bump_data_version(conn: sqlite3.Connection) -> None:
+    """
+    Incrementa el contador de versión de datos. Se llama desde TODAS las
+    escrituras de los componentes, dentro de su misma transacción (el commit
+    lo hace quien escribe), así que solo avanza si la escritura se confirma.
+    """
+    conn.execute(
+        "INSERT INTO app_config(key,value) VALUES(?, '1') "
+        "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1",
+        (DATA_VERSION_KEY,),
+    )
+
+
+def get_data_version(conn: sqlite3.Connection) -> Tuple[str, int]:
+    """
+    (epoch, versión). El epoch es aleatorio por fichero: dos BDs distintas con
+    el mismo contador no comparten ETag.
+    """
+    rows = conn.execute(
+        "SELECT key, value FROM app_config WHERE key IN (?, ?)",
+        (DATA_EPOCH_KEY, DATA_VERSION_KEY),
+    ).fetchall()
+    values = {r[0]: r[1] for r in rows}
+    try:
+        version = int(values.get(DATA_VERSION_KEY) or 0)
+    except ValueError:
+        version = 0
+    return str(values.get(DATA_EPOCH_KEY) or ""), version
+
+
+def init_data_version(conn: sqlite3.Connection) -> None:
+    """Migración: crea epoch y contador si no existen."""
+    conn.execute(
+        "INSERT OR IGNORE INTO app_config(key,value) VALUES(?, ?)",
+        (DATA_EPOCH_KEY, uuid.uuid4().hex[:12]),
+    )
+    conn.execute(
+        "INSERT OR IGNORE INTO app_config(key,value) VALUES(?, '0')",
+        (DATA_VERSION_KEY,),
+    )
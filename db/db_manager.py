@@ -2,14 +2,22 @@
 # -*- coding: utf-8 -*-
 
 import sqlite3
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional
+
+import numpy as np
 
 from . import db_schema
-from .analisis import Analisis
+from .analisis import Analisis, fecha_ordinal
 from .config import Config
+from .informe import SECTIONS, Informe, InformeBatch
+from .ingest_checkpoint import IngestCheckpoint
 from .ingreso import Ingreso
 from .limite_parametro import LimiteParametro
+from .observation import Observation
+from .param_summary import ParamSummary
 from .paciente import Paciente
+from .series import SeriesRow
+from .series_cache import SeriesArrays, SeriesCache, series_cache_for
 from .hematologia import Hematologia
 from .bioquimica import Bioquimica
 from .gasometria import Gasometria
@@ -30,12 +38,22 @@ class AnalysisDB:
       - bioquimica
       - gasometria
       - orina
+      - observation (todos los resultados numéricos, formato largo)
+      - informe (informe completo en una sola transacción)
+      - ingest_checkpoint (ficheros ya procesados por la ingesta vigilada)
+      - param_summary (resumen por parámetro: último valor, min/max, alertas)
+
+    Con series_cache=True las series se sirven desde una caché columnar en
+    memoria compartida por todas las conexiones al mismo fichero (ver
+    db/series_cache.py); las escrituras de esta fachada la invalidan.
     """
 
-    def __init__(self, db_path: str = DB_FILE):
+    def __init__(self, db_path: str = DB_FILE, series_cache: bool = False):
         self.db_path = db_path
         self.conn: Optional[sqlite3.Connection] = None
         self.is_open: bool = False
+        self.use_series_cache = series_cache
+        self.series_cache: Optional[SeriesCache] = None
 
         # Componentes
         self.analisis: Optional[Analisis] = None
@@ -44,15 +62,23 @@ class AnalysisDB:
         self.bioquimica: Optional[Bioquimica] = None
         self.gasometria: Optional[Gasometria] = None
         self.orina: Optional[Orina] = None
+        self.observation: Optional[Observation] = None
+        self.param_summary: Optional[ParamSummary] = None
         self.config: Optional[Config] = None
         self.limite_parametro: Optional[LimiteParametro] = None
         self.tratamiento: Optional[Tratamiento] = None
         self.ingreso: Optional[Ingreso] = None
+        self.informe: Optional[Informe] = None
+        self.ingest_checkpoint: Optional[IngestCheckpoint] = None
 
     # --------------------
     #   OPEN / CLOSE
     # --------------------
-    def open(self) -> None:
+    def open(self, create_schema: bool = True) -> None:
+        """
+        Abre la conexión. create_schema=False omite la creación del esquema
+        (útil cuando el fichero ya se inicializó antes, p.ej. desde un pool).
+        """
         if self.is_open:
             return
 
@@ -60,8 +86,11 @@ class AnalysisDB:
         self.conn.row_factory = sqlite3.Row
         self.conn.execute("PRAGMA foreign_keys = ON")
 
-        self._create_tables()
+        if create_schema:
+            self._create_tables()
         self._init_components()
+        if self.use_series_cache and self.db_path != ":memory:":
+            self.series_cache = series_cache_for(self.db_path)
         self.is_open = True
 
     def close(self) -> None:
@@ -70,14 +99,14 @@ class AnalysisDB:
 
         self.conn = None
         self.is_open = False
+        self.series_cache = None
 
     # --------------------
     #   INIT
     # --------------------
     def _create_tables(self) -> None:
-        cur = self.conn.cursor()
-        db_schema.create_schema(cur)
-        self.conn.commit()
+        # Solo aplica las migraciones pendientes (ver db_schema.MIGRATIONS)
+        db_schema.migrate(self.conn)
 
     def _init_components(self) -> None:
         self.analisis = Analisis(self.conn)
@@ -86,10 +115,26 @@ class AnalysisDB:
         self.bioquimica = Bioquimica(self.conn, self.analisis)
         self.gasometria = Gasometria(self.conn, self.analisis)
         self.orina = Orina(self.conn, self.analisis)
+        self.observation = Observation(self.conn, self.analisis)
+        self.param_summary = ParamSummary(self.conn)
         self.config = Config(self.conn)
         self.limite_parametro = LimiteParametro(self.conn)
         self.tratamiento = Tratamiento(self.conn)
         self.ingreso = Ingreso(self.conn)
+        self.informe = Informe(
+            self.conn,
+            self.analisis,
+            self.paciente,
+            {
+                "hematologia": self.hematologia,
+                "bioquimica": self.bioquimica,
+                "gasometria": self.gasometria,
+                "orina": self.orina,
+                "observation": self.observation,
+            },
+            on_write=self._invalidate_series,
+        )
+        self.ingest_checkpoint = IngestCheckpoint(self.conn)
 
     # --------------------
     #   API FACHADA
@@ -98,8 +143,12 @@ class AnalysisDB:
     def create_analisis(self, info: Dict[str, Any]) -> int:
         return self.analisis.create(info)
 
-    def list_analisis(self, limit: Optional[int] = None):
-        return self.analisis.list(limit)
+    def list_analisis(self, limit: Optional[int] = None, **window: Any):
+        return self.analisis.list(limit, **window)
+
+    def report_keys(self):
+        """(fecha_analisis, numero_peticion) de los informes ya importados."""
+        return self.analisis.keys()
 
     # Paciente
     def save_patient(self, d: Dict[str, Any]):
@@ -110,37 +159,128 @@ class AnalysisDB:
 
     # Hematologia
     def insert_hematologia(self, d: Dict[str, Any]):
-        return self.hematologia.insert(d)
+        self.hematologia.insert(d)
+        self._invalidate_series(["hematologia"])
 
-    def list_hematologia(self, limit=None):
-        return self.hematologia.list(limit)
+    def list_hematologia(self, limit=None, **window: Any):
+        return self.hematologia.list(limit, **window)
 
     # Bioquímica
     def insert_bioquimica(self, d: Dict[str, Any]):
-        return self.bioquimica.insert(d)
+        self.bioquimica.insert(d)
+        self._invalidate_series(["bioquimica"])
 
-    def list_bioquimica(self, limit=None):
-        return self.bioquimica.list(limit)
+    def list_bioquimica(self, limit=None, **window: Any):
+        return self.bioquimica.list(limit, **window)
 
     # Gasometría
     def insert_gasometria(self, d: Dict[str, Any]):
-        return self.gasometria.insert(d)
+        self.gasometria.insert(d)
+        self._invalidate_series(["gasometria"])
 
-    def list_gasometria(self, limit=None):
-        return self.gasometria.list(limit)
+    def list_gasometria(self, limit=None, **window: Any):
+        return self.gasometria.list(limit, **window)
 
     # Orina
     def insert_orina(self, d: Dict[str, Any]):
-        return self.orina.insert(d)
-
-    def list_orina(self, limit=None):
-        return self.orina.list(limit)
-
-
-
-
-
-
-
-
-
+        self.orina.insert(d)
+        self._invalidate_series(["orina"])
+
+    def list_orina(self, limit=None, **window: Any):
+        return self.orina.list(limit, **window)
+
+    # Series (una columna, solo fecha + valor)
+    def series(
+        self,
+        param: str,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        limit: Optional[int] = None,
+        table: Optional[str] = None,
+    ) -> List[SeriesRow]:
+        """
+        [(fecha_analisis, valor), ...] ascendente para 'param'. Sin 'table' se
+        usa la primera sección que tenga esa columna (glucosa -> bioquimica);
+        si ninguna la tiene, la tabla 'observation' (acido_urico, ggt...).
+        """
+        if table is None:
+            table = next(
+                (t for t in SECTIONS if param in getattr(self, t).FIELDS), None
+            )
+            if table is None:
+                if not self.observation.has(param):
+                    raise ValueError(f"Parámetro desconocido: {param}")
+                table = "observation"
+        elif table not in SECTIONS and table != "observation":
+            raise ValueError(f"Tabla desconocida: {table}")
+        return getattr(self, table).series(param, date_from, date_to, limit)
+
+    def list_rows(self, table: str, limit: Optional[int] = None, **window: Any) -> List[Dict[str, Any]]:
+        """list_<table> genérico para 'analisis' y las secciones (ver db.rows.select_rows)."""
+        if table != "analisis" and table not in SECTIONS:
+            raise ValueError(f"Tabla desconocida: {table}")
+        return getattr(self, table).list(limit, **window)
+
+    def series_arrays(
+        self,
+        param: str,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        limit: Optional[int] = None,
+        table: Optional[str] = None,
+    ) -> SeriesArrays:
+        """
+        Igual que series() pero como (fechas datetime64[D], valores float64).
+        Con la caché activa es un slicing en memoria; fuera de ella (tabla
+        'observation', transacción abierta, límites que no son YYYY-MM-DD y
+        el SQL compara como texto) se consulta la BD.
+        """
+        if table is None:
+            table = next((t for t in SECTIONS if param in getattr(self, t).FIELDS), None)
+        cache = self.series_cache
+        iso_bounds = all(fecha_ordinal(b) is not None for b in (date_from, date_to) if b)
+        if cache is not None and table in SECTIONS and iso_bounds and not self.conn.in_transaction:
+            return cache.series(self.conn, table, getattr(self, table).FIELDS, param,
+                                date_from, date_to, limit)
+        pairs = self.series(param, date_from, date_to, limit, table)
+        dates = np.array([f for f, _ in pairs], dtype="datetime64[D]")
+        values = np.array([v for _, v in pairs], dtype=np.float64)
+        return dates, values
+
+    def _invalidate_series(self, tables: Iterable[str]) -> None:
+        if self.series_cache is not None:
+            self.series_cache.invalidate(tables)
+
+    def series_many(
+        self,
+        table: str,
+        params: Iterable[str],
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, List[SeriesRow]]:
+        """Varias series de la misma tabla en una consulta (limit por serie)."""
+        if table not in SECTIONS:
+            raise ValueError(f"Tabla desconocida: {table}")
+        return getattr(self, table).series_many(list(params), date_from, date_to, limit)
+
+    # Observaciones (formato largo)
+    def observation_keys(self) -> List[str]:
+        return self.observation.keys()
+
+    def list_observations(self, analisis_id: int) -> List[Dict[str, Any]]:
+        return self.observation.list(analisis_id)
+
+    # Resumen por parámetro (mantenido por triggers al insertar)
+    def list_param_summary(self, source: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self.param_summary.list(source)
+
+    # Informe completo (una transacción)
+    def import_report(self, parsed: Dict[str, Any]) -> None:
+        return self.informe.import_report(parsed)
+
+    def import_reports(self, reports: Iterable[Dict[str, Any]], commit_every: int = 100) -> int:
+        return self.informe.import_reports(reports, commit_every=commit_every)
+
+    def report_batch(self, commit_every: int = 100) -> InformeBatch:
+        return self.informe.batch(commit_every)
@@ -1,9 +1,14 @@
 # db/db_schema.py
 # -*- coding: utf-8 -*-
 
-from typing import Any
+import sqlite3
+from typing import Any, Callable, List, Tuple, Union
 
-SCHEMA_VERSION: int = 3
+from .analisis import backfill_fecha_ordinal
+from .data_version import init_data_version
+from .param_summary import create_param_range, create_param_summary
+
+SCHEMA_VERSION: int = 11
 
 SCHEMA_SQL: str = """
 -- ================== ANALISIS (DOCUMENTO) ===================
@@ -159,5 +164,140 @@ CREATE INDEX IF NOT EXISTS idx_param_limit_key ON param_limit(param_key);
 """
 
 
+# ================== MIGRACIONES ===================
+# Pasos numerados (versión destino, SQL o función(conn)). Se aplican en orden
+# los que superan el PRAGMA user_version del fichero. SCHEMA_SQL es la base
+# (v3) y es idempotente, así que también sirve para ficheros antiguos que
+# nunca guardaron user_version (= 0). Los cambios nuevos se AÑADEN al final
+# con el número siguiente y se sube SCHEMA_VERSION; nunca se editan los pasos
+# ya publicados.
+Migration = Union[str, Callable[[sqlite3.Connection], None]]
+
+MIGRATIONS: List[Tuple[int, Migration]] = [
+    (3, SCHEMA_SQL),
+    # v4: índices para las consultas de series (fecha + JOIN por analisis_id)
+    (4, """
+    CREATE INDEX IF NOT EXISTS idx_analisis_fecha ON analisis(fecha_analisis);
+    CREATE INDEX IF NOT EXISTS idx_hematologia_analisis_id ON hematologia(analisis_id);
+    CREATE INDEX IF NOT EXISTS idx_bioquimica_analisis_id ON bioquimica(analisis_id);
+    CREATE INDEX IF NOT EXISTS idx_gasometria_analisis_id ON gasometria(analisis_id);
+    CREATE INDEX IF NOT EXISTS idx_orina_analisis_id ON orina(analisis_id);
+    """),
+    # v5: versión de datos (ETag de la API), ver db/data_version.py
+    (5, init_data_version),
+    # v6: una fila por sección y análisis (reimportar un informe no duplica
+    # filas). Se conservan las primeras filas importadas; el índice único
+    # sustituye al de v4 para el JOIN por analisis_id.
+    (6, """
+    DELETE FROM hematologia WHERE id NOT IN (SELECT MIN(id) FROM hematologia GROUP BY analisis_id);
+    DELETE FROM bioquimica WHERE id NOT IN (SELECT MIN(id) FROM bioquimica GROUP BY analisis_id);
+    DELETE FROM gasometria WHERE id NOT IN (SELECT MIN(id) FROM gasometria GROUP BY analisis_id);
+    DELETE FROM orina WHERE id NOT IN (SELECT MIN(id) FROM orina GROUP BY analisis_id);
+    DROP INDEX IF EXISTS idx_hematologia_analisis_id;
+    DROP INDEX IF EXISTS idx_bioquimica_analisis_id;
+    DROP INDEX IF EXISTS idx_gasometria_analisis_id;
+    DROP INDEX IF EXISTS idx_orina_analisis_id;
+    CREATE UNIQUE INDEX IF NOT EXISTS ux_hematologia_analisis_id ON hematologia(analisis_id);
+    CREATE UNIQUE INDEX IF NOT EXISTS ux_bioquimica_analisis_id ON bioquimica(analisis_id);
+    CREATE UNIQUE INDEX IF NOT EXISTS ux_gasometria_analisis_id ON gasometria(analisis_id);
+    CREATE UNIQUE INDEX IF NOT EXISTS ux_orina_analisis_id ON orina(analisis_id);
+    """),
+    # v7: ficheros procesados por la ingesta de carpeta vigilada (importer/watcher.py)
+    (7, """
+    CREATE TABLE IF NOT EXISTS ingest_checkpoint (
+        path TEXT PRIMARY KEY,
+        size INTEGER NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        digest TEXT,
+        status TEXT NOT NULL,
+        error TEXT,
+        processed_at TEXT NOT NULL
+    );
+    """),
+    # v8: todos los resultados numéricos en formato largo (db/observation.py).
+    # La PK (param_key, analisis_id) es el índice de las series: una serie es
+    # un recorrido por rango de param_key. Los informes ya importados no se
+    # rellenan (hay que reimportar los PDFs).
+    (8, """
+    CREATE TABLE IF NOT EXISTS observation (
+        analisis_id INTEGER NOT NULL,
+        param_key TEXT NOT NULL,
+        value REAL NOT NULL,
+        unit TEXT,
+        ref_min REAL,
+        ref_max REAL,
+        PRIMARY KEY (param_key, analisis_id),
+        FOREIGN KEY (analisis_id) REFERENCES analisis(id) ON DELETE CASCADE
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_observation_analisis_id ON observation(analisis_id);
+    """),
+    # v9: fecha como número de día (analisis.fecha_ordinal), rellenada para
+    # los análisis existentes. Filtros y orden por fecha van por
+    # idx_analisis_fecha_ordinal, que sustituye a idx_analisis_fecha.
+    (9, backfill_fecha_ordinal),
+    # v10: resumen por parámetro (db/param_summary.py) mantenido por triggers
+    # AFTER INSERT de cada sección y de 'observation'; se rellena con los
+    # datos existentes.
+    (10, create_param_summary),
+    # v11: rangos configurados por parámetro (param_range); los triggers de
+    # param_summary los aplican a los parámetros nuevos
+    (11, create_param_range),
+]
+
+
+def get_version(conn: sqlite3.Connection) -> int:
+    return int(conn.execute("PRAGMA user_version").fetchone()[0])
+
+
+def _split_sql(script: str) -> List[str]:
+    """
+    Trocea un script en sentencias. executescript() haría COMMIT implícito,
+    así que cada sentencia se ejecuta por separado dentro de la transacción.
+    """
+    statements: List[str] = []
+    buf = ""
+    for line in script.splitlines(keepends=True):
+        if not buf and (not line.strip() or line.lstrip().startswith("--")):
+            continue
+        buf += line
+        if sqlite3.complete_statement(buf):
+            statements.append(buf.strip())
+            buf = ""
+    if buf.strip():
+        statements.append(buf.strip())
+    return statements
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """
+    Lleva el fichero a SCHEMA_VERSION aplicando solo los pasos pendientes,
+    todos en UNA transacción (si alguno falla, no se aplica ninguno).
+    Si ya está al día, el coste es una lectura de PRAGMA user_version.
+
+    Devuelve la versión resultante.
+    """
+    current = get_version(conn)
+    if current >= SCHEMA_VERSION:
+        return current
+
+    pending = [(v, step) for v, step in MIGRATIONS if v > current]
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute("BEGIN")
+    try:
+        for version, step in pending:
+            if callable(step):
+                step(conn)
+            else:
+                for stmt in _split_sql(step):
+                    conn.execute(stmt)
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return SCHEMA_VERSION
+
+
 def create_schema(cursor: Any) -> None:
-    cursor.executescript(SCHEMA_SQL)
+    migrate(cursor.connection)
@@ -0,0 +1,179 @@
+# db/informe.py
+# -*- coding: utf-8 -*-
+
+import sqlite3
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from metrics import timer
+
+from .analisis import Analisis
+from .paciente import Paciente
+
+SECTIONS = ("hematologia", "bioquimica", "gasometria", "orina")
+
+
+class Informe:
+    """
+    Escritura de informes completos (salida de parse_hematology_pdf).
+
+    Paciente, cabecera 'analisis' y filas de todas las secciones se escriben
+    en UNA transacción, en lugar de un commit (fsync) por cada insert.
+
+    Si 'sections' incluye "observation" (db/observation.py), los resultados
+    en formato largo del informe se escriben en la misma transacción.
+
+    'on_write' se llama tras cada commit con las tablas escritas (p.ej. para
+    invalidar la caché de series, db/series_cache.py).
+    """
+
+    def __init__(self, conn: sqlite3.Connection, analisis: Analisis, paciente: Paciente,
+                 sections: Dict[str, Any],
+                 on_write: Optional[Callable[[Iterable[str]], None]] = None):
+        self.conn = conn
+        self.analisis = analisis
+        self.paciente = paciente
+        self.sections = sections
+        self.on_write = on_write
+
+    def stage(self, parsed: Dict[str, Any]) -> Dict[str, List[List[Any]]]:
+        """
+        Resuelve (sin commit) las cabeceras 'analisis' del informe y devuelve
+        las filas de cada sección listas para insert_rows.
+        """
+        staged: Dict[str, List[List[Any]]] = {}
+        with timer("db.stage"):
+            for table in SECTIONS:
+                records = parsed.get(table) or []
+                if not records:
+                    continue
+                component = self.sections[table]
+                staged[table] = [
+                    component.row(d, self.analisis.ensure(d, commit=False))
+                    for d in records
+                ]
+            # Formato largo: varias filas por registro
+            observation = self.sections.get("observation")
+            if observation is not None:
+                rows = [
+                    row
+                    for d in parsed.get("observation") or []
+                    for row in observation.rows(d, self.analisis.ensure(d, commit=False))
+                ]
+                if rows:
+                    staged["observation"] = rows
+        return staged
+
+    def write_staged(self, staged: Dict[str, List[List[Any]]]) -> None:
+        for table, rows in staged.items():
+            if rows:
+                self.sections[table].insert_rows(rows, commit=False)
+
+    def import_report(self, parsed: Dict[str, Any]) -> None:
+        try:
+            paciente = parsed.get("paciente")
+            if isinstance(paciente, dict):
+                with timer("db.paciente"):
+                    self.paciente.save(paciente, commit=False)
+            staged = self.stage(parsed)
+            self.write_staged(staged)
+            with timer("db.commit"):
+                self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        self.notify_write(staged)
+
+    def notify_write(self, staged: Dict[str, List[List[Any]]]) -> None:
+        if self.on_write is not None and staged:
+            self.on_write(list(staged))
+
+    def batch(self, commit_every: int = 100) -> "InformeBatch":
+        return InformeBatch(self, commit_every)
+
+    def import_reports(self, reports: Iterable[Dict[str, Any]], commit_every: int = 100) -> int:
+        n = 0
+        with self.batch(commit_every) as b:
+            for parsed in reports:
+                b.add(parsed)
+                n += 1
+        return n
+
+
+class InformeBatch:
+    """
+    Acumula informes y los vuelca con executemany, con un commit cada
+    'commit_every' informes.
+
+    Cada add() va en su propio SAVEPOINT: si un informe falla, se deshace solo
+    ese informe y se relanza la excepción; el resto del lote sigue adelante.
+    Si falla flush() se deshacen todos los informes pendientes; con
+    add(..., flush=False) el llamante hace los flush() y sabe qué grupo se
+    ha perdido. Usar como context manager (el __exit__ vuelca lo pendiente).
+    """
+
+    def __init__(self, informe: Informe, commit_every: int = 100):
+        if commit_every < 1:
+            raise ValueError("commit_every debe ser >= 1")
+        self.informe = informe
+        self.conn = informe.conn
+        self.commit_every = commit_every
+        self.pending: Dict[str, List[List[Any]]] = {}
+        self.pending_reports = 0
+        self.paciente: Optional[Dict[str, Any]] = None
+        self.committed = 0
+
+    def __enter__(self) -> "InformeBatch":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
+        else:
+            self._discard()
+
+    def add(self, parsed: Dict[str, Any], flush: bool = True) -> None:
+        if not self.conn.in_transaction:
+            self.conn.execute("BEGIN")
+        self.conn.execute("SAVEPOINT informe")
+        try:
+            staged = self.informe.stage(parsed)
+        except Exception:
+            self.conn.execute("ROLLBACK TO informe")
+            self.conn.execute("RELEASE informe")
+            raise
+        self.conn.execute("RELEASE informe")
+
+        for table, rows in staged.items():
+            self.pending.setdefault(table, []).extend(rows)
+        paciente = parsed.get("paciente")
+        if isinstance(paciente, dict):
+            # Paciente.save reemplaza: basta con guardar el último del lote
+            self.paciente = paciente
+
+        self.pending_reports += 1
+        if flush and self.pending_reports >= self.commit_every:
+            self.flush()
+
+    def flush(self) -> None:
+        try:
+            if self.paciente is not None:
+                with timer("db.paciente"):
+                    self.informe.paciente.save(self.paciente, commit=False)
+            self.informe.write_staged(self.pending)
+            with timer("db.commit"):
+                self.conn.commit()
+        except Exception:
+            self._discard()
+            raise
+        self.informe.notify_write(self.pending)
+        self.committed += self.pending_reports
+        self._reset()
+
+    def _discard(self) -> None:
+        self.conn.rollback()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.pending = {}
+        self.pending_reports = 0
+        self.paciente = None
@@ -0,0 +1,48 @@
+# db/ingest_checkpoint.py
+# -*- coding: utf-8 -*-
+
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+
+@dataclass
+class CheckpointEntry:
+    path: str
+    size: int
+    mtime_ns: int
+    digest: Optional[str] = None
+    status: str = "ok"  # ok | skipped | error
+    error: Optional[str] = None
+
+
+class IngestCheckpoint:
+    """
+    Ficheros ya procesados por la ingesta de carpeta vigilada
+    (importer.watcher). Con (size, mtime_ns) iguales un fichero no se vuelve
+    a abrir; si cambian pero el hash coincide, solo se actualiza la entrada.
+
+    No toca data_version: no son datos que se muestren.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def load(self) -> Dict[str, CheckpointEntry]:
+        rows = self.conn.execute(
+            "SELECT path, size, mtime_ns, digest, status, error FROM ingest_checkpoint"
+        ).fetchall()
+        return {r[0]: CheckpointEntry(*r) for r in rows}
+
+    def save_many(self, entries: Iterable[CheckpointEntry], commit: bool = True) -> None:
+        now = datetime.now().isoformat(timespec="seconds")
+        self.conn.executemany(
+            "INSERT INTO ingest_checkpoint(path,size,mtime_ns,digest,status,error,processed_at) "
+            "VALUES(?,?,?,?,?,?,?) ON CONFLICT(path) DO UPDATE SET "
+            "size=excluded.size, mtime_ns=excluded.mtime_ns, digest=excluded.digest, "
+            "status=excluded.status, error=excluded.error, processed_at=excluded.processed_at",
+            [(e.path, e.size, e.mtime_ns, e.digest, e.status, e.error, now) for e in entries],
+        )
+        if commit:
+            self.conn.commit()
@@ -4,6 +4,8 @@
 import sqlite3
 from typing import List, Dict, Any
 
+from .data_version import bump_data_version
+
 
 class Ingreso:
     def __init__(self, conn: sqlite3.Connection):
@@ -23,6 +25,7 @@ class Ingreso:
             "INSERT INTO hospital_stay(admission_date,discharge_date,notes) VALUES(?,?,?)",
             (d.get("admission_date"), d.get("discharge_date"), d.get("notes")),
         )
+        bump_data_version(self.conn)
         self.conn.commit()
         return int(cur.lastrowid)
 
@@ -32,11 +35,13 @@ class Ingreso:
             "UPDATE hospital_stay SET admission_date=?, discharge_date=?, notes=? WHERE id=?",
             (d.get("admission_date"), d.get("discharge_date"), d.get("notes"), stay_id),
         )
+        bump_data_version(self.conn)
         self.conn.commit()
 
     def delete_hospital_stay(self, stay_id: int) -> None:
         cur = self.conn.cursor()
         cur.execute("DELETE FROM hospital_stay WHERE id=?", (stay_id,))
+        bump_data_version(self.conn)
         self.conn.commit()
 
 
@@ -4,6 +4,8 @@
 import sqlite3
 from typing import Optional, List, Dict, Any
 
+from .data_version import bump_data_version
+
 
 class LimiteParametro:
     def __init__(self, conn: sqlite3.Connection):
@@ -29,6 +31,7 @@ class LimiteParametro:
             "INSERT INTO param_limit(param_key,value,label,enabled) VALUES(?,?,?,?)",
             (d["param_key"], d["value"], d.get("label"), int(d.get("enabled", 1))),
         )
+        bump_data_version(self.conn)
         self.conn.commit()
         return int(cur.lastrowid)
 
@@ -38,11 +41,13 @@ class LimiteParametro:
             "UPDATE param_limit SET param_key=?, value=?, label=?, enabled=? WHERE id=?",
             (d["param_key"], d["value"], d.get("label"), int(d.get("enabled", 1)), limit_id),
         )
+        bump_data_version(self.conn)
         self.conn.commit()
 
     def delete_param_limit(self, limit_id: int) -> None:
         cur = self.conn.cursor()
         cur.execute("DELETE FROM param_limit WHERE id=?", (limit_id,))
+        bump_data_version(self.conn)
         self.conn.commit()
 
 
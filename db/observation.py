@@ -0,0 +1,100 @@
+# db/observation.py
+# -*- coding: utf-8 -*-
+
+import sqlite3
+from typing import Any, Dict, List, Optional, Sequence
+
+from metrics import timer
+
+from .analisis import Analisis, date_range_sql
+from .data_version import bump_data_version
+from .series import SeriesRow
+
+
+class Observation:
+    """
+    Resultados numéricos en formato largo: una fila (valor, unidad, rango de
+    referencia) por parámetro y análisis, incluidos los que no tienen
+    columna en las tablas de sección (acido_urico, ggt, gaso_calcio_ionico...).
+    """
+
+    FIELDS: List[str] = ["param_key", "value", "unit", "ref_min", "ref_max"]
+
+    def __init__(self, conn: sqlite3.Connection, analisis: Analisis):
+        self.conn = conn
+        self.analisis = analisis
+
+    def insert(self, d: Dict[str, Any], commit: bool = True) -> None:
+        analisis_id = self.analisis.ensure(d, commit=False)
+        self.insert_rows(self.rows(d, analisis_id), commit=commit)
+
+    def rows(self, d: Dict[str, Any], analisis_id: int) -> List[List[Any]]:
+        """
+        Filas ["analisis_id"] + FIELDS de un registro con 'resultados'
+        (salida de lab_pdf.line_parser.parse_observations).
+        """
+        return [
+            [analisis_id] + [r.get(f) for f in self.FIELDS]
+            for r in d.get("resultados") or []
+            if r.get("param_key") and r.get("value") is not None
+        ]
+
+    def insert_rows(self, rows: Sequence[Sequence[Any]], commit: bool = True) -> None:
+        """
+        Inserta filas ya resueltas (ver rows) con un único executemany.
+        Idempotente: un parámetro ya guardado para el análisis no se duplica.
+        """
+        cols = ["analisis_id"] + self.FIELDS
+        with timer("db.insert.observation"):
+            cur = self.conn.executemany(
+                f"INSERT INTO observation ({','.join(cols)}) VALUES ({','.join(['?'] * len(cols))}) "
+                "ON CONFLICT(param_key, analisis_id) DO NOTHING",
+                rows,
+            )
+        if cur.rowcount:
+            bump_data_version(self.conn)
+        if commit:
+            self.conn.commit()
+
+    def has(self, param_key: str) -> bool:
+        row = self.conn.execute(
+            "SELECT 1 FROM observation WHERE param_key = ? LIMIT 1", (param_key,)
+        ).fetchone()
+        return row is not None
+
+    def keys(self) -> List[str]:
+        """Claves con al menos un resultado (se leen solo de la PK)."""
+        return [r[0] for r in self.conn.execute("SELECT DISTINCT param_key FROM observation ORDER BY param_key")]
+
+    def list(self, analisis_id: int) -> List[Dict[str, Any]]:
+        """Todos los resultados de un análisis."""
+        rows = self.conn.execute(
+            f"SELECT {', '.join(self.FIELDS)} FROM observation WHERE analisis_id = ? ORDER BY param_key",
+            (analisis_id,),
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    def series(self, param_key: str, date_from: Optional[str] = None, date_to: Optional[str] = None,
+               limit: Optional[int] = None) -> List[SeriesRow]:
+        """
+        Igual que db.series.select_series, para cualquier parámetro: un
+        recorrido por rango de la PK (param_key, analisis_id) + búsqueda de
+        la fecha por rowid de analisis.
+        """
+        sql = """
+            SELECT analisis.fecha_analisis, observation.value
+            FROM observation
+            JOIN analisis ON observation.analisis_id = analisis.id
+            WHERE observation.param_key = ?
+        """
+        where, params = date_range_sql(date_from, date_to)
+        sql += where
+        params.insert(0, param_key)
+        sql += " ORDER BY analisis.fecha_ordinal DESC, analisis.id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        rows = self.conn.execute(sql, params).fetchall()
+        rows.reverse()
+        return [(r[0], r[1]) for r in rows]
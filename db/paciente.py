@@ -4,12 +4,14 @@
 import sqlite3
 from typing import Dict, Any, Optional
 
+from .data_version import bump_data_version
+
 
 class Paciente:
     def __init__(self, conn: sqlite3.Connection):
         self.conn = conn
 
-    def save(self, info: Dict[str, Any]) -> None:
+    def save(self, info: Dict[str, Any], commit: bool = True) -> None:
         cur = self.conn.cursor()
         cur.execute("DELETE FROM paciente")
         cur.execute(
@@ -25,7 +27,9 @@ class Paciente:
                 info.get("numero_historia"),
             ),
         )
-        self.conn.commit()
+        bump_data_version(self.conn)
+        if commit:
+            self.conn.commit()
 
     def get(self) -> Optional[Dict[str, Any]]:
         cur = self.conn.cursor()
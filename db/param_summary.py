@@ -0,0 +1,334 @@
+# db/param_summary.py
+# -*- coding: utf-8 -*-
+
+import sqlite3
+from itertools import groupby
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .informe import SECTIONS
+
+# Tablas resumidas: las secciones (una serie por columna numérica) y
+# 'observation' (una serie por param_key)
+SOURCES = SECTIONS + ("observation",)
+
+TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS param_summary (
+    source TEXT NOT NULL,
+    param_key TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    first_date TEXT,
+    first_ordinal INTEGER,
+    last_date TEXT,
+    last_ordinal INTEGER,
+    last_analisis_id INTEGER,
+    last_value REAL,
+    prev_date TEXT,
+    prev_ordinal INTEGER,
+    prev_analisis_id INTEGER,
+    prev_value REAL,
+    min_value REAL,
+    max_value REAL,
+    range_low REAL,
+    range_high REAL,
+    out_of_range INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (source, param_key)
+) WITHOUT ROWID
+"""
+
+# Rangos configurados por parámetro: los triggers los copian a cada fila
+# nueva de param_summary, así que un parámetro que aparece por primera vez
+# ya cuenta sus valores fuera de rango con el rango vigente
+RANGE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS param_range (
+    source TEXT NOT NULL,
+    param_key TEXT NOT NULL,
+    range_low REAL,
+    range_high REAL,
+    PRIMARY KEY (source, param_key)
+) WITHOUT ROWID
+"""
+
+_NUMERIC = "('integer', 'real')"
+
+Range = Tuple[Optional[float], Optional[float]]
+
+# El punto nuevo es el más reciente / el segundo más reciente, por
+# (fecha_ordinal, analisis_id) como las series
+_NEWEST = "(excluded.last_ordinal, excluded.last_analisis_id) > (last_ordinal, last_analisis_id)"
+_SECOND = ("(prev_ordinal IS NULL OR (excluded.last_ordinal, excluded.last_analisis_id)"
+           " > (prev_ordinal, prev_analisis_id))")
+
+
+def _upsert_sql(source: str, key: str, value: str) -> str:
+    """
+    UPSERT de un valor nuevo (expresiones 'key' y 'value' sobre NEW) en
+    param_summary. En el DO UPDATE las columnas sin prefijo son las de la fila
+    existente (valores previos a la actualización).
+    """
+    shift = ", ".join(
+        f"prev_{c} = CASE WHEN {_NEWEST} THEN last_{c} WHEN {_SECOND} THEN excluded.last_{c} ELSE prev_{c} END"
+        for c in ("date", "ordinal", "analisis_id", "value")
+    )
+    last = ", ".join(
+        f"last_{c} = CASE WHEN {_NEWEST} THEN excluded.last_{c} ELSE last_{c} END"
+        for c in ("date", "ordinal", "analisis_id", "value")
+    )
+    return f"""
+        INSERT INTO param_summary (source, param_key, n, first_date, first_ordinal, last_date,
+                                   last_ordinal, last_analisis_id, last_value, min_value, max_value,
+                                   range_low, range_high, out_of_range)
+        SELECT '{source}', {key}, 1, a.fecha_analisis, a.fecha_ordinal, a.fecha_analisis,
+               a.fecha_ordinal, a.id, {value}, {value}, {value},
+               r.range_low, r.range_high, COALESCE({value} < r.range_low OR {value} > r.range_high, 0)
+        FROM analisis a
+        LEFT JOIN param_range r ON r.source = '{source}' AND r.param_key = {key}
+        WHERE a.id = NEW.analisis_id AND a.fecha_ordinal IS NOT NULL AND typeof({value}) IN {_NUMERIC}
+        ON CONFLICT (source, param_key) DO UPDATE SET
+            n = n + 1,
+            first_date = CASE WHEN excluded.first_ordinal < first_ordinal THEN excluded.first_date ELSE first_date END,
+            first_ordinal = MIN(first_ordinal, excluded.first_ordinal),
+            {shift},
+            {last},
+            min_value = MIN(min_value, excluded.min_value),
+            max_value = MAX(max_value, excluded.max_value),
+            out_of_range = out_of_range
+                + COALESCE(excluded.last_value < range_low OR excluded.last_value > range_high, 0);
+    """
+
+
+def numeric_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    """Columnas REAL/INTEGER de una sección (sin id ni analisis_id)."""
+    return [
+        r[1] for r in conn.execute(f"PRAGMA table_info({table})")
+        if r[1] not in ("id", "analisis_id") and str(r[2]).upper() in ("REAL", "INTEGER")
+    ]
+
+
+def create_summary_triggers(conn: sqlite3.Connection) -> None:
+    """
+    (Re)crea los triggers AFTER INSERT que mantienen param_summary: corren en
+    la misma transacción que el INSERT y solo para filas realmente insertadas
+    (ON CONFLICT DO NOTHING no los dispara). Una migración que añada columnas
+    a una sección debe volver a llamarla.
+    """
+    for table in SECTIONS:
+        body = "".join(_upsert_sql(table, f"'{c}'", f"NEW.{c}") for c in numeric_columns(conn, table))
+        conn.execute(f"DROP TRIGGER IF EXISTS trg_{table}_summary")
+        if body:
+            conn.execute(f"CREATE TRIGGER trg_{table}_summary AFTER INSERT ON {table} BEGIN {body} END")
+    conn.execute("DROP TRIGGER IF EXISTS trg_observation_summary")
+    conn.execute(
+        "CREATE TRIGGER trg_observation_summary AFTER INSERT ON observation BEGIN "
+        f"{_upsert_sql('observation', 'NEW.param_key', 'NEW.value')} END"
+    )
+
+
+def create_param_summary(conn: sqlite3.Connection) -> None:
+    """Migración v10: tabla, triggers y resumen inicial de los datos existentes."""
+    conn.execute(TABLE_SQL)
+    create_summary_triggers(conn)
+    ParamSummary(conn).rebuild(commit=False)
+
+
+def create_param_range(conn: sqlite3.Connection) -> None:
+    """
+    Migración v11: tabla param_range con los rangos ya fijados en
+    param_summary y triggers que la leen.
+    """
+    conn.execute(RANGE_TABLE_SQL)
+    conn.execute(
+        "INSERT OR IGNORE INTO param_range (source, param_key, range_low, range_high) "
+        "SELECT source, param_key, range_low, range_high FROM param_summary "
+        "WHERE range_low IS NOT NULL OR range_high IS NOT NULL"
+    )
+    create_summary_triggers(conn)
+
+
+class ParamSummary:
+    """
+    Resumen materializado por parámetro (param_summary): nº de valores,
+    primera/última fecha, último y penúltimo valor, mínimo, máximo y nº de
+    valores fuera de [range_low, range_high].
+
+    Lo mantienen los triggers de cada sección (create_summary_triggers) al
+    insertar, así que leerlo es una sola lectura de la PK. El rango con el
+    que se cuentan los valores fuera de rango se fija con set_ranges /
+    set_range (se guarda en param_range y se recuenta lo que cambia); los
+    inserts posteriores lo usan de forma incremental, también para
+    parámetros nuevos. Para otro rango sin escribir en la BD está
+    count_out_of_range.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def list(self, source: Optional[str] = None) -> List[Dict[str, Any]]:
+        if source is None:
+            rows = self.conn.execute("SELECT * FROM param_summary ORDER BY source, param_key")
+        else:
+            rows = self.conn.execute(
+                "SELECT * FROM param_summary WHERE source = ? ORDER BY param_key", (source,)
+            )
+        return [dict(r) for r in rows.fetchall()]
+
+    def get(self, source: str, param_key: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute(
+            "SELECT * FROM param_summary WHERE source = ? AND param_key = ?", (source, param_key)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def set_range(self, source: str, param_key: str, low: Optional[float], high: Optional[float],
+                  commit: bool = True) -> None:
+        """Fija el rango de un parámetro y recuenta sus valores fuera de rango."""
+        self._values_sql(source, param_key)  # ValueError si no existe
+        self.set_ranges({(source, param_key): (low, high)}, commit=commit)
+
+    def ranges(self) -> Dict[Tuple[str, str], Range]:
+        """Rangos guardados en param_range: (source, param_key) -> (low, high)."""
+        return {
+            (r[0], r[1]): (r[2], r[3])
+            for r in self.conn.execute("SELECT source, param_key, range_low, range_high FROM param_range")
+        }
+
+    def set_ranges(self, ranges: Dict[Tuple[str, str], Range], commit: bool = True) -> int:
+        """
+        Guarda los rangos dados y recuenta (una consulta por tabla) solo los
+        parámetros cuyo rango guardado cambia. Sin cambios no escribe nada.
+        Devuelve el nº de filas de param_summary recontadas.
+        """
+        saved = self.ranges()
+        new_ranges = [(src, key, low, high) for (src, key), (low, high) in ranges.items()
+                      if saved.get((src, key), (None, None)) != (low, high)]
+        stale: Dict[str, Dict[str, Range]] = {}
+        for r in self.conn.execute("SELECT source, param_key, range_low, range_high FROM param_summary"):
+            rng = ranges.get((r[0], r[1]))
+            if rng is not None and (r[2], r[3]) != rng:
+                stale.setdefault(r[0], {})[r[1]] = rng
+        if not new_ranges and not stale:
+            return 0
+
+        self.conn.executemany(
+            "INSERT INTO param_range (source, param_key, range_low, range_high) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (source, param_key) DO UPDATE SET "
+            "range_low = excluded.range_low, range_high = excluded.range_high",
+            new_ranges,
+        )
+        updates = []
+        for source, by_key in stale.items():
+            counts = self.count_out_of_range(source, by_key)
+            updates += [(low, high, counts[key], source, key) for key, (low, high) in by_key.items()]
+        self.conn.executemany(
+            "UPDATE param_summary SET range_low = ?, range_high = ?, out_of_range = ? "
+            "WHERE source = ? AND param_key = ?",
+            updates,
+        )
+        if commit:
+            self.conn.commit()
+        return len(updates)
+
+    def count_out_of_range(
+        self, source: str, ranges: Dict[str, Tuple[Optional[float], Optional[float]]]
+    ) -> Dict[str, int]:
+        """
+        Nº de valores fuera de [low, high] por parámetro de 'source', sin
+        escribir nada (para rangos distintos del guardado). En una sección es
+        una sola pasada por la tabla para todas sus columnas.
+        """
+        if not ranges:
+            return {}
+        if source != "observation":
+            columns = numeric_columns(self.conn, source) if source in SECTIONS else []
+            unknown = [k for k in ranges if k not in columns]
+            if unknown:
+                raise ValueError(f"Parámetro desconocido: {source}.{unknown[0]}")
+            keys = list(ranges)
+            sums = ", ".join(
+                f"COALESCE(SUM(typeof({source}.{k}) IN {_NUMERIC} AND ({source}.{k} < ? OR {source}.{k} > ?)), 0)"
+                for k in keys
+            )
+            params = [b for k in keys for b in ranges[k]]
+            row = self.conn.execute(
+                f"SELECT {sums} FROM {source} JOIN analisis a ON {source}.analisis_id = a.id "
+                "WHERE a.fecha_ordinal IS NOT NULL",
+                params,
+            ).fetchone()
+            return {k: int(n or 0) for k, n in zip(keys, row)}
+
+        out: Dict[str, int] = {}
+        for key, (low, high) in ranges.items():
+            sql, params = self._values_sql(source, key)
+            out[key] = self.conn.execute(
+                f"SELECT COUNT(*) FROM ({sql}) WHERE value < ? OR value > ?", (*params, low, high)
+            ).fetchone()[0]
+        return out
+
+    def rebuild(self, commit: bool = True) -> None:
+        """Recalcula el resumen desde las tablas (con los rangos de param_range)."""
+        ranges = self.ranges() if self._has_range_table() else {}
+        self.conn.execute("DELETE FROM param_summary")
+        rows = []
+        for source in SOURCES:
+            for key, values in self._all_values(source):
+                low, high = ranges.get((source, key), (None, None))
+                rows.append(_summarize(source, key, list(values), low, high))
+        self.conn.executemany(
+            f"INSERT INTO param_summary VALUES ({','.join(['?'] * 18)})", rows
+        )
+        if commit:
+            self.conn.commit()
+
+    # --------------------
+    #   INTERNOS
+    # --------------------
+    def _has_range_table(self) -> bool:
+        # La migración v10 reconstruye antes de que exista param_range (v11)
+        return self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'param_range'"
+        ).fetchone() is not None
+
+    def _values_sql(self, source: str, param_key: str) -> Tuple[str, List[Any]]:
+        """SELECT (fecha, fecha_ordinal, analisis_id, value) de una serie, en orden."""
+        if source == "observation":
+            column, where, params = "observation.value", "observation.param_key = ?", [param_key]
+        elif source in SECTIONS and param_key in numeric_columns(self.conn, source):
+            column, where, params = f"{source}.{param_key}", "1", []
+        else:
+            raise ValueError(f"Parámetro desconocido: {source}.{param_key}")
+        sql = f"""
+            SELECT a.fecha_analisis AS fecha, a.fecha_ordinal AS ordinal, a.id AS analisis_id,
+                   {column} AS value
+            FROM {source} JOIN analisis a ON {source}.analisis_id = a.id
+            WHERE {where} AND a.fecha_ordinal IS NOT NULL AND typeof({column}) IN {_NUMERIC}
+            ORDER BY a.fecha_ordinal, a.id
+        """
+        return sql, params
+
+    def _all_values(self, source: str) -> Iterable[Tuple[str, Iterable[Tuple[Any, ...]]]]:
+        if source == "observation":
+            rows = self.conn.execute(
+                f"""
+                SELECT o.param_key, a.fecha_analisis, a.fecha_ordinal, a.id, o.value
+                FROM observation o JOIN analisis a ON o.analisis_id = a.id
+                WHERE a.fecha_ordinal IS NOT NULL AND typeof(o.value) IN {_NUMERIC}
+                ORDER BY o.param_key, a.fecha_ordinal, a.id
+                """
+            )
+            for key, group in groupby(rows, key=lambda r: r[0]):
+                yield key, (tuple(r)[1:] for r in group)
+            return
+        for column in numeric_columns(self.conn, source):
+            sql, params = self._values_sql(source, column)
+            values = [tuple(r) for r in self.conn.execute(sql, params)]
+            if values:
+                yield column, values
+
+
+def _summarize(source: str, key: str, values: List[Tuple[Any, ...]],
+               low: Optional[float], high: Optional[float]) -> Tuple[Any, ...]:
+    """Fila de param_summary (orden de TABLE_SQL) a partir de la serie ordenada."""
+    first, last = values[0], values[-1]
+    prev = values[-2] if len(values) > 1 else (None, None, None, None)
+    nums = [v[3] for v in values]
+    out = sum(1 for v in nums if (low is not None and v < low) or (high is not None and v > high))
+    return (source, key, len(values), first[0], first[1], *last, *prev,
+            min(nums), max(nums), low, high, out)
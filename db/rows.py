@@ -0,0 +1,78 @@
+# db/rows.py
+# -*- coding: utf-8 -*-
+
+import sqlite3
+from typing import Any, Dict, List, Optional, Tuple
+
+from .analisis import date_range_sql, fecha_ordinal
+
+# Columnas de analisis que acompañan a cada fila de sección
+_ANALISIS_COLUMNS = "analisis.fecha_analisis, analisis.fecha_ordinal, analisis.numero_peticion, analisis.origen"
+
+
+def _cursor_sql(op: str, date: Optional[str], row_id: Optional[int], name: str) -> Tuple[str, List[Any]]:
+    if date is None:
+        if row_id is not None:
+            raise ValueError(f"'{name}_id' requiere '{name}_date'")
+        return "", []
+    ordinal = fecha_ordinal(date)
+    if ordinal is None:
+        raise ValueError(f"'{name}_date' no es una fecha YYYY-MM-DD: {date!r}")
+    if row_id is None:
+        # Solo fecha: el día entero queda fuera
+        return f" AND analisis.fecha_ordinal {op} ?", [ordinal]
+    return f" AND (analisis.fecha_ordinal, analisis.id) {op} (?, ?)", [ordinal, int(row_id)]
+
+
+def select_rows(
+    conn: sqlite3.Connection,
+    table: str,
+    limit: Optional[int] = None,
+    *,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    after_date: Optional[str] = None,
+    after_id: Optional[int] = None,
+    before_date: Optional[str] = None,
+    before_id: Optional[int] = None,
+    descending: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Filas de 'table' (una sección, o 'analisis') con los datos de su
+    análisis, ordenadas por (fecha, analisis.id).
+
+    - date_from / date_to: ventana de fechas inclusiva.
+    - after_* / before_*: cursor (keyset) exclusivo sobre (fecha, analisis.id).
+      Para la página siguiente se pasa la fecha y el analisis_id de la
+      última fila recibida: after_* en orden ascendente, before_* con
+      descending=True.
+    - descending: las más recientes primero (con 'limit', las N últimas).
+
+    Todo se resuelve como un recorrido por rango de
+    idx_analisis_fecha_ordinal; LIMIT corta la lectura, así que el coste de
+    una página no depende de lo profunda que esté en el historial.
+    """
+    if table == "analisis":
+        sql = "SELECT analisis.* FROM analisis WHERE 1"
+    else:
+        sql = f"""
+            SELECT {table}.*, {_ANALISIS_COLUMNS}
+            FROM {table}
+            JOIN analisis ON {table}.analisis_id = analisis.id
+            WHERE 1
+        """
+    where, params = date_range_sql(date_from, date_to)
+    sql += where
+    for op, date, row_id, name in ((">", after_date, after_id, "after"),
+                                   ("<", before_date, before_id, "before")):
+        where, more = _cursor_sql(op, date, row_id, name)
+        sql += where
+        params += more
+
+    direction = "DESC" if descending else "ASC"
+    sql += f" ORDER BY analisis.fecha_ordinal {direction}, analisis.id {direction}"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+
+    return [dict(r) for r in conn.execute(sql, params).fetchall()]
@@ -0,0 +1,101 @@
+# db/series.py
+# -*- coding: utf-8 -*-
+
+import sqlite3
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .analisis import date_range_sql
+
+SeriesRow = Tuple[str, Any]
+
+
+def select_series(
+    conn: sqlite3.Connection,
+    table: str,
+    fields: Sequence[str],
+    column: str,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> List[SeriesRow]:
+    """
+    Serie temporal de UNA columna: [(fecha_analisis, valor), ...] en orden
+    ascendente de fecha, sin NULLs. Con 'limit' devuelve los N puntos más
+    recientes. Las fechas (YYYY-MM-DD) son inclusivas.
+
+    Solo se proyectan las dos columnas necesarias; el filtro y el orden por
+    fecha son un recorrido (descendente) de idx_analisis_fecha_ordinal y el
+    JOIN usa ux_<tabla>_analisis_id, así que LIMIT corta la lectura.
+    """
+    if column not in fields:
+        raise ValueError(f"Columna desconocida en {table}: {column}")
+
+    sql = f"""
+        SELECT analisis.fecha_analisis, {table}.{column}
+        FROM {table}
+        JOIN analisis ON {table}.analisis_id = analisis.id
+        WHERE {table}.{column} IS NOT NULL
+    """
+    where, params = date_range_sql(date_from, date_to)
+    sql += where
+    sql += " ORDER BY analisis.fecha_ordinal DESC, analisis.id DESC"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+
+    rows = conn.execute(sql, params).fetchall()
+    rows.reverse()
+    return [(r[0], r[1]) for r in rows]
+
+
+def select_series_many(
+    conn: sqlite3.Connection,
+    table: str,
+    fields: Sequence[str],
+    columns: Sequence[str],
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> Dict[str, List[SeriesRow]]:
+    """
+    Igual que select_series pero para varias columnas de la MISMA tabla en una
+    sola consulta: {columna: [(fecha, valor), ...]}. 'limit' se aplica por
+    columna; la lectura se corta en cuanto todas tienen sus N puntos.
+    """
+    columns = list(dict.fromkeys(columns))
+    for column in columns:
+        if column not in fields:
+            raise ValueError(f"Columna desconocida en {table}: {column}")
+    out: Dict[str, List[SeriesRow]] = {c: [] for c in columns}
+    if not columns:
+        return out
+
+    projected = ", ".join(f"{table}.{c}" for c in columns)
+    any_value = " OR ".join(f"{table}.{c} IS NOT NULL" for c in columns)
+    sql = f"""
+        SELECT analisis.fecha_analisis, {projected}
+        FROM {table}
+        JOIN analisis ON {table}.analisis_id = analisis.id
+        WHERE ({any_value})
+    """
+    where, params = date_range_sql(date_from, date_to)
+    sql += where
+    sql += " ORDER BY analisis.fecha_ordinal DESC, analisis.id DESC"
+
+    open_cols = set(range(len(columns)))
+    for r in conn.execute(sql, params):
+        fecha = r[0]
+        for i in list(open_cols):
+            value = r[i + 1]
+            if value is None:
+                continue
+            points = out[columns[i]]
+            points.append((fecha, value))
+            if limit is not None and len(points) >= limit:
+                open_cols.discard(i)
+        if not open_cols:
+            break
+
+    for points in out.values():
+        points.reverse()
+    return out
@@ -0,0 +1,223 @@
+# db/series_cache.py
+# -*- coding: utf-8 -*-
+
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import date
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .analisis import fecha_ordinal
+from .data_version import get_data_version
+
+# (fechas datetime64[D], valores float64), ascendente por fecha
+SeriesArrays = Tuple[np.ndarray, np.ndarray]
+
+MAX_FILES = 8
+
+_EMPTY: SeriesArrays = (np.empty(0, dtype="datetime64[D]"), np.empty(0, dtype=np.float64))
+for _a in _EMPTY:
+    _a.flags.writeable = False
+
+
+def _day(bound: str) -> np.datetime64:
+    ordinal = fecha_ordinal(bound)
+    if ordinal is None:
+        raise ValueError(f"Fecha no es YYYY-MM-DD: {bound!r}")
+    return np.datetime64(date.fromordinal(ordinal), "D")
+
+
+@dataclass
+class _TableColumns:
+    version: Tuple[str, int]
+    columns: Dict[str, SeriesArrays] = field(default_factory=dict)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(d.nbytes + v.nbytes for d, v in self.columns.values())
+
+
+def _to_dates(fechas: Sequence[Any]) -> np.ndarray:
+    try:
+        return np.array(fechas, dtype="datetime64[D]")
+    except (TypeError, ValueError):
+        out = np.empty(len(fechas), dtype="datetime64[D]")
+        for i, f in enumerate(fechas):
+            try:
+                out[i] = np.datetime64(str(f), "D")
+            except (TypeError, ValueError):
+                out[i] = np.datetime64("NaT")
+        return out
+
+
+def _to_values(raw: Sequence[Any]) -> np.ndarray:
+    try:
+        return np.array(raw, dtype=np.float64)
+    except (TypeError, ValueError):
+        # Columnas de texto (p.ej. orina): mismo criterio que parse_float
+        out = np.full(len(raw), np.nan)
+        for i, v in enumerate(raw):
+            try:
+                out[i] = float(v.replace(",", ".") if isinstance(v, str) else v)
+            except (TypeError, ValueError):
+                pass
+        return out
+
+
+class SeriesCache:
+    """
+    Caché columnar en memoria de las series de UN fichero de BD: por cada
+    columna de sección, un array de fechas (datetime64[D]) y otro de valores
+    (float64), sin NULLs y en orden ascendente.
+
+    - Carga perezosa por tabla: la primera serie pedida de 'hematologia'
+      lee la tabla entera en una consulta y rellena todas sus columnas.
+    - Cada tabla cargada guarda la versión de datos (db/data_version.py) con
+      la que se leyó; si el fichero cambia (otra conexión u otro proceso)
+      se vuelve a leer. Las escrituras de AnalysisDB la invalidan además
+      explícitamente (invalidate).
+    - Una lectura es un searchsorted + slicing: los arrays devueltos son
+      vistas de solo lectura.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._tables: Dict[str, _TableColumns] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def series(
+        self,
+        conn: sqlite3.Connection,
+        table: str,
+        fields: Sequence[str],
+        column: str,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> SeriesArrays:
+        """
+        Mismo resultado que db.series.select_series, como arrays. Los límites
+        deben ser fechas YYYY-MM-DD (ValueError si no): el SQL compara los
+        demás como texto, y AnalysisDB.series_arrays los manda allí.
+        """
+        if column not in fields:
+            raise ValueError(f"Columna desconocida en {table}: {column}")
+        lo_date = _day(date_from) if date_from else None
+        hi_date = _day(date_to) if date_to else None
+
+        dates, values = self._columns(conn, table, fields).get(column, _EMPTY)
+        lo = int(np.searchsorted(dates, lo_date, "left")) if lo_date is not None else 0
+        hi = int(np.searchsorted(dates, hi_date, "right")) if hi_date is not None else len(dates)
+        if limit is not None:
+            lo = max(lo, hi - limit)
+        return dates[lo:hi], values[lo:hi]
+
+    def invalidate(self, tables: Optional[Iterable[str]] = None) -> None:
+        """Descarta las tablas indicadas (todas si None)."""
+        with self._lock:
+            doomed = list(self._tables) if tables is None else [t for t in tables if t in self._tables]
+            for t in doomed:
+                del self._tables[t]
+            self.invalidations += len(doomed)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "tables": sorted(self._tables),
+                "columns": sum(len(t.columns) for t in self._tables.values()),
+                "bytes": sum(t.nbytes for t in self._tables.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else None,
+                "invalidations": self.invalidations,
+            }
+
+    # --------------------
+    #   INTERNOS
+    # --------------------
+    def _columns(self, conn: sqlite3.Connection, table: str, fields: Sequence[str]) -> Dict[str, SeriesArrays]:
+        version = get_data_version(conn)
+        with self._lock:
+            cached = self._tables.get(table)
+            if cached is not None and cached.version == version:
+                self.hits += 1
+                return cached.columns
+            if cached is not None:
+                self.invalidations += 1
+            self.misses += 1
+            loaded = _TableColumns(version, self._load(conn, table, fields))
+            self._tables[table] = loaded
+            return loaded.columns
+
+    @staticmethod
+    def _load(conn: sqlite3.Connection, table: str, fields: Sequence[str]) -> Dict[str, SeriesArrays]:
+        projected = ", ".join(f"{table}.{c}" for c in fields)
+        rows = conn.execute(
+            f"""
+            SELECT analisis.fecha_analisis, {projected}
+            FROM {table}
+            JOIN analisis ON {table}.analisis_id = analisis.id
+            ORDER BY analisis.fecha_ordinal ASC, analisis.id ASC
+            """
+        ).fetchall()
+        if not rows:
+            return {}
+
+        cols = list(zip(*rows))
+        dates = _to_dates(cols[0])
+        valid_date = ~np.isnat(dates)
+        out: Dict[str, SeriesArrays] = {}
+        for i, column in enumerate(fields, start=1):
+            values = _to_values(cols[i])
+            keep = valid_date & ~np.isnan(values)
+            if not keep.any():
+                continue
+            d, v = dates[keep], values[keep]
+            d.flags.writeable = False
+            v.flags.writeable = False
+            out[column] = (d, v)
+        return out
+
+
+# ============================================================
+#   REGISTRO POR FICHERO (compartido por todas las conexiones)
+# ============================================================
+
+_registry_lock = threading.Lock()
+_registry: "OrderedDict[str, SeriesCache]" = OrderedDict()
+
+
+def series_cache_for(db_path: str) -> SeriesCache:
+    """
+    Caché del fichero 'db_path' (la misma para todas sus conexiones). Se
+    conservan como mucho MAX_FILES ficheros (se descartan los menos usados).
+    """
+    key = os.path.abspath(db_path)
+    with _registry_lock:
+        cache = _registry.get(key)
+        if cache is None:
+            cache = _registry[key] = SeriesCache()
+            while len(_registry) > MAX_FILES:
+                _registry.popitem(last=False)
+        else:
+            _registry.move_to_end(key)
+        return cache
+
+
+def drop_series_cache(db_path: str) -> None:
+    with _registry_lock:
+        _registry.pop(os.path.abspath(db_path), None)
+
+
+def series_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """{db_path: stats} de las cachés vivas (memoria y aciertos por paciente)."""
+    with _registry_lock:
+        caches: List[Tuple[str, SeriesCache]] = list(_registry.items())
+    return {path: cache.stats() for path, cache in caches}
@@ -4,6 +4,8 @@
 import sqlite3
 from typing import Dict, List, Any
 
+from .data_version import bump_data_version
+
 
 class Tratamiento:
     def __init__(self, conn: sqlite3.Connection):
@@ -30,6 +32,7 @@ class Tratamiento:
                 d.get("notes"),
             ),
         )
+        bump_data_version(self.conn)
         self.conn.commit()
         return int(cur.lastrowid)
 
@@ -46,11 +49,13 @@ class Tratamiento:
                 treatment_id,
             ),
         )
+        bump_data_version(self.conn)
         self.conn.commit()
 
     def delete_treatment(self, treatment_id: int) -> None:
         cur = self.conn.cursor()
         cur.execute("DELETE FROM treatment_course WHERE id=?", (treatment_id,))
+        bump_data_version(self.conn)
         self.conn.commit()
 
 
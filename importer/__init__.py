@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+Motor de importación de informes PDF de laboratorio en la BD del paciente.
+
+Expone:
+  - import_pdfs
+  - import_directory
+  - collect_pdf_paths
+  - write_report
+  - BatchImportResult
+  - MemoryPdf (PDF en memoria, sin pasar por disco)
+  - FolderWatcher (ingesta incremental de una carpeta vigilada)
+"""
+
+from .batch import (
+    BatchImportResult,
+    MemoryPdf,
+    collect_pdf_paths,
+    default_workers,
+    import_directory,
+    import_pdfs,
+    write_report,
+)
+from .watcher import FolderWatcher, WatcherStats
+
+__all__ = [
+    "BatchImportResult",
+    "FolderWatcher",
+    "MemoryPdf",
+    "WatcherStats",
+    "collect_pdf_paths",
+    "default_workers",
+    "import_directory",
+    "import_pdfs",
+    "write_report",
+]
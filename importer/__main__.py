@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Importación masiva desde línea de comandos.
+
+Uso:
+    python -m importer <paciente.db> <directorio_o_pdf> [...] [--workers N]
+
+Ejemplo:
+    python -m importer paciente.db ./pdfs_analisis --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from db import AnalysisDB
+from lab_pdf.parse_cache import ParseCache, default_cache_path
+
+from .batch import collect_pdf_paths, default_workers, import_pdfs
+
+
+def _expand(inputs: List[str], recursive: bool) -> List[Path]:
+    paths: List[Path] = []
+    for raw in inputs:
+        p = Path(raw)
+        if p.is_dir():
+            paths.extend(collect_pdf_paths(p, recursive=recursive))
+        else:
+            paths.append(p)
+    return paths
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m importer",
+        description="Importa informes PDF de laboratorio en una BD de paciente.",
+    )
+    parser.add_argument("db_path", help="Fichero SQLite del paciente (se crea si no existe)")
+    parser.add_argument("inputs", nargs="+", help="PDFs o directorios con PDFs")
+    parser.add_argument("--workers", type=int, default=default_workers(),
+                        help="Procesos de parseo (por defecto: nº de CPUs)")
+    parser.add_argument("--no-recursive", action="store_true",
+                        help="No entrar en subdirectorios")
+    parser.add_argument("--cache", default=None,
+                        help=f"Caché de parseo (por defecto: {default_cache_path()})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Parsear siempre, sin caché")
+    parser.add_argument("--skip-existing", action="store_true",
+                        help="Saltar (leyendo solo la cabecera) los informes ya importados")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    pdfs = _expand(args.inputs, recursive=not args.no_recursive)
+    if not pdfs:
+        print("[AVISO] No se han encontrado PDFs")
+        return 1
+
+    cache = None if args.no_cache else ParseCache(args.cache or default_cache_path())
+    db = AnalysisDB(args.db_path)
+    db.open()
+    try:
+        result = import_pdfs(db, pdfs, workers=args.workers, cache=cache,
+                             skip_existing=args.skip_existing)
+    finally:
+        db.close()
+        if cache is not None:
+            cache.close()
+
+    for err in result.errors:
+        print(f"  [ERROR] {err}")
+    print(
+        f"\n[OK] Importados: {result.ok} ({result.cached} de caché)  Ya importados: {result.skipped}  "
+        f"Errores: {len(result.errors)}  "
+        f"Tiempo: {result.elapsed:.2f}s ({result.files_per_second:.1f} PDF/s)"
+    )
+    return 0 if result.ok or result.skipped or not result.errors else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,448 @@
+# -*- coding: utf-8 -*-
+"""
+Importación masiva de informes PDF.
+
+La extracción de texto (pypdf) y el parseo de secciones son CPU puro, así que
+se reparten entre procesos. El ProcessPoolExecutor es UNO por proceso,
+creado la primera vez que hace falta y compartido por todas las
+importaciones (p.ej. varios trabajos de la API a la vez): el total de
+procesos no pasa de default_workers() y pypdf solo se importa una vez por
+proceso trabajador. Los resultados vuelven al proceso principal, que es el
+ÚNICO que escribe en la BD (SQLite no admite varios escritores concurrentes).
+
+Con skip_existing=True cada trabajador lee primero solo la cabecera del PDF
+(primera página) y descarta los informes cuya (fecha_analisis,
+numero_peticion) ya está en la BD, sin extraer ni parsear el resto.
+
+Además de rutas se aceptan MemoryPdf (PDFs ya en memoria, p.ej. subidas
+pequeñas): se parsean desde un io.BytesIO sin escribirlos a disco.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import closing, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Tuple, Union,
+)
+
+from lab_pdf import parse_hematology_pdf
+from metrics import REGISTRY as TIMERS
+from lab_pdf.page_filter import read_report_header
+from lab_pdf.parse_cache import CacheEntry, ParseCache, file_digest
+
+logger = logging.getLogger(__name__)
+# Una línea JSON por fichero con sus tiempos por etapa (SALUD_V1_TIMINGS=json)
+timings_logger = logging.getLogger("metrics.timings")
+
+PathLike = Union[str, Path]
+ReportKey = Tuple[str, str]  # (fecha_analisis, numero_peticion)
+# on_result(ruta, estado, error, segundos): estado "ok" | "skipped" | "error"
+# (informe no soportado o fallo al guardar) | "failed" (error inesperado al
+# leer, o commit fallido del lote); segundos = tiempo de parseo del fichero
+# en el trabajador
+ResultCallback = Callable[[str, str, Optional[str], float], None]
+
+
+@dataclass(frozen=True)
+class MemoryPdf:
+    """PDF en memoria. 'name' hace las veces de ruta en errores y on_result."""
+    name: str
+    data: bytes
+    digest: Optional[str] = None  # SHA-256 de 'data' si ya se conoce
+
+    def open(self) -> io.BytesIO:
+        return io.BytesIO(self.data)
+
+    def sha256(self) -> str:
+        return self.digest or hashlib.sha256(self.data).hexdigest()
+
+
+PdfInput = Union[PathLike, MemoryPdf]
+
+
+@dataclass
+class ParsedFile:
+    """Resultado del parseo de un PDF en un proceso trabajador."""
+    path: str
+    data: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    expected: bool = True  # False -> error inesperado (no es ValueError)
+    digest: Optional[str] = None  # SHA-256 del PDF (solo con caché)
+    cached: bool = False
+    skipped: bool = False  # ya importado (solo con skip_existing)
+    seconds: float = 0.0  # tiempo de parseo en el trabajador
+    stages: Dict[str, float] = field(default_factory=dict)  # metrics.timer por etapa
+
+
+@dataclass
+class BatchImportResult:
+    """Resumen de una importación (mismo formato de errores que ImportResult)."""
+    ok: int = 0
+    errors: List[str] = field(default_factory=list)
+    elapsed: float = 0.0
+    cached: int = 0  # PDFs resueltos desde la caché de parseo
+    skipped: int = 0  # PDFs ya importados (skip_existing)
+    cancelled: bool = False  # se detuvo antes de tratar todos los PDFs
+
+    @property
+    def processed(self) -> int:
+        return self.ok + self.skipped + len(self.errors)
+
+    @property
+    def files_per_second(self) -> float:
+        return self.processed / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def collect_pdf_paths(root: PathLike, *, recursive: bool = True) -> List[Path]:
+    """Devuelve los PDFs de un directorio, ordenados por ruta."""
+    root = Path(root)
+    pattern = "**/*" if recursive else "*"
+    return sorted(
+        p for p in root.glob(pattern)
+        if p.is_file() and p.suffix.lower() == ".pdf"
+    )
+
+
+def write_report(db: Any, data: Dict[str, Any]) -> None:
+    """Vuelca en la BD abierta el dict devuelto por parse_hematology_pdf (una transacción)."""
+    db.import_report(data)
+
+
+# Caché de solo lectura por proceso trabajador (se abre una vez por proceso)
+_worker_caches: Dict[str, Optional[ParseCache]] = {}
+
+
+def _worker_cache(cache_path: str) -> Optional[ParseCache]:
+    if cache_path not in _worker_caches:
+        try:
+            _worker_caches[cache_path] = ParseCache(cache_path, readonly=True)
+        except Exception:
+            _worker_caches[cache_path] = None
+    return _worker_caches[cache_path]
+
+
+# Pool compartido por todas las importaciones del proceso (ver _shared_pool)
+_pool_lock = threading.Lock()
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _shared_pool() -> ProcessPoolExecutor:
+    """Pool de default_workers() procesos, creado al primer uso (o si se rompió)."""
+    global _pool
+    with _pool_lock:
+        # Si un trabajador murió el pool queda roto: se crea otro
+        if _pool is None or getattr(_pool, "_broken", False):
+            _pool = ProcessPoolExecutor(max_workers=default_workers())
+        return _pool
+
+
+def shutdown_pool() -> None:
+    """Cierra el pool compartido (se vuelve a crear si se importa de nuevo)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _is_known(pdf: Union[str, MemoryPdf], known: FrozenSet[ReportKey]) -> bool:
+    header = read_report_header(pdf.open() if isinstance(pdf, MemoryPdf) else pdf)
+    if header is None or not header.get("numero_peticion"):
+        return False
+    return (header["fecha_analisis"], header["numero_peticion"]) in known
+
+
+def _parse_one(
+    pdf_path: Union[str, MemoryPdf],
+    cache: Union[ParseCache, str, None] = None,
+    known: Optional[FrozenSet[ReportKey]] = None,
+) -> ParsedFile:
+    """
+    Trabajador: extrae y parsea un PDF. Nunca lanza excepción.
+
+    Con caché solo LEE: las entradas nuevas las escribe el proceso principal.
+    Con 'known' descarta antes de nada los informes ya importados.
+    """
+    t0 = time.perf_counter()
+    if TIMERS.enabled:
+        with TIMERS.capture() as stages:
+            parsed = _parse(pdf_path, cache, known)
+        parsed.stages = stages
+    else:
+        parsed = _parse(pdf_path, cache, known)
+    parsed.seconds = time.perf_counter() - t0
+    return parsed
+
+
+def _parse(
+    pdf: Union[str, MemoryPdf],
+    cache: Union[ParseCache, str, None],
+    known: Optional[FrozenSet[ReportKey]],
+) -> ParsedFile:
+    in_memory = isinstance(pdf, MemoryPdf)
+    pdf_path = pdf.name if in_memory else pdf
+    digest: Optional[str] = None
+    try:
+        if known and _is_known(pdf, known):
+            return ParsedFile(path=pdf_path, skipped=True)
+        if cache is not None:
+            digest = pdf.sha256() if in_memory else file_digest(pdf)
+            reader = _worker_cache(cache) if isinstance(cache, str) else cache
+            hit = reader.get(digest) if reader is not None else None
+            if hit is not None:
+                return ParsedFile(path=pdf_path, data=hit.data, error=hit.error,
+                                  digest=digest, cached=True)
+        data = parse_hematology_pdf(pdf.open() if in_memory else pdf)
+        return ParsedFile(path=pdf_path, data=data, digest=digest)
+    except ValueError as e:
+        # Informe no soportado (radiología, alta, microbiología...)
+        return ParsedFile(path=pdf_path, error=str(e), digest=digest)
+    except Exception as e:
+        # Se conserva el hash: el fallo queda asociado al contenido del fichero
+        return ParsedFile(path=pdf_path, error=str(e), expected=False, digest=digest)
+
+
+def _parse_chunk(
+    pdfs: Sequence[Union[str, MemoryPdf]],
+    cache_path: Optional[str],
+    known: Optional[FrozenSet[ReportKey]],
+    timings: bool,
+) -> List[ParsedFile]:
+    """Trabajador del pool compartido: un trozo de PDFs de una importación."""
+    # El pool no es de esta importación: el estado del registro viaja con el trozo
+    TIMERS.enabled = timings
+    return [_parse_one(p, cache_path, known) for p in pdfs]
+
+
+def _iter_parsed(
+    paths: Sequence[Union[str, MemoryPdf]],
+    workers: int,
+    chunksize: int,
+    cache: Optional[ParseCache] = None,
+    known: Optional[FrozenSet[ReportKey]] = None,
+) -> Iterator[ParsedFile]:
+    if workers <= 1:
+        for p in paths:
+            yield _parse_one(p, cache, known)
+        return
+
+    # Como mucho 'workers' trozos en vuelo por importación; el pool es común
+    # y limita el total de procesos. Las claves conocidas se serializan una
+    # vez por trozo (pickle no repite el objeto dentro de un mismo envío).
+    pool = _shared_pool()
+    cache_path = cache.path if cache is not None else None
+    chunks = (paths[i:i + chunksize] for i in range(0, len(paths), chunksize))
+    pending: "deque[Future]" = deque()
+
+    def submit_next() -> None:
+        chunk = next(chunks, None)
+        if chunk is not None:
+            pending.append(pool.submit(_parse_chunk, chunk, cache_path, known, TIMERS.enabled))
+
+    try:
+        for _ in range(workers):
+            submit_next()
+        # En orden de entrada: el último paciente guardado es el del último
+        # PDF, igual que en la importación secuencial.
+        while pending:
+            done = pending.popleft().result()
+            submit_next()
+            yield from done
+    finally:
+        # Si el consumidor para antes (cancelación), no se parsea lo pendiente
+        for fut in pending:
+            fut.cancel()
+
+
+def _log_timings(parsed: ParsedFile, status: str, db_stages: Optional[Dict[str, float]]) -> None:
+    stages = dict(parsed.stages)
+    for stage, seconds in (db_stages or {}).items():
+        stages[stage] = stages.get(stage, 0.0) + seconds
+    timings_logger.info(json.dumps({
+        "file": Path(parsed.path).name,
+        "status": status,
+        "cached": parsed.cached,
+        "seconds": round(parsed.seconds, 6),
+        "stages": {k: round(v, 6) for k, v in sorted(stages.items())},
+    }))
+
+
+def import_pdfs(
+    db: Any,
+    pdf_paths: Iterable[PdfInput],
+    *,
+    workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+    commit_every: int = 100,
+    cache: Optional[ParseCache] = None,
+    skip_existing: bool = False,
+    on_result: Optional[ResultCallback] = None,
+    cancel: Optional[threading.Event] = None,
+) -> BatchImportResult:
+    """
+    Parsea los PDFs en paralelo y los inserta en 'db' desde este proceso.
+
+    workers=None usa un proceso por CPU; workers<=1 parsea en el propio
+    proceso (sin pool). Las escrituras se agrupan en transacciones de
+    'commit_every' informes. Los errores se devuelven por fichero, con el
+    formato "<nombre.pdf>: <mensaje>".
+
+    Con 'cache' (ver lab_pdf.parse_cache) los PDFs ya vistos no se vuelven
+    a extraer; los nuevos se añaden a la caché al terminar.
+
+    Con 'skip_existing' los informes cuya cabecera (fecha, nº de petición)
+    ya está en 'db' se cuentan en 'skipped' sin parsearse.
+
+    'on_result' se llama una vez por fichero, en el orden de entrada (ver
+    ResultCallback). Un "ok" (y 'result.ok') solo se da cuando el commit de
+    su lote ha ido bien, así que los ficheros que lo siguen esperan con él
+    hasta ese commit. Si el commit falla se deshace todo el lote: cada uno
+    de sus informes se da como "failed" con el error del commit.
+
+    Si se activa 'cancel', se deja de tratar PDFs: lo ya parseado se guarda
+    y el resultado vuelve con cancelled=True.
+
+    Con metrics activado, los tiempos por etapa medidos en los trabajadores
+    se agregan al registro de este proceso (y, con json_log, se escribe una
+    línea JSON por fichero en el logger "metrics.timings").
+    """
+    paths = [p if isinstance(p, MemoryPdf) else str(p) for p in pdf_paths]
+    result = BatchImportResult()
+    if not paths:
+        return result
+
+    n_workers = min(workers if workers is not None else default_workers(), len(paths))
+    if chunksize is None:
+        # Trozos pequeños: reparto equilibrado sin penalizar el IPC
+        chunksize = max(1, min(16, len(paths) // (n_workers * 4) or 1))
+
+    hits: List[str] = []
+    misses: List[tuple] = []
+
+    t0 = time.perf_counter()
+    known = frozenset(db.report_keys()) if skip_existing else None
+    parsed_files = _iter_parsed(paths, n_workers, chunksize, cache, known)
+
+    def finish(parsed: ParsedFile, status: str, error: Optional[str] = None,
+               db_stages: Optional[Dict[str, float]] = None) -> None:
+        if on_result is not None:
+            on_result(parsed.path, status, error, parsed.seconds)
+        if TIMERS.json_log:
+            _log_timings(parsed, status, db_stages)
+
+    # Resultados a la espera del commit: los "ok" del lote abierto y, para
+    # conservar el orden de entrada, todo lo que llega detrás de ellos
+    queued: List[Tuple[ParsedFile, str, Optional[str], Optional[Dict[str, float]]]] = []
+
+    def report(parsed: ParsedFile, status: str, error: Optional[str] = None,
+               db_stages: Optional[Dict[str, float]] = None) -> None:
+        if status == "ok" or queued:
+            queued.append((parsed, status, error, db_stages))
+        else:
+            finish(parsed, status, error, db_stages)
+
+    def commit(batch: Any) -> None:
+        outcome = list(queued)
+        queued.clear()
+        try:
+            batch.flush()
+        except Exception as e:
+            lost = [q for q in outcome if q[1] == "ok"]
+            logger.exception("Error guardando en BD un lote de %d informe(s)", len(lost))
+            for parsed, _, _, _ in lost:
+                result.errors.append(f"{Path(parsed.path).name}: {e}")
+            outcome = [(p, "failed", str(e), st) if status == "ok" else (p, status, err, st)
+                       for p, status, err, st in outcome]
+        else:
+            result.ok += sum(1 for q in outcome if q[1] == "ok")
+        for q in outcome:
+            finish(*q)
+
+    with db.report_batch(commit_every=commit_every) as batch, closing(parsed_files):
+        for parsed in parsed_files:
+            if cancel is not None and cancel.is_set():
+                result.cancelled = True
+                break
+            if n_workers > 1 and parsed.stages:
+                # Medidos en el trabajador: se agregan al registro de este proceso
+                TIMERS.merge(parsed.stages)
+            name = Path(parsed.path).name
+            if parsed.skipped:
+                result.skipped += 1
+                report(parsed, "skipped")
+                continue
+            if parsed.cached:
+                result.cached += 1
+                hits.append(parsed.digest)
+            elif parsed.digest is not None and parsed.expected:
+                misses.append((parsed.digest, CacheEntry(data=parsed.data, error=parsed.error)))
+
+            if parsed.error is not None:
+                if parsed.expected:
+                    logger.warning("Informe no soportado: %s (%s)", parsed.path, parsed.error)
+                else:
+                    logger.error("Error parseando PDF: %s (%s)", parsed.path, parsed.error)
+                result.errors.append(f"{name}: {parsed.error}")
+                report(parsed, "error" if parsed.expected else "failed", parsed.error)
+                continue
+
+            # Tiempos de BD de este fichero solo si se van a escribir en el log
+            with TIMERS.capture() if TIMERS.json_log else nullcontext() as db_stages:
+                try:
+                    batch.add(parsed.data, flush=False)
+                except Exception as e:
+                    # Solo se deshace este informe (SAVEPOINT)
+                    logger.exception("Error guardando en BD: %s", parsed.path)
+                    result.errors.append(f"{name}: {e}")
+                    error: Optional[str] = str(e)
+                else:
+                    error = None
+            report(parsed, "ok" if error is None else "error", error, db_stages)
+            if batch.pending_reports >= commit_every:
+                commit(batch)
+
+        if queued or batch.pending_reports:
+            commit(batch)
+
+    if cache is not None:
+        try:
+            cache.put_many(misses)
+            cache.touch_many(hits)
+        except Exception:
+            # La caché es una optimización: nunca debe romper la importación
+            logger.exception("No se pudo actualizar la caché de parseo")
+
+    result.elapsed = time.perf_counter() - t0
+    logger.info(
+        "Importación: %d ok (%d de caché), %d ya importados, %d errores, %.2fs "
+        "(%.1f PDF/s, %d procesos)",
+        result.ok, result.cached, result.skipped, len(result.errors), result.elapsed,
+        result.files_per_second, n_workers,
+    )
+    return result
+
+
+def import_directory(
+    db: Any,
+    directory: PathLike,
+    *,
+    recursive: bool = True,
+    **kwargs: Any,
+) -> BatchImportResult:
+    """Importa todos los PDFs de 'directory' (ver import_pdfs)."""
+    return import_pdfs(db, collect_pdf_paths(directory, recursive=recursive), **kwargs)
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+Ingesta incremental de una carpeta vigilada.
+
+El laboratorio deja PDFs nuevos en una carpeta compartida; FolderWatcher la
+recorre cada 'interval' segundos (sondeo: funciona igual en carpetas de red
+y en Windows, donde inotify no existe) e importa solo lo nuevo o cambiado:
+
+- Punto de control en la propia BD (tabla ingest_checkpoint: ruta, tamaño,
+  mtime, hash, estado). Tras un reinicio se carga de una vez y los ficheros
+  con el mismo (tamaño, mtime) no se vuelven a abrir.
+- Si cambian tamaño o mtime pero el hash ya se conoce (copia, 'touch'), se
+  actualiza la entrada sin parsear.
+- Los ficheros modificados hace menos de 'settle' segundos se dejan para la
+  siguiente vuelta (pueden estar copiándose todavía).
+- Lo pendiente se importa en microlotes de 'batch_size' con import_pdfs
+  (skip_existing=True). El punto de control de un lote se guarda después de
+  que el lote se haya confirmado: si el proceso muere a mitad, el lote se
+  repite y la importación es idempotente.
+- Los errores inesperados (fichero bloqueado, ilegible...) no se guardan en
+  el punto de control: se reintentan cuando cambia el fichero o al
+  reiniciar el servicio.
+
+WatcherStats expone la latencia por fichero (desde su mtime hasta que queda
+confirmado en la BD) y el backlog (ficheros pendientes).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple, Union
+
+from db.ingest_checkpoint import CheckpointEntry
+from lab_pdf.parse_cache import ParseCache, file_digest
+
+from .batch import import_pdfs
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+DEFAULT_INTERVAL = 5.0
+DEFAULT_BATCH_SIZE = 20
+DEFAULT_SETTLE = 2.0
+
+
+@dataclass
+class PendingFile:
+    path: str
+    size: int
+    mtime_ns: int
+
+
+@dataclass
+class WatcherStats:
+    backlog: int = 0  # ficheros pendientes (incluidos los que aún se copian)
+    imported: int = 0
+    skipped: int = 0  # ya importados (misma cabecera o mismo hash)
+    errors: int = 0
+    cycles: int = 0
+    last_scan_s: float = 0.0
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=500))
+
+    def snapshot(self) -> Dict[str, Any]:
+        lat = sorted(self.latencies)
+        return {
+            "backlog": self.backlog,
+            "imported": self.imported,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "cycles": self.cycles,
+            "last_scan_s": round(self.last_scan_s, 4),
+            "latency_s": {
+                "last": round(self.latencies[-1], 3) if lat else None,
+                "p50": round(statistics.median(lat), 3) if lat else None,
+                "p95": round(lat[int(0.95 * (len(lat) - 1))], 3) if lat else None,
+                "max": round(lat[-1], 3) if lat else None,
+            },
+        }
+
+
+class FolderWatcher:
+    def __init__(
+        self,
+        db: Any,
+        folder: PathLike,
+        *,
+        interval: float = DEFAULT_INTERVAL,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        settle: float = DEFAULT_SETTLE,
+        workers: int = 1,
+        cache: Optional[ParseCache] = None,
+        recursive: bool = True,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size debe ser >= 1")
+        self.db = db
+        self.folder = Path(folder).resolve()
+        self.interval = interval
+        self.batch_size = batch_size
+        self.settle = settle
+        self.workers = workers
+        self.cache = cache
+        self.recursive = recursive
+        self.stats = WatcherStats()
+
+        self._checkpoint: Dict[str, CheckpointEntry] = db.ingest_checkpoint.load()
+        self._digests: Set[str] = {
+            e.digest for e in self._checkpoint.values() if e.digest and e.status in ("ok", "skipped")
+        }
+        # Fallos inesperados en esta ejecución: ruta -> (size, mtime_ns)
+        self._failed: Dict[str, Tuple[int, int]] = {}
+
+    # --------------------
+    #   ESCANEO
+    # --------------------
+    def _iter_pdfs(self, directory: str):
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if self.recursive:
+                            yield from self._iter_pdfs(entry.path)
+                    elif entry.name.lower().endswith(".pdf") and entry.is_file():
+                        yield entry
+        except OSError as e:
+            logger.warning("No se puede leer la carpeta %s (%s)", directory, e)
+
+    def scan(self) -> Tuple[List[PendingFile], int]:
+        """
+        (ficheros listos para importar, nº de ficheros que aún se están
+        copiando). Solo hace stat(): no abre ningún fichero.
+        """
+        t0 = time.perf_counter()
+        now_ns = time.time_ns()
+        settle_ns = int(self.settle * 1e9)
+        ready: List[PendingFile] = []
+        settling = 0
+        for entry in self._iter_pdfs(str(self.folder)):
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            path = entry.path
+            stamp = (st.st_size, st.st_mtime_ns)
+            known = self._checkpoint.get(path)
+            if known is not None and (known.size, known.mtime_ns) == stamp:
+                continue
+            if self._failed.get(path) == stamp:
+                continue
+            if now_ns - st.st_mtime_ns < settle_ns:
+                settling += 1
+                continue
+            ready.append(PendingFile(path, st.st_size, st.st_mtime_ns))
+        ready.sort(key=lambda f: (f.mtime_ns, f.path))
+        self.stats.last_scan_s = time.perf_counter() - t0
+        return ready, settling
+
+    # --------------------
+    #   IMPORTACIÓN
+    # --------------------
+    def _process_batch(self, files: List[PendingFile]) -> None:
+        entries: List[CheckpointEntry] = []
+        to_import: Dict[str, CheckpointEntry] = {}
+
+        for f in files:
+            try:
+                digest = file_digest(f.path)
+            except OSError as e:
+                logger.warning("No se puede leer %s (%s)", f.path, e)
+                self._failed[f.path] = (f.size, f.mtime_ns)
+                self.stats.errors += 1
+                continue
+            entry = CheckpointEntry(f.path, f.size, f.mtime_ns, digest)
+            prev = self._checkpoint.get(f.path)
+            if prev is not None and prev.digest == digest:
+                # Solo ha cambiado el mtime ('touch'): se conserva el estado
+                entry.status, entry.error = prev.status, prev.error
+                entries.append(entry)
+            elif digest in self._digests:
+                # Mismo contenido ya importado con otra ruta (copia, renombrado)
+                entry.status = "skipped"
+                entries.append(entry)
+                self.stats.skipped += 1
+            else:
+                entry.status = "failed"  # hasta que import_pdfs informe
+                to_import[f.path] = entry
+
+        def on_result(path: str, status: str, error: Optional[str], _seconds: float) -> None:
+            entry = to_import[path]
+            entry.status = status
+            entry.error = error
+
+        if to_import:
+            try:
+                import_pdfs(
+                    self.db, list(to_import), workers=self.workers, cache=self.cache,
+                    skip_existing=True, on_result=on_result,
+                )
+            except Exception:
+                # Lote no confirmado: sin punto de control, se repite en la siguiente vuelta
+                logger.exception("Error importando lote de %d PDF(s)", len(to_import))
+                return
+
+        done_ns = time.time_ns()
+        for path, entry in to_import.items():
+            if entry.status == "failed":
+                self._failed[path] = (entry.size, entry.mtime_ns)
+                self.stats.errors += 1
+                continue
+            entries.append(entry)
+            if entry.status == "ok":
+                self.stats.imported += 1
+                self.stats.latencies.append((done_ns - entry.mtime_ns) / 1e9)
+            elif entry.status == "skipped":
+                self.stats.skipped += 1
+            else:
+                self.stats.errors += 1
+
+        self.db.ingest_checkpoint.save_many(entries)
+        for entry in entries:
+            self._checkpoint[entry.path] = entry
+            self._failed.pop(entry.path, None)
+            if entry.status in ("ok", "skipped"):
+                self._digests.add(entry.digest)
+
+    def run_once(self) -> int:
+        """Una vuelta: escaneo + importación de todo lo listo. Devuelve nº de ficheros tratados."""
+        ready, settling = self.scan()
+        self.stats.cycles += 1
+        self.stats.backlog = len(ready) + settling
+        for i in range(0, len(ready), self.batch_size):
+            batch = ready[i:i + self.batch_size]
+            self._process_batch(batch)
+            self.stats.backlog -= len(batch)
+        if ready:
+            logger.info("Ingesta: %s", self.stats.snapshot())
+        return len(ready)
+
+    def run_forever(self, stop: Optional[threading.Event] = None,
+                    on_cycle: Optional[Callable[["FolderWatcher"], None]] = None) -> None:
+        """Vueltas cada 'interval' segundos hasta que se active 'stop'."""
+        stop = stop or threading.Event()
+        logger.info("Vigilando %s (cada %.1fs)", self.folder, self.interval)
+        while not stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Error en la vuelta de ingesta")
+            if on_cycle is not None:
+                on_cycle(self)
+            stop.wait(self.interval)
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+Reconocimiento de etiquetas de parámetros a partir de
+'parametros_laboratorio.json' (salida de scan_lab_params.py).
+
+Todas las variantes de nombre observadas en el archivo ('original_names')
+se compilan en un trie de caracteres plegados (sin tildes ni mayúsculas,
+espacios colapsados) y el trie se vuelca a una única expresión regular
+con los prefijos factorizados, que recorre el motor de 're' en C. Como en
+los informes la etiqueta va al inicio de la línea, el recorrido es lineal
+en la longitud de la línea sea cual sea el número de alias, y de una vez
+da el fin de la etiqueta, el nombre canónico y su unidad.
+
+alias_index() reconstruye el trie cuando el JSON cambia (tamaño o mtime).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Tuple, Union
+
+log = logging.getLogger(__name__)
+
+ENV_VAR = "SALUD_V1_PARAMS_JSON"
+DEFAULT_PARAMS_JSON = Path(__file__).resolve().parent.parent / "parametros_laboratorio.json"
+
+_END = ""  # clave del nodo terminal (ningún carácter plegado es "")
+
+
+@dataclass(frozen=True)
+class AliasEntry:
+    name: str                   # nombre canónico (primera variante del JSON)
+    unit: Optional[str] = None  # unidad más habitual (None si no hay)
+
+
+def _fold_char(ch: str) -> str:
+    base = "".join(c for c in unicodedata.normalize("NFKD", ch) if not unicodedata.combining(c))
+    return base.casefold()
+
+
+_FOLD_TABLE = {
+    cp: f
+    for cp in [*range(0x41, 0x250), 0xB5]
+    for f in [_fold_char(chr(cp))]
+    if len(f) == 1 and f != chr(cp)
+}
+
+# Carácter plegado -> todas sus variantes ('a' -> 'aAáÁàÀ...'): el regex del
+# trie se aplica al texto original, sin plegarlo antes línea a línea
+_VARIANTS: Dict[str, str] = {}
+for _cp, _f in _FOLD_TABLE.items():
+    _VARIANTS[_f] = _VARIANTS.get(_f, _f) + chr(_cp)
+
+
+def fold(text: str) -> str:
+    """'Ácido Úrico' -> 'acido urico'."""
+    return text.translate(_FOLD_TABLE)
+
+
+def _normalize(alias: str) -> str:
+    return " ".join(fold(alias).split())
+
+
+class AliasIndex:
+    def __init__(self, entries: Iterable[Tuple[str, AliasEntry]] = (), version: str = ""):
+        """entries: pares (alias, AliasEntry)."""
+        self.version = version
+        self._root: Dict[str, Any] = {}
+        self._entries: Dict[str, AliasEntry] = {}
+        self._patterns: Dict[str, Pattern[str]] = {}
+        self._by_label: Dict[str, Optional[AliasEntry]] = {}
+        for alias, entry in entries:
+            self.add(alias, entry)
+
+    @property
+    def size(self) -> int:
+        return len(self._entries)
+
+    @classmethod
+    def from_json(cls, path: Union[str, Path]) -> "AliasIndex":
+        raw = Path(path).read_bytes()
+        data = json.loads(raw.decode("utf-8"))
+        entries: List[Tuple[str, AliasEntry]] = []
+        for key, info in data.items():
+            names = info.get("original_names") or [key]
+            units = info.get("units") or []
+            entry = AliasEntry(names[0], units[0] if units else None)
+            for alias in [key, *names]:
+                entries.append((alias, entry))
+        return cls(entries, version=hashlib.sha256(raw).hexdigest()[:8])
+
+    def add(self, alias: str, entry: AliasEntry) -> None:
+        norm = _normalize(alias)
+        if not norm or norm in self._entries:
+            return  # alias vacío o repetido: se queda el primero
+        self._entries[norm] = entry
+        node = self._root
+        for ch in norm:
+            node = node.setdefault(ch, {})
+        node[_END] = entry
+        self._patterns.clear()
+        self._by_label.clear()
+
+    def entry(self, label: str) -> Optional[AliasEntry]:
+        """AliasEntry de una etiqueta tal como aparece en el texto."""
+        try:
+            return self._by_label[label]
+        except KeyError:
+            found = self._by_label[label] = self._entries.get(_normalize(label))
+            return found
+
+    def line_pattern(self, tail: str) -> Optional[Pattern[str]]:
+        """
+        Regex '^ alias [*] tail' sobre la línea original, con la etiqueta en
+        el grupo 'alias' (ver entry). Cada carácter del trie acepta sus
+        variantes con tilde y mayúscula. El trie se vuelca como alternancias
+        anidadas con los prefijos factorizados (un solo camino por carácter;
+        a igualdad, gana el alias más largo que deje encajar 'tail').
+        None si el índice está vacío.
+        """
+        if not self._entries:
+            return None
+        pattern = self._patterns.get(tail)
+        if pattern is None:
+            pattern = re.compile(
+                rf"^\s*(?P<alias>{_trie_regex(self._root)})(?=[\s*]|$)\s*(?:\*\s*)*{tail}",
+                re.VERBOSE,
+            )
+            self._patterns[tail] = pattern
+        return pattern
+
+
+def _char_regex(ch: str) -> str:
+    if ch == " ":
+        return r"\s+"
+    variants = _VARIANTS.get(ch, ch)
+    if len(variants) == 1:
+        return re.escape(ch)
+    return "[" + "".join(re.escape(v) for v in variants) + "]"
+
+
+def _trie_regex(node: Dict[str, Any]) -> str:
+    alternatives = [_char_regex(ch) + _trie_regex(child) for ch, child in node.items() if ch != _END]
+    if not alternatives:
+        return ""
+    body = alternatives[0] if len(alternatives) == 1 else "(?:" + "|".join(alternatives) + ")"
+    return f"(?:{body})?" if _END in node else body
+
+
+# ============================================================
+#   ÍNDICE COMPARTIDO (se recarga si cambia el JSON)
+# ============================================================
+
+_lock = threading.Lock()
+_current: Optional[Tuple[Tuple[str, int, int], AliasIndex]] = None
+
+
+def params_json_path() -> Path:
+    return Path(os.getenv(ENV_VAR) or DEFAULT_PARAMS_JSON)
+
+
+def alias_index(path: Optional[Union[str, Path]] = None) -> AliasIndex:
+    """
+    Índice del JSON de parámetros (por defecto el del proyecto o el de
+    SALUD_V1_PARAMS_JSON). Coste por llamada: un stat; el trie solo se
+    reconstruye cuando cambian la ruta, el tamaño o el mtime del fichero.
+    Si el JSON falta o es inválido se devuelve un índice vacío.
+    """
+    global _current
+    p = Path(path) if path is not None else params_json_path()
+    try:
+        st = p.stat()
+        stamp = (str(p), st.st_size, st.st_mtime_ns)
+    except OSError:
+        stamp = (str(p), -1, -1)
+
+    with _lock:
+        if _current is not None and _current[0] == stamp:
+            return _current[1]
+        index = AliasIndex()
+        if stamp[1] >= 0:
+            try:
+                index = AliasIndex.from_json(p)
+            except (OSError, ValueError) as e:
+                log.warning("No se pudo cargar %s: %s", p, e)
+        _current = (stamp, index)
+        return index
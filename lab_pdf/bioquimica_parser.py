@@ -5,195 +5,70 @@ Parser específico de la sección de BIOQUÍMICA.
 
 from __future__ import annotations
 
-import re
 from typing import Dict, Optional
 
-from .pdf_utils import extract_float
+from .param_scanner import ParamScanner, ParamSpec
 
+# Asteriscos opcionales ANTES del valor (con espacios opcionales alrededor)
+AST = r"(?:\s*\*+\s*)?"  # 0 o más asteriscos
 
-def parse_bioquimica_section(texto: str) -> Dict[str, Optional[float]]:
-    """
-    Extrae parámetros de bioquímica a partir del texto de la sección.
-    Robusto ante asteriscos (*) y variaciones de etiquetas.
-    """
-
-    # Asteriscos opcionales ANTES del valor (con espacios opcionales alrededor)
-    AST = r"(?:\s*\*+\s*)?"  # 0 o más asteriscos
-
-    flags = re.IGNORECASE
-
+# Etiqueta -> clave de salida (el orden es el del dict devuelto)
+BIOQUIMICA_PARAMS = (
     # -------------------------
     # Básicos
     # -------------------------
-    glucosa = extract_float(
-        rf"\bGlucosa\b\s*{AST}([0-9]+(?:[.,][0-9]+)?)\s*mg/dL",
-        texto,
-        flags=flags,
-    )
-    urea = extract_float(
-        rf"\bUrea\b\s*{AST}([0-9]+(?:[.,][0-9]+)?)\s*mg/dL",
-        texto,
-        flags=flags,
-    )
-    creatinina = extract_float(
-        rf"\bCreatinina\b\s*{AST}([0-9]+(?:[.,][0-9]+)?)\s*mg/dL",
-        texto,
-        flags=flags,
-    )
-
-    sodio = extract_float(
-        rf"\bSodio\b\s*{AST}([0-9]+(?:[.,][0-9]+)?)\s*mmol/L",
-        texto,
-        flags=flags,
-    )
-    potasio = extract_float(
-        rf"\bPotasio\b\s*{AST}([0-9]+(?:[.,][0-9]+)?)\s*mmol/L",
-        texto,
-        flags=flags,
-    )
-
+    ParamSpec("glucosa", r"\bGlucosa\b", r"mg/dL"),
+    ParamSpec("urea", r"\bUrea\b", r"mg/dL"),
+    ParamSpec("creatinina", r"\bCreatinina\b", r"mg/dL"),
+    ParamSpec("sodio", r"\bSodio\b", r"mmol/L"),
+    ParamSpec("potasio", r"\bPotasio\b", r"mmol/L"),
     # En tus PDFs sale como "Cloruro" (a veces podría salir "Cloro")
-    cloro = extract_float(
-        rf"\bClor(?:o|uro)\b\s*{AST}([0-9]+(?:[.,][0-9]+)?)\s*mmol/L",
-        texto,
-        flags=flags,
-    )
-
-    calcio = extract_float(
-        rf"\bCalcio\b\s*{AST}([0-9]+(?:[.,][0-9]+)?)\s*mg/dL",
-        texto,
-        flags=flags,
-    )
-
+    ParamSpec("cloro", r"\bClor(?:o|uro)\b", r"mmol/L"),
+    ParamSpec("calcio", r"\bCalcio\b", r"mg/dL"),
     # A veces sale "Fósforo", otras "Fosfato"
-    fosforo = extract_float(
-        rf"\b(?:F[oó]sforo|Fosfato)\b\s*{AST}([0-9]+(?:[.,][0-9]+)?)\s*mg/dL",
-        texto,
-        flags=flags,
-    )
-
-    acido_urico = extract_float(
-        rf"\b[ÁA]cido\s+úrico\b\s*{AST}([0-9]+(?:[.,][0-9]+)?)\s*mg/dL",
-        texto,
-        flags=flags,
-    )
-
+    ParamSpec("fosforo", r"\b(?:F[oó]sforo|Fosfato)\b", r"mg/dL"),
+    ParamSpec("acido_urico", r"\b[ÁA]cido\s+úrico\b", r"mg/dL"),
     # "Gammaglutamil transferasa (GGT)" o "GGT"
-    ggt = extract_float(
-        rf"(?:\bGGT\b|Gammaglutamil\s+transferasa\s*\(\s*GGT\s*\))\s*{AST}([0-9]+(?:[.,][0-9]+)?)\s*U/L",
-        texto,
-        flags=flags,
-    )
-
+    ParamSpec("ggt", r"(?:\bGGT\b|Gammaglutamil\s+transferasa\s*\(\s*GGT\s*\))", r"U/L"),
     # "Alanina aminotransferasa (ALT/GPT)" o variantes
-    alt_gpt = extract_float(
-        rf"(?:\bALT\b|Alanina\s+aminotransferasa\s*\(\s*ALT\s*/\s*GPT\s*\)|ALT\s*/\s*GPT|ALT\s*\(\s*GPT\s*\))\s*{AST}([0-9]+(?:[.,][0-9]+)?)\s*U/L",
-        texto,
-        flags=flags,
-    )
-
+    ParamSpec(
+        "alt_gpt",
+        r"(?:\bALT\b|Alanina\s+aminotransferasa\s*\(\s*ALT\s*/\s*GPT\s*\)|ALT\s*/\s*GPT|ALT\s*\(\s*GPT\s*\))",
+        r"U/L",
+    ),
     # "Aspartato aminotransferasa (AST/GOT)" o variantes
-    ast_got = extract_float(
-        rf"(?:\bAST\b|Aspartato\s+aminotransferasa\s*\(\s*AST\s*/\s*GOT\s*\)|AST\s*/\s*GOT|AST\s*\(\s*GOT\s*\))\s*{AST}([0-9]+(?:[.,][0-9]+)?)\s*U/L",
-        texto,
-        flags=flags,
-    )
-
-    fosfatasa_alcalina = extract_float(
-        rf"\bFosfatasa\s+alcalina\b\s*{AST}([0-9]+(?:[.,][0-9]+)?)\s*U/L",
-        texto,
-        flags=flags,
-    )
-
-    bilirrubina_total = extract_float(
-        rf"\bBilirrubina\s+total\b\s*{AST}([0-9]+(?:[.,][0-9]+)?)\s*mg/dL",
-        texto,
-        flags=flags,
-    )
-
+    ParamSpec(
+        "ast_got",
+        r"(?:\bAST\b|Aspartato\s+aminotransferasa\s*\(\s*AST\s*/\s*GOT\s*\)|AST\s*/\s*GOT|AST\s*\(\s*GOT\s*\))",
+        r"U/L",
+    ),
+    ParamSpec("fosfatasa_alcalina", r"\bFosfatasa\s+alcalina\b", r"U/L"),
+    ParamSpec("bilirrubina_total", r"\bBilirrubina\s+total\b", r"mg/dL"),
     # -------------------------
-    # Lípidos (lo que te falta)
+    # Lípidos
     # -------------------------
-    colesterol_total = extract_float(
-        rf"\bColesterol\s+total\b\s*{AST}([0-9]+(?:[.,][0-9]+)?)\s*mg/dL",
-        texto,
-        flags=flags,
-    )
-    colesterol_hdl = extract_float(
-        rf"\bColesterol\s+HDL\b\s*{AST}([0-9]+(?:[.,][0-9]+)?)\s*mg/dL",
-        texto,
-        flags=flags,
-    )
-    colesterol_ldl = extract_float(
-        rf"\bColesterol\s+LDL\b\s*{AST}([0-9]+(?:[.,][0-9]+)?)\s*mg/dL",
-        texto,
-        flags=flags,
-    )
-    colesterol_no_hdl = extract_float(
-        rf"\bColesterol\s+no\s+HDL\b\s*{AST}([0-9]+(?:[.,][0-9]+)?)\s*mg/dL",
-        texto,
-        flags=flags,
-    )
-    trigliceridos = extract_float(
-        rf"\bTriglic[eé]ridos\b\s*{AST}([0-9]+(?:[.,][0-9]+)?)\s*mg/dL",
-        texto,
-        flags=flags,
-    )
-
-    # Índice de riesgo cardiovascular
-    indice_riesgo = extract_float(
-        rf"\b[ÍI]ndice\s+de\s+riesgo\s+cardiovascular\b\s*{AST}([0-9]+(?:[.,][0-9]+)?)",
-        texto,
-        flags=flags,
-    )
-
+    ParamSpec("colesterol_total", r"\bColesterol\s+total\b", r"mg/dL"),
+    ParamSpec("colesterol_hdl", r"\bColesterol\s+HDL\b", r"mg/dL"),
+    ParamSpec("colesterol_ldl", r"\bColesterol\s+LDL\b", r"mg/dL"),
+    ParamSpec("colesterol_no_hdl", r"\bColesterol\s+no\s+HDL\b", r"mg/dL"),
+    ParamSpec("trigliceridos", r"\bTriglic[eé]ridos\b", r"mg/dL"),
+    # Índice de riesgo cardiovascular (sin unidad)
+    ParamSpec("indice_riesgo", r"\b[ÍI]ndice\s+de\s+riesgo\s+cardiovascular\b"),
     # -------------------------
     # Hierro / Ferritina / Vitaminas
     # -------------------------
-    hierro = extract_float(
-        rf"\bHierro\b\s*{AST}([0-9]+(?:[.,][0-9]+)?)\s*µ?g/dL",
-        texto,
-        flags=flags,
-    )
-    ferritina = extract_float(
-        rf"\bFerritina\b\s*{AST}([0-9]+(?:[.,][0-9]+)?)\s*ng/mL",
-        texto,
-        flags=flags,
-    )
-    vitamina_b12 = extract_float(
-        rf"\bVitamina\s+B12\b\s*{AST}([0-9]+(?:[.,][0-9]+)?)\s*pg/mL",
-        texto,
-        flags=flags,
-    )
-    folico = extract_float(
-        rf"\b[ÁA]cido\s+f[oó]lico\b\s*{AST}([0-9]+(?:[.,][0-9]+)?)\s*ng/mL",
-        texto,
-        flags=flags,
-    )
+    ParamSpec("hierro", r"\bHierro\b", r"µ?g/dL"),
+    ParamSpec("ferritina", r"\bFerritina\b", r"ng/mL"),
+    ParamSpec("vitamina_b12", r"\bVitamina\s+B12\b", r"pg/mL"),
+    ParamSpec("folico", r"\b[ÁA]cido\s+f[oó]lico\b", r"ng/mL"),
+)
 
-    return {
-        "glucosa": glucosa,
-        "urea": urea,
-        "creatinina": creatinina,
-        "sodio": sodio,
-        "potasio": potasio,
-        "cloro": cloro,
-        "calcio": calcio,
-        "fosforo": fosforo,
-        "acido_urico": acido_urico,
-        "ggt": ggt,
-        "alt_gpt": alt_gpt,
-        "ast_got": ast_got,
-        "fosfatasa_alcalina": fosfatasa_alcalina,
-        "bilirrubina_total": bilirrubina_total,
-        "colesterol_total": colesterol_total,
-        "colesterol_hdl": colesterol_hdl,
-        "colesterol_ldl": colesterol_ldl,
-        "colesterol_no_hdl": colesterol_no_hdl,
-        "trigliceridos": trigliceridos,
-        "indice_riesgo": indice_riesgo,
-        "hierro": hierro,
-        "ferritina": ferritina,
-        "vitamina_b12": vitamina_b12,
-        "folico": folico,
-    }
+_SCANNER = ParamScanner(BIOQUIMICA_PARAMS, gap=rf"\s*{AST}")
+
+
+def parse_bioquimica_section(texto: str) -> Dict[str, Optional[float]]:
+    """
+    Extrae parámetros de bioquímica a partir del texto de la sección.
+    Robusto ante asteriscos (*) y variaciones de etiquetas.
+    """
+    return _SCANNER.scan(texto)
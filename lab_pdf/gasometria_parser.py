@@ -10,32 +10,26 @@ from typing import Dict, Optional
 from .pdf_utils import extract_named_value
 
 
+# Clave de salida -> etiqueta literal al inicio de línea (el orden es el del dict devuelto)
+GASOMETRIA_LABELS = (
+    ("gaso_ph", "pH"),
+    ("gaso_pco2", "pCO2"),
+    ("gaso_po2", "pO2"),
+    ("gaso_tco2", "CO2 Total (TCO2)"),
+    ("gaso_so2_calc", "Saturación de Oxígeno (sO2) calculada"),
+    ("gaso_so2", "Saturación de Oxígeno (sO2)"),
+    ("gaso_p50", "p50"),
+    ("gaso_bicarbonato", "Bicarbonato (CO3H-)"),
+    ("gaso_sbc", "Bicarbonato Estandar (SBC)"),
+    ("gaso_eb", "Exceso de Bases (EB)"),
+    ("gaso_beecf", "E. de bases en fluido extracelular (BEecf)"),
+    ("gaso_calcio_ionico", "Calcio iónico"),
+    ("gaso_lactato", "Lactato"),
+)
+
+
 def parse_gasometria_section(texto: str) -> Dict[str, Optional[float]]:
     """
     Parsea la sección de GASOMETRÍA (venosa/arterial) y devuelve un dict.
     """
-    data: Dict[str, Optional[float]] = {}
-
-    data["gaso_ph"] = extract_named_value("pH", texto)
-    data["gaso_pco2"] = extract_named_value("pCO2", texto)
-    data["gaso_po2"] = extract_named_value("pO2", texto)
-    data["gaso_tco2"] = extract_named_value("CO2 Total (TCO2)", texto)
-
-    data["gaso_so2_calc"] = extract_named_value(
-        "Saturación de Oxígeno (sO2) calculada", texto
-    )
-    data["gaso_so2"] = extract_named_value(
-        "Saturación de Oxígeno (sO2)", texto
-    )
-
-    data["gaso_p50"] = extract_named_value("p50", texto)
-    data["gaso_bicarbonato"] = extract_named_value("Bicarbonato (CO3H-)", texto)
-    data["gaso_sbc"] = extract_named_value("Bicarbonato Estandar (SBC)", texto)
-    data["gaso_eb"] = extract_named_value("Exceso de Bases (EB)", texto)
-    data["gaso_beecf"] = extract_named_value(
-        "E. de bases en fluido extracelular (BEecf)", texto
-    )
-    data["gaso_calcio_ionico"] = extract_named_value("Calcio iónico", texto)
-    data["gaso_lactato"] = extract_named_value("Lactato", texto)
-
-    return data
+    return {key: extract_named_value(label, texto) for key, label in GASOMETRIA_LABELS}
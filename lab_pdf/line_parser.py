@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+Parser genérico de líneas de resultado:
+
+    Nombre  [*]  valor  [unidad]  [ref_min - ref_max]
+
+Los parsers de sección solo conservan los parámetros de su tabla; este
+recorre TODAS las líneas de cada sección y devuelve cualquier resultado
+numérico reconocible (ácido úrico, GGT, calcio iónico...) con su unidad y
+rango de referencia, para el almacén largo 'observation' (una fila por
+parámetro y análisis).
+
+Si la etiqueta es un alias conocido de 'parametros_laboratorio.json'
+(lab_pdf.alias_index), el trie da directamente dónde acaba el nombre y su
+nombre canónico (variantes como "Acido úrico"/"Ácido Úrico" se unifican);
+si no, el nombre se delimita con la expresión regular de línea completa.
+
+La clave canónica (param_key) se resuelve con las tablas de etiquetas de
+los parsers de sección (p.ej. "Cloruro" -> 'cloro', "Calcio iónico" en
+gasometría -> 'gaso_calcio_ionico'); si el nombre no es conocido se deriva
+del propio nombre ("Proteína C reactiva" -> 'proteina_c_reactiva').
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Pattern, Sequence, Tuple
+
+from .alias_index import AliasIndex, alias_index
+from .bioquimica_parser import BIOQUIMICA_PARAMS
+from .gasometria_parser import GASOMETRIA_LABELS
+from .hematologia_parser import HEMATOLOGIA_PARAMS
+from .orina_parser import ORINA_NUMERIC_PARAMS
+
+_NUM = r"[0-9]+(?:[.,][0-9]+)?"
+
+# Lo que sigue a la etiqueta, hasta el final de la línea
+_TAIL = rf"""
+    (?P<value>-?{_NUM})                                # valor
+    (?:\s+(?P<unit>[^\d\s+*-]\S*))?                    # unidad (x10^3/µL, mg/dL, %...)
+    (?:\s+(?P<ref_min>[+-]?{_NUM})\s*[-–]\s*(?P<ref_max>[+-]?{_NUM}))?  # rango
+    \s*$"""
+
+# Línea completa (anclada al final: el nombre es perezoso y retrocede hasta
+# que valor, unidad y rango encajan). El nombre empieza por letra y no
+# admite ':' (cabeceras tipo "Recepción: 24/06/25").
+_RESULT_LINE = re.compile(
+    rf"""^\s*
+    (?P<name>[^\W\d_][\w %()\[\]/.,'+-]*?)             # nombre
+    \s+(?:\*\s*)*                                      # espacios y posibles asteriscos
+    {_TAIL}""",
+    re.VERBOSE,
+)
+
+
+class ResultLine(NamedTuple):
+    name: str
+    value: float
+    unit: Optional[str]
+    ref_min: Optional[float]
+    ref_max: Optional[float]
+    known: bool = False  # etiqueta resuelta por el índice de alias
+
+
+# Forma de unidad: con '/', '%', '^', 'µ', '°' o '[' (mg/dL, x10^3/µL, %...) o
+# una abreviatura corta (fL, pg, seg, mmHg); "tubos" o "frascos" no lo son
+_UNIT_SHAPE = re.compile(r"[/%^µ°\[]|^[A-Za-z]{1,4}$")
+
+
+def is_observation(r: ResultLine) -> bool:
+    """
+    Un resultado de verdad trae unidad o rango de referencia, o su etiqueta
+    es un alias conocido. Sin esto encajan cabeceras y pies como "Página 1
+    de 2", "Hoja 1" o "Muestra 2 tubos".
+    """
+    if r.known or r.ref_min is not None:
+        return True
+    return r.unit is not None and bool(_UNIT_SHAPE.search(r.unit))
+
+
+def _to_float(raw: Optional[str]) -> Optional[float]:
+    if raw is None:
+        return None
+    return float(raw.replace(",", "."))
+
+
+def parse_result_line(line: str, aliases: Optional[AliasIndex] = None) -> Optional[ResultLine]:
+    """
+    ResultLine de una línea de resultado numérico, o None si no lo es.
+    Con 'aliases', una etiqueta conocida da el nombre canónico (y la unidad
+    si la línea no la trae).
+    """
+    pattern = aliases.line_pattern(_TAIL) if aliases is not None else None
+    if pattern is not None:
+        m = pattern.match(line)
+        if m:
+            entry = aliases.entry(m.group("alias"))
+            return ResultLine(
+                name=entry.name,
+                value=_to_float(m.group("value")),
+                unit=m.group("unit") or entry.unit,
+                ref_min=_to_float(m.group("ref_min")),
+                ref_max=_to_float(m.group("ref_max")),
+                known=True,
+            )
+    m = _RESULT_LINE.match(line)
+    if not m:
+        return None
+    return ResultLine(
+        name=" ".join(m.group("name").split()),
+        value=_to_float(m.group("value")),
+        unit=m.group("unit"),
+        ref_min=_to_float(m.group("ref_min")),
+        ref_max=_to_float(m.group("ref_max")),
+    )
+
+
+def parse_numeric_line(line: str) -> Optional[Tuple[str, float, str, float, float]]:
+    """
+    (nombre, valor, unidad, ref_min, ref_max) solo si la línea trae unidad
+    y rango de referencia (criterio de scan_lab_params).
+    """
+    r = parse_result_line(line)
+    if r is None or r.unit is None or r.ref_min is None:
+        return None
+    return r.name, r.value, r.unit, r.ref_min, r.ref_max
+
+
+# ============================================================
+#   CLAVE CANÓNICA
+# ============================================================
+
+# Etiquetas conocidas por sección: (regex de etiqueta, clave)
+def _label_table(specs: Sequence[Any]) -> List[Tuple[Pattern[str], str]]:
+    return [(re.compile(s.label, re.IGNORECASE), s.key) for s in specs]
+
+
+_KNOWN_LABELS: Dict[str, List[Tuple[Pattern[str], str]]] = {
+    "hematologia": _label_table(HEMATOLOGIA_PARAMS),
+    "bioquimica": _label_table(BIOQUIMICA_PARAMS),
+    "gasometria": [(re.compile(re.escape(label), re.IGNORECASE), key) for key, label in GASOMETRIA_LABELS],
+    "orina": _label_table(ORINA_NUMERIC_PARAMS),
+}
+
+# Nombres desconocidos: mismo convenio que las columnas de cada sección
+_KEY_FORMAT = {"gasometria": "gaso_{}", "orina": "{}_ur"}
+
+
+def slugify(name: str) -> str:
+    """'Ácido fólico (B9)' -> 'acido_folico_b9'."""
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    return "_".join(re.findall(r"[a-z0-9]+", ascii_name.lower()))
+
+
+@lru_cache(maxsize=4096)
+def param_key(name: str, section: str) -> str:
+    """Clave canónica de un nombre de parámetro dentro de su sección."""
+    for pattern, key in _KNOWN_LABELS.get(section, ()):
+        if pattern.fullmatch(name):
+            return key
+    slug = slugify(name)
+    if section == "orina":
+        slug = "_".join(w for w in slug.split("_") if w != "orina")
+    return _KEY_FORMAT.get(section, "{}").format(slug)
+
+
+def parse_observations(sections: Dict[str, str],
+                       aliases: Optional[AliasIndex] = None) -> List[Dict[str, Any]]:
+    """
+    Resultados numéricos de todas las secciones, como dicts con param_key,
+    value, unit, ref_min y ref_max. Gana la primera aparición de cada clave
+    (mismo criterio que los parsers de sección). Solo cuentan las líneas
+    que pasan is_observation.
+
+    'aliases' por defecto es el índice de parametros_laboratorio.json
+    (alias_index: se recarga solo si el JSON cambia).
+    """
+    if aliases is None:
+        aliases = alias_index()
+    out: Dict[str, Dict[str, Any]] = {}
+    for section, texto in sections.items():
+        for line in texto.splitlines():
+            r = parse_result_line(line, aliases)
+            if r is None or not is_observation(r):
+                continue
+            key = param_key(r.name, section)
+            if not key or key in out:
+                continue
+            out[key] = {
+                "param_key": key,
+                "value": r.value,
+                "unit": r.unit,
+                "ref_min": r.ref_min,
+                "ref_max": r.ref_max,
+            }
+    return list(out.values())
@@ -13,12 +13,25 @@ from __future__ import annotations
 import re
 from typing import Dict, Optional, Any
 
+from .param_scanner import ParamSpec
 from .pdf_utils import extract_float, extract_token
 
 _NUM = r"([0-9]+(?:[.,][0-9]+)?)"
 STAR = r"(?:\s*\*+\s*)?"  # 0 o más asteriscos, con o sin espacios
 
 
+# Etiquetas de los parámetros numéricos (las usa el parser genérico de
+# líneas, lab_pdf.line_parser, para dar a cada resultado su clave estable)
+ORINA_NUMERIC_PARAMS = (
+    ParamSpec("ph", r"pH"),
+    ParamSpec("densidad", r"Densidad"),
+    ParamSpec("sodio_ur", r"Sodio(?:\s+orina)?"),
+    ParamSpec("creatinina_ur", r"Creatinina(?:\s+orina)?"),
+    ParamSpec("albumina_ur", r"Alb[uú]mina(?:\s+orina)?"),
+    ParamSpec("indice_albumina_creatinina", r"[IÍ]ndice\s+Alb/Cre"),
+)
+
+
 def _normalize_text(texto: str) -> str:
     if not texto:
         return ""
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Extracción de texto por etapas para informes de laboratorio.
+
+pypdf cuesta milisegundos por página y la mayor parte del tiempo de un
+import se va en extraer texto. Un informe de alta o de microbiología de
+varias páginas se extraía entero solo para rechazarlo al final de
+parse_hematology_pdf. Aquí las páginas se extraen una a una:
+
+1. Primera página: debe tener la fecha de 'Recepción:' (cabecera del
+   informe; sin ella parse_metadata falla igualmente) y algún encabezado de
+   SECTION_PATTERNS o, en su defecto, valores de hemograma (el parser de
+   hematología trabaja sobre el texto completo si no hay encabezado). Si no,
+   se deja de leer: el informe se rechazará con el mismo ValueError.
+2. Páginas siguientes: una página con encabezado abre la sección
+   correspondiente; una página sin encabezado continúa la sección abierta
+   si su parser encuentra algún valor o si alguna línea es un resultado
+   (parse_result_line + is_observation: parámetros que el parser de la
+   sección no conserva, como vitamina D o TSH, van a 'observation'). Una
+   página que no aporta nada no se guarda, pero se sigue buscando un
+   encabezado en las siguientes; tras _MAX_SKIPPED_PAGES páginas seguidas
+   sin aportar se termina la extracción (anexos, hojas de observaciones,
+   informes no analíticos concatenados...).
+
+read_report_header lee solo la cabecera (primera página) para saber, antes
+de parsear nada más, si un informe ya está importado.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+from .bioquimica_parser import parse_bioquimica_section
+from .gasometria_parser import parse_gasometria_section
+from .hematologia_parser import parse_hematologia_section
+from .line_parser import is_observation, parse_result_line
+from .metadata_parser import parse_metadata
+from .orina_parser import parse_orina_section
+from .pdf_utils import PdfSource, has_any_value, iter_page_texts
+from .section_splitter import SECTION_PATTERNS
+
+_FECHA_RECEPCION = re.compile(r"Recepción:\s*[0-9]{1,2}/[0-9]{1,2}/[0-9]{2}")
+
+# Páginas seguidas sin encabezado ni resultados que se toleran antes de
+# dejar de leer (p.ej. una hoja de comentarios entre dos secciones)
+_MAX_SKIPPED_PAGES = 1
+
+_SECTION_RES = {key: re.compile(pat) for key, pat in SECTION_PATTERNS.items()}
+
+_SECTION_PARSERS: Dict[str, Callable[[str], dict]] = {
+    "hematologia": parse_hematologia_section,
+    "bioquimica": parse_bioquimica_section,
+    "gasometria": parse_gasometria_section,
+    "orina": parse_orina_section,
+}
+
+
+def _last_header(texto: str) -> Optional[str]:
+    """Sección cuyo encabezado aparece más tarde en la página (None si no hay)."""
+    best = None
+    best_pos = -1
+    for key, rx in _SECTION_RES.items():
+        m = rx.search(texto)
+        if m and m.start() > best_pos:
+            best, best_pos = key, m.start()
+    return best
+
+
+def _has_values(section: str, texto: str) -> bool:
+    return has_any_value(_SECTION_PARSERS[section](texto))
+
+
+def _has_result_line(texto: str) -> bool:
+    """Alguna línea es un resultado (mismo criterio que 'observation')."""
+    for line in texto.splitlines():
+        r = parse_result_line(line)
+        if r is not None and is_observation(r):
+            return True
+    return False
+
+
+class LabPageFilter:
+    """
+    Decide página a página si hay que seguir extrayendo. Trabaja solo con
+    texto (sin pypdf) para poder probarse de forma aislada.
+    """
+
+    def __init__(self):
+        self.pages: List[str] = []
+        self.open_section: Optional[str] = None
+        self.skipped = 0
+
+    def feed(self, texto: str) -> bool:
+        """
+        Procesa la siguiente página. Devuelve False cuando ya no hace falta
+        leer más páginas.
+        """
+        if not self.pages:
+            return self._feed_first(texto)
+
+        header = _last_header(texto)
+        if header is not None:
+            self.pages.append(texto)
+            self.open_section = header
+            self.skipped = 0
+            return True
+
+        if self.open_section is not None and (
+            _has_values(self.open_section, texto) or _has_result_line(texto)
+        ):
+            self.pages.append(texto)
+            self.skipped = 0
+            return True
+
+        # La página no continúa ninguna sección: se descarta y se sigue
+        # buscando un encabezado unas pocas páginas más
+        self.open_section = None
+        self.skipped += 1
+        return self.skipped <= _MAX_SKIPPED_PAGES
+
+    def _feed_first(self, texto: str) -> bool:
+        self.pages.append(texto)
+        if not _FECHA_RECEPCION.search(texto):
+            return False
+
+        header = _last_header(texto)
+        if header is None and _has_values("hematologia", texto):
+            header = "hematologia"
+        self.open_section = header
+        return header is not None
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.pages)
+
+
+def extract_lab_text(pdf_path: PdfSource) -> str:
+    """
+    Como extract_text_from_pdf, pero deja de extraer páginas en cuanto se
+    sabe que el resto no aporta al parseo (ver docstring del módulo).
+    """
+    page_filter = LabPageFilter()
+    for texto in iter_page_texts(pdf_path):
+        if not page_filter.feed(texto):
+            break
+    return page_filter.text
+
+
+def read_report_header(pdf_path: PdfSource) -> Optional[Dict[str, Any]]:
+    """
+    parse_metadata sobre la primera página (fecha_analisis, numero_peticion,
+    origen). None si no hay fecha de 'Recepción:' (informe no soportado).
+    """
+    first = next(iter_page_texts(pdf_path), "")
+    try:
+        return parse_metadata(first)
+    except ValueError:
+        return None
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Escáner de parámetros en una sola pasada.
+
+Cada sección describe sus parámetros en una tabla declarativa (ParamSpec:
+clave de salida, etiqueta, unidad). La tabla se compila UNA vez al importar
+en una única alternancia y el texto se recorre con finditer.
+
+La alternancia consume texto (etiqueta + valor + unidad): una coincidencia
+no puede solapar con la siguiente. Gana la primera aparición de cada clave,
+igual que con un re.search independiente por campo, siempre que la tabla
+cumpla:
+
+- todas las etiquetas empiezan por letra (el patrón va precedido de un
+  lookahead de letra: el motor descarta rápido las posiciones con dígitos,
+  espacios o signos, que son la mayoría del texto);
+- ninguna coincidencia completa de un parámetro contiene la etiqueta de
+  otro (en ese caso el segundo quedaría oculto).
+
+No se añade \b delante de las etiquetas: cambiaría el resultado con texto
+pegado ("...mg/dLUrea 30") respecto a los parsers anteriores.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+
+NUM = r"([0-9]+(?:[.,][0-9]+)?)"
+
+
+@dataclass(frozen=True)
+class ParamSpec:
+    key: str                      # clave en el dict de salida
+    label: str                    # regex de la etiqueta (alternativas incluidas)
+    unit: Optional[str] = None    # regex de la unidad tras el valor (None: sin unidad)
+
+
+class ParamScanner:
+    def __init__(self, specs: Sequence[ParamSpec], *, gap: str, flags: int = re.IGNORECASE):
+        """
+        gap: regex entre etiqueta y valor (espacios, asteriscos...).
+        """
+        self.keys = [s.key for s in specs]
+        if len(set(self.keys)) != len(self.keys):
+            raise ValueError("Claves duplicadas en la tabla de parámetros")
+
+        alternatives = []
+        for s in specs:
+            value = NUM.replace("(", f"(?P<{s.key}>", 1)
+            unit = rf"\s*{s.unit}" if s.unit else ""
+            alternatives.append(rf"{s.label}{gap}{value}{unit}")
+        self.pattern = re.compile(r"(?=[^\W\d_])(?:" + "|".join(alternatives) + ")", flags)
+
+    def scan(self, texto: str) -> Dict[str, Optional[float]]:
+        """Dict con todas las claves de la tabla (None si no aparece)."""
+        found: Dict[str, Optional[float]] = {}
+        pending = len(self.keys)
+        for m in self.pattern.finditer(texto):
+            key = m.lastgroup
+            if key in found:
+                continue
+            found[key] = _to_float(m.group(key))
+            pending -= 1
+            if not pending:
+                break
+        return {k: found.get(k) for k in self.keys}
+
+
+def _to_float(raw: str) -> Optional[float]:
+    # Mismo criterio que pdf_utils.extract_float
+    try:
+        return float(raw.replace(",", "."))
+    except ValueError:
+        return None
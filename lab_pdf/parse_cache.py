@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+Caché persistente de parseo de PDFs.
+
+Clave: SHA-256 de los bytes del PDF + versión del parser. Un acierto cuesta
+un hash del fichero y una consulta; no se llega a abrir el PDF con pypdf.
+
+- La versión del parser es un hash de los módulos de lab_pdf: cualquier
+  cambio en un parser invalida automáticamente las entradas antiguas.
+- Se guardan también los ValueError (informes no soportados): son
+  deterministas y volver a extraerlos cuesta lo mismo que uno válido.
+- Tamaño acotado: al superar 'max_entries' se eliminan las menos usadas.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import marshal
+import os
+import pkgutil
+import sqlite3
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from .alias_index import alias_index
+from .pdf_to_json import parse_hematology_pdf
+
+PathLike = Union[str, Path]
+
+DEFAULT_MAX_ENTRIES = 5000
+_CHUNK = 1024 * 1024
+
+
+@lru_cache(maxsize=1)
+def parser_version() -> str:
+    """Hash del código de todos los módulos de lab_pdf (fuente o bytecode)."""
+    import lab_pdf
+
+    return modules_version(*(m.name for m in pkgutil.iter_modules(lab_pdf.__path__)))
+
+
+@lru_cache(maxsize=None)
+def modules_version(*names: str) -> str:
+    """Hash del código de los módulos 'names' de lab_pdf (fuente o bytecode)."""
+    import lab_pdf
+
+    finders = {m.name: m.module_finder for m in pkgutil.iter_modules(lab_pdf.__path__)}
+    h = hashlib.sha256()
+    for name in sorted(set(names)):
+        h.update(name.encode("utf-8"))
+        spec = finders[name].find_spec(f"lab_pdf.{name}")
+        origin = getattr(spec, "origin", None) if spec else None
+        if origin and os.path.isfile(origin) and origin.endswith(".py"):
+            with open(origin, "rb") as f:
+                h.update(f.read())
+        elif spec and spec.loader and hasattr(spec.loader, "get_code"):
+            # Ejecutable congelado (PyInstaller): no hay .py, sí bytecode
+            code = spec.loader.get_code(f"lab_pdf.{name}")
+            if code is not None:
+                h.update(marshal.dumps(code))
+    return h.hexdigest()[:16]
+
+
+def file_digest(path: PathLike) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def default_cache_path() -> Path:
+    """Misma carpeta de datos que la API (SALUD_V1_DATA_DIR o ~/.salud_v1)."""
+    base = os.getenv("SALUD_V1_DATA_DIR")
+    root = Path(base).expanduser() if base else Path.home() / ".salud_v1"
+    return (root / "parse_cache.db").resolve()
+
+
+@dataclass
+class CacheEntry:
+    data: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None  # mensaje del ValueError
+
+
+class ParseCache:
+    """
+    Caché SQLite (modo WAL: los procesos trabajadores leen mientras el
+    proceso principal escribe).
+    """
+
+    def __init__(self, path: PathLike, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 readonly: bool = False):
+        self.path = str(path)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        if readonly:
+            # Lectores (procesos trabajadores): sin DDL ni escrituras
+            uri = Path(self.path).resolve().as_uri() + "?mode=ro"
+            self.conn = sqlite3.connect(uri, uri=True, timeout=10.0, check_same_thread=False)
+            return
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=10.0, check_same_thread=False)
+        with self._lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS parse_cache (
+                    digest TEXT NOT NULL,
+                    parser_version TEXT NOT NULL,
+                    data TEXT,
+                    error TEXT,
+                    last_used INTEGER NOT NULL,
+                    PRIMARY KEY (digest, parser_version)
+                )
+                """
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_parse_cache_last_used ON parse_cache(last_used)"
+            )
+            # Entradas de versiones anteriores del parser: ya no sirven
+            self.conn.execute(
+                "DELETE FROM parse_cache WHERE parser_version <> ?", (self.version,)
+            )
+            self.conn.commit()
+
+    @property
+    def version(self) -> str:
+        """
+        Versión del parser + del JSON de alias: las entradas dejan de valer
+        si cambia el código de lab_pdf o parametros_laboratorio.json.
+        """
+        return f"{parser_version()}-{alias_index().version}"
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+    # --------------------
+    #   LECTURA
+    # --------------------
+    def get(self, digest: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT data, error FROM parse_cache WHERE digest=? AND parser_version=?",
+                (digest, self.version),
+            ).fetchone()
+        if row is None:
+            return None
+        data, error = row
+        return CacheEntry(data=json.loads(data) if data is not None else None, error=error)
+
+    # --------------------
+    #   ESCRITURA
+    # --------------------
+    def put(self, digest: str, entry: CacheEntry) -> None:
+        self.put_many([(digest, entry)])
+
+    def put_many(self, items: Iterable[Tuple[str, CacheEntry]]) -> None:
+        rows = [
+            (
+                digest,
+                self.version,
+                json.dumps(e.data, ensure_ascii=False) if e.data is not None else None,
+                e.error,
+            )
+            for digest, e in items
+        ]
+        if not rows:
+            return
+        with self._lock:
+            tick = self._next_tick()
+            self.conn.executemany(
+                "INSERT INTO parse_cache(digest,parser_version,data,error,last_used) "
+                "VALUES(?,?,?,?,?) ON CONFLICT(digest,parser_version) DO UPDATE SET "
+                "data=excluded.data, error=excluded.error, last_used=excluded.last_used",
+                [r + (tick,) for r in rows],
+            )
+            self._evict()
+            self.conn.commit()
+
+    def touch_many(self, digests: Iterable[str]) -> None:
+        """Marca entradas como usadas (orden LRU)."""
+        params = [(d, self.version) for d in digests]
+        if not params:
+            return
+        with self._lock:
+            tick = self._next_tick()
+            self.conn.executemany(
+                f"UPDATE parse_cache SET last_used={tick} WHERE digest=? AND parser_version=?",
+                params,
+            )
+            self.conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self.conn.execute("SELECT COUNT(*) FROM parse_cache").fetchone()[0])
+
+    def _next_tick(self) -> int:
+        # Contador lógico (no reloj): LRU estable aunque cambie la hora del sistema
+        row = self.conn.execute("SELECT MAX(last_used) FROM parse_cache").fetchone()
+        return int(row[0] or 0) + 1
+
+    def _evict(self) -> None:
+        count = int(self.conn.execute("SELECT COUNT(*) FROM parse_cache").fetchone()[0])
+        excess = count - self.max_entries
+        if excess > 0:
+            self.conn.execute(
+                "DELETE FROM parse_cache WHERE rowid IN "
+                "(SELECT rowid FROM parse_cache ORDER BY last_used ASC LIMIT ?)",
+                (excess,),
+            )
+
+    # --------------------
+    #   ATAJO
+    # --------------------
+    def parse(self, pdf_path: PathLike) -> Dict[str, Any]:
+        """
+        parse_hematology_pdf con caché. Misma semántica: lanza ValueError si
+        el informe no es soportado (también cuando viene de la caché).
+        """
+        digest = file_digest(pdf_path)
+        entry = self.get(digest)
+        if entry is None:
+            try:
+                entry = CacheEntry(data=parse_hematology_pdf(str(pdf_path)))
+            except ValueError as e:
+                entry = CacheEntry(error=str(e))
+            self.put(digest, entry)
+        else:
+            self.touch_many([digest])
+        if entry.error is not None:
+            raise ValueError(entry.error)
+        return entry.data
+
+
+_default_cache: Optional[ParseCache] = None
+_default_lock = threading.Lock()
+
+
+def get_default_cache() -> Optional[ParseCache]:
+    """
+    Caché compartida en default_cache_path(). Si no se puede abrir (disco de
+    solo lectura, permisos...) devuelve None y se parsea sin caché.
+    """
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            try:
+                _default_cache = ParseCache(default_cache_path())
+            except (OSError, sqlite3.Error):
+                return None
+        return _default_cache
@@ -13,7 +13,10 @@ import json
 from pathlib import Path
 from typing import Dict, Any
 
-from .pdf_utils import extract_text_from_pdf, has_any_value
+from metrics import timer
+
+from .pdf_utils import PdfSource, has_any_value
+from .page_filter import extract_lab_text
 from .metadata_parser import parse_metadata
 from .patient_parser import parse_patient
 from .section_splitter import split_lab_sections
@@ -21,13 +24,14 @@ from .hematologia_parser import parse_hematologia_section
 from .bioquimica_parser import parse_bioquimica_section
 from .gasometria_parser import parse_gasometria_section
 from .orina_parser import parse_orina_section
+from .line_parser import parse_observations
 
 
 # ============================================================
 #   FUNCIÓN PRINCIPAL (API PÚBLICA)
 # ============================================================
 
-def parse_hematology_pdf(pdf_path: str) -> Dict[str, Any]:
+def parse_hematology_pdf(pdf_path: PdfSource) -> Dict[str, Any]:
     """
     Parsea un informe PDF de laboratorio y devuelve un dict con formato:
 
@@ -37,25 +41,33 @@ def parse_hematology_pdf(pdf_path: str) -> Dict[str, Any]:
       "bioquimica":  [ {...} ],
       "gasometria":  [ {...} ],
       "orina":       [ {...} ],
+      "observation": [ {..., "resultados": [ {param_key, value, unit, ref_min, ref_max}, ... ]} ],
       "analisis":    [ {...} ]  # alias de hematologia para compatibilidad
     }
 
     (Si alguna serie no está presente, vendrá como lista vacía o no se incluirá.)
+    'pdf_path' puede ser también un flujo binario (io.BytesIO) ya en memoria.
     """
-    pdf_path = str(pdf_path)
-    texto = extract_text_from_pdf(pdf_path)
+    if isinstance(pdf_path, Path):
+        pdf_path = str(pdf_path)
+    # Cada etapa se cronometra (metrics.timer: sin coste si está desactivado)
+    with timer("pdf.extract"):
+        texto = extract_lab_text(pdf_path)
 
     # --- Datos de paciente ---
-    paciente_data = parse_patient(texto)
+    with timer("pdf.paciente"):
+        paciente_data = parse_patient(texto)
 
     # --- Metadatos comunes ---
-    meta = parse_metadata(texto)
+    with timer("pdf.metadata"):
+        meta = parse_metadata(texto)
     fecha_analisis = meta["fecha_analisis"]
     numero_peticion = meta["numero_peticion"]
     origen = meta["origen"]
 
     # --- Secciones del informe ---
-    sections = split_lab_sections(texto)
+    with timer("pdf.split_sections"):
+        sections = split_lab_sections(texto)
 
     hemat_text = sections.get("hematologia", texto)
     bio_text = sections.get("bioquimica", texto)
@@ -63,19 +75,23 @@ def parse_hematology_pdf(pdf_path: str) -> Dict[str, Any]:
     orina_text = sections.get("orina", "")
 
     # --- Hematología ---
-    hemat_vals = parse_hematologia_section(hemat_text)
+    with timer("pdf.section.hematologia"):
+        hemat_vals = parse_hematologia_section(hemat_text)
     has_hema = has_any_value(hemat_vals)
 
     # --- Bioquímica ---
-    bio_vals = parse_bioquimica_section(bio_text) if "bioquimica" in sections else {}
+    with timer("pdf.section.bioquimica"):
+        bio_vals = parse_bioquimica_section(bio_text) if "bioquimica" in sections else {}
     has_bio = has_any_value(bio_vals)
 
     # --- Gasometría ---
-    gaso_vals = parse_gasometria_section(gaso_text) if "gasometria" in sections else {}
+    with timer("pdf.section.gasometria"):
+        gaso_vals = parse_gasometria_section(gaso_text) if "gasometria" in sections else {}
     has_gaso = has_any_value(gaso_vals)
 
     # --- Orina ---
-    orina_vals = parse_orina_section(orina_text) if "orina" in sections else {}
+    with timer("pdf.section.orina"):
+        orina_vals = parse_orina_section(orina_text) if "orina" in sections else {}
     has_orina = has_any_value(orina_vals)
 
     # Si no hay ningún bloque reconocible, probablemente no es un informe de lab estándar
@@ -122,6 +138,17 @@ def parse_hematology_pdf(pdf_path: str) -> Dict[str, Any]:
         }
         result["orina"] = [orina_record]
 
+    # --- Todos los resultados numéricos (formato largo) ---
+    with timer("pdf.observation"):
+        resultados = parse_observations(sections)
+    if resultados:
+        result["observation"] = [{
+            "fecha_analisis": fecha_analisis,
+            "numero_peticion": numero_peticion,
+            "origen": origen,
+            "resultados": resultados,
+        }]
+
     return result
 
 
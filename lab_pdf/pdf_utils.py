@@ -6,23 +6,32 @@ Utilidades generales para parsing de informes PDF de laboratorio.
 from __future__ import annotations
 
 import re
-from typing import Dict, Any, Optional
+from pathlib import Path
+from typing import BinaryIO, Dict, Any, Iterator, Optional, Union
 
 from pypdf import PdfReader
 
+# Ruta del PDF o flujo binario ya abierto (p.ej. io.BytesIO de una subida)
+PdfSource = Union[str, Path, BinaryIO]
+
 
 # ============================================================
 #   UTILIDADES GENERALES
 # ============================================================
 
-def extract_text_from_pdf(pdf_path: str) -> str:
-    """Extrae todo el texto de un PDF en una sola cadena."""
+def iter_page_texts(pdf_path: PdfSource) -> Iterator[str]:
+    """
+    Texto de cada página, extraído bajo demanda: las páginas que no se
+    consumen no se llegan a procesar. Acepta una ruta o un flujo binario.
+    """
     reader = PdfReader(pdf_path)
-    chunks = []
     for page in reader.pages:
-        txt = page.extract_text() or ""
-        chunks.append(txt)
-    return "\n".join(chunks)
+        yield page.extract_text() or ""
+
+
+def extract_text_from_pdf(pdf_path: PdfSource) -> str:
+    """Extrae todo el texto de un PDF en una sola cadena."""
+    return "\n".join(iter_page_texts(pdf_path))
 
 
 def extract_float(pattern: str, texto: str, flags: int = re.IGNORECASE) -> Optional[float]:
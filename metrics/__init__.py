@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+"""
+Instrumentación ligera del pipeline de importación.
+
+Expone:
+  - timer (context manager por etapa; nulo si está desactivado)
+  - enable / disable / is_enabled
+  - REGISTRY (TimerRegistry global: snapshot, reset, capture, merge)
+"""
+
+from .timers import REGISTRY, TimerRegistry, disable, enable, is_enabled, timer
+
+__all__ = ["REGISTRY", "TimerRegistry", "disable", "enable", "is_enabled", "timer"]
@@ -0,0 +1,172 @@
+# metrics/timers.py
+# -*- coding: utf-8 -*-
+"""
+Cronómetros por etapa del pipeline PDF -> BD.
+
+    from metrics import timer
+    with timer("pdf.extract"):
+        ...
+
+Cada etapa acumula número de llamadas, total y máximo exactos, y una
+muestra de las últimas 'sample_size' duraciones para p50/p95.
+
+Desactivado (por defecto) timer() devuelve un context manager nulo
+compartido: el coste es una comprobación de atributo por etapa. Se activa
+con enable() o con la variable de entorno SALUD_V1_TIMINGS=1 ("json"
+además escribe una línea JSON por fichero importado, ver importer.batch).
+
+capture() recoge también las duraciones del hilo actual en un dict: así los
+procesos trabajadores devuelven sus tiempos junto al resultado de cada PDF
+y el proceso principal los agrega con merge().
+"""
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from typing import Any, Deque, Dict, Iterator, List, Mapping, Optional
+
+DEFAULT_SAMPLE_SIZE = 2048
+ENV_VAR = "SALUD_V1_TIMINGS"
+
+_NULL = nullcontext()
+
+
+class StageStats:
+    __slots__ = ("count", "total", "max", "samples")
+
+    def __init__(self, sample_size: int) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples: Deque[float] = deque(maxlen=sample_size)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.samples.append(seconds)
+
+    def summary(self) -> Dict[str, Any]:
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "total_s": self.total,
+            "mean_s": self.total / self.count if self.count else 0.0,
+            "p50_s": _percentile(ordered, 0.50),
+            "p95_s": _percentile(ordered, 0.95),
+            "max_s": self.max,
+        }
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    # Rango más cercano: siempre un valor observado
+    idx = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+    return ordered[idx]
+
+
+class _Timer:
+    __slots__ = ("registry", "name", "t0")
+
+    def __init__(self, registry: "TimerRegistry", name: str) -> None:
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self) -> "_Timer":
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.registry.record(self.name, time.perf_counter() - self.t0)
+
+
+class TimerRegistry:
+    def __init__(self, enabled: bool = False, sample_size: int = DEFAULT_SAMPLE_SIZE) -> None:
+        self.enabled = enabled
+        self.json_log = False
+        self.sample_size = sample_size
+        self._stats: Dict[str, StageStats] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    # --------------------
+    #   MEDICIÓN
+    # --------------------
+    def timer(self, name: str):
+        if not self.enabled:
+            return _NULL
+        return _Timer(self, name)
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = StageStats(self.sample_size)
+            stats.add(seconds)
+        captured = getattr(self._local, "captured", None)
+        if captured is not None:
+            captured[name] = captured.get(name, 0.0) + seconds
+
+    @contextmanager
+    def capture(self) -> Iterator[Dict[str, float]]:
+        """Duraciones por etapa medidas en este hilo dentro del bloque."""
+        previous = getattr(self._local, "captured", None)
+        captured: Dict[str, float] = {}
+        self._local.captured = captured
+        try:
+            yield captured
+        finally:
+            self._local.captured = previous
+
+    def merge(self, stages: Mapping[str, float]) -> None:
+        """Agrega tiempos medidos en otro proceso (ver capture)."""
+        for name, seconds in stages.items():
+            self.record(name, seconds)
+
+    # --------------------
+    #   CONSULTA
+    # --------------------
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: s.summary() for name, s in sorted(self._stats.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+REGISTRY = TimerRegistry()
+
+# Método ligado: una llamada menos por etapa cuando está desactivado
+timer = REGISTRY.timer
+
+
+def enable(json_log: bool = False) -> None:
+    REGISTRY.enabled = True
+    REGISTRY.json_log = json_log
+
+
+def disable() -> None:
+    REGISTRY.enabled = False
+    REGISTRY.json_log = False
+
+
+def is_enabled() -> bool:
+    return REGISTRY.enabled
+
+
+def configure_from_env(value: Optional[str] = None) -> None:
+    value = (os.getenv(ENV_VAR, "") if value is None else value).strip().lower()
+    if value in ("1", "true", "on", "yes"):
+        enable()
+    elif value == "json":
+        enable(json_log=True)
+
+
+configure_from_env()
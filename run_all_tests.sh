@@ -21,6 +21,8 @@ $PYTHON -m pytest tests \
   --cov=ranges \
   --cov=ranges_config \
   --cov=charts \
+  --cov=importer \
+  --cov=metrics \
   --cov-report=term-missing \
   --cov-fail-under=80
 
@@ -11,29 +11,58 @@ Escáner de parámetros de laboratorio en PDFs HURH.
     - unidades observadas
     - rangos (mín, máx) observados
 
+Incremental: junto al JSON de salida se guarda un índice SQLite
+('<salida>.index.db') con, por fichero, (tamaño, mtime, SHA-256) y, por
+hash, las líneas de parámetros extraídas. En cada ejecución:
+  - los ficheros con (tamaño, mtime) sin cambios no se vuelven a abrir;
+  - los nuevos o modificados se leen en un pool de procesos; si su hash ya
+    estaba en el índice (copia o 'touch') no se vuelve a extraer el texto;
+  - solo las líneas de hashes aún no volcados se fusionan en el JSON
+    existente. Si el JSON no existe, se reconstruye desde el índice.
+
+Las líneas de cada hash se guardan con la versión del extractor (código
+de los módulos de lab_pdf que dan las líneas, SCAN_MODULES, + SCAN_FORMAT):
+al cambiar esos módulos o este extractor, las entradas de otra versión se borran, sus PDFs se vuelven a
+leer y el JSON se reconstruye (también con --full). Los PDFs cuya
+extracción falla no se guardan en el índice y se reintentan en la
+siguiente ejecución.
+
 Uso:
-    python3.14 scan_lab_params.py ruta_directorio_pdfs salida.json
+    python3.14 scan_lab_params.py ruta_directorio_pdfs salida.json [--workers N] [--full]
 
 Ejemplo:
     python3.14 scan_lab_params.py ./pdfs_analisis parametros_laboratorio.json
 """
 
-import sys
-import os
-import re
+import argparse
 import json
-from typing import Dict, Any, Tuple, Optional, List
+import os
+import sqlite3
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from lab_pdf.line_parser import parse_numeric_line
+from lab_pdf.parse_cache import file_digest, modules_version
+from lab_pdf.pdf_utils import extract_text_from_pdf
+
+# (línea original, nombre, valor, unidad, ref_min, ref_max)
+ParamLine = Tuple[str, str, float, str, float, float]
 
-from PyPDF2 import PdfReader
+MAX_EXAMPLES = 5
 
+# Subir al cambiar extract_param_lines o el formato de ParamLine
+SCAN_FORMAT = 1
 
-def extract_text_from_pdf(path: str) -> str:
-    reader = PdfReader(path)
-    chunks = []
-    for page in reader.pages:
-        txt = page.extract_text() or ""
-        chunks.append(txt)
-    return "\n".join(chunks)
+# Módulos de lab_pdf de los que salen las líneas: texto del PDF y
+# parse_numeric_line (con su índice de alias). Los cambios en el resto de
+# lab_pdf no invalidan el índice.
+SCAN_MODULES = ("pdf_utils", "line_parser", "alias_index")
+
+
+def scan_version() -> str:
+    """Versión de las líneas guardadas en el índice."""
+    return f"{modules_version(*SCAN_MODULES)}-{SCAN_FORMAT}"
 
 
 def normalize_name(name: str) -> str:
@@ -48,112 +77,183 @@ def normalize_name(name: str) -> str:
     return name.upper()
 
 
-def parse_numeric_line(line: str) -> Optional[Tuple[str, float, str, float, float]]:
+def extract_param_lines(text: str) -> List[ParamLine]:
+    """
+    Líneas 'Nombre [*] valor unidad ref_min - ref_max' del texto. El criterio
+    es el de lab_pdf.line_parser, el mismo que alimenta la tabla 'observation'.
     """
-    Intenta parsear una línea de resultado numérico con rango de referencia.
+    lines: List[ParamLine] = []
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        parsed = parse_numeric_line(line)
+        if parsed:
+            lines.append((raw_line,) + parsed)
+    return lines
 
-    Ejemplos que queremos captar:
 
-        Glucosa             92 mg/dL        70 - 110
-        Cloruro            102 mmol/L       98 - 107
-        Hemoglobina        14,1 g/dL     13,5 - 17,5
+# ============================================================
+#   TRABAJADORES (pool de procesos)
+# ============================================================
 
-    Devuelve:
-        (nombre, valor, unidad, ref_min, ref_max)
-    o None si no encaja.
-    """
-    # Permitimos letras, acentos, %, paréntesis, etc. en el nombre
-    pattern = (
-        r"""^
-        (?P<name>[A-Za-zÁÉÍÓÚÜáéíóúÑñçÇ0-9 %()\/\.\-]+?)   # nombre
-        \s+\**                                             # espacios y posibles asteriscos
-        (?P<value>[0-9]+(?:[.,][0-9]+)?)                   # valor
-        \s+
-        (?P<unit>[\w\/%\.\u00B5µ·]+)                       # unidad (mg/dL, mmol/L, %, µmol/L, etc.)
-        \s+
-        (?P<ref_min>[0-9]+(?:[.,][0-9]+)?)                 # rango mínimo
-        \s*[-–]\s*                                         # guion (puede ser - o –)
-        (?P<ref_max>[0-9]+(?:[.,][0-9]+)?)                 # rango máximo
-        """
-    )
+# Hashes ya extraídos, copiados a cada proceso al arrancarlo
+_worker_known: FrozenSet[str] = frozenset()
 
-    m = re.match(pattern, line, flags=re.VERBOSE)
-    if not m:
-        return None
 
-    name = m.group("name").strip()
-    value = float(m.group("value").replace(",", "."))
-    unit = m.group("unit").strip()
-    ref_min = float(m.group("ref_min").replace(",", "."))
-    ref_max = float(m.group("ref_max").replace(",", "."))
+def _init_worker(known: FrozenSet[str]) -> None:
+    global _worker_known
+    _worker_known = known
 
-    return name, value, unit, ref_min, ref_max
 
-
-def scan_directory(dir_path: str) -> Dict[str, Any]:
+def _scan_file(path: str) -> Tuple[str, Optional[str], Optional[List[ParamLine]], Optional[str]]:
     """
-    Recorre todos los PDFs de dir_path, extrae parámetros y construye
-    un diccionario agregado.
+    (ruta, hash, líneas, error). líneas=None si el hash ya estaba en el
+    índice (no hace falta extraer). Nunca lanza excepción.
+    """
+    try:
+        digest = file_digest(path)
+    except OSError as e:
+        return path, None, None, str(e)
+    if digest in _worker_known:
+        return path, digest, None, None
+    try:
+        return path, digest, extract_param_lines(extract_text_from_pdf(path)), None
+    except Exception as e:
+        return path, digest, [], str(e)
+
+
+# ============================================================
+#   ÍNDICE PERSISTENTE
+# ============================================================
+
+class ScanIndex:
+    """
+    files:   ruta -> (size, mtime_ns, digest)
+    digests: hash -> líneas extraídas (JSON) y versión del parser que las
+             extrajo; solo extracciones correctas
+    merged:  hashes cuyas líneas ya están en el JSON de salida
+
+    Al abrirlo se borran los hashes de otra versión; si había alguno, se
+    vacía también 'merged' para que el JSON se reconstruya entero (sus
+    entradas pueden venir de líneas obsoletas).
     """
-    params: Dict[str, Dict[str, Any]] = {}
-
-    pdf_files: List[str] = [
-        os.path.join(dir_path, f)
-        for f in os.listdir(dir_path)
-        if f.lower().endswith(".pdf")
-    ]
-
-    pdf_files.sort()
-
-    if not pdf_files:
-        print(f"[AVISO] No se han encontrado PDFs en {dir_path}")
-        return params
-
-    for pdf_path in pdf_files:
-        print(f"[INFO] Procesando: {os.path.basename(pdf_path)}")
-        try:
-            text = extract_text_from_pdf(pdf_path)
-        except Exception as e:
-            print(f"  [ERROR] No se pudo leer el PDF: {e}")
-            continue
-
-        for raw_line in text.splitlines():
-            line = raw_line.strip()
-            if not line:
-                continue
-
-            parsed = parse_numeric_line(line)
-            if not parsed:
-                continue
 
-            name_orig, value, unit, ref_min, ref_max = parsed
-            key = normalize_name(name_orig)
-
-            if key not in params:
-                params[key] = {
-                    "normalized_key": key,
-                    "original_names": set(),
-                    "units": set(),
-                    "ranges": set(),   # se guardan como tuplas (min, max)
-                    "examples": []
-                }
-
-            entry = params[key]
-            entry["original_names"].add(name_orig.strip())
-            entry["units"].add(unit)
-            entry["ranges"].add((ref_min, ref_max))
-
-            # Guardamos unos pocos ejemplos de líneas para contexto
-            if len(entry["examples"]) < 5:
-                entry["examples"].append({
-                    "line": raw_line,
-                    "value": value,
-                    "ref_min": ref_min,
-                    "ref_max": ref_max,
-                    "unit": unit,
-                })
-
-    # Convertir sets a listas ordenadas para serializar a JSON
+    def __init__(self, path: str, version: Optional[str] = None):
+        self.path = path
+        self.version = version or scan_version()
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                digest TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS digests (
+                digest TEXT PRIMARY KEY,
+                lines TEXT NOT NULL,
+                error TEXT
+            );
+            CREATE TABLE IF NOT EXISTS merged (
+                digest TEXT PRIMARY KEY
+            );
+            """
+        )
+        columns = {r[1] for r in self.conn.execute("PRAGMA table_info(digests)")}
+        if "version" not in columns:
+            # Índices anteriores: sin versión, todo se considera obsoleto
+            self.conn.execute("ALTER TABLE digests ADD COLUMN version TEXT")
+        stale = self.conn.execute(
+            "DELETE FROM digests WHERE version IS NOT ? OR error IS NOT NULL", (self.version,)
+        ).rowcount
+        if stale:
+            self.reset_merged()
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def files(self) -> Dict[str, Tuple[int, int, str]]:
+        rows = self.conn.execute("SELECT path, size, mtime_ns, digest FROM files").fetchall()
+        return {r[0]: (r[1], r[2], r[3]) for r in rows}
+
+    def known_digests(self) -> FrozenSet[str]:
+        return frozenset(r[0] for r in self.conn.execute("SELECT digest FROM digests"))
+
+    def save_files(self, rows: Iterable[Tuple[str, int, int, str]]) -> None:
+        self.conn.executemany(
+            "INSERT INTO files(path,size,mtime_ns,digest) VALUES(?,?,?,?) "
+            "ON CONFLICT(path) DO UPDATE SET size=excluded.size, "
+            "mtime_ns=excluded.mtime_ns, digest=excluded.digest",
+            rows,
+        )
+
+    def save_digests(self, rows: Iterable[Tuple[str, List[ParamLine]]]) -> None:
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO digests(digest,lines,error,version) VALUES(?,?,NULL,?)",
+            [(d, json.dumps(lines, ensure_ascii=False), self.version) for d, lines in rows],
+        )
+
+    def forget_files(self, paths: Iterable[str]) -> None:
+        self.conn.executemany("DELETE FROM files WHERE path=?", [(p,) for p in paths])
+
+    def lines_for(self, digest: str) -> List[ParamLine]:
+        row = self.conn.execute("SELECT lines FROM digests WHERE digest=?", (digest,)).fetchone()
+        return [tuple(x) for x in json.loads(row[0])] if row else []
+
+    def merged(self) -> FrozenSet[str]:
+        return frozenset(r[0] for r in self.conn.execute("SELECT digest FROM merged"))
+
+    def mark_merged(self, digests: Iterable[str]) -> None:
+        self.conn.executemany("INSERT OR IGNORE INTO merged(digest) VALUES(?)", [(d,) for d in digests])
+
+    def reset_merged(self) -> None:
+        self.conn.execute("DELETE FROM merged")
+
+    def commit(self) -> None:
+        self.conn.commit()
+
+
+# ============================================================
+#   AGREGADO
+# ============================================================
+
+def _empty_entry(key: str) -> Dict[str, Any]:
+    return {
+        "normalized_key": key,
+        "original_names": set(),
+        "units": set(),
+        "ranges": set(),   # se guardan como tuplas (min, max)
+        "examples": [],
+    }
+
+
+def merge_lines(params: Dict[str, Dict[str, Any]], lines: Iterable[ParamLine]) -> None:
+    for raw_line, name_orig, value, unit, ref_min, ref_max in lines:
+        key = normalize_name(name_orig)
+        entry = params.get(key)
+        if entry is None:
+            entry = params[key] = _empty_entry(key)
+
+        entry["original_names"].add(name_orig.strip())
+        entry["units"].add(unit)
+        entry["ranges"].add((ref_min, ref_max))
+
+        # Guardamos unos pocos ejemplos de líneas para contexto
+        if len(entry["examples"]) < MAX_EXAMPLES:
+            entry["examples"].append({
+                "line": raw_line,
+                "value": value,
+                "ref_min": ref_min,
+                "ref_max": ref_max,
+                "unit": unit,
+            })
+
+
+def serialize(params: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Convierte sets a listas ordenadas para serializar a JSON."""
     serializable: Dict[str, Any] = {}
     for key, entry in params.items():
         serializable[key] = {
@@ -166,30 +266,176 @@ def scan_directory(dir_path: str) -> Dict[str, Any]:
             ),
             "examples": entry["examples"],
         }
-
     return serializable
 
 
-def main():
-    if len(sys.argv) < 3:
-        print("Uso: python3.14 scan_lab_params.py <directorio_pdfs> <salida.json>")
-        sys.exit(1)
+def deserialize(data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Inverso de serialize: el JSON existente como punto de partida."""
+    params: Dict[str, Dict[str, Any]] = {}
+    for key, entry in data.items():
+        params[key] = {
+            "normalized_key": entry.get("normalized_key", key),
+            "original_names": set(entry.get("original_names", [])),
+            "units": set(entry.get("units", [])),
+            "ranges": {(r["min"], r["max"]) for r in entry.get("ranges", [])},
+            "examples": list(entry.get("examples", [])),
+        }
+    return params
 
-    dir_path = sys.argv[1]
-    out_path = sys.argv[2]
 
-    if not os.path.isdir(dir_path):
-        print(f"[ERROR] '{dir_path}' no es un directorio válido.")
-        sys.exit(1)
+# ============================================================
+#   ESCANEO
+# ============================================================
+
+def _list_pdfs(dir_path: str) -> Dict[str, Tuple[int, int]]:
+    found: Dict[str, Tuple[int, int]] = {}
+    with os.scandir(dir_path) as it:
+        for e in it:
+            if e.name.lower().endswith(".pdf") and e.is_file():
+                st = e.stat()
+                found[e.path] = (st.st_size, st.st_mtime_ns)
+    return found
 
-    params = scan_directory(dir_path)
 
-    with open(out_path, "w", encoding="utf-8") as f:
+def _refresh_index(index: ScanIndex, dir_path: str, workers: Optional[int]) -> List[Tuple[str, str]]:
+    """
+    Pone el índice al día con el contenido del directorio y devuelve
+    (ruta, hash) de los PDFs presentes, ordenados por ruta.
+    """
+    on_disk = _list_pdfs(dir_path)
+    indexed = index.files()
+    known = index.known_digests()
+
+    # También los que no cambiaron pero cuyo hash no tiene líneas válidas
+    # (extracción fallida o de otra versión del parser)
+    todo = sorted(p for p, st in on_disk.items()
+                  if p not in indexed or indexed[p][:2] != st or indexed[p][2] not in known)
+    current = {p: indexed[p][2] for p in on_disk if p not in todo}
+
+    if todo:
+        n_workers = min(workers or os.cpu_count() or 1, len(todo))
+        if n_workers <= 1:
+            _init_worker(known)
+            results = [_scan_file(p) for p in todo]
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                     initargs=(known,)) as ex:
+                results = list(ex.map(_scan_file, todo, chunksize=16))
+
+        file_rows, digest_rows = [], []
+        for path, digest, lines, error in results:
+            if digest is None:
+                print(f"  [ERROR] No se pudo leer {os.path.basename(path)}: {error}")
+                continue
+            if error is not None:
+                # No se guardan sus líneas: se reintenta en la próxima ejecución
+                print(f"  [ERROR] No se pudo leer el PDF {os.path.basename(path)}: {error}")
+            else:
+                print(f"[INFO] Procesado: {os.path.basename(path)}")
+            size, mtime_ns = on_disk[path]
+            file_rows.append((path, size, mtime_ns, digest))
+            if lines is not None and error is None:
+                digest_rows.append((digest, lines))
+            current[path] = digest
+        index.save_digests(digest_rows)
+        index.save_files(file_rows)
+
+    index.forget_files([p for p in indexed if p not in on_disk])
+    index.commit()
+    return sorted(current.items())
+
+
+def write_json(out_path: str, params: Dict[str, Any]) -> None:
+    tmp = out_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
         json.dump(params, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, out_path)
+
+
+def default_index_path(out_path: str) -> str:
+    return out_path + ".index.db"
+
+
+def scan_directory(
+    dir_path: str,
+    out_path: Optional[str] = None,
+    *,
+    index_path: Optional[str] = None,
+    workers: Optional[int] = None,
+    full: bool = False,
+) -> Dict[str, Any]:
+    """
+    Recorre todos los PDFs de dir_path, extrae parámetros y construye
+    un diccionario agregado.
+
+    Con 'out_path' es incremental: parte del JSON existente, le añade lo de
+    los PDFs que aún no se habían volcado y lo reescribe. 'full' reconstruye
+    el agregado desde el índice (sin releer PDFs).
+    """
+    if out_path is None and index_path is None:
+        index_path = ":memory:"  # sin persistencia: todo desde cero
+    index = ScanIndex(index_path or default_index_path(out_path))
+    try:
+        files = _refresh_index(index, dir_path, workers)
+        if not files:
+            print(f"[AVISO] No se han encontrado PDFs en {dir_path}")
+
+        params: Dict[str, Dict[str, Any]] = {}
+        merged = index.merged()
+        if not full and merged and out_path and os.path.exists(out_path):
+            with open(out_path, "r", encoding="utf-8") as f:
+                params = deserialize(json.load(f))
+        else:
+            index.reset_merged()
+            merged = frozenset()
+
+        # Los hashes sin líneas (extracción fallida) no se marcan como
+        # volcados: entran en cuanto se extraigan bien
+        known = index.known_digests()
+        pending: List[str] = []
+        seen = set(merged)
+        for _path, digest in files:
+            if digest in known and digest not in seen:
+                seen.add(digest)
+                pending.append(digest)
+        for digest in pending:
+            merge_lines(params, index.lines_for(digest))
+        result = serialize(params)
+        print(f"[INFO] PDFs: {len(files)}  nuevos en el agregado: {len(pending)}")
+
+        if out_path:
+            write_json(out_path, result)
+            # Solo cuando el JSON ya está en disco: si algo falla antes, la
+            # siguiente ejecución vuelve a fusionar esos hashes
+            index.mark_merged(pending)
+            index.commit()
+        return result
+    finally:
+        index.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(
+        prog="scan_lab_params.py",
+        description="Escanea PDFs HURH y agrega los parámetros con rango de referencia.",
+    )
+    ap.add_argument("dir_path", help="Directorio con los PDFs")
+    ap.add_argument("out_path", help="JSON de salida (p.ej. parametros_laboratorio.json)")
+    ap.add_argument("--workers", type=int, default=None, help="Procesos de lectura (por defecto, uno por CPU)")
+    ap.add_argument("--index", default=None, help="Índice incremental (por defecto, <salida>.index.db)")
+    ap.add_argument("--full", action="store_true", help="Reconstruir el JSON desde el índice")
+    args = ap.parse_args(argv)
+
+    if not os.path.isdir(args.dir_path):
+        print(f"[ERROR] '{args.dir_path}' no es un directorio válido.")
+        sys.exit(1)
+
+    params = scan_directory(args.dir_path, args.out_path, index_path=args.index,
+                            workers=args.workers, full=args.full)
 
     print(f"\n[OK] Parámetros encontrados: {len(params)}")
-    print(f"[OK] Fichero JSON generado: {out_path}")
+    print(f"[OK] Fichero JSON generado: {args.out_path}")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
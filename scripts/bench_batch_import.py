@@ -0,0 +1,88 @@
+# scripts/bench_batch_import.py
+"""
+Benchmark de throughput del importador masivo (importer.import_pdfs).
+
+Replica los informes válidos de tests/data hasta tener N PDFs (o usa un
+directorio propio) e importa el lote en una BD temporal, primero en serie
+(workers=1), luego con el pool de procesos y por último dos pasadas con la
+caché de parseo (fría y caliente).
+
+Uso:
+    python scripts/bench_batch_import.py [--n 400] [--workers 8] [--dir PDFS]
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from db import AnalysisDB  # noqa: E402
+from importer import collect_pdf_paths, default_workers, import_pdfs  # noqa: E402
+from lab_pdf.parse_cache import ParseCache  # noqa: E402
+
+SAMPLES = [
+    ROOT / "tests" / "data" / "hemocultivos_20251113.pdf",
+    ROOT / "tests" / "data" / "sample_lab_report_2025_06_24.pdf",
+]
+
+
+def _build_corpus(dest: Path, n: int) -> list:
+    paths = []
+    for i in range(n):
+        src = SAMPLES[i % len(SAMPLES)]
+        p = dest / f"{i:05d}_{src.name}"
+        shutil.copy(src, p)
+        paths.append(p)
+    return paths
+
+
+def _run(paths, workers: int, tmp: Path, tag: str, cache=None) -> None:
+    db = AnalysisDB(str(tmp / f"bench_{tag}.db"))
+    db.open()
+    try:
+        res = import_pdfs(db, paths, workers=workers, cache=cache)
+    finally:
+        db.close()
+    print(
+        f"{tag:>10}: workers={workers:<3} pdfs={res.processed:<6} ok={res.ok:<6} "
+        f"errores={len(res.errors):<4} caché={res.cached:<6} tiempo={res.elapsed:7.2f}s  "
+        f"throughput={res.files_per_second:8.1f} PDF/s"
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=400, help="Nº de PDFs sintéticos (si no se da --dir)")
+    ap.add_argument("--workers", type=int, default=default_workers())
+    ap.add_argument("--dir", help="Directorio con PDFs reales")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as td:
+        tmp = Path(td)
+        if args.dir:
+            paths = collect_pdf_paths(args.dir)
+        else:
+            corpus = tmp / "corpus"
+            corpus.mkdir()
+            paths = _build_corpus(corpus, args.n)
+
+        _run(paths, 1, tmp, "serie")
+        _run(paths, args.workers, tmp, "pool")
+
+        cache = ParseCache(tmp / "parse_cache.db")
+        try:
+            _run(paths, args.workers, tmp, "caché-fría", cache)
+            _run(paths, args.workers, tmp, "caché-cal.", cache)
+        finally:
+            cache.close()
+
+
+if __name__ == "__main__":
+    main()
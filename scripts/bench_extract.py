@@ -0,0 +1,112 @@
+# scripts/bench_extract.py
+"""
+Benchmark de la extracción por etapas (lab_pdf.page_filter) frente a la
+extracción completa de todas las páginas.
+
+Construye con pypdf un corpus mixto a partir de tests/data:
+  - informes de laboratorio tal cual (1-2 páginas),
+  - informes de laboratorio con anexos no analíticos al final,
+  - informes no analíticos de varias páginas (microbiología / alta),
+y parsea cada PDF con parse_hematology_pdf usando ambas extracciones.
+Comprueba que el resultado (registros analíticos o rechazo) es el mismo.
+Los datos de paciente no se comparan: los anexos se construyen con páginas
+de otro informe, cuya cabecera rellenaba campos del paciente al extraerlo
+todo.
+
+Uso:
+    python scripts/bench_extract.py [--repeat 5] [--annex-pages 6]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pypdf import PdfReader, PdfWriter
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from lab_pdf import pdf_to_json  # noqa: E402
+from lab_pdf.page_filter import extract_lab_text  # noqa: E402
+from lab_pdf.pdf_utils import extract_text_from_pdf  # noqa: E402
+
+DATA = ROOT / "tests" / "data"
+LAB = [DATA / "sample_lab_report_2025_06_24.pdf", DATA / "hemocultivos_20251113.pdf"]
+NO_LAB = [DATA / "hemocultivos_20251108_hemocultivos.pdf", DATA / "hemocultivos_20251111.pdf"]
+
+
+def _write(dest: Path, sources) -> Path:
+    writer = PdfWriter()
+    for src, pages in sources:
+        reader = PdfReader(str(src))
+        for i in pages if pages is not None else range(len(reader.pages)):
+            writer.add_page(reader.pages[i])
+    with open(dest, "wb") as f:
+        writer.write(f)
+    return dest
+
+
+def _build_corpus(tmp: Path, annex_pages: int) -> list:
+    annex = (NO_LAB[0], [0])
+    corpus = []
+    for i, src in enumerate(LAB):
+        corpus.append(_write(tmp / f"lab_{i}.pdf", [(src, None)]))
+        corpus.append(_write(tmp / f"lab_anexo_{i}.pdf", [(src, None)] + [annex] * annex_pages))
+    for i, src in enumerate(NO_LAB):
+        corpus.append(_write(tmp / f"nolab_{i}.pdf", [(src, None)] * (annex_pages + 1)))
+    return corpus
+
+
+def _parse(path: Path, extractor):
+    pdf_to_json.extract_lab_text = extractor
+    try:
+        return ("ok", pdf_to_json.parse_hematology_pdf(str(path)))
+    except ValueError as e:
+        return ("error", str(e))
+
+
+def _records(data: dict) -> dict:
+    return {k: v for k, v in data.items() if k != "paciente"}
+
+
+def _time(corpus, extractor, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for p in corpus:
+            _parse(p, extractor)
+    return (time.perf_counter() - t0) / repeat
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--annex-pages", type=int, default=6)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = _build_corpus(Path(tmp), args.annex_pages)
+        pages = sum(len(PdfReader(str(p)).pages) for p in corpus)
+
+        for p in corpus:
+            full = _parse(p, extract_text_from_pdf)
+            staged = _parse(p, extract_lab_text)
+            if full[0] != staged[0] or (full[0] == "ok" and _records(full[1]) != _records(staged[1])):
+                raise SystemExit(f"Resultado distinto en {p.name}: {full[0]} vs {staged[0]}")
+
+        t_full = _time(corpus, extract_text_from_pdf, args.repeat)
+        t_staged = _time(corpus, extract_lab_text, args.repeat)
+        pdf_to_json.extract_lab_text = extract_lab_text
+
+    print(f"corpus: {len(corpus)} PDFs, {pages} páginas (anexos de {args.annex_pages} páginas)")
+    print(f"  extracción completa : {t_full * 1000:8.1f} ms/corpus")
+    print(f"  extracción por etapas: {t_staged * 1000:8.1f} ms/corpus")
+    print(f"  speedup              : {t_full / t_staged:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
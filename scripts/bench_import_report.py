@@ -0,0 +1,106 @@
+# scripts/bench_import_report.py
+"""
+Benchmark de escritura: commits (≈ fsyncs) y tiempo por estrategia.
+
+Estrategias comparadas sobre N informes sintéticos (derivados de un PDF real):
+  - insert_*        : save_patient + insert_<sección> por separado (un commit cada uno)
+  - import_report   : un informe = una transacción
+  - import_reports  : lotes de --commit-every informes con executemany
+
+Los COMMIT se cuentan con sqlite3.Connection.set_trace_callback; en modo
+journal por defecto cada COMMIT implica al menos un fsync del fichero.
+
+Uso:
+    python scripts/bench_import_report.py [--n 1000] [--commit-every 100]
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from db import AnalysisDB  # noqa: E402
+from lab_pdf import parse_hematology_pdf  # noqa: E402
+
+SAMPLE = ROOT / "tests" / "data" / "sample_lab_report_2025_06_24.pdf"
+SECTIONS = ("hematologia", "bioquimica", "gasometria", "orina")
+
+
+def _reports(n: int):
+    base = parse_hematology_pdf(str(SAMPLE))
+    out = []
+    for i in range(n):
+        r = copy.deepcopy(base)
+        for sec in SECTIONS:
+            for d in r.get(sec, []):
+                d["fecha_analisis"] = f"{2000 + i // 365:04d}-{(i // 28) % 12 + 1:02d}-{i % 28 + 1:02d}"
+                d["numero_peticion"] = f"BENCH{i:07d}"
+        out.append(r)
+    return out
+
+
+def _legacy(db: AnalysisDB, reports) -> None:
+    for r in reports:
+        db.save_patient(r["paciente"])
+        for d in r.get("hematologia", []):
+            db.insert_hematologia(d)
+        for d in r.get("bioquimica", []):
+            db.insert_bioquimica(d)
+        for d in r.get("gasometria", []):
+            db.insert_gasometria(d)
+        for d in r.get("orina", []):
+            db.insert_orina(d)
+
+
+def _single(db: AnalysisDB, reports) -> None:
+    for r in reports:
+        db.import_report(r)
+
+
+def _run(tag: str, fn, reports, tmp: Path) -> None:
+    db = AnalysisDB(str(tmp / f"{tag}.db"))
+    db.open()
+    commits = [0]
+
+    def trace(sql: str) -> None:
+        if sql.strip().upper() == "COMMIT":
+            commits[0] += 1
+
+    db.conn.set_trace_callback(trace)
+    t0 = time.perf_counter()
+    try:
+        fn(db, reports)
+    finally:
+        elapsed = time.perf_counter() - t0
+        db.close()
+    print(
+        f"{tag:>16}: informes={len(reports):<6} commits={commits[0]:<7} "
+        f"tiempo={elapsed:7.3f}s  ({len(reports) / elapsed:9.1f} informes/s)"
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=1000)
+    ap.add_argument("--commit-every", type=int, default=100)
+    args = ap.parse_args()
+
+    reports = _reports(args.n)
+    with tempfile.TemporaryDirectory() as td:
+        tmp = Path(td)
+        _run("insert_*", _legacy, reports, tmp)
+        _run("import_report", _single, reports, tmp)
+        _run("import_reports", lambda db, rs: db.import_reports(rs, commit_every=args.commit_every),
+             reports, tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# scripts/bench_parse.py
+"""
+Microbenchmark de parseo por informe sobre los PDFs de tests/data.
+
+El texto se extrae UNA vez (pypdf queda fuera de la medida) y después se
+mide, por informe, el parseo de secciones (hematología y bioquímica por
+separado) y el parse completo sin extracción.
+
+Uso:
+    python scripts/bench_parse.py [--repeat 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from lab_pdf import pdf_to_json  # noqa: E402
+from lab_pdf.bioquimica_parser import parse_bioquimica_section  # noqa: E402
+from lab_pdf.hematologia_parser import parse_hematologia_section  # noqa: E402
+from lab_pdf.pdf_utils import extract_text_from_pdf  # noqa: E402
+from lab_pdf.section_splitter import split_lab_sections  # noqa: E402
+
+DATA = ROOT / "tests" / "data"
+
+
+def _per_call_us(fn, arg, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn(arg)
+    return (time.perf_counter() - t0) / repeat * 1e6
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=200)
+    args = ap.parse_args()
+
+    texts = {p.name: extract_text_from_pdf(str(p)) for p in sorted(DATA.glob("*.pdf"))}
+
+    def parse_no_io(name: str):
+        # parse_hematology_pdf con el texto ya extraído
+        original = pdf_to_json.extract_lab_text
+        pdf_to_json.extract_lab_text = lambda _p: texts[name]
+        try:
+            return pdf_to_json.parse_hematology_pdf(name)
+        except ValueError:
+            return None
+        finally:
+            pdf_to_json.extract_lab_text = original
+
+    total_hema = total_bio = total_full = 0.0
+    for name, text in texts.items():
+        sections = split_lab_sections(text)
+        hema_text = sections.get("hematologia", text)
+        bio_text = sections.get("bioquimica", text)
+        t_hema = _per_call_us(parse_hematologia_section, hema_text, args.repeat)
+        t_bio = _per_call_us(parse_bioquimica_section, bio_text, args.repeat)
+        t_full = _per_call_us(parse_no_io, name, args.repeat)
+        total_hema += t_hema
+        total_bio += t_bio
+        total_full += t_full
+        print(f"{name:>42}: hemato={t_hema:8.1f}µs  bioq={t_bio:8.1f}µs  informe={t_full:8.1f}µs")
+
+    n = len(texts)
+    print(f"{'media':>42}: hemato={total_hema / n:8.1f}µs  bioq={total_bio / n:8.1f}µs  "
+          f"informe={total_full / n:8.1f}µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+# scripts/bench_pipeline.py
+"""
+Benchmark de throughput del pipeline sobre el corpus sintético de
+scripts/generate_fake_pdfs.py.
+
+Fases (cada una en un proceso nuevo, para que el pico de memoria sea solo
+suyo):
+  - parse:        parse_hematology_pdf de todo el corpus, en serie
+  - import-serie: importación completa en una BD temporal (workers=1)
+  - import-pool:  importación completa con el pool de procesos
+
+De cada fase se guarda PDFs/s, resultado (ok / rechazados), tiempos por
+etapa (metrics: count, p50, p95, max) y pico de memoria (RSS del proceso
+de la fase y de sus trabajadores). Todo se escribe en un JSON junto con el
+commit, para comparar entre versiones con --compare.
+
+Uso:
+    python scripts/bench_pipeline.py [--corpus DIR] [--n 2000] [--workers 8]
+                                     [--phases parse,import-serie,import-pool]
+                                     [--out bench.json] [--compare anterior.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import multiprocessing
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PHASES = ("parse", "import-serie", "import-pool")
+
+
+def _peak_rss_kib() -> Dict[str, Optional[int]]:
+    if resource is None:
+        return {"self": None, "children": None}
+    # ru_maxrss: KiB en Linux, bytes en macOS
+    scale = 1024 if sys.platform == "darwin" else 1
+    return {
+        "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // scale,
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss // scale,
+    }
+
+
+def _run_phase(phase: str, paths: List[str], workers: int) -> Dict[str, Any]:
+    """Se ejecuta en un proceso nuevo (ver main)."""
+    import metrics
+    from db import AnalysisDB
+    from importer import import_pdfs
+    from lab_pdf import parse_hematology_pdf
+
+    # Los señuelos generan un aviso por PDF: no interesan aquí
+    logging.getLogger("importer").setLevel(logging.ERROR)
+    metrics.enable()
+    metrics.REGISTRY.reset()
+    out: Dict[str, Any] = {"pdfs": len(paths)}
+
+    t0 = time.perf_counter()
+    if phase == "parse":
+        ok = rejected = 0
+        for p in paths:
+            try:
+                parse_hematology_pdf(p)
+                ok += 1
+            except ValueError:
+                rejected += 1
+        out.update(ok=ok, rejected=rejected, workers=1)
+    else:
+        n_workers = 1 if phase == "import-serie" else workers
+        with tempfile.TemporaryDirectory() as td:
+            db = AnalysisDB(str(Path(td) / "bench.db"))
+            db.open()
+            try:
+                res = import_pdfs(db, paths, workers=n_workers)
+            finally:
+                db.close()
+        out.update(ok=res.ok, rejected=len(res.errors), workers=n_workers)
+    elapsed = time.perf_counter() - t0
+
+    out["seconds"] = round(elapsed, 4)
+    out["pdfs_per_s"] = round(len(paths) / elapsed, 2) if elapsed > 0 else 0.0
+    out["stages"] = metrics.REGISTRY.snapshot()
+    out["peak_rss_kib"] = _peak_rss_kib()
+    return out
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def _ensure_corpus(corpus: Path, n: int, seed: int) -> List[str]:
+    manifest = corpus / "manifest.json"
+    if not manifest.exists():
+        sys.path.insert(0, str(ROOT / "scripts"))
+        from generate_fake_pdfs import generate_corpus
+
+        print(f"Generando corpus de {n} PDFs en {corpus}...")
+        generate_corpus(corpus, n, seed=seed)
+    files = json.loads(manifest.read_text(encoding="utf-8"))["files"]
+    return [str(corpus / e["file"]) for e in files]
+
+
+def _compare(current: Dict[str, Any], previous: Dict[str, Any]) -> None:
+    print(f"\nComparación con {previous['meta'].get('commit')}:")
+    for phase, cur in current["phases"].items():
+        prev = previous.get("phases", {}).get(phase)
+        if not prev:
+            continue
+        delta = (cur["pdfs_per_s"] / prev["pdfs_per_s"] - 1) * 100 if prev["pdfs_per_s"] else 0.0
+        print(f"  {phase:<13} {prev['pdfs_per_s']:9.1f} -> {cur['pdfs_per_s']:9.1f} PDF/s ({delta:+.1f}%)")
+        for stage, s in cur["stages"].items():
+            ps = prev.get("stages", {}).get(stage)
+            if ps and ps["p50_s"]:
+                d = (s["p50_s"] / ps["p50_s"] - 1) * 100
+                print(f"      {stage:<26} p50 {ps['p50_s'] * 1e3:8.3f} -> {s['p50_s'] * 1e3:8.3f} ms ({d:+.1f}%)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--corpus", help="Corpus existente o donde generarlo (por defecto, temporal)")
+    ap.add_argument("--n", type=int, default=2000, help="Nº de PDFs si hay que generar el corpus")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--phases", default=",".join(PHASES))
+    ap.add_argument("--out", default="bench_pipeline.json")
+    ap.add_argument("--compare", help="JSON de una ejecución anterior")
+    args = ap.parse_args(argv)
+
+    from importer import default_workers
+
+    workers = args.workers or default_workers()
+    phases = [p.strip() for p in args.phases.split(",") if p.strip()]
+    unknown = set(phases) - set(PHASES)
+    if unknown:
+        ap.error(f"Fases desconocidas: {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory() as td:
+        corpus = Path(args.corpus) if args.corpus else Path(td) / "corpus"
+        paths = _ensure_corpus(corpus, args.n, args.seed)
+
+        results: Dict[str, Any] = {
+            "meta": {
+                "commit": _git_commit(),
+                "date": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpus": multiprocessing.cpu_count(),
+                "corpus": str(corpus) if args.corpus else None,
+                "pdfs": len(paths),
+                "seed": args.seed,
+            },
+            "phases": {},
+        }
+        ctx = multiprocessing.get_context("spawn")
+        for phase in phases:
+            # Proceso nuevo por fase: pico de memoria y cachés independientes
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as ex:
+                r = ex.submit(_run_phase, phase, paths, workers).result()
+            results["phases"][phase] = r
+            rss = r["peak_rss_kib"]
+            print(f"{phase:<13} {r['pdfs_per_s']:9.1f} PDF/s  ok={r['ok']:<6} rechazados={r['rejected']:<5} "
+                  f"{r['seconds']:7.2f}s  pico RSS={rss['self']} KiB (trabajadores {rss['children']} KiB)")
+
+    Path(args.out).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"Resultados en {args.out}")
+
+    if args.compare:
+        _compare(results, json.loads(Path(args.compare).read_text(encoding="utf-8")))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+# scripts/bench_series.py
+"""
+Benchmark de lectura de series (DbSeriesProvider.get_series).
+
+Genera un historial sintético de --years años (un análisis cada --every
+días, con hematología y bioquímica) y compara:
+  - list_*   : SELECT tabla.* + dict por fila + strptime (camino antiguo)
+  - series   : AnalysisDB.series (fecha + columna, NULLs filtrados en SQL)
+
+Uso:
+    python scripts/bench_series.py [--years 20] [--every 2] [--repeat 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from charts.series_provider import DbSeriesProvider  # noqa: E402
+from db import AnalysisDB  # noqa: E402
+
+PARAMS = ("leucocitos", "hemoglobina", "glucosa", "ferritina")
+
+
+class _ListOnly:
+    """Envoltorio sin .series(): fuerza el camino antiguo del provider."""
+
+    def __init__(self, db: AnalysisDB):
+        self.is_open = True
+        self.list_hematologia = db.list_hematologia
+        self.list_bioquimica = db.list_bioquimica
+        self.list_gasometria = db.list_gasometria
+        self.list_orina = db.list_orina
+
+
+def _fill(db: AnalysisDB, years: int, every: int) -> int:
+    rnd = random.Random(0)
+    hem = db.hematologia
+    bio = db.bioquimica
+    hem_rows, bio_rows = [], []
+    day = date(2025, 1, 1) - timedelta(days=365 * years)
+    n = 0
+    while day < date(2025, 1, 1):
+        d = {"fecha_analisis": day.isoformat(), "numero_peticion": f"S{n:07d}"}
+        aid = db.analisis.ensure(d, commit=False)
+        hem_rows.append(hem.row({**d, **{f: rnd.uniform(1, 100) for f in hem.FIELDS}}, aid))
+        # ferritina solo en ~1 de cada 5 análisis (muchos NULL)
+        b = {f: rnd.uniform(1, 100) for f in bio.FIELDS if f != "ferritina"}
+        if n % 5 == 0:
+            b["ferritina"] = rnd.uniform(10, 300)
+        bio_rows.append(bio.row({**d, **b}, aid))
+        day += timedelta(days=every)
+        n += 1
+    hem.insert_rows(hem_rows, commit=False)
+    bio.insert_rows(bio_rows, commit=False)
+    db.conn.commit()
+    return n
+
+
+def _time(fn, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--years", type=int, default=20)
+    ap.add_argument("--every", type=int, default=2, help="Días entre análisis")
+    ap.add_argument("--limit", type=int, default=10000)
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as td:
+        db = AnalysisDB(str(Path(td) / "bench_series.db"))
+        db.open()
+        try:
+            n = _fill(db, args.years, args.every)
+            print(f"historial: {n} análisis ({args.years} años)")
+            old = DbSeriesProvider(_ListOnly(db))
+            new = DbSeriesProvider(db)
+            for p in PARAMS:
+                t_old = _time(lambda: old.get_series(p, limit=args.limit), args.repeat)
+                t_new = _time(lambda: new.get_series(p, limit=args.limit), args.repeat)
+                pts = len(new.get_series(p, limit=args.limit))
+                print(
+                    f"{p:>12}: puntos={pts:<6} list_*={t_old * 1000:8.2f}ms  "
+                    f"series={t_new * 1000:8.2f}ms  x{t_old / t_new:5.1f}"
+                )
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# scripts/bench_upload.py
+"""
+Benchmark de memoria de la recepción de subidas A TRAVÉS DEL ENDPOINT HTTP:
+
+- 'File(...)': el endpoint anterior (List[UploadFile] = File(...) y
+  UploadStore.save). starlette parsea el formulario entero antes de llamar
+  al endpoint y deja cada fichero en un SpooledTemporaryFile de hasta 1 MB
+  en memoria.
+- 'stream': api.uploads.receive_uploads, que parsea request.stream() y
+  escribe cada trozo en el UploadStore según llega.
+
+Cada variante corre en un subproceso y la aplicación se llama como ASGI
+con el cuerpo multipart entregado en trozos de 64 KiB (como uvicorn), sin
+tenerlo entero en memoria. Se mide el RSS real: pico (ru_maxrss) menos el
+RSS antes de la petición. El de 'stream' no debe depender ni del tamaño ni
+del número de ficheros.
+
+Uso:
+    python scripts/bench_upload.py [--files 500] [--size-kb 512]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterator, List
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from fastapi import FastAPI, File, Request, UploadFile  # noqa: E402
+
+from api.uploads import UploadStore, receive_uploads  # noqa: E402
+
+BOUNDARY = b"bench-upload-boundary"
+ASGI_CHUNK = 64 * 1024
+
+
+def _app(dest: Path) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/file")
+    async def file_upload(pdf_files: List[UploadFile] = File(...)):
+        store = UploadStore(dest)
+        for uf in pdf_files:
+            await store.save(uf)
+        return {"n": len(pdf_files)}
+
+    @app.post("/stream")
+    async def stream_upload(request: Request):
+        stored, _ = await receive_uploads(request, UploadStore(dest))
+        return {"n": len(stored)}
+
+    return app
+
+
+def _body(files: int, size: int) -> Iterator[bytes]:
+    """Cuerpo multipart generado por trozos (contenido distinto por fichero)."""
+    block = os.urandom(ASGI_CHUNK)
+    for i in range(files):
+        yield (b"--" + BOUNDARY + b"\r\nContent-Disposition: form-data; name=\"pdf_files\"; "
+               b"filename=\"informe_%04d.pdf\"\r\nContent-Type: application/pdf\r\n\r\n" % i)
+        yield i.to_bytes(4, "big")
+        left = size - 4
+        while left > 0:
+            yield block[:min(left, ASGI_CHUNK)]
+            left -= ASGI_CHUNK
+        yield b"\r\n"
+    yield b"--" + BOUNDARY + b"--\r\n"
+
+
+async def _post(app: FastAPI, path: str, files: int, size: int) -> int:
+    chunks = _body(files, size)
+    pending = next(chunks)
+    status = []
+
+    async def receive():
+        nonlocal pending
+        body = pending
+        pending = next(chunks, None)
+        return {"type": "http.request", "body": body, "more_body": pending is not None}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "server": ("bench", 80), "client": ("bench", 1),
+        "headers": [(b"content-type", b"multipart/form-data; boundary=" + BOUNDARY)],
+    }
+    await app(scope, receive, send)
+    return status[0]
+
+
+def _run_variant(path: str, files: int, size: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        app = _app(Path(tmp))
+        base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        t0 = time.perf_counter()
+        status = asyncio.run(_post(app, path, files, size))
+        elapsed = time.perf_counter() - t0
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{status} {peak - base} {elapsed:.3f}")  # ru_maxrss en KiB (Linux)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--files", type=int, default=500)
+    ap.add_argument("--size-kb", type=int, default=512)
+    ap.add_argument("--variant", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    size = args.size_kb * 1024
+    if args.variant:
+        _run_variant(args.variant, args.files, size)
+        return 0
+
+    print(f"{args.files} ficheros de {args.size_kb} KiB por POST multipart")
+    for label, path in (("File(...)", "/file"), ("stream", "/stream")):
+        out = subprocess.run(
+            [sys.executable, __file__, "--variant", path,
+             "--files", str(args.files), "--size-kb", str(args.size_kb)],
+            check=True, capture_output=True, text=True,
+        ).stdout.split()
+        status, rss_kib, elapsed = int(out[0]), int(out[1]), float(out[2])
+        print(f"{label:<10} HTTP {status}   +RSS pico {rss_kib / 1024:8.1f} MiB   {elapsed:6.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,38 @@
 # scripts/generate_fake_pdfs.py
+"""
+PDFs sintéticos con el formato de los informes del HURH.
+
+Sin argumentos regenera los dos ficheros de tests/data que usan los tests.
+Con --corpus genera N informes aleatorios (en paralelo, uno por proceso y
+lote) para los benchmarks: secciones variadas, valores fuera de rango con
+asteriscos, informes de varias páginas y señuelos no analíticos (altas,
+hemocultivos, radiología). Cada informe depende solo de (seed, índice): el
+mismo comando produce siempre el mismo corpus. Se escribe además un
+manifest.json con el tipo y las secciones esperadas de cada PDF.
+
+Uso:
+    python scripts/generate_fake_pdfs.py
+    python scripts/generate_fake_pdfs.py --corpus DIR [--n 2000] [--seed 1]
+                                         [--workers 8] [--decoys 0.15]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
 
+PAGE_BREAK = "%%SALTO%%"  # línea que fuerza un salto de página
+
 
 def write_pdf(path: Path, text: str) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -13,6 +42,10 @@ def write_pdf(path: Path, text: str) -> None:
     y = height - 40
 
     for line in text.splitlines():
+        if line == PAGE_BREAK:
+            c.showPage()
+            y = height - 40
+            continue
         c.drawString(x_margin, y, line)
         y -= 14
         if y < 40:
@@ -106,7 +139,253 @@ Resultado: NO desarrollo bacteriano significativo tras 5 días de incubación.
 Interpretación: Hemocultivos NEGATIVOS.
 """
 
-if __name__ == "__main__":
+
+
+# ============================================================
+#   CORPUS ALEATORIO
+# ============================================================
+
+# (etiqueta, unidad, mín. ref., máx. ref., decimales)
+Param = Tuple[str, str, float, float, int]
+
+HEMATO_PARAMS: Dict[str, List[Param]] = {
+    "SERIE BLANCA": [
+        ("Leucocitos", "x10^3/µL", 4.0, 10.5, 1),
+        ("Neutrófilos %", "%", 41, 72, 1),
+        ("Linfocitos %", "%", 20, 51, 1),
+        ("Monocitos %", "%", 2, 12, 1),
+        ("Eosinófilos %", "%", 0, 8, 1),
+        ("Basófilos %", "%", 0, 1.8, 1),
+        ("Neutrófilos", "x10^3/µL", 1.5, 7.5, 1),
+        ("Linfocitos", "x10^3/µL", 0.9, 5.2, 1),
+        ("Monocitos", "x10^3/µL", 0.2, 1.1, 1),
+        ("Eosinófilos", "x10^3/µL", 0.1, 0.65, 1),
+        ("Basófilos", "x10^3/µL", 0, 0.2, 1),
+    ],
+    "SERIE ROJA": [
+        ("Hematíes", "x10^6/µL", 4.2, 5.8, 2),
+        ("Hemoglobina", "g/dL", 13.5, 17.5, 1),
+        ("Hematocrito", "%", 40, 52, 1),
+        ("V.C.M", "fL", 80, 96, 1),
+        ("H.C.M.", "pg", 27, 33, 1),
+        ("C.H.C.M.", "g/dL", 32, 36, 1),
+        ("R.D.W", "%", 11.5, 14.5, 1),
+    ],
+    "SERIE PLAQUETAR": [
+        ("Plaquetas", "x10^3/µL", 150, 400, 0),
+        ("Volumen Plaquetar Medio", "fL", 7.4, 10.4, 1),
+    ],
+}
+
+BIOQ_PARAMS: List[Param] = [
+    ("Glucosa", "mg/dL", 74, 110, 0),
+    ("Urea", "mg/dL", 12.8, 42.8, 1),
+    ("Creatinina", "mg/dL", 0.7, 1.3, 2),
+    ("Sodio", "mmol/L", 136, 146, 0),
+    ("Potasio", "mmol/L", 3.5, 5.1, 1),
+    ("Cloruro", "mmol/L", 101, 109, 0),
+    ("Calcio", "mg/dL", 8.6, 10.2, 1),
+    ("Fosfato", "mg/dL", 2.4, 4.4, 2),
+    ("Ácido úrico", "mg/dL", 3.5, 7.2, 2),
+    ("Gammaglutamil transferasa (GGT)", "U/L", 1, 73, 0),
+    ("Alanina aminotransferasa (ALT/GPT)", "U/L", 1, 50, 0),
+    ("Aspartato aminotransferasa (AST/GOT)", "U/L", 1, 50, 0),
+    ("Fosfatasa alcalina", "U/L", 40, 129, 0),
+    ("Bilirrubina total", "mg/dL", 0.3, 1.2, 2),
+    ("Colesterol total", "mg/dL", 120, 200, 0),
+    ("Colesterol HDL", "mg/dL", 40, 60, 0),
+    ("Colesterol LDL", "mg/dL", 50, 130, 0),
+    ("Triglicéridos", "mg/dL", 50, 150, 0),
+    ("Hierro", "µg/dL", 59, 158, 0),
+    ("Ferritina", "ng/mL", 30, 400, 1),
+    ("Vitamina B12", "pg/mL", 197, 771, 1),
+    ("Ácido fólico", "ng/mL", 3.9, 26.8, 1),
+]
+
+GASO_PARAMS: List[Param] = [
+    ("pH", "", 7.32, 7.42, 2),
+    ("pCO2", "mmHg", 41, 51, 0),
+    ("pO2", "mmHg", 25, 40, 0),
+    ("CO2 Total (TCO2)", "mmol/L", 27, 33, 1),
+    ("Bicarbonato (CO3H-)", "mmol/L", 22, 26, 1),
+    ("Exceso de Bases (EB)", "mmol/L", -2, 2, 1),
+    ("Lactato", "mmol/L", 0.5, 2.2, 1),
+]
+
+ORINA_TIRAS = ["Glucosa", "Proteínas", "Cuerpos cetónicos", "Sangre", "Nitritos",
+               "Leucocitos esterasas", "Bilirrubina", "Urobilinógeno"]
+ORINA_TOKENS = ["NEGATIVO", "NEGATIVO", "NEGATIVO", "TRAZAS", "+", "++", "NORMAL"]
+
+ORIGENES = ["A. Primaria", "Urgencias", "Hematología", "Hospital de Día", "Medicina Interna"]
+NOMBRES = ["ANA", "LUIS", "MARTA", "JAVIER", "LUCÍA", "PABLO", "CARMEN", "DIEGO"]
+APELLIDOS = ["GARCÍA", "MARTÍN", "LÓPEZ", "SANZ", "PÉREZ", "GÓMEZ", "ALONSO", "DÍEZ"]
+COMENTARIOS = [
+    "Comentario: muestra ligeramente hemolizada.",
+    "Comentario: se recomienda repetir en 48 horas.",
+    "Comentario: valores revisados por el facultativo responsable.",
+    "Nota: resultados validados técnicamente.",
+]
+
+SECTIONS = ("hematologia", "bioquimica", "gasometria", "orina")
+DECOY_KINDS = ("hemocultivos", "alta", "radiologia")
+
+
+def _value(rng: random.Random, lo: float, hi: float, dec: int) -> Tuple[str, str]:
+    """Valor alrededor del rango de referencia: ('*' | '**' | '', valor)."""
+    span = (hi - lo) or 1.0
+    if rng.random() < 0.25:
+        # Fuera de rango: '*' leve, '**' marcado
+        far = rng.random() < 0.3
+        delta = span * (rng.uniform(0.6, 1.5) if far else rng.uniform(0.05, 0.5))
+        v = hi + delta if rng.random() < 0.5 else max(0.0, lo - delta) if lo > 0 else lo - delta
+        star = "**" if far else "*"
+    else:
+        v = rng.uniform(lo, hi)
+        star = ""
+    return star, f"{v:.{dec}f}"
+
+
+def _param_lines(rng: random.Random, params: List[Param], keep: float = 0.85) -> List[str]:
+    lines = []
+    for label, unit, lo, hi, dec in params:
+        if rng.random() > keep:
+            continue
+        star, v = _value(rng, lo, hi, dec)
+        value = f"{star} {v}" if star else v
+        ref = f"{lo:g} - {hi:g}"
+        lines.append(" ".join(x for x in (label, value, unit, ref) if x))
+    return lines
+
+
+def _header(rng: random.Random, peticion: str, fecha: date) -> List[str]:
+    nombre = rng.choice(NOMBRES)
+    apellidos = f"{rng.choice(APELLIDOS)} {rng.choice(APELLIDOS)}"
+    nac = date(rng.randint(1935, 2005), rng.randint(1, 12), rng.randint(1, 28))
+    return [
+        f"Nombre: {nombre}      Nº petición: {peticion}",
+        f"Apellidos: {apellidos}  Doctor: DR PRUEBA",
+        f"Fecha nacimiento: {nac:%d/%m/%Y}  Sexo: {rng.choice('MF')}  "
+        f"Nº Historia: HURH{rng.randint(1, 999999):06d}",
+        f"Recepción: {fecha:%d/%m/%y}  Finalización: {fecha:%d/%m/%y}",
+        f"Origen: {rng.choice(ORIGENES)}",
+    ]
+
+
+def _lab_sections(rng: random.Random) -> List[str]:
+    chosen = [s for s in SECTIONS if rng.random() < (0.9 if s == "hematologia" else 0.45)]
+    return chosen or ["hematologia"]
+
+
+def _section_lines(rng: random.Random, section: str) -> List[str]:
+    if section == "hematologia":
+        lines = ["HEMATOLOGÍA"]
+        with_series = rng.random() < 0.6
+        for serie, params in HEMATO_PARAMS.items():
+            if with_series:
+                lines.append(serie)
+            lines += _param_lines(rng, params)
+        return lines
+    if section == "bioquimica":
+        title = rng.choice(["BIOQUÍMICA", "BIOQUÍMICA EN SANGRE"])
+        return [title, "Prueba Resultado Unidades Valores de referencia"] + _param_lines(rng, BIOQ_PARAMS, 0.7)
+    if section == "gasometria":
+        return ["GASOMETRÍA VENOSA"] + _param_lines(rng, GASO_PARAMS, 0.95)
+    # orina
+    lines = ["ORINA", f"pH {rng.choice([5.0, 5.5, 6.0, 6.5, 7.0])}",
+             f"Densidad {rng.randint(1005, 1030)}"]
+    lines += [f"{t} {rng.choice(ORINA_TOKENS)}" for t in ORINA_TIRAS if rng.random() < 0.8]
+    if rng.random() < 0.5:
+        lines += [f"Creatinina orina {rng.uniform(20, 250):.1f} mg/dL",
+                  f"Albúmina orina {rng.uniform(0, 60):.1f} mg/L"]
+    return lines
+
+
+def _decoy_lines(rng: random.Random, kind: str, pages: int) -> List[str]:
+    if kind == "hemocultivos":
+        body = ["HEMOCULTIVOS",
+                "Muestras: 2 frascos aerobios, 2 frascos anaerobios.",
+                "Resultado: NO desarrollo bacteriano significativo tras 5 días de incubación."]
+    elif kind == "alta":
+        body = ["INFORME DE ALTA", "Motivo de ingreso: fiebre neutropénica.",
+                "Evolución: favorable con antibioterapia empírica."]
+    else:
+        body = ["INFORME RADIOLÓGICO", "Técnica: TC de tórax con contraste.",
+                "Hallazgos: sin alteraciones significativas."]
+    lines = list(body)
+    for _ in range(pages - 1):
+        lines.append(PAGE_BREAK)
+        lines += [rng.choice(COMENTARIOS) for _ in range(rng.randint(10, 40))]
+    return lines
+
+
+def build_report(seed: int, idx: int, decoy_ratio: float = 0.15) -> Tuple[str, Dict[str, object]]:
+    """Texto de un informe aleatorio y su entrada de manifiesto."""
+    rng = random.Random(f"{seed}:{idx}")
+    fecha = date(2020, 1, 1) + timedelta(days=rng.randint(0, 5 * 365))
+    lines = _header(rng, f"{seed % 100:02d}{idx:08d}", fecha)
+
+    if rng.random() < decoy_ratio:
+        kind = rng.choice(DECOY_KINDS)
+        pages = rng.choice([1, 1, 2, 4])
+        lines += _decoy_lines(rng, kind, pages)
+        return "\n".join(lines), {"kind": kind, "sections": [], "pages": pages}
+
+    sections = _lab_sections(rng)
+    pages = 1
+    for i, section in enumerate(sections):
+        if i and rng.random() < 0.3:
+            lines.append(PAGE_BREAK)  # sección en página nueva
+            pages += 1
+        lines += _section_lines(rng, section)
+    if rng.random() < 0.2:
+        # Anexo de comentarios al final (varias páginas que no aportan valores)
+        for _ in range(rng.randint(1, 3)):
+            lines.append(PAGE_BREAK)
+            lines += [rng.choice(COMENTARIOS) for _ in range(rng.randint(5, 30))]
+            pages += 1
+    return "\n".join(lines), {"kind": "lab", "sections": sections, "pages": pages}
+
+
+def _write_chunk(args: Tuple[str, int, List[int], float]) -> List[Dict[str, object]]:
+    out_dir, seed, indices, decoy_ratio = args
+    entries = []
+    for idx in indices:
+        text, entry = build_report(seed, idx, decoy_ratio)
+        name = f"informe_{idx:06d}.pdf"
+        write_pdf(Path(out_dir) / name, text)
+        entries.append({"file": name, **entry})
+    return entries
+
+
+def generate_corpus(
+    out_dir: Path,
+    n: int,
+    *,
+    seed: int = 1,
+    workers: Optional[int] = None,
+    decoy_ratio: float = 0.15,
+    chunk: int = 50,
+) -> List[Dict[str, object]]:
+    """Genera n PDFs en 'out_dir' repartidos entre procesos y escribe manifest.json."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    jobs = [(str(out_dir), seed, list(range(i, min(i + chunk, n))), decoy_ratio)
+            for i in range(0, n, chunk)]
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        chunks = [_write_chunk(j) for j in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            chunks = list(ex.map(_write_chunk, jobs))
+    manifest = [e for c in chunks for e in c]
+    (out_dir / "manifest.json").write_text(
+        json.dumps({"seed": seed, "n": n, "decoy_ratio": decoy_ratio, "files": manifest}, indent=1),
+        encoding="utf-8",
+    )
+    return manifest
+
+
+def _write_fixtures() -> None:
     base_dir = Path(__file__).parents[1] / "tests" / "data"
 
     hemato_pdf = base_dir / "hemocultivos_20251111.pdf"
@@ -117,3 +396,28 @@ if __name__ == "__main__":
 
     print("Generado:", hemato_pdf)
     print("Generado:", hemocultivos_pdf)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Genera PDFs sintéticos de informes del HURH.")
+    ap.add_argument("--corpus", help="Directorio del corpus aleatorio (sin él: ficheros de tests/data)")
+    ap.add_argument("--n", type=int, default=2000)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--decoys", type=float, default=0.15, help="Proporción de informes no analíticos")
+    args = ap.parse_args(argv)
+
+    if not args.corpus:
+        _write_fixtures()
+        return 0
+
+    manifest = generate_corpus(Path(args.corpus), args.n, seed=args.seed,
+                               workers=args.workers, decoy_ratio=args.decoys)
+    labs = sum(1 for e in manifest if e["kind"] == "lab")
+    print(f"Generados {len(manifest)} PDFs en {args.corpus} ({labs} analíticas, "
+          f"{len(manifest) - labs} señuelos)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
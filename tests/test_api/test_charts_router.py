@@ -0,0 +1,187 @@
+# tests/test_api/test_charts_router.py
+# -*- coding: utf-8 -*-
+
+import json
+
+import pytest
+from starlette.requests import Request
+
+from api.routers import charts
+
+
+def _request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+@pytest.fixture
+def db(tmp_path):
+    from db import AnalysisDB
+
+    d = AnalysisDB(str(tmp_path / "charts.db"))
+    d.open()
+    d.insert_hematologia({"fecha_analisis": "2025-01-01", "numero_peticion": "P1", "leucocitos": 5.0})
+    d.insert_bioquimica({"fecha_analisis": "2025-01-02", "numero_peticion": "P2", "glucosa": 90.0})
+    try:
+        yield d
+    finally:
+        d.close()
+
+
+def _call(db, params, if_none_match=None, max_points=None):
+    resp = charts.series_batch(_request(if_none_match), params=params, limit=1000, date_from=None,
+                               date_to=None, max_points=max_points, db=db)
+    return resp.status_code, json.loads(resp.body)
+
+
+def test_series_batch_returns_all_params(db):
+    status, body = _call(db, "leucocitos, glucosa,hemoglobina")
+    assert status == 200
+    series = body["series"]
+    assert list(series) == ["leucocitos", "glucosa", "hemoglobina"]
+    assert series["leucocitos"]["points"] == [{"date": "2025-01-01", "value": 5.0}]
+    assert series["glucosa"]["table"] == "bioquimica"
+    assert series["hemoglobina"]["points"] == []
+
+
+def test_series_batch_rejects_unknown_param(db):
+    status, body = _call(db, "leucocitos,no_existe")
+    assert status == 400
+    assert "no_existe" in body["error"]
+
+
+def test_series_batch_etag_and_304(db):
+    first = charts.series_batch(_request(), params="leucocitos", limit=1000,
+                                date_from=None, date_to=None, max_points=None, db=db)
+    etag = first.headers["etag"]
+
+    again = charts.series_batch(_request(etag), params="leucocitos", limit=1000,
+                                date_from=None, date_to=None, max_points=None, db=db)
+    assert again.status_code == 304
+
+    db.insert_hematologia({"fecha_analisis": "2025-01-03", "numero_peticion": "P3", "leucocitos": 6.0})
+    changed = charts.series_batch(_request(etag), params="leucocitos", limit=1000,
+                                  date_from=None, date_to=None, max_points=None, db=db)
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_series_batch_downsamples_keeping_out_of_range(db):
+    rows = [{"fecha_analisis": f"2024-{m:02d}-{d:02d}", "numero_peticion": f"D{m}{d}",
+             "leucocitos": 7.0 + (d % 3) * 0.1}
+            for m in range(1, 13) for d in range(1, 29)]
+    rows[100]["leucocitos"] = 50.0  # muy por encima del rango por defecto
+    for r in rows:
+        db.insert_hematologia(r)
+
+    status, body = _call(db, "leucocitos", max_points=40)
+    s = body["series"]["leucocitos"]
+    assert status == 200
+    assert s["downsampled"] is True
+    assert len(s["points"]) <= 45
+    assert {"date": rows[100]["fecha_analisis"], "value": 50.0} in s["points"]
+
+    status, body = _call(db, "leucocitos", max_points=5000)
+    assert body["series"]["leucocitos"]["downsampled"] is False
+
+
+@pytest.fixture
+def cached_db(tmp_path):
+    from db import AnalysisDB
+    from db.series_cache import drop_series_cache
+
+    path = str(tmp_path / "cached.db")
+    d = AnalysisDB(path, series_cache=True)
+    d.open()
+    for fecha, num, hb in (("2025-01-01", "P1", 12.0), ("2025-01-03", "P2", 13.0), ("2025-01-05", "P3", 14.0)):
+        d.insert_hematologia({"fecha_analisis": fecha, "numero_peticion": num, "hemoglobina": hb})
+    try:
+        yield d
+    finally:
+        d.close()
+        drop_series_cache(path)
+
+
+@pytest.mark.parametrize("date_from", ["2025/01/03", "garbage", "2025-01-03"])
+def test_series_endpoints_accept_non_iso_bounds_with_cache(cached_db, date_from):
+    # Límites no ISO: mismo resultado que el SQL (comparación de texto), no un 500
+    expected = [{"date": f, "value": v}
+                for f, v in cached_db.series("hemoglobina", date_from=date_from)]
+    assert len(expected) == (2 if date_from == "2025-01-03" else 0)
+
+    resp = charts.series(_request(), param="hemoglobina", limit=1000, date_from=date_from,
+                         date_to=None, max_points=None, db=cached_db)
+    assert resp.status_code == 200
+    assert json.loads(resp.body)["points"] == expected
+
+    resp = charts.series_batch(_request(), params="hemoglobina", limit=1000, date_from=date_from,
+                               date_to="2025-01-05", max_points=None, db=cached_db)
+    assert resp.status_code == 200
+    assert json.loads(resp.body)["series"]["hemoglobina"]["points"] == expected
+
+
+def test_summary_reads_param_summary(db):
+    resp = charts.summary(_request(), db=db)
+    body = json.loads(resp.body)["params"]
+    assert set(body) == {"leucocitos", "glucosa"}
+    leu = body["leucocitos"]
+    assert (leu["count"], leu["last_value"], leu["last_date"], leu["delta"]) == (1, 5.0, "2025-01-01", None)
+
+    # GET solo lee: el recuento con el rango actual no se guarda
+    before = db.param_summary.get("hematologia", "leucocitos")
+    assert (before["range_low"], before["range_high"]) == (None, None)
+    assert db.conn.in_transaction is False
+
+    assert charts.summary(_request(resp.headers["etag"]), db=db).status_code == 304
+
+
+def test_summary_counts_with_current_range_without_writing(db, monkeypatch):
+    from ranges import RangesManager
+
+    db.insert_hematologia({"fecha_analisis": "2025-01-03", "numero_peticion": "P3", "leucocitos": 50.0})
+    rm = RangesManager()
+    rm.update_range("leucocitos", 4.0, 10.0)
+    monkeypatch.setattr(charts, "_RM", rm)
+
+    before = db.param_summary.get("hematologia", "leucocitos")
+    leu = json.loads(charts.summary(_request(), db=db).body)["params"]["leucocitos"]
+    assert leu["out_of_range"] == 1
+    assert db.param_summary.get("hematologia", "leucocitos") == before
+
+    # Con el rango ya guardado se usa el contador incremental
+    db.param_summary.set_range("hematologia", "leucocitos", 4.0, 10.0)
+    leu = json.loads(charts.summary(_request(), db=db).body)["params"]["leucocitos"]
+    assert leu["out_of_range"] == 1
+
+
+def test_ranges_are_stored_on_open_and_after_bulk_update(tmp_path, monkeypatch):
+    from api.db_pool import DbPool
+    from ranges import RangesManager
+
+    pool = DbPool()
+    pool.on_open = charts.store_summary_ranges
+    monkeypatch.setattr(charts, "db_pool", pool)
+    monkeypatch.setattr(charts, "_RM", RangesManager())
+    db_path = str(tmp_path / "pool.db")
+    try:
+        with pool.connection(db_path) as db:
+            db.insert_hematologia({"fecha_analisis": "2025-01-01", "numero_peticion": "P1", "leucocitos": 50.0})
+            row = db.param_summary.get("hematologia", "leucocitos")
+            default = charts._RM.get_all()["leucocitos"]
+            assert (row["range_low"], row["range_high"]) == (default.min_value, default.max_value)
+            assert row["out_of_range"] == 1
+
+        charts.update_ranges_bulk(charts.BulkRangeUpdate(ranges={"leucocitos": {"min": 1.0, "max": 60.0}}))
+
+        with pool.connection(db_path) as db:
+            row = db.param_summary.get("hematologia", "leucocitos")
+            assert (row["range_low"], row["range_high"], row["out_of_range"]) == (1.0, 60.0, 0)
+
+            # Rangos al día: /summary no recuenta nada
+            def no_count(*_a, **_kw):
+                raise AssertionError("recuento innecesario")
+            monkeypatch.setattr(db.param_summary, "count_out_of_range", no_count)
+            body = json.loads(charts.summary(_request(), db=db).body)["params"]
+            assert body["leucocitos"]["out_of_range"] == 0
+    finally:
+        pool.close_all()
@@ -0,0 +1,140 @@
+# tests/test_api/test_db_pool.py
+# -*- coding: utf-8 -*-
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from api.db_pool import DbPool
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "pool.db")
+
+
+def test_connection_is_reused_by_same_thread(db_path):
+    pool = DbPool()
+    with pool.connection(db_path) as db1:
+        assert db1.is_open
+    with pool.connection(db_path) as db2:
+        pass
+
+    assert db1 is db2
+    assert pool.stats() == {"idle": 1, "busy": 0}
+    pool.close_all()
+    assert not db1.is_open
+
+
+def test_schema_created_only_on_first_open(db_path, monkeypatch):
+    from db import AnalysisDB
+
+    calls = []
+    original = AnalysisDB.open
+
+    def spy(self, create_schema=True):
+        calls.append(create_schema)
+        return original(self, create_schema=create_schema)
+
+    monkeypatch.setattr(AnalysisDB, "open", spy)
+    pool = DbPool()
+
+    # Dos conexiones simultáneas -> la segunda se abre sin crear esquema
+    with pool.connection(db_path):
+        with pool.connection(db_path) as inner:
+            assert inner.list_analisis() == []
+
+    assert calls == [True, False]
+    pool.close_all()
+
+
+def test_concurrent_requests_get_distinct_connections(db_path):
+    pool = DbPool()
+    with pool.connection(db_path) as a:
+        with pool.connection(db_path) as b:
+            assert a is not b
+            assert pool.stats()["busy"] == 2
+    assert pool.stats() == {"idle": 2, "busy": 0}
+    pool.close_all()
+
+
+def test_prefers_connection_last_used_by_current_thread(db_path):
+    pool = DbPool()
+    seen = []
+
+    def worker():
+        with pool.connection(db_path) as db:
+            seen.append(db)
+
+    with ThreadPoolExecutor(max_workers=1) as ex:  # siempre el mismo hilo
+        with pool.connection(db_path) as mine:
+            ex.submit(worker).result()
+        # Ociosas: la del worker y (más reciente) la de este hilo
+        ex.submit(worker).result()
+
+    assert seen[0] is not mine
+    assert seen[1] is seen[0]
+    pool.close_all()
+
+
+def test_idle_connections_expire_after_ttl(db_path):
+    clock = FakeClock()
+    pool = DbPool(ttl=10, clock=clock)
+    with pool.connection(db_path) as db1:
+        pass
+
+    clock.now = 11
+    with pool.connection(db_path) as db2:
+        pass
+
+    assert db2 is not db1
+    assert not db1.is_open
+    pool.close_all()
+
+
+def test_lru_bound_closes_least_recently_used(tmp_path):
+    pool = DbPool(max_idle=2)
+    dbs = []
+    for name in ("a.db", "b.db", "c.db"):
+        with pool.connection(str(tmp_path / name)) as db:
+            dbs.append(db)
+
+    assert pool.stats()["idle"] == 2
+    assert not dbs[0].is_open
+    assert dbs[1].is_open and dbs[2].is_open
+    pool.close_all()
+
+
+def test_release_closes_idle_and_in_use_on_checkin(db_path):
+    pool = DbPool()
+    with pool.connection(db_path) as idle:
+        pass
+
+    with pool.connection(db_path) as busy:
+        assert busy is idle
+        pool.release(db_path)
+        assert busy.is_open  # en uso: se cierra al devolverse
+    assert not busy.is_open
+    assert pool.stats() == {"idle": 0, "busy": 0}
+
+
+def test_checkin_rolls_back_open_transaction(db_path):
+    pool = DbPool()
+    with pytest.raises(RuntimeError):
+        with pool.connection(db_path) as db:
+            db.conn.execute(
+                "INSERT INTO analisis (fecha_analisis, numero_peticion) VALUES ('2025-01-01', 'X')"
+            )
+            raise RuntimeError("request fallido")
+
+    with pool.connection(db_path) as db:
+        assert db.list_analisis() == []
+    pool.close_all()
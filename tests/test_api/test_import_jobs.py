@@ -0,0 +1,142 @@
+# tests/test_api/test_import_jobs.py
+# -*- coding: utf-8 -*-
+
+import shutil
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+from api import import_jobs as jobs_mod
+from api.import_jobs import CANCELLED, DONE, ImportJobManager, JobLimitError
+from db import AnalysisDB
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+
+@pytest.fixture(autouse=True)
+def _isolated_data_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("SALUD_V1_DATA_DIR", str(tmp_path / "data_dir"))
+    monkeypatch.setattr(jobs_mod, "get_default_cache", lambda: None)
+
+
+@contextmanager
+def _connect(db_path):
+    db = AnalysisDB(db_path)
+    db.open()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def manager():
+    m = ImportJobManager(_connect, max_running=2, max_per_db=1)
+    yield m
+    m.shutdown()
+
+
+@pytest.fixture
+def pdfs(tmp_path):
+    d = tmp_path / "pdfs"
+    d.mkdir()
+    shutil.copy(DATA_DIR / "hemocultivos_20251113.pdf", d / "a.pdf")
+    shutil.copy(DATA_DIR / "hemocultivos_20251108_hemocultivos.pdf", d / "b.pdf")
+    return [str(d / "a.pdf"), str(d / "b.pdf")]
+
+
+def _blocking_import(started, release):
+    def fake(db, paths, *, on_result=None, cancel=None, **_kw):
+        started.set()
+        release.wait(5)
+        from importer import BatchImportResult
+        return BatchImportResult(cancelled=bool(cancel and cancel.is_set()))
+    return fake
+
+
+def test_job_reports_progress_and_result(manager, pdfs, tmp_path):
+    job = manager.submit(str(tmp_path / "p.db"), pdfs, pre_errors=["x.pdf: subida fallida"])
+    manager.wait(job.job_id, timeout=30)
+
+    snap = job.snapshot()
+    assert snap["state"] == DONE
+    assert (snap["total"], snap["processed"], snap["ok"]) == (2, 2, 1)
+    assert snap["error_count"] == 2
+    assert [f["name"] for f in snap["files"]] == ["a.pdf", "b.pdf"]
+    assert all(f["seconds"] >= 0 for f in snap["files"])
+    assert snap["result"]["ok"] == 1
+    assert snap["result"]["errors"][0] == "x.pdf: subida fallida"
+
+
+def test_reimport_by_default_and_skip_existing_on_request(manager, pdfs, tmp_path):
+    db_path = str(tmp_path / "p.db")
+    for skip_existing, expected in ((False, (1, 0)), (False, (1, 0)), (True, (0, 1))):
+        job = manager.submit(db_path, pdfs[:1], skip_existing=skip_existing)
+        manager.wait(job.job_id, timeout=30)
+        snap = job.snapshot(include_files=False)
+        assert (snap["ok"], snap["skipped"]) == expected
+
+
+def test_one_active_job_per_db(manager, tmp_path, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    monkeypatch.setattr(jobs_mod, "import_pdfs", _blocking_import(started, release))
+
+    db_path = str(tmp_path / "p.db")
+    first = manager.submit(db_path, [])
+    with pytest.raises(JobLimitError):
+        manager.submit(db_path, [])
+    other = manager.submit(str(tmp_path / "otra.db"), [])  # otra BD: permitido
+
+    release.set()
+    manager.wait(first.job_id, timeout=5)
+    manager.wait(other.job_id, timeout=5)
+    assert manager.submit(db_path, []).job_id != first.job_id
+
+
+def test_cancel_running_job(manager, tmp_path, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    monkeypatch.setattr(jobs_mod, "import_pdfs", _blocking_import(started, release))
+
+    job = manager.submit(str(tmp_path / "p.db"), [])
+    assert started.wait(5)
+    manager.cancel(job.job_id)
+    release.set()
+    manager.wait(job.job_id, timeout=5)
+    assert job.state == CANCELLED
+
+
+def test_cancel_queued_job_never_runs(tmp_path, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    monkeypatch.setattr(jobs_mod, "import_pdfs", _blocking_import(started, release))
+    m = ImportJobManager(_connect, max_running=1, max_per_db=1)
+    try:
+        running = m.submit(str(tmp_path / "a.db"), [])
+        assert started.wait(5)
+        queued = m.submit(str(tmp_path / "b.db"), [])
+        m.cancel(queued.job_id)
+        assert queued.state == CANCELLED
+        release.set()
+        m.wait(running.job_id, timeout=5)
+        assert queued.started_at is None
+    finally:
+        m.shutdown()
+
+
+def test_import_pdfs_cancel_stops_between_files(pdfs, tmp_path):
+    from importer import import_pdfs
+
+    cancel = threading.Event()
+    seen = []
+
+    def on_result(path, status, error, seconds):
+        seen.append(path)
+        cancel.set()
+
+    with _connect(str(tmp_path / "c.db")) as db:
+        res = import_pdfs(db, pdfs, workers=1, commit_every=1,
+                          on_result=on_result, cancel=cancel)
+        assert res.cancelled
+        assert seen == pdfs[:1]
+        assert len(db.list_hematologia()) == 1  # lo ya parseado se guarda
@@ -0,0 +1,59 @@
+# tests/test_api/test_rows_router.py
+# -*- coding: utf-8 -*-
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+from starlette.responses import Response
+
+from api.routers import rows
+
+
+def _request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+@pytest.fixture
+def db(tmp_path):
+    from db import AnalysisDB
+
+    d = AnalysisDB(str(tmp_path / "rows.db"))
+    d.open()
+    for i in range(5):
+        d.insert_bioquimica({"fecha_analisis": f"2025-01-0{i + 1}", "numero_peticion": f"P{i}",
+                             "glucosa": 90.0 + i})
+    try:
+        yield d
+    finally:
+        d.close()
+
+
+def _call(db, table="bioquimica", **kwargs):
+    params = dict(limit=2, date_from=None, date_to=None, after_date=None, after_id=None,
+                  before_date=None, before_id=None, order="asc")
+    params.update(kwargs)
+    response = Response()
+    body = rows.rows(_request(), response, table, db=db, **params)
+    return body, response
+
+
+def test_pages_follow_next_cursor(db):
+    got, cursor = [], {}
+    while True:
+        body, response = _call(db, order="desc", **cursor)
+        got += [r["glucosa"] for r in body["rows"]]
+        if body["next"] is None:
+            break
+        cursor = body["next"]
+    assert got == [94.0, 93.0, 92.0, 91.0, 90.0]
+    assert "ETag" in response.headers
+
+
+def test_errors(db):
+    with pytest.raises(HTTPException) as e:
+        _call(db, table="paciente")
+    assert e.value.status_code == 404
+    with pytest.raises(HTTPException) as e:
+        _call(db, after_date="no-es-fecha")
+    assert e.value.status_code == 400
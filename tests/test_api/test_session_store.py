@@ -0,0 +1,25 @@
+# tests/test_api/test_session_store.py
+# -*- coding: utf-8 -*-
+
+from api.session_store import SessionStore
+
+
+def test_close_unknown_session_returns_false():
+    store = SessionStore()
+    assert store.close("nope") is False
+
+
+def test_on_close_called_when_last_session_of_path_closes(tmp_path):
+    closed = []
+    store = SessionStore(on_close=lambda info: closed.append(info.db_path))
+
+    path = str(tmp_path / "p.db")
+    s1 = store.register(path)
+    s2 = store.register(path)
+
+    assert store.close(s1.session_id) is True
+    assert closed == []  # s2 sigue usando el fichero
+
+    assert store.close(s2.session_id) is True
+    assert closed == [s2.db_path]
+    assert store.get(s2.session_id) is None
@@ -0,0 +1,184 @@
+# tests/test_api/test_uploads.py
+# -*- coding: utf-8 -*-
+
+import asyncio
+import hashlib
+import io
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from starlette.requests import Request
+
+from api.uploads import SMALL_UPLOAD_BYTES, UploadFormError, UploadStore, display_name, receive_uploads
+from importer import MemoryPdf, import_pdfs
+from db import AnalysisDB
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+SAMPLE = DATA_DIR / "sample_lab_report_2025_06_24.pdf"
+
+
+def _upload(data: bytes, filename: str) -> UploadFile:
+    return UploadFile(io.BytesIO(data), filename=filename)
+
+
+def _save(store, data, filename):
+    return asyncio.run(store.save(_upload(data, filename)))
+
+
+BOUNDARY = "limite-de-prueba"
+
+
+def _multipart(parts):
+    """Cuerpo multipart/form-data; parts = [(campo, nombre_fichero|None, bytes)]."""
+    body = b""
+    for field, filename, data in parts:
+        disposition = f'form-data; name="{field}"'
+        if filename is not None:
+            disposition += f'; filename="{filename}"'
+        body += (f"--{BOUNDARY}\r\nContent-Disposition: {disposition}\r\n"
+                 "Content-Type: application/pdf\r\n\r\n").encode() + data + b"\r\n"
+    return body + f"--{BOUNDARY}--\r\n".encode()
+
+
+def _streamed_request(body, chunk=5, content_type=f"multipart/form-data; boundary={BOUNDARY}"):
+    """Request cuyo cuerpo llega por trozos de 'chunk' bytes, como desde uvicorn."""
+    chunks = [body[i:i + chunk] for i in range(0, len(body), chunk)] or [b""]
+    messages = [{"type": "http.request", "body": c, "more_body": i < len(chunks) - 1}
+                for i, c in enumerate(chunks)]
+
+    async def receive():
+        return messages.pop(0)
+
+    scope = {"type": "http", "method": "POST", "path": "/imports/upload",
+             "headers": [(b"content-type", content_type.encode())]}
+    return Request(scope, receive)
+
+
+def _receive(store, body, **kwargs):
+    return asyncio.run(receive_uploads(_streamed_request(body, **kwargs), store))
+
+
+def test_upload_is_streamed_to_content_addressed_file(tmp_path):
+    store = UploadStore(tmp_path, chunk_size=7)
+    data = b"%PDF-1.4 " + b"x" * 100
+
+    stored = _save(store, data, "informe.pdf")
+
+    digest = hashlib.sha256(data).hexdigest()
+    assert (stored.name, stored.digest, stored.size) == ("informe.pdf", digest, len(data))
+    assert stored.source == str(tmp_path / f"{digest}.pdf")
+    assert Path(stored.source).read_bytes() == data
+    assert [p.name for p in tmp_path.iterdir()] == [f"{digest}.pdf"]  # sin temporales
+
+
+def test_same_name_does_not_overwrite_and_same_content_is_shared(tmp_path):
+    store = UploadStore(tmp_path)
+    a = _save(store, b"uno", "informe.pdf")
+    b = _save(store, b"dos", "informe.pdf")
+    c = _save(store, b"uno", "otro.pdf")
+
+    assert a.source != b.source
+    assert a.source == c.source
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_client_directories_are_ignored():
+    assert display_name("../../etc/x.pdf") == "x.pdf"
+    assert display_name("C:\\Users\\a\\x.pdf") == "x.pdf"
+    assert display_name(None) == "subida.pdf"
+
+
+def test_small_files_stay_in_memory_within_budget(tmp_path):
+    store = UploadStore(tmp_path, memory_limit=10, memory_budget=15, chunk_size=4)
+
+    small = _save(store, b"12345678", "a.pdf")
+    big = _save(store, b"x" * 11, "b.pdf")  # supera memory_limit: a disco
+    over = _save(store, b"abcdefgh", "c.pdf")  # ya no cabe en el presupuesto
+
+    assert small.in_memory and small.source.data == b"12345678"
+    assert small.source.digest == hashlib.sha256(b"12345678").hexdigest()
+    assert not big.in_memory and Path(big.source).read_bytes() == b"x" * 11
+    assert not over.in_memory
+
+
+def test_memory_pdf_parses_like_the_file(tmp_path):
+    blob = MemoryPdf("memoria.pdf", SAMPLE.read_bytes())
+    names = []
+
+    db = AnalysisDB(str(tmp_path / "m.db"))
+    db.open()
+    try:
+        res = import_pdfs(db, [blob], workers=1,
+                          on_result=lambda path, *_: names.append(path))
+        assert res.ok == 1 and names == ["memoria.pdf"]
+        assert len(db.list_hematologia()) == 1
+    finally:
+        db.close()
+
+
+def test_multipart_stream_is_written_as_it_arrives(tmp_path):
+    store = UploadStore(tmp_path)
+    body = _multipart([("otro", None, b"ignorado"), ("pdf_files", "../a.pdf", b"uno" * 50),
+                       ("pdf_files", "b.pdf", b"dos"), ("pdf_files", "vacio.pdf", b"")])
+
+    stored, errors = _receive(store, body, chunk=3)
+
+    assert errors == []
+    assert [(s.name, s.size) for s in stored] == [("a.pdf", 150), ("b.pdf", 3), ("vacio.pdf", 0)]
+    assert Path(stored[0].source).read_bytes() == b"uno" * 50
+    assert stored[1].digest == hashlib.sha256(b"dos").hexdigest()
+    assert not any(p.name.endswith(".part") for p in tmp_path.iterdir())
+
+
+def test_truncated_multipart_leaves_no_temporaries(tmp_path):
+    store = UploadStore(tmp_path)
+    body = _multipart([("pdf_files", "a.pdf", b"completo"), ("pdf_files", "b.pdf", b"x" * 100)])
+
+    stored, _ = _receive(store, body[:-60])
+
+    assert [s.name for s in stored] == ["a.pdf"]
+    assert [p.name for p in tmp_path.iterdir()] == [Path(stored[0].source).name]
+
+
+def test_non_multipart_body_is_rejected(tmp_path):
+    with pytest.raises(UploadFormError):
+        _receive(UploadStore(tmp_path), b"{}", content_type="application/json")
+
+
+def _upload_endpoint(tmp_path, monkeypatch, body, in_memory=True, skip_existing=False):
+    from api.routers import imports as imports_router
+
+    monkeypatch.setattr(imports_router, "uploads_dir", lambda: tmp_path)
+    submitted = {}
+
+    def fake_submit(db_path, paths, pre_errors=None, names=None, skip_existing=False):
+        submitted.update(paths=paths, names=names, skip_existing=skip_existing)
+        return imports_router.ImportJobCreated(job_id="x", state="queued", total=len(paths))
+
+    monkeypatch.setattr(imports_router, "_submit", fake_submit)
+    monkeypatch.setattr(imports_router, "resolve_db_path", lambda *_: "p.db")
+    asyncio.run(imports_router.import_upload(_streamed_request(body, chunk=64 * 1024), session_id=None,
+                                             in_memory=in_memory, skip_existing=skip_existing))
+    return submitted
+
+
+def test_upload_endpoint_submits_stored_sources(tmp_path, monkeypatch):
+    big = b"x" * (SMALL_UPLOAD_BYTES + 1)
+    body = _multipart([("pdf_files", "a.pdf", big), ("pdf_files", "b.pdf", SAMPLE.read_bytes())])
+
+    submitted = _upload_endpoint(tmp_path, monkeypatch, body)
+
+    disk, memory = submitted["paths"]
+    assert submitted["names"] == {disk: "a.pdf"}
+    assert Path(disk).read_bytes() == big
+    assert isinstance(memory, MemoryPdf) and memory.name == "b.pdf"
+    assert submitted["skip_existing"] is False
+    body = _multipart([("pdf_files", "c.pdf", b"c")])
+    assert _upload_endpoint(tmp_path, monkeypatch, body, skip_existing=True)["skip_existing"] is True
+
+
+def test_upload_endpoint_requires_pdf_files(tmp_path, monkeypatch):
+    with pytest.raises(HTTPException) as exc:
+        _upload_endpoint(tmp_path, monkeypatch, _multipart([("otro", None, b"1")]))
+    assert exc.value.status_code == 422
@@ -0,0 +1,42 @@
+import numpy as np
+
+from charts.downsample import downsample_indices, lttb_indices
+
+
+def test_lttb_keeps_endpoints_and_size():
+    x = np.arange(1000, dtype=float)
+    y = np.sin(x / 50.0)
+    idx = lttb_indices(x, y, 100)
+    assert len(idx) == 100
+    assert idx[0] == 0 and idx[-1] == 999
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_lttb_keeps_spike():
+    x = np.arange(500, dtype=float)
+    y = np.zeros(500)
+    y[247] = 100.0
+    assert 247 in lttb_indices(x, y, 20)
+
+
+def test_lttb_noop_when_small():
+    x = np.arange(10, dtype=float)
+    assert list(lttb_indices(x, x, 50)) == list(range(10))
+
+
+def test_downsample_forces_out_of_range_crossings_and_last():
+    n = 2000
+    x = np.arange(n, dtype=float)
+    y = np.full(n, 5.0)
+    y[::97] = 20.0        # fuera de rango (high=10)
+    y[1500:1503] = 7.5    # cruza el umbral 7 y vuelve
+    idx = set(downsample_indices(x, y, 50, low=1.0, high=10.0, thresholds=[7.0]).tolist())
+
+    assert set(np.flatnonzero(y > 10.0).tolist()) <= idx
+    assert {1499, 1500, 1502, 1503} <= idx
+    assert {n - 2, n - 1} <= idx
+
+
+def test_downsample_noop_without_max_points():
+    y = np.arange(5, dtype=float)
+    assert list(downsample_indices(y, y, None)) == [0, 1, 2, 3, 4]
@@ -1,4 +1,4 @@
-from charts.series_provider import parse_date_yyyy_mm_dd, parse_float, DbSeriesProvider
+from charts.series_provider import parse_date_yyyy_mm_dd, parse_float, DbSeriesProvider, Series
 
 
 class FakeDb:
@@ -41,3 +41,31 @@ def test_provider_returns_sorted_filtered_points():
     assert points[1].value == 2.0
     assert points[0].date.strftime("%Y-%m-%d") == "2025-11-11"
     assert points[1].date.strftime("%Y-%m-%d") == "2025-11-13"
+
+
+def test_provider_fallback_filters_dates():
+    provider = DbSeriesProvider(FakeDb())
+    points = provider.get_series("leucocitos", date_from="2025-11-12")
+    assert [p.value for p in points] == [2.0]
+
+
+def test_series_from_pairs_sorts_and_drops_invalid():
+    s = Series.from_pairs([("2025-01-03", "1,5"), ("2025-01-01", 2), ("bad", 3), ("2025-01-02", None)])
+    assert s.iso_dates() == ["2025-01-01", "2025-01-03"]
+    assert s.values.tolist() == [2.0, 1.5]
+    assert s.to_payload() == [{"date": "2025-01-01", "value": 2.0}, {"date": "2025-01-03", "value": 1.5}]
+
+
+def test_series_indexing_and_window():
+    s = Series.from_pairs([(f"2025-01-0{d}", d) for d in range(1, 6)])
+    assert s[0].date.strftime("%Y-%m-%d") == "2025-01-01" and s[-1].value == 5.0
+    assert s.between("2025-01-02", "2025-01-04").values.tolist() == [2.0, 3.0, 4.0]
+    assert isinstance(s[[0, 4]], Series) and len(s[[0, 4]]) == 2
+    assert len(Series.empty()) == 0 and not Series.empty()
+
+
+def test_downsample_returns_series():
+    s = Series.from_pairs([(f"2025-{m:02d}-{d:02d}", float(d)) for m in range(1, 13) for d in range(1, 29)])
+    reduced, done = DbSeriesProvider.downsample(s, 20)
+    assert done and isinstance(reduced, Series) and len(reduced) < len(s)
+    assert reduced[-1] == s[-1]
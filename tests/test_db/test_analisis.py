@@ -34,3 +34,27 @@ def test_ensure_with_existing_id(components):
     )
     ensured_id = analisis.ensure({"analisis_id": new_id})
     assert ensured_id == new_id
+
+
+def test_keys_and_exists(components):
+    analisis = components["analisis"]
+    analisis.ensure({"fecha_analisis": "2025-01-01", "numero_peticion": "P1"})
+    analisis.create({"fecha_analisis": "2025-01-02"})  # sin nº de petición
+
+    assert analisis.keys() == {("2025-01-01", "P1")}
+    assert analisis.exists("2025-01-01", "P1")
+    assert not analisis.exists("2025-01-02", "P1")
+
+
+def test_fecha_ordinal_filled_on_insert(components):
+    from datetime import date
+
+    analisis = components["analisis"]
+    analisis.ensure({"fecha_analisis": "2025-01-02", "numero_peticion": "P2"})
+    analisis.create({"fecha_analisis": "2025-01-01"})
+    analisis.create({"fecha_analisis": "sin fecha"})
+
+    rows = analisis.list()
+    assert [r["fecha_ordinal"] for r in rows] == [
+        None, date(2025, 1, 1).toordinal(), date(2025, 1, 2).toordinal(),
+    ]
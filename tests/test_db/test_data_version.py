@@ -0,0 +1,54 @@
+# tests/test_db/test_data_version.py
+# -*- coding: utf-8 -*-
+
+from db.data_version import get_data_version
+
+
+def _version(db):
+    return get_data_version(db.conn)[1]
+
+
+def test_new_file_has_epoch_and_zero_version(analysis_db):
+    epoch, version = get_data_version(analysis_db.conn)
+    assert epoch
+    assert version == 0
+
+
+def test_every_component_write_bumps_version(analysis_db):
+    writes = [
+        lambda: analysis_db.insert_hematologia({"fecha_analisis": "2025-01-01", "numero_peticion": "P1", "leucocitos": 5}),
+        lambda: analysis_db.save_patient({"nombre": "Ana"}),
+        lambda: analysis_db.config.config_set("treatment_default_days", "7"),
+        lambda: analysis_db.tratamiento.create_treatment({"name": "T"}),
+        lambda: analysis_db.ingreso.create_hospital_stay({"admission_date": "2025-01-01"}),
+        lambda: analysis_db.limite_parametro.create_param_limit({"param_key": "leucocitos", "value": 1.0}),
+    ]
+    last = _version(analysis_db)
+    for write in writes:
+        write()
+        now = _version(analysis_db)
+        assert now > last
+        last = now
+
+
+def test_reads_and_rollbacks_do_not_bump(analysis_db):
+    before = _version(analysis_db)
+    analysis_db.list_hematologia()
+    analysis_db.series("leucocitos")
+    try:
+        analysis_db.import_report({"hematologia": [{"fecha_analisis": "2025-01-01"}]})
+    except ValueError:
+        pass
+    assert _version(analysis_db) == before
+
+
+def test_epoch_differs_between_files(tmp_path):
+    from db import AnalysisDB
+
+    epochs = set()
+    for name in ("a.db", "b.db"):
+        db = AnalysisDB(str(tmp_path / name))
+        db.open()
+        epochs.add(get_data_version(db.conn)[0])
+        db.close()
+    assert len(epochs) == 2
@@ -0,0 +1,139 @@
+# tests/test_db/test_db_schema.py
+# -*- coding: utf-8 -*-
+
+import sqlite3
+
+import pytest
+
+from db import db_schema, AnalysisDB
+
+
+def _tables(conn):
+    return {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+
+
+def test_migrate_new_file_sets_user_version(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "nuevo.db"))
+    assert db_schema.migrate(conn) == db_schema.SCHEMA_VERSION
+    assert db_schema.get_version(conn) == db_schema.SCHEMA_VERSION
+    assert {"analisis", "hematologia", "param_limit"} <= _tables(conn)
+    conn.close()
+
+
+def test_schema_version_matches_last_migration():
+    versions = [v for v, _ in db_schema.MIGRATIONS]
+    assert versions == sorted(set(versions))
+    assert versions[-1] == db_schema.SCHEMA_VERSION
+
+
+def test_legacy_file_without_user_version_is_upgraded(tmp_path):
+    # Fichero creado con el executescript antiguo: esquema completo, user_version = 0
+    path = str(tmp_path / "antiguo.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(db_schema.SCHEMA_SQL)
+    conn.execute("INSERT INTO analisis (fecha_analisis, numero_peticion) VALUES ('2024-01-01', 'P1')")
+    conn.commit()
+    conn.close()
+
+    db = AnalysisDB(path)
+    db.open()
+    try:
+        assert db_schema.get_version(db.conn) == db_schema.SCHEMA_VERSION
+        assert db.conn.execute("SELECT COUNT(*) FROM analisis").fetchone()[0] == 1
+    finally:
+        db.close()
+
+
+def test_current_file_only_reads_pragma(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "x.db"))
+    db_schema.migrate(conn)
+
+    statements = []
+    conn.set_trace_callback(statements.append)
+    db_schema.migrate(conn)
+    assert statements == ["PRAGMA user_version"]
+    conn.close()
+
+
+def test_failed_step_rolls_back_everything(tmp_path, monkeypatch):
+    conn = sqlite3.connect(str(tmp_path / "x.db"))
+    db_schema.migrate(conn)
+
+    def boom(c):
+        c.execute("CREATE TABLE tmp_migracion (id INTEGER)")
+        raise RuntimeError("fallo")
+
+    new_version = db_schema.SCHEMA_VERSION + 1
+    monkeypatch.setattr(db_schema, "MIGRATIONS",
+                        db_schema.MIGRATIONS + [(new_version, boom)])
+    monkeypatch.setattr(db_schema, "SCHEMA_VERSION", new_version)
+
+    with pytest.raises(RuntimeError):
+        db_schema.migrate(conn)
+    assert db_schema.get_version(conn) == new_version - 1
+    assert "tmp_migracion" not in _tables(conn)
+    conn.close()
+
+
+def test_pending_steps_applied_in_order(tmp_path, monkeypatch):
+    conn = sqlite3.connect(str(tmp_path / "x.db"))
+    db_schema.migrate(conn)
+    base = db_schema.SCHEMA_VERSION
+
+    monkeypatch.setattr(db_schema, "MIGRATIONS", db_schema.MIGRATIONS + [
+        (base + 1, "CREATE TABLE paso_a (id INTEGER);\n-- comentario\nCREATE TABLE paso_b (id INTEGER);"),
+        (base + 2, lambda c: c.execute("INSERT INTO paso_a VALUES (1)")),
+    ])
+    monkeypatch.setattr(db_schema, "SCHEMA_VERSION", base + 2)
+
+    assert db_schema.migrate(conn) == base + 2
+    assert {"paso_a", "paso_b"} <= _tables(conn)
+    assert conn.execute("SELECT COUNT(*) FROM paso_a").fetchone()[0] == 1
+    conn.close()
+
+
+def test_v6_removes_duplicated_section_rows(tmp_path, monkeypatch):
+    # Fichero en v5 con un informe importado dos veces (filas duplicadas)
+    path = str(tmp_path / "v5.db")
+    conn = sqlite3.connect(path)
+    monkeypatch.setattr(db_schema, "MIGRATIONS", [m for m in db_schema.MIGRATIONS if m[0] <= 5])
+    monkeypatch.setattr(db_schema, "SCHEMA_VERSION", 5)
+    db_schema.migrate(conn)
+    conn.execute("INSERT INTO analisis (id, fecha_analisis, numero_peticion) VALUES (1, '2025-01-01', 'P1')")
+    conn.execute("INSERT INTO hematologia (analisis_id, leucocitos) VALUES (1, 5.0)")
+    conn.execute("INSERT INTO hematologia (analisis_id, leucocitos) VALUES (1, 5.0)")
+    conn.commit()
+    conn.close()
+    monkeypatch.undo()
+
+    db = AnalysisDB(path)
+    db.open()
+    try:
+        assert db.conn.execute("SELECT COUNT(*) FROM hematologia").fetchone()[0] == 1
+        db.insert_hematologia({"fecha_analisis": "2025-01-01", "numero_peticion": "P1", "leucocitos": 9.9})
+        assert [r["leucocitos"] for r in db.list_hematologia()] == [5.0]
+    finally:
+        db.close()
+
+
+def test_v9_backfills_fecha_ordinal(tmp_path):
+    from datetime import date
+
+    conn = sqlite3.connect(str(tmp_path / "v8.db"))
+    for version, step in db_schema.MIGRATIONS:
+        if version > 8:
+            break
+        if callable(step):
+            step(conn)
+        else:
+            for stmt in db_schema._split_sql(step):
+                conn.execute(stmt)
+    conn.execute("PRAGMA user_version = 8")
+    conn.execute("INSERT INTO analisis (fecha_analisis, numero_peticion) VALUES ('2024-03-05', 'P1')")
+    conn.commit()
+
+    db_schema.migrate(conn)
+    assert conn.execute("SELECT fecha_ordinal FROM analisis").fetchone()[0] == date(2024, 3, 5).toordinal()
+    indexes = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+    assert "idx_analisis_fecha_ordinal" in indexes and "idx_analisis_fecha" not in indexes
+    conn.close()
@@ -0,0 +1,98 @@
+# tests/test_db/test_informe.py
+# -*- coding: utf-8 -*-
+
+import pytest
+
+
+def _report(fecha="2025-11-24", num="PET-1", leucocitos=5.0):
+    return {
+        "paciente": {"nombre": "Ana", "apellidos": "Prueba", "numero_historia": "HURH1"},
+        "hematologia": [
+            {"fecha_analisis": fecha, "numero_peticion": num, "origen": "HOSP",
+             "leucocitos": leucocitos, "hemoglobina": 13.5},
+        ],
+        "bioquimica": [
+            {"fecha_analisis": fecha, "numero_peticion": num, "glucosa": 90.0},
+        ],
+        "gasometria": [
+            {"fecha_analisis": fecha, "numero_peticion": num, "gaso_ph": 7.4},
+        ],
+    }
+
+
+def _count_commits(db):
+    commits = []
+    db.conn.set_trace_callback(lambda sql: commits.append(sql) if sql.strip().upper() == "COMMIT" else None)
+    return commits
+
+
+def test_import_report_writes_everything_in_one_commit(analysis_db):
+    commits = _count_commits(analysis_db)
+
+    analysis_db.import_report(_report())
+
+    assert len(commits) == 1
+    assert analysis_db.get_patient()["nombre"] == "Ana"
+    assert len(analysis_db.list_analisis()) == 1
+    hema = analysis_db.list_hematologia()
+    bio = analysis_db.list_bioquimica()
+    assert hema[0]["leucocitos"] == 5.0
+    assert hema[0]["origen"] == "HOSP"
+    assert bio[0]["analisis_id"] == hema[0]["analisis_id"]
+    assert len(analysis_db.list_gasometria()) == 1
+
+
+def test_import_report_rolls_back_on_error(analysis_db):
+    bad = _report()
+    bad["bioquimica"][0]["numero_peticion"] = None  # ensure() exige nº de petición
+
+    with pytest.raises(ValueError):
+        analysis_db.import_report(bad)
+
+    assert analysis_db.get_patient() is None
+    assert analysis_db.list_analisis() == []
+    assert analysis_db.list_hematologia() == []
+
+
+def test_import_reports_commits_every_n(analysis_db):
+    commits = _count_commits(analysis_db)
+    reports = [_report(fecha=f"2025-01-{i + 1:02d}", num=f"P{i}") for i in range(5)]
+
+    n = analysis_db.import_reports(reports, commit_every=2)
+
+    assert n == 5
+    assert len(commits) == 3  # 2 + 2 + 1
+    assert len(analysis_db.list_analisis()) == 5
+    assert len(analysis_db.list_hematologia()) == 5
+    assert len(analysis_db.list_bioquimica()) == 5
+
+
+def test_batch_failed_report_does_not_poison_the_batch(analysis_db):
+    bad = _report(fecha="2025-02-01", num="BAD")
+    bad["gasometria"][0]["numero_peticion"] = None
+
+    with analysis_db.report_batch(commit_every=10) as batch:
+        batch.add(_report(fecha="2025-01-01", num="OK1"))
+        with pytest.raises(ValueError):
+            batch.add(bad)
+        batch.add(_report(fecha="2025-03-01", num="OK2"))
+
+    peticiones = sorted(r["numero_peticion"] for r in analysis_db.list_analisis())
+    assert peticiones == ["OK1", "OK2"]
+    assert len(analysis_db.list_hematologia()) == 2
+    assert len(analysis_db.list_gasometria()) == 2
+
+
+def test_batch_exception_discards_pending(analysis_db):
+    with pytest.raises(RuntimeError):
+        with analysis_db.report_batch(commit_every=10) as batch:
+            batch.add(_report())
+            raise RuntimeError("boom")
+
+    assert analysis_db.list_analisis() == []
+    assert analysis_db.list_hematologia() == []
+
+
+def test_batch_rejects_invalid_commit_every(analysis_db):
+    with pytest.raises(ValueError):
+        analysis_db.report_batch(commit_every=0)
@@ -0,0 +1,60 @@
+# tests/test_db/test_observation.py
+# -*- coding: utf-8 -*-
+
+import pytest
+
+
+def _record(fecha, num, **values):
+    return {
+        "fecha_analisis": fecha,
+        "numero_peticion": num,
+        "resultados": [
+            {"param_key": k, "value": v, "unit": "mg/dL", "ref_min": 3.5, "ref_max": 7.2}
+            for k, v in values.items()
+        ],
+    }
+
+
+def test_import_report_writes_observations_in_same_transaction(analysis_db):
+    analysis_db.import_report({
+        "bioquimica": [{"fecha_analisis": "2025-01-01", "numero_peticion": "P1", "glucosa": 90.0}],
+        "observation": [_record("2025-01-01", "P1", acido_urico=4.3, glucosa=90.0)],
+    })
+
+    (analisis,) = analysis_db.list_analisis()
+    obs = analysis_db.list_observations(analisis["id"])
+    assert [o["param_key"] for o in obs] == ["acido_urico", "glucosa"]
+    assert obs[0] == {"param_key": "acido_urico", "value": 4.3, "unit": "mg/dL",
+                      "ref_min": 3.5, "ref_max": 7.2}
+
+
+def test_reimport_does_not_duplicate(analysis_db):
+    for _ in range(2):
+        analysis_db.observation.insert(_record("2025-01-01", "P1", ggt=30.0))
+    assert analysis_db.conn.execute("SELECT COUNT(*) FROM observation").fetchone()[0] == 1
+
+
+def test_series_falls_back_to_observation(analysis_db):
+    for fecha, num, v in (("2025-01-03", "P3", 5.0), ("2025-01-01", "P1", 4.0), ("2025-01-02", "P2", 4.5)):
+        analysis_db.observation.insert(_record(fecha, num, acido_urico=v))
+
+    assert analysis_db.series("acido_urico") == [
+        ("2025-01-01", 4.0), ("2025-01-02", 4.5), ("2025-01-03", 5.0),
+    ]
+    assert analysis_db.series("acido_urico", limit=1) == [("2025-01-03", 5.0)]
+    assert analysis_db.series("acido_urico", date_to="2025-01-02", table="observation") == [
+        ("2025-01-01", 4.0), ("2025-01-02", 4.5),
+    ]
+    assert analysis_db.observation_keys() == ["acido_urico"]
+    with pytest.raises(ValueError):
+        analysis_db.series("no_existe")
+
+
+def test_series_is_a_primary_key_range_scan(analysis_db):
+    plan = analysis_db.conn.execute(
+        "EXPLAIN QUERY PLAN SELECT analisis.fecha_analisis, observation.value "
+        "FROM observation JOIN analisis ON observation.analisis_id = analisis.id "
+        "WHERE observation.param_key = ?", ("ggt",)
+    ).fetchall()
+    detail = " ".join(r[-1] for r in plan)
+    assert "SEARCH observation USING PRIMARY KEY (param_key=?)" in detail
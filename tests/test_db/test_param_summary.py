@@ -0,0 +1,103 @@
+# tests/test_db/test_param_summary.py
+# -*- coding: utf-8 -*-
+
+import pytest
+
+
+def _hemo(db, fecha, num, **values):
+    db.insert_hematologia({"fecha_analisis": fecha, "numero_peticion": num, **values})
+
+
+def test_insert_updates_summary_out_of_order(analysis_db):
+    _hemo(analysis_db, "2025-01-02", "P2", leucocitos=6.0)
+    _hemo(analysis_db, "2025-01-03", "P3", leucocitos=9.0)
+    _hemo(analysis_db, "2025-01-01", "P1", leucocitos=3.0, hemoglobina=14.0)
+
+    s = analysis_db.param_summary.get("hematologia", "leucocitos")
+    assert (s["n"], s["first_date"], s["last_date"]) == (3, "2025-01-01", "2025-01-03")
+    assert (s["last_value"], s["prev_value"], s["prev_date"]) == (9.0, 6.0, "2025-01-02")
+    assert (s["min_value"], s["max_value"]) == (3.0, 9.0)
+    # Las columnas sin valor no cuentan
+    assert analysis_db.param_summary.get("hematologia", "hemoglobina")["n"] == 1
+    assert analysis_db.param_summary.get("hematologia", "plaquetas") is None
+
+
+def test_reimport_and_rollback_leave_summary_untouched(analysis_db):
+    _hemo(analysis_db, "2025-01-01", "P1", leucocitos=5.0)
+    _hemo(analysis_db, "2025-01-01", "P1", leucocitos=5.0)  # ON CONFLICT DO NOTHING
+    assert analysis_db.param_summary.get("hematologia", "leucocitos")["n"] == 1
+
+    with pytest.raises(Exception):
+        analysis_db.import_report({
+            "hematologia": [{"fecha_analisis": "2025-01-02", "numero_peticion": "P2", "leucocitos": 7.0}],
+            "bioquimica": [{"fecha_analisis": "2025-01-02"}],  # sin nº de petición: falla
+        })
+    assert analysis_db.param_summary.get("hematologia", "leucocitos")["n"] == 1
+
+
+def test_out_of_range_uses_range_incrementally(analysis_db):
+    _hemo(analysis_db, "2025-01-01", "P1", leucocitos=3.0)
+    _hemo(analysis_db, "2025-01-02", "P2", leucocitos=6.0)
+    summary = analysis_db.param_summary
+
+    summary.set_range("hematologia", "leucocitos", 4.0, 10.0)
+    assert summary.get("hematologia", "leucocitos")["out_of_range"] == 1
+    _hemo(analysis_db, "2025-01-03", "P3", leucocitos=12.0)
+    _hemo(analysis_db, "2025-01-04", "P4", leucocitos=5.0)
+    assert summary.get("hematologia", "leucocitos")["out_of_range"] == 2
+
+    with pytest.raises(ValueError):
+        summary.set_range("hematologia", "no_existe", 0, 1)
+
+
+def test_stored_ranges_apply_to_new_params(analysis_db):
+    summary = analysis_db.param_summary
+    ranges = {("hematologia", "leucocitos"): (4.0, 10.0), ("observation", "ggt"): (None, 35.0)}
+    assert summary.set_ranges(ranges) == 0  # aún sin datos: solo param_range
+    assert summary.ranges() == ranges
+
+    _hemo(analysis_db, "2025-01-01", "P1", leucocitos=12.0)
+    analysis_db.observation.insert({"fecha_analisis": "2025-01-01", "numero_peticion": "P1",
+                                    "resultados": [{"param_key": "ggt", "value": 40.0}]})
+    for key in ranges:
+        row = summary.get(*key)
+        assert ((row["range_low"], row["range_high"]), row["out_of_range"]) == (ranges[key], 1)
+
+    # Mismos rangos: no se escribe nada
+    changes = analysis_db.conn.total_changes
+    assert summary.set_ranges(ranges) == 0
+    assert analysis_db.conn.total_changes == changes
+
+    summary.rebuild()
+    assert summary.get("hematologia", "leucocitos")["out_of_range"] == 1
+
+
+def test_count_out_of_range_is_read_only(analysis_db):
+    _hemo(analysis_db, "2025-01-01", "P1", leucocitos=3.0, hemoglobina=18.0)
+    _hemo(analysis_db, "2025-01-02", "P2", leucocitos=12.0, hemoglobina=14.0)
+    analysis_db.observation.insert({"fecha_analisis": "2025-01-02", "numero_peticion": "P2",
+                                    "resultados": [{"param_key": "ggt", "value": 40.0}]})
+    summary = analysis_db.param_summary
+    before = summary.list()
+
+    counts = summary.count_out_of_range(
+        "hematologia", {"leucocitos": (4.0, 10.0), "hemoglobina": (None, 17.0)})
+    assert counts == {"leucocitos": 2, "hemoglobina": 1}
+    assert summary.count_out_of_range("observation", {"ggt": (None, 35.0)}) == {"ggt": 1}
+    assert summary.list() == before and not analysis_db.conn.in_transaction
+
+    with pytest.raises(ValueError):
+        summary.count_out_of_range("hematologia", {"no_existe": (0, 1)})
+
+
+def test_observation_and_rebuild_match_triggers(analysis_db):
+    for fecha, num, v in (("2025-01-02", "P2", 40.0), ("2025-01-01", "P1", 30.0)):
+        analysis_db.observation.insert({"fecha_analisis": fecha, "numero_peticion": num,
+                                        "resultados": [{"param_key": "ggt", "value": v}]})
+        _hemo(analysis_db, fecha, num, leucocitos=v / 10)
+    analysis_db.param_summary.set_range("observation", "ggt", None, 35.0)
+
+    incremental = analysis_db.list_param_summary()
+    analysis_db.param_summary.rebuild()
+    assert analysis_db.list_param_summary() == incremental
+    assert analysis_db.param_summary.get("observation", "ggt")["out_of_range"] == 1
@@ -0,0 +1,61 @@
+# tests/test_db/test_rows.py
+# -*- coding: utf-8 -*-
+
+import pytest
+
+
+def _fill(db):
+    # Dos análisis el mismo día: el cursor debe desempatar por analisis_id
+    for fecha, pet, leu in [("2025-01-02", "P2", 2.0), ("2025-01-01", "P1", 1.0),
+                            ("2025-01-02", "P3", 3.0), ("2025-01-04", "P4", 4.0)]:
+        db.insert_hematologia({"fecha_analisis": fecha, "numero_peticion": pet, "leucocitos": leu})
+
+
+def _leu(rows):
+    return [r["leucocitos"] for r in rows]
+
+
+def test_default_order_and_descending_limit(analysis_db):
+    _fill(analysis_db)
+    assert _leu(analysis_db.list_hematologia()) == [1.0, 2.0, 3.0, 4.0]
+    # Con descending, 'limit' da los más recientes
+    assert _leu(analysis_db.list_hematologia(limit=2, descending=True)) == [4.0, 3.0]
+
+
+def test_date_window(analysis_db):
+    _fill(analysis_db)
+    rows = analysis_db.list_hematologia(date_from="2025-01-02", date_to="2025-01-03")
+    assert _leu(rows) == [2.0, 3.0]
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_keyset_pages_cover_everything_once(analysis_db, descending):
+    _fill(analysis_db)
+    prefix = "before" if descending else "after"
+    seen, cursor = [], {}
+    while True:
+        page = analysis_db.list_hematologia(limit=1, descending=descending, **cursor)
+        if not page:
+            break
+        seen += _leu(page)
+        last = page[-1]
+        cursor = {f"{prefix}_date": last["fecha_analisis"], f"{prefix}_id": last["analisis_id"]}
+    expected = [1.0, 2.0, 3.0, 4.0]
+    assert seen == (expected[::-1] if descending else expected)
+
+
+def test_cursor_date_only_and_invalid(analysis_db):
+    _fill(analysis_db)
+    assert _leu(analysis_db.list_hematologia(after_date="2025-01-02")) == [4.0]
+    with pytest.raises(ValueError):
+        analysis_db.list_hematologia(after_id=1)
+    with pytest.raises(ValueError):
+        analysis_db.list_hematologia(before_date="ayer")
+
+
+def test_list_analisis_and_list_rows(analysis_db):
+    _fill(analysis_db)
+    assert [r["numero_peticion"] for r in analysis_db.list_analisis(limit=2, descending=True)] == ["P4", "P3"]
+    assert analysis_db.list_rows("hematologia", 1) == analysis_db.list_hematologia(limit=1)
+    with pytest.raises(ValueError):
+        analysis_db.list_rows("paciente")
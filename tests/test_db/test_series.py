@@ -0,0 +1,101 @@
+# tests/test_db/test_series.py
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from charts.series_provider import DbSeriesProvider
+
+
+def _fill(db):
+    rows = [
+        ("2025-01-03", "P3", 6.0, 90.0),
+        ("2025-01-01", "P1", 4.0, None),
+        ("2025-01-02", "P2", None, 100.0),
+        ("2025-01-04", "P4", 7.5, 110.0),
+    ]
+    for fecha, pet, leu, glu in rows:
+        db.insert_hematologia({"fecha_analisis": fecha, "numero_peticion": pet, "leucocitos": leu})
+        db.insert_bioquimica({"fecha_analisis": fecha, "numero_peticion": pet, "glucosa": glu})
+
+
+def test_series_ascending_without_nulls(analysis_db):
+    _fill(analysis_db)
+    assert analysis_db.series("leucocitos") == [
+        ("2025-01-01", 4.0), ("2025-01-03", 6.0), ("2025-01-04", 7.5),
+    ]
+
+
+def test_series_limit_keeps_most_recent(analysis_db):
+    _fill(analysis_db)
+    assert analysis_db.series("leucocitos", limit=2) == [("2025-01-03", 6.0), ("2025-01-04", 7.5)]
+
+
+def test_series_date_range_inclusive(analysis_db):
+    _fill(analysis_db)
+    got = analysis_db.series("glucosa", date_from="2025-01-02", date_to="2025-01-03")
+    assert got == [("2025-01-02", 100.0), ("2025-01-03", 90.0)]
+
+
+def test_series_resolves_table_and_rejects_unknown(analysis_db):
+    _fill(analysis_db)
+    # 'glucosa' existe en bioquímica y en orina: sin tabla gana bioquímica
+    assert len(analysis_db.series("glucosa")) == 3
+    assert analysis_db.series("glucosa", table="orina") == []
+    with pytest.raises(ValueError):
+        analysis_db.series("no_existe")
+    with pytest.raises(ValueError):
+        analysis_db.series("leucocitos; DROP TABLE analisis", table="hematologia")
+
+
+def test_series_uses_indexes(analysis_db):
+    # "Últimos 90 días": recorrido por rango de idx_analisis_fecha_ordinal,
+    # sin ordenación aparte (ni TEMP B-TREE)
+    plan = analysis_db.conn.execute(
+        "EXPLAIN QUERY PLAN SELECT analisis.fecha_analisis, bioquimica.creatinina "
+        "FROM bioquimica JOIN analisis ON bioquimica.analisis_id = analisis.id "
+        "WHERE bioquimica.creatinina IS NOT NULL AND analisis.fecha_ordinal >= ? "
+        "ORDER BY analisis.fecha_ordinal DESC, analisis.id DESC LIMIT 10",
+        (0,),
+    ).fetchall()
+    detail = " ".join(r[-1] for r in plan)
+    assert "idx_analisis_fecha_ordinal (fecha_ordinal>?)" in detail
+    assert "TEMP B-TREE" not in detail
+
+
+def test_series_date_bounds_use_ordinal(analysis_db):
+    _fill(analysis_db)
+    statements = []
+    analysis_db.conn.set_trace_callback(statements.append)
+    got = analysis_db.series("leucocitos", date_from="2025-01-03", date_to="2025-01-04")
+    analysis_db.conn.set_trace_callback(None)
+
+    assert got == [("2025-01-03", 6.0), ("2025-01-04", 7.5)]
+    assert "analisis.fecha_ordinal >=" in statements[-1]
+
+
+def test_provider_uses_projected_series(analysis_db):
+    _fill(analysis_db)
+    points = DbSeriesProvider(analysis_db).get_series("leucocitos", limit=10, date_from="2025-01-02")
+    assert [(p.date.strftime("%Y-%m-%d"), p.value) for p in points] == [
+        ("2025-01-03", 6.0), ("2025-01-04", 7.5),
+    ]
+
+
+def test_series_many_one_query_per_table(analysis_db):
+    _fill(analysis_db)
+    statements = []
+    analysis_db.conn.set_trace_callback(statements.append)
+    got = analysis_db.series_many("hematologia", ["leucocitos", "hemoglobina"], limit=2)
+    analysis_db.conn.set_trace_callback(None)
+
+    assert len([s for s in statements if "SELECT" in s]) == 1
+    assert got == {"leucocitos": [("2025-01-03", 6.0), ("2025-01-04", 7.5)], "hemoglobina": []}
+
+
+def test_provider_batch_matches_single_series(analysis_db):
+    _fill(analysis_db)
+    provider = DbSeriesProvider(analysis_db)
+    batch = provider.get_series_batch(["glucosa", "leucocitos", "no_existe"], limit=2)
+    assert list(batch) == ["glucosa", "leucocitos"]
+    for p in ("glucosa", "leucocitos"):
+        assert batch[p] == provider.get_series(p, limit=2)
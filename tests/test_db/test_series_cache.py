@@ -0,0 +1,112 @@
+# tests/test_db/test_series_cache.py
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+from db import AnalysisDB
+from db.series_cache import drop_series_cache, series_cache_stats
+
+
+@pytest.fixture
+def cached_db(tmp_path):
+    path = str(tmp_path / "cache.db")
+    db = AnalysisDB(path, series_cache=True)
+    db.open()
+    try:
+        yield db
+    finally:
+        db.close()
+        drop_series_cache(path)
+
+
+def _hemo(fecha, num, hb):
+    return {"fecha_analisis": fecha, "numero_peticion": num, "hemoglobina": hb}
+
+
+def _as_pairs(arrays):
+    dates, values = arrays
+    return [(str(d), float(v)) for d, v in zip(dates, values)]
+
+
+def test_cache_matches_sql_series(cached_db):
+    for i, (fecha, hb) in enumerate([("2025-01-03", 13.0), ("2025-01-01", 12.5),
+                                     ("2025-01-02", None), ("2025-01-05", 14.0)]):
+        cached_db.insert_hematologia(_hemo(fecha, f"P{i}", hb))
+
+    for kwargs in ({}, {"limit": 2}, {"date_from": "2025-01-02"},
+                   {"date_from": "2025-01-02", "date_to": "2025-01-04"}, {"limit": 0}):
+        assert _as_pairs(cached_db.series_arrays("hemoglobina", **kwargs)) == \
+            cached_db.series("hemoglobina", **kwargs)
+
+
+def test_non_iso_bounds_fall_back_to_sql(cached_db):
+    cached_db.insert_hematologia(_hemo("2025-01-03", "P1", 13.0))
+    cached_db.insert_hematologia(_hemo("2025-01-05", "P2", 14.0))
+
+    for bound in ("2025/01/03", "garbage"):
+        assert _as_pairs(cached_db.series_arrays("hemoglobina", date_from=bound)) == \
+            cached_db.series("hemoglobina", date_from=bound)
+        assert _as_pairs(cached_db.series_arrays("hemoglobina", date_to=bound)) == \
+            cached_db.series("hemoglobina", date_to=bound)
+    with pytest.raises(ValueError):
+        cached_db.series_cache.series(cached_db.conn, "hematologia", cached_db.hematologia.FIELDS,
+                                      "hemoglobina", date_from="garbage")
+
+
+def test_hits_and_invalidation_on_insert(cached_db):
+    cached_db.insert_hematologia(_hemo("2025-01-01", "P1", 12.5))
+    cache = cached_db.series_cache
+
+    cached_db.series_arrays("hemoglobina")
+    cached_db.series_arrays("hematocrito")  # misma tabla: ya cargada
+    assert (cache.misses, cache.hits) == (1, 1)
+
+    cached_db.insert_hematologia(_hemo("2025-01-02", "P2", 13.0))
+    assert "hematologia" not in cache.stats()["tables"]
+    _, values = cached_db.series_arrays("hemoglobina")
+    assert values.tolist() == [12.5, 13.0]
+    assert not values.flags.writeable
+
+
+def test_import_report_invalidates(cached_db):
+    cached_db.series_arrays("glucosa")
+    cached_db.import_report({"bioquimica": [
+        {"fecha_analisis": "2025-01-01", "numero_peticion": "P1", "glucosa": 90.0},
+    ]})
+    assert cached_db.series_arrays("glucosa")[1].tolist() == [90.0]
+
+
+def test_write_from_other_connection_is_detected(cached_db):
+    cached_db.insert_hematologia(_hemo("2025-01-01", "P1", 12.5))
+    assert cached_db.series_arrays("hemoglobina")[1].tolist() == [12.5]
+
+    other = AnalysisDB(cached_db.db_path)  # sin caché: no invalida
+    other.open()
+    try:
+        other.insert_hematologia(_hemo("2025-01-02", "P2", 13.0))
+    finally:
+        other.close()
+
+    assert cached_db.series_arrays("hemoglobina")[1].tolist() == [12.5, 13.0]
+
+
+def test_observation_params_bypass_cache(cached_db):
+    cached_db.observation.insert({
+        "fecha_analisis": "2025-01-01", "numero_peticion": "P1",
+        "resultados": [{"param_key": "acido_urico", "value": 4.3}],
+    })
+    dates, values = cached_db.series_arrays("acido_urico")
+    assert dates.tolist() == [np.datetime64("2025-01-01", "D").item()]
+    assert values.tolist() == [4.3]
+    assert cached_db.series_cache.stats()["tables"] == []
+
+
+def test_stats_report_memory(cached_db):
+    cached_db.insert_hematologia(_hemo("2025-01-01", "P1", 12.5))
+    cached_db.series_arrays("hemoglobina")
+
+    stats = series_cache_stats()[cached_db.db_path]
+    assert stats["tables"] == ["hematologia"]
+    assert stats["columns"] >= 1 and stats["bytes"] >= 16
+    assert stats["hit_rate"] == 0.0
@@ -0,0 +1,43 @@
+# tests/test_importer/conftest.py
+# -*- coding: utf-8 -*-
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from db import AnalysisDB
+
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+
+@pytest.fixture(autouse=True)
+def _isolated_data_dir(tmp_path, monkeypatch):
+    """La caché de parseo por defecto (CLI) no debe tocar ~/.salud_v1."""
+    monkeypatch.setenv("SALUD_V1_DATA_DIR", str(tmp_path / "data_dir"))
+
+
+@pytest.fixture
+def pdf_dir(tmp_path) -> Path:
+    """
+    Directorio con dos informes válidos y un informe de hemocultivos
+    (no soportado), con un subdirectorio para probar la recursividad.
+    """
+    d = tmp_path / "pdfs"
+    (d / "sub").mkdir(parents=True)
+    shutil.copy(DATA_DIR / "hemocultivos_20251113.pdf", d / "a_hemato.pdf")
+    shutil.copy(DATA_DIR / "sample_lab_report_2025_06_24.pdf", d / "sub" / "b_sample.pdf")
+    shutil.copy(DATA_DIR / "hemocultivos_20251108_hemocultivos.pdf", d / "c_hemocultivos.pdf")
+    (d / "notas.txt").write_text("no es un pdf", encoding="utf-8")
+    return d
+
+
+@pytest.fixture
+def analysis_db(tmp_path):
+    db = AnalysisDB(str(tmp_path / "import.db"))
+    db.open()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -0,0 +1,168 @@
+# tests/test_importer/test_batch.py
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from importer import collect_pdf_paths, import_directory, import_pdfs
+
+
+def test_collect_pdf_paths_recursive_and_flat(pdf_dir):
+    names = [p.name for p in collect_pdf_paths(pdf_dir)]
+    assert names == ["a_hemato.pdf", "c_hemocultivos.pdf", "b_sample.pdf"]
+
+    flat = [p.name for p in collect_pdf_paths(pdf_dir, recursive=False)]
+    assert flat == ["a_hemato.pdf", "c_hemocultivos.pdf"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_import_directory_reports_ok_and_errors(pdf_dir, analysis_db, workers):
+    res = import_directory(analysis_db, pdf_dir, workers=workers)
+
+    assert res.ok == 2
+    assert len(res.errors) == 1
+    assert res.errors[0].startswith("c_hemocultivos.pdf: ")
+    assert res.processed == 3
+
+    fechas = sorted(r["fecha_analisis"] for r in analysis_db.list_hematologia())
+    assert fechas == ["2025-06-24", "2025-11-13"]
+    assert len(analysis_db.list_bioquimica()) == 2
+
+
+def test_import_pdfs_missing_file_is_reported(tmp_path, analysis_db):
+    res = import_pdfs(analysis_db, [tmp_path / "no_existe.pdf"], workers=1)
+
+    assert res.ok == 0
+    assert len(res.errors) == 1
+    assert res.errors[0].startswith("no_existe.pdf: ")
+
+
+def test_import_pdfs_empty_input(analysis_db):
+    res = import_pdfs(analysis_db, [])
+    assert res.ok == 0
+    assert res.errors == []
+    assert res.files_per_second == 0.0
+
+
+def test_cli_imports_directory(pdf_dir, tmp_path, capsys):
+    from importer.__main__ import main
+
+    rc = main([str(tmp_path / "cli.db"), str(pdf_dir), "--workers", "1"])
+
+    assert rc == 0
+    out = capsys.readouterr().out
+    assert "Importados: 2" in out
+    assert "c_hemocultivos.pdf" in out
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_import_pdfs_uses_parse_cache(pdf_dir, tmp_path, analysis_db, monkeypatch, workers):
+    from lab_pdf import pdf_to_json
+    from lab_pdf.parse_cache import ParseCache
+
+    cache = ParseCache(tmp_path / "cache.db")
+    first = import_directory(analysis_db, pdf_dir, workers=workers, cache=cache)
+    assert first.cached == 0
+    assert len(cache) == 3  # 2 válidos + 1 no soportado
+
+    def boom(_path):
+        raise AssertionError("no debería extraer texto con la caché caliente")
+
+    monkeypatch.setattr(pdf_to_json, "extract_lab_text", boom)
+    again = import_directory(analysis_db, pdf_dir, workers=1, cache=cache)
+    assert again.cached == 3
+    assert again.ok == first.ok
+    assert again.errors == first.errors
+    cache.close()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_skip_existing_reads_only_header(pdf_dir, analysis_db, monkeypatch, workers):
+    from lab_pdf import pdf_to_json
+
+    first = import_directory(analysis_db, pdf_dir, workers=workers, skip_existing=True)
+    assert first.ok == 2 and first.skipped == 0
+
+    def boom(_path):
+        raise AssertionError("no debería parsear informes ya importados")
+
+    monkeypatch.setattr(pdf_to_json, "extract_lab_text", boom)
+    again = import_directory(analysis_db, pdf_dir, workers=1, skip_existing=True)
+
+    assert again.skipped == 2
+    assert again.ok == 0
+    assert len(again.errors) == 1  # el hemocultivo no tiene cabecera reconocible
+    assert again.processed == 3
+
+
+def test_reimport_without_skip_does_not_duplicate_rows(pdf_dir, analysis_db):
+    import_directory(analysis_db, pdf_dir, workers=1)
+    again = import_directory(analysis_db, pdf_dir, workers=1)
+
+    assert again.ok == 2
+    assert len(analysis_db.list_analisis()) == 2
+    assert len(analysis_db.list_hematologia()) == 2
+    assert len(analysis_db.list_bioquimica()) == 2
+
+
+def test_failed_commit_reports_whole_group_as_failed(pdf_dir, analysis_db, monkeypatch):
+    from db.informe import Informe
+
+    real_write = Informe.write_staged
+    calls = []
+
+    def write_staged(self, pending):
+        calls.append(pending)
+        if len(calls) == 1:
+            raise RuntimeError("disco lleno")
+        real_write(self, pending)
+
+    monkeypatch.setattr(Informe, "write_staged", write_staged)
+    seen = []
+    res = import_directory(analysis_db, pdf_dir, workers=1, commit_every=1,
+                           on_result=lambda p, status, err, s: seen.append((p.split("/")[-1], status, err)))
+
+    assert [(name, status) for name, status, _ in seen] == [
+        ("a_hemato.pdf", "failed"), ("c_hemocultivos.pdf", "error"), ("b_sample.pdf", "ok"),
+    ]
+    assert seen[0][2] == "disco lleno"
+    assert res.ok == 1
+    assert "a_hemato.pdf: disco lleno" in res.errors
+    assert [r["fecha_analisis"] for r in analysis_db.list_hematologia()] == ["2025-06-24"]
+
+
+def test_concurrent_imports_share_one_pool(pdf_dir, tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from db import AnalysisDB
+    from importer import batch
+
+    def run(tag):
+        db = AnalysisDB(str(tmp_path / f"{tag}.db"))
+        db.open()
+        try:
+            return import_directory(db, pdf_dir, workers=2).ok
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        assert list(ex.map(run, ["uno", "dos"])) == [2, 2]
+    pool = batch._pool
+    assert pool is not None and pool._max_workers == batch.default_workers()
+    assert run("tres") == 2 and batch._pool is pool
+
+
+def test_unexpected_error_keeps_digest(pdf_dir, tmp_path, monkeypatch):
+    from importer import batch
+    from lab_pdf.parse_cache import ParseCache, file_digest
+
+    def boom(_path):
+        raise RuntimeError("pypdf roto")
+
+    monkeypatch.setattr(batch, "parse_hematology_pdf", boom)
+    pdf = str(pdf_dir / "a_hemato.pdf")
+    cache = ParseCache(tmp_path / "cache.db")
+    parsed = batch._parse_one(pdf, cache)
+    cache.close()
+
+    assert parsed.error == "pypdf roto" and not parsed.expected
+    assert parsed.digest == file_digest(pdf)
@@ -0,0 +1,106 @@
+# tests/test_importer/test_watcher.py
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+
+import pytest
+
+from db import AnalysisDB
+from importer.watcher import FolderWatcher
+
+from .conftest import DATA_DIR
+
+
+@pytest.fixture
+def inbox(tmp_path):
+    d = tmp_path / "inbox"
+    d.mkdir()
+    return d
+
+
+def _drop(inbox, src_name, dest_name):
+    dest = inbox / dest_name
+    shutil.copy(DATA_DIR / src_name, dest)
+    return dest
+
+
+def _watcher(db, inbox):
+    return FolderWatcher(db, inbox, settle=0.0, batch_size=1)
+
+
+def test_imports_new_files_and_checkpoints_them(analysis_db, inbox):
+    _drop(inbox, "hemocultivos_20251113.pdf", "a.pdf")
+    _drop(inbox, "hemocultivos_20251108_hemocultivos.pdf", "b.pdf")
+
+    w = _watcher(analysis_db, inbox)
+    assert w.run_once() == 2
+    assert w.stats.imported == 1
+    assert w.stats.errors == 1  # hemocultivos: no soportado, pero queda registrado
+    assert w.stats.backlog == 0
+    assert w.stats.snapshot()["latency_s"]["last"] is not None
+
+    statuses = {os.path.basename(p): e.status for p, e in analysis_db.ingest_checkpoint.load().items()}
+    assert statuses == {"a.pdf": "ok", "b.pdf": "error"}
+
+    # Segunda vuelta: nada que hacer
+    assert w.run_once() == 0
+
+
+def test_restart_does_not_reopen_checkpointed_files(tmp_path, inbox, monkeypatch):
+    _drop(inbox, "hemocultivos_20251113.pdf", "a.pdf")
+    db_path = str(tmp_path / "w.db")
+
+    db = AnalysisDB(db_path)
+    db.open()
+    _watcher(db, inbox).run_once()
+    db.close()
+
+    from importer import watcher as watcher_mod
+
+    def boom(_path):
+        raise AssertionError("no debería volver a leer ficheros ya procesados")
+
+    monkeypatch.setattr(watcher_mod, "file_digest", boom)
+    db = AnalysisDB(db_path)
+    db.open()
+    try:
+        assert _watcher(db, inbox).run_once() == 0
+    finally:
+        db.close()
+
+
+def test_copy_with_known_content_is_skipped_without_parsing(analysis_db, inbox, monkeypatch):
+    _drop(inbox, "sample_lab_report_2025_06_24.pdf", "a.pdf")
+    w = _watcher(analysis_db, inbox)
+    w.run_once()
+
+    from importer import watcher as watcher_mod
+
+    monkeypatch.setattr(watcher_mod, "import_pdfs", lambda *a, **k: pytest.fail("no debería importar"))
+    _drop(inbox, "sample_lab_report_2025_06_24.pdf", "copia.pdf")
+    assert w.run_once() == 1
+    assert w.stats.skipped == 1
+    assert len(analysis_db.list_hematologia()) == 1
+
+
+def test_recent_files_wait_for_settle(analysis_db, inbox):
+    _drop(inbox, "hemocultivos_20251113.pdf", "a.pdf")
+    w = FolderWatcher(analysis_db, inbox, settle=3600.0)
+
+    assert w.run_once() == 0
+    assert w.stats.backlog == 1
+
+
+def test_cli_once_writes_status_file(tmp_path, inbox):
+    from app.ingest_main import main
+    import json
+
+    _drop(inbox, "hemocultivos_20251113.pdf", "a.pdf")
+    status = tmp_path / "estado.json"
+    rc = main([str(tmp_path / "cli.db"), str(inbox), "--once", "--settle", "0",
+               "--status-file", str(status)])
+
+    assert rc == 0
+    snap = json.loads(status.read_text(encoding="utf-8"))
+    assert snap["imported"] == 1 and snap["backlog"] == 0
@@ -0,0 +1,68 @@
+import json
+import os
+
+from lab_pdf.alias_index import AliasEntry, AliasIndex, alias_index
+from lab_pdf.line_parser import parse_observations, parse_result_line
+
+
+def _write(path, params):
+    data = {
+        name.upper(): {"normalized_key": name.upper(), "original_names": aliases, "units": units}
+        for name, aliases, units in params
+    }
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
+def _index():
+    calcio = AliasEntry("Calcio", "mg/dL")
+    return AliasIndex([
+        ("Calcio", calcio),
+        ("Calcio corregido por albúmina", AliasEntry("Calcio corregido por albúmina", "mg/dL")),
+        ("Acido úrico", AliasEntry("Acido úrico", "mg/dL")),
+        ("Ácido Úrico", AliasEntry("Otro", None)),  # mismo alias plegado: gana el primero
+    ])
+
+
+def test_variants_resolve_to_canonical_name_and_unit():
+    idx = _index()
+    assert idx.size == 3
+    r = parse_result_line("ÁCIDO  ÚRICO * 4,3 3.5 - 7.2", idx)
+    assert (r.name, r.value, r.unit, r.ref_min) == ("Acido úrico", 4.3, "mg/dL", 3.5)
+
+
+def test_longest_alias_that_fits_wins():
+    idx = _index()
+    assert parse_result_line("Calcio corregido por albúmina 9.6 mg/dL", idx).name == (
+        "Calcio corregido por albúmina"
+    )
+    assert parse_result_line("Calcio 9.4 mg/dL 8.6 - 10.2", idx).name == "Calcio"
+    # etiqueta desconocida que empieza por un alias: la resuelve el regex general
+    assert parse_result_line("Calcio iónico 1.2 mmol/L", idx).name == "Calcio iónico"
+    assert parse_result_line("Calciox 1.2", idx).name == "Calciox"
+
+
+def test_observations_use_alias_for_key():
+    idx = AliasIndex([("Cloro", AliasEntry("Cloruro", "mmol/L"))])
+    (obs,) = parse_observations({"bioquimica": "Cloro 105"}, idx)
+    assert obs["param_key"] == "cloro" and obs["unit"] == "mmol/L"
+
+
+def test_index_is_rebuilt_when_json_changes(tmp_path):
+    path = tmp_path / "params.json"
+    _write(path, [("Glucosa", ["Glucosa"], ["mg/dL"])])
+    first = alias_index(path)
+    assert alias_index(path) is first  # sin cambios: mismo trie
+    assert first.entry("glucosa").unit == "mg/dL"
+
+    _write(path, [("Glucosa", ["Glucosa"], ["mg/dL"]), ("GGT", ["GGT", "Gammaglutamil transferasa (GGT)"], ["U/L"])])
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    second = alias_index(path)
+    assert second is not first and second.version != first.version
+    assert second.entry("GAMMAGLUTAMIL TRANSFERASA (GGT)").name == "GGT"
+
+
+def test_missing_json_gives_empty_index(tmp_path):
+    idx = alias_index(tmp_path / "no_existe.json")
+    assert idx.size == 0 and idx.line_pattern("x") is None
+    assert parse_result_line("Glucosa 84 mg/dL", idx).name == "Glucosa"
@@ -0,0 +1,67 @@
+from lab_pdf import parse_hematology_pdf
+from lab_pdf.alias_index import AliasEntry, AliasIndex
+from lab_pdf.line_parser import ResultLine, param_key, parse_observations, parse_result_line
+
+
+def test_parse_result_line_variants():
+    assert parse_result_line("Leucocitos * 2.4 x10^3/µL 4 - 10.5") == ResultLine(
+        "Leucocitos", 2.4, "x10^3/µL", 4.0, 10.5,
+    )
+    # sin unidad / sin rango / rango con signo
+    assert parse_result_line("pH 7.41 7.32 - 7.42") == ResultLine("pH", 7.41, None, 7.32, 7.42)
+    assert parse_result_line("Ferritina 552,2 ng/mL") == ResultLine("Ferritina", 552.2, "ng/mL", None, None)
+    assert parse_result_line("Exceso de Bases (EB) 0.0 mmol/L -2 - +2").ref_min == -2.0
+    # el nombre retrocede hasta que el resto de la línea encaja
+    assert parse_result_line("Beta 2 microglobulina 1.9 mg/L").name == "Beta 2 microglobulina"
+
+
+def test_non_result_lines_are_ignored():
+    for line in ("HEMATOLOGÍA", "Recepción: 24/06/25", "Prueba Resultado Unidades",
+                 "Glucosa Negativo", "Muestras: 2 frascos aerobios"):
+        assert parse_result_line(line) is None
+
+
+def test_param_key_uses_section_labels_then_slug():
+    assert param_key("Cloruro", "bioquimica") == "cloro"
+    assert param_key("Neutrófilos %", "hematologia") == "neutrofilos_pct"
+    assert param_key("Neutrófilos", "hematologia") == "neutrofilos_abs"
+    assert param_key("Calcio iónico", "gasometria") == "gaso_calcio_ionico"
+    assert param_key("Sodio orina", "orina") == "sodio_ur"
+    assert param_key("Proteína C reactiva", "bioquimica") == "proteina_c_reactiva"
+    assert param_key("Potasio", "gasometria") == "gaso_potasio"
+
+
+def test_parse_observations_first_occurrence_wins():
+    obs = parse_observations({
+        "bioquimica": "Ácido úrico 4.28 mg/dL 3.5 - 7.2\nGGT 30 U/L\nGGT 99 U/L",
+        "gasometria": "Calcio iónico 1.21 mmol/L 1.12 - 1.32",
+    })
+    by_key = {o["param_key"]: o for o in obs}
+    assert set(by_key) == {"acido_urico", "ggt", "gaso_calcio_ionico"}
+    assert by_key["ggt"]["value"] == 30.0
+    assert by_key["acido_urico"] == {
+        "param_key": "acido_urico", "value": 4.28, "unit": "mg/dL", "ref_min": 3.5, "ref_max": 7.2,
+    }
+
+
+def test_header_and_footer_lines_are_not_observations():
+    obs = parse_observations({
+        "bioquimica": "Página 1 de 2\nMuestra 2 tubos\nHoja 1\nValidado por Dr. Perez 12345\n"
+                      "Glucosa 84 mg/dL\npH 7.41 7.32 - 7.42",
+    })
+    assert [o["param_key"] for o in obs] == ["glucosa", "ph"]
+
+    # Sin unidad ni rango, solo si la etiqueta es un alias conocido
+    riesgo = "Indice de riesgo cardiovascular"
+    idx = AliasIndex([(riesgo, AliasEntry(riesgo, None))])
+    text = {"bioquimica": f"{riesgo} 2.3\nHoja 1"}
+    assert parse_observations(text, AliasIndex([])) == []
+    assert [o["value"] for o in parse_observations(text, idx)] == [2.3]
+
+
+def test_report_keeps_values_without_section_column(hemato_pdf_path):
+    data = parse_hematology_pdf(hemato_pdf_path)
+    record = data["observation"][0]
+    assert record["numero_peticion"] == data["hematologia"][0]["numero_peticion"]
+    keys = {o["param_key"] for o in record["resultados"]}
+    assert {"leucocitos", "glucosa", "gaso_lactato", "gaso_beecf"} <= keys
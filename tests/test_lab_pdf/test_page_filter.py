@@ -0,0 +1,76 @@
+from pathlib import Path
+
+from lab_pdf.page_filter import LabPageFilter, extract_lab_text
+from lab_pdf.pdf_utils import extract_text_from_pdf
+
+HEADER = (
+    "Nombre: PACIENTE PRUEBA      Nº petición: 1\n"
+    "Recepción: 24/06/25  Finalización: 24/06/25\n"
+)
+HEMATO = "HEMATOLOGÍA\nLeucocitos 5.0 x10^3/µL\nHemoglobina 14.0 g/dL\n"
+BIOQ = "BIOQUÍMICA\nGlucosa 84 mg/dL\n"
+NOTAS = "Observaciones clínicas\nPaciente estable, sin cambios.\n"
+
+
+def _feed_all(pages):
+    f = LabPageFilter()
+    read = 0
+    for p in pages:
+        read += 1
+        if not f.feed(p):
+            break
+    return f, read
+
+
+def test_first_page_without_reception_date_stops():
+    f, read = _feed_all(["Finalización: 14/11/25\nHEMOCULTIVOS\n", HEMATO, HEMATO])
+    assert read == 1
+    assert "HEMOCULTIVOS" in f.text
+
+
+def test_first_page_without_sections_or_values_stops():
+    _, read = _feed_all([HEADER + NOTAS, HEMATO])
+    assert read == 1
+
+
+def test_first_page_without_header_but_with_hemogram_values_continues():
+    f, read = _feed_all([HEADER + "Leucocitos 5.0 x10^3/µL\n", BIOQ, NOTAS])
+    assert read == 3
+    assert f.open_section is None
+    assert "Glucosa" in f.text
+
+
+def test_section_continuing_on_next_page_is_kept():
+    f, read = _feed_all([HEADER + HEMATO, "Plaquetas 200 x10^3/µL\n", BIOQ, NOTAS, NOTAS, HEMATO])
+    assert read == 5
+    assert "Plaquetas" in f.text and "Glucosa" in f.text
+    assert NOTAS not in f.text
+
+
+def test_result_lines_outside_section_table_continue_and_later_headers_are_read():
+    pages = [
+        HEADER + BIOQ,
+        "Vitamina D 30 ng/mL\nTSH 2.1 µUI/mL\n",
+        "HEMATOLOGÍA\nHemoglobina 14.0 g/dL\n",
+    ]
+    f = LabPageFilter()
+    assert [f.feed(p) for p in pages] == [True, True, True]
+    assert "Vitamina D" in f.text and "Hemoglobina" in f.text
+    assert f.open_section == "hematologia"
+
+
+def test_page_without_results_is_skipped_but_next_header_is_read():
+    f, read = _feed_all([HEADER + BIOQ, NOTAS, HEMATO, NOTAS, NOTAS, BIOQ])
+    assert read == 5
+    assert "Hemoglobina" in f.text
+    assert NOTAS not in f.text
+
+
+def test_footer_numbers_do_not_continue_a_section():
+    f, read = _feed_all([HEADER + BIOQ, "Página 2 de 3\nCama 12\n", NOTAS])
+    assert read == 3
+    assert "Página" not in f.text
+
+
+def test_extract_lab_text_matches_full_text_on_lab_reports(hemato_pdf_path: Path):
+    assert extract_lab_text(str(hemato_pdf_path)) == extract_text_from_pdf(str(hemato_pdf_path))
@@ -0,0 +1,41 @@
+import pytest
+
+from lab_pdf.bioquimica_parser import BIOQUIMICA_PARAMS
+from lab_pdf.hematologia_parser import HEMATOLOGIA_PARAMS
+from lab_pdf.param_scanner import ParamScanner, ParamSpec
+
+SPECS = (
+    ParamSpec("glucosa", r"Glucosa", r"mg/dL"),
+    ParamSpec("urea", r"Urea", r"mg/dL"),
+    ParamSpec("indice", r"Índice"),
+)
+
+
+def test_scan_returns_all_keys_in_table_order():
+    scanner = ParamScanner(SPECS, gap=r"\s*")
+    out = scanner.scan("Urea 30 mg/dL")
+    assert list(out) == ["glucosa", "urea", "indice"]
+    assert out == {"glucosa": None, "urea": 30.0, "indice": None}
+
+
+def test_first_occurrence_wins_and_comma_decimal():
+    scanner = ParamScanner(SPECS, gap=r"\s*\**\s*")
+    out = scanner.scan("Glucosa * 98,5 mg/dL\nÍndice 3.2\nGlucosa 120 mg/dL")
+    assert out["glucosa"] == 98.5
+    assert out["indice"] == 3.2
+
+
+def test_label_without_unit_is_ignored():
+    scanner = ParamScanner(SPECS, gap=r"\s*")
+    assert scanner.scan("Glucosa 98 mmol/L")["glucosa"] is None
+
+
+def test_duplicate_keys_rejected():
+    with pytest.raises(ValueError):
+        ParamScanner((ParamSpec("a", "X"), ParamSpec("a", "Y")), gap=r"\s*")
+
+
+@pytest.mark.parametrize("specs", [BIOQUIMICA_PARAMS, HEMATOLOGIA_PARAMS])
+def test_section_tables_have_unique_keys(specs):
+    keys = [s.key for s in specs]
+    assert len(keys) == len(set(keys))
@@ -0,0 +1,69 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from lab_pdf import parse_cache, pdf_to_json
+from lab_pdf.parse_cache import CacheEntry, ParseCache, file_digest
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = ParseCache(tmp_path / "cache.db")
+    yield c
+    c.close()
+
+
+def test_parse_hit_skips_extraction(cache, hemato_pdf_path: Path, monkeypatch):
+    first = cache.parse(hemato_pdf_path)
+
+    def boom(_path):
+        raise AssertionError("extract_lab_text no debería llamarse")
+
+    monkeypatch.setattr(pdf_to_json, "extract_lab_text", boom)
+    assert cache.parse(hemato_pdf_path) == first
+
+
+def test_unsupported_report_is_cached_as_error(cache, hemocultivos_pdf_path: Path, monkeypatch):
+    with pytest.raises(ValueError):
+        cache.parse(hemocultivos_pdf_path)
+    monkeypatch.setattr(pdf_to_json, "extract_lab_text", lambda _p: pytest.fail("sin caché"))
+    with pytest.raises(ValueError):
+        cache.parse(hemocultivos_pdf_path)
+
+
+def test_key_is_content_not_path(cache, hemato_pdf_path: Path, tmp_path):
+    copy = tmp_path / "otro_nombre.pdf"
+    shutil.copy(hemato_pdf_path, copy)
+    cache.parse(hemato_pdf_path)
+    assert cache.get(file_digest(copy)) is not None
+
+
+def test_lru_eviction(tmp_path):
+    c = ParseCache(tmp_path / "lru.db", max_entries=2)
+    c.put("a", CacheEntry(data={"n": 1}))
+    c.put("b", CacheEntry(data={"n": 2}))
+    c.touch_many(["a"])          # 'b' pasa a ser la menos usada
+    c.put("c", CacheEntry(data={"n": 3}))
+    assert len(c) == 2
+    assert c.get("a") is not None
+    assert c.get("b") is None
+    c.close()
+
+
+def test_parser_change_invalidates(tmp_path, monkeypatch):
+    path = tmp_path / "ver.db"
+    c = ParseCache(path)
+    c.put("a", CacheEntry(data={"n": 1}))
+    c.close()
+
+    monkeypatch.setattr(parse_cache, "parser_version", lambda: "otra-version")
+    c2 = ParseCache(path)
+    assert c2.get("a") is None
+    assert len(c2) == 0
+    c2.close()
+
+
+def test_parser_version_is_stable():
+    assert parse_cache.parser_version() == parse_cache.parser_version()
+    assert len(parse_cache.parser_version()) == 16
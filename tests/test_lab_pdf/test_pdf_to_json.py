@@ -56,7 +56,7 @@ def test_parse_hematology_pdf_only_bioquimica(monkeypatch, tmp_path):
         return fake_text
 
     # Parcheamos la función de extracción de texto
-    monkeypatch.setattr(pdf_to_json, "extract_text_from_pdf", fake_extract)
+    monkeypatch.setattr(pdf_to_json, "extract_lab_text", fake_extract)
 
     fake_pdf = tmp_path / "dummy.pdf"
     fake_pdf.write_text("no importa", encoding="utf-8")
@@ -83,7 +83,7 @@ def test_parse_hematology_pdf_only_orina(monkeypatch, tmp_path):
     def fake_extract(path: str) -> str:
         return fake_text
 
-    monkeypatch.setattr(pdf_to_json, "extract_text_from_pdf", fake_extract)
+    monkeypatch.setattr(pdf_to_json, "extract_lab_text", fake_extract)
 
     fake_pdf = tmp_path / "dummy_orina.pdf"
     fake_pdf.write_text("no importa", encoding="utf-8")
@@ -118,7 +118,7 @@ def test_parse_hematology_pdf_no_recognized_sections_raises(monkeypatch, tmp_pat
     def fake_extract(path: str) -> str:
         return fake_text
 
-    monkeypatch.setattr(pdf_to_json, "extract_text_from_pdf", fake_extract)
+    monkeypatch.setattr(pdf_to_json, "extract_lab_text", fake_extract)
 
     fake_pdf = tmp_path / "dummy_empty.pdf"
     fake_pdf.write_text("no importa", encoding="utf-8")
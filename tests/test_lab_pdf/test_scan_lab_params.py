@@ -0,0 +1,108 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+import scan_lab_params
+from scan_lab_params import parse_numeric_line, scan_directory
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+
+@pytest.fixture
+def pdf_dir(tmp_path):
+    d = tmp_path / "pdfs"
+    d.mkdir()
+    shutil.copy(DATA_DIR / "sample_lab_report_2025_06_24.pdf", d / "a.pdf")
+    return d
+
+
+def _count_extractions(monkeypatch):
+    # _scan_file captura cualquier excepción: se cuentan las llamadas
+    calls = []
+    monkeypatch.setattr(scan_lab_params, "extract_text_from_pdf", lambda p: calls.append(p) or "")
+    return calls
+
+
+def test_parse_numeric_line():
+    assert parse_numeric_line("Hemoglobina **14,1 g/dL 13,5 - 17,5") == (
+        "Hemoglobina", 14.1, "g/dL", 13.5, 17.5,
+    )
+    assert parse_numeric_line("Glucosa 84 mg/dL") is None
+
+
+def test_rerun_only_touches_new_files(pdf_dir, tmp_path, monkeypatch):
+    out = tmp_path / "params.json"
+    first = scan_directory(str(pdf_dir), str(out), workers=1)
+    assert "HEMOGLOBINA" in first
+    assert json.loads(out.read_text(encoding="utf-8")) == first
+
+    # Sin cambios: ni se abre ningún PDF ni cambia el agregado
+    calls = _count_extractions(monkeypatch)
+    assert scan_directory(str(pdf_dir), str(out), workers=1) == first
+
+    # Una copia con otro nombre: mismo hash, no se extrae de nuevo
+    shutil.copy(pdf_dir / "a.pdf", pdf_dir / "copia.pdf")
+    assert scan_directory(str(pdf_dir), str(out), workers=1) == first
+    assert calls == []
+
+
+def test_new_report_is_merged_into_existing_json(pdf_dir, tmp_path):
+    out = tmp_path / "params.json"
+    scan_directory(str(pdf_dir), str(out), workers=1)
+
+    shutil.copy(DATA_DIR / "hemocultivos_20251113.pdf", pdf_dir / "b.pdf")
+    merged = scan_directory(str(pdf_dir), str(out), workers=1)
+
+    ranges = {(r["min"], r["max"]) for r in merged["HEMOGLOBINA"]["ranges"]}
+    assert ranges == {(13.5, 17.5), (13.0, 17.0)}  # a.pdf + b.pdf
+    assert scan_directory(str(pdf_dir), str(tmp_path / "desde_cero.json")) == merged
+
+
+def test_missing_json_is_rebuilt_from_index(pdf_dir, tmp_path, monkeypatch):
+    out = tmp_path / "params.json"
+    first = scan_directory(str(pdf_dir), str(out), workers=1)
+    out.unlink()
+
+    calls = _count_extractions(monkeypatch)
+    assert scan_directory(str(pdf_dir), str(out), workers=1) == first
+    assert out.exists() and calls == []
+
+
+def test_parser_change_invalidates_cached_lines(pdf_dir, tmp_path, monkeypatch):
+    out = tmp_path / "params.json"
+    assert "HEMOGLOBINA" in scan_directory(str(pdf_dir), str(out), workers=1)
+
+    # Otra versión del parser: se vuelve a extraer y el JSON se reconstruye
+    # (también con --full) solo con las líneas nuevas
+    monkeypatch.setattr(scan_lab_params, "scan_version", lambda: "otra")
+    calls = _count_extractions(monkeypatch)
+    assert scan_directory(str(pdf_dir), str(out), workers=1) == {}
+    assert scan_directory(str(pdf_dir), str(out), workers=1, full=True) == {}
+    assert len(calls) == 1
+
+
+def test_failed_extraction_is_retried(pdf_dir, tmp_path, monkeypatch):
+    out = tmp_path / "params.json"
+
+    def broken(path):
+        raise ValueError("PDF dañado")
+
+    with monkeypatch.context() as m:
+        m.setattr(scan_lab_params, "extract_text_from_pdf", broken)
+        assert scan_directory(str(pdf_dir), str(out), workers=1) == {}
+
+    assert "HEMOGLOBINA" in scan_directory(str(pdf_dir), str(out), workers=1)
+
+
+def test_scan_version_only_tracks_line_modules(monkeypatch):
+    from lab_pdf.parse_cache import modules_version, parser_version
+
+    version = scan_lab_params.scan_version()
+    assert version == f"{modules_version(*scan_lab_params.SCAN_MODULES)}-{scan_lab_params.SCAN_FORMAT}"
+    assert not version.startswith(parser_version())
+    assert modules_version(*reversed(scan_lab_params.SCAN_MODULES)) == version.split("-")[0]
+
+    monkeypatch.setattr(scan_lab_params, "SCAN_MODULES", scan_lab_params.SCAN_MODULES + ("metadata_parser",))
+    assert scan_lab_params.scan_version() != version
@@ -0,0 +1,97 @@
+# tests/test_metrics/test_timers.py
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+from pathlib import Path
+
+import pytest
+
+from db import AnalysisDB
+from importer import import_pdfs
+from metrics import REGISTRY, TimerRegistry
+from metrics.timers import configure_from_env
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+
+@pytest.fixture
+def timers(monkeypatch):
+    """Registro global activado y vacío durante el test."""
+    monkeypatch.setattr(REGISTRY, "enabled", True)
+    monkeypatch.setattr(REGISTRY, "json_log", False)
+    REGISTRY.reset()
+    yield REGISTRY
+    REGISTRY.reset()
+
+
+def test_disabled_registry_records_nothing():
+    reg = TimerRegistry(enabled=False)
+    t1, t2 = reg.timer("a"), reg.timer("b")
+    assert t1 is t2  # el mismo context manager nulo, sin asignaciones
+    with t1:
+        pass
+    assert reg.snapshot() == {}
+
+
+def test_summary_percentiles():
+    reg = TimerRegistry(enabled=True)
+    for ms in range(1, 101):
+        reg.record("etapa", ms / 1000)
+
+    s = reg.snapshot()["etapa"]
+    assert s["count"] == 100
+    assert s["p50_s"] == pytest.approx(0.050)
+    assert s["p95_s"] == pytest.approx(0.095)
+    assert s["max_s"] == pytest.approx(0.100)
+
+
+def test_capture_and_merge():
+    worker, main = TimerRegistry(enabled=True), TimerRegistry(enabled=True)
+    with worker.capture() as stages:
+        with worker.timer("pdf.extract"):
+            pass
+        with worker.timer("pdf.extract"):
+            pass
+    assert list(stages) == ["pdf.extract"]
+
+    main.merge(stages)
+    assert main.snapshot()["pdf.extract"]["count"] == 1  # una entrada por fichero
+
+
+def test_env_configuration(monkeypatch):
+    monkeypatch.setattr(REGISTRY, "enabled", False)
+    monkeypatch.setattr(REGISTRY, "json_log", False)
+    configure_from_env("json")
+    assert REGISTRY.enabled and REGISTRY.json_log
+
+
+def test_import_records_pipeline_stages_and_json_lines(timers, tmp_path, caplog):
+    timers.json_log = True
+    db = AnalysisDB(str(tmp_path / "t.db"))
+    db.open()
+    try:
+        with caplog.at_level(logging.INFO, logger="metrics.timings"):
+            import_pdfs(db, [DATA_DIR / "sample_lab_report_2025_06_24.pdf"], workers=1)
+    finally:
+        db.close()
+
+    snap = timers.snapshot()
+    for stage in ("pdf.extract", "pdf.split_sections", "pdf.section.hematologia",
+                  "db.stage", "db.insert.hematologia", "db.commit"):
+        assert snap[stage]["count"] >= 1, stage
+
+    line = json.loads(caplog.records[-1].getMessage())
+    assert line["file"] == "sample_lab_report_2025_06_24.pdf"
+    assert line["status"] == "ok"
+    assert {"pdf.extract", "db.stage"} <= set(line["stages"])
+
+
+def test_metrics_endpoint(timers):
+    from api.routers.core import metrics
+
+    timers.record("pdf.extract", 0.01)
+    body = metrics(reset=True)
+    assert body["enabled"] is True
+    assert body["stages"]["pdf.extract"]["count"] == 1
+    assert timers.snapshot() == {}
@@ -10,6 +10,10 @@ export function getSessionId(){
   return urlParams.get("session_id") || "";
 }
 
+// Respuestas GET por URL: { etag, data }. El servidor contesta 304 mientras
+// la versión de datos de la BD no cambie y reutilizamos el JSON ya parseado.
+const etagCache = new Map();
+
 export async function apiGet(base, path){
   const sid = getSessionId();
   const url = new URL(`${base}${path}`, window.location.origin);
@@ -18,7 +22,20 @@ export async function apiGet(base, path){
     url.searchParams.set("session_id", sid);
   }
 
-  const res = await fetch(url.toString());
+  const key = url.toString();
+  const cached = etagCache.get(key);
+  const headers = cached ? { "If-None-Match": cached.etag } : {};
+
+  const res = await fetch(key, { headers, cache: "no-store" });
+  if(res.status === 304 && cached) return cached.data;
   if(!res.ok) throw new Error(`${res.status} ${res.statusText}`);
-  return await res.json();
+
+  const data = await res.json();
+  const etag = res.headers.get("ETag");
+  if(etag){
+    etagCache.set(key, { etag, data });
+  }else{
+    etagCache.delete(key);
+  }
+  return data;
 }
@@ -123,6 +123,12 @@ function buildGroupsFromRanges(meta, ranges) {
   return groups;
 }
 
+// "Solo nuevos": omitir informes ya importados (por defecto se reimportan)
+function skipExisting(){
+  const chk = document.getElementById("chkSkipExisting");
+  return !!(chk && chk.checked);
+}
+
 function bindImportPdfs(){
   const btn = document.getElementById("btnImportPdfs");
   const input = document.getElementById("fileImportPdfs");
@@ -138,21 +144,12 @@ function bindImportPdfs(){
 
         setStatus(true, statusEl, "Importando PDFs…");
 
-        const res = await fetch(`${state.base}/imports/from_paths?session_id=${encodeURIComponent(state.sessionId)}`, {
-          method: "POST",
-          headers: {"Content-Type":"application/json"},
-          body: JSON.stringify({ pdf_paths: paths }),
-        });
-        if(!res.ok) throw new Error(`${res.status} ${res.statusText}`);
-        const j = await res.json();
-
-        await refreshChart();
-
-        if(j.errors && j.errors.length){
-          setStatus(false, statusEl, `Importado: ${j.imported}, Errores: ${j.errors.length}`);
-        } else {
-          setStatus(true, statusEl, `Importado: ${j.imported}`);
-        }
+        const job = await apiJson(
+          "POST",
+          `/imports/from_paths?session_id=${encodeURIComponent(state.sessionId)}`,
+          { session_id: state.sessionId, pdf_paths: paths, skip_existing: skipExisting() },
+        );
+        await finishImportJob(job, statusEl);
         return;
       }
 
@@ -184,20 +181,14 @@ function bindImportPdfs(){
           fd.append("pdf_files", f);
         }
 
-        const res = await fetch(`${state.base}/imports/upload?session_id=${encodeURIComponent(state.sessionId)}`, {
+        const url = `${state.base}/imports/upload?session_id=${encodeURIComponent(state.sessionId)}`
+          + (skipExisting() ? "&skip_existing=true" : "");
+        const res = await fetch(url, {
           method: "POST",
           body: fd,
         });
         if(!res.ok) throw new Error(`${res.status} ${res.statusText}`);
-        const j = await res.json();
-
-        await refreshChart();
-
-        if(j.errors && j.errors.length){
-          setStatus(false, statusEl, `Importado: ${j.imported}, Errores: ${j.errors.length}`);
-        } else {
-          setStatus(true, statusEl, `Importado: ${j.imported}`);
-        }
+        await finishImportJob(await res.json(), statusEl);
       } catch(e){
         console.error(e);
         setStatus(false, statusEl, `Error importando: ${e.message}`);
@@ -206,6 +197,32 @@ function bindImportPdfs(){
   }
 }
 
+// La importación corre en segundo plano: se sondea el trabajo hasta que
+// termina, mostrando el progreso en la barra de estado.
+async function finishImportJob(job, statusEl){
+  const sid = encodeURIComponent(state.sessionId);
+  let j = job;
+  while(j.state === "queued" || j.state === "running"){
+    setStatus(true, statusEl, `Importando ${j.processed ?? 0}/${j.total}…`);
+    await new Promise(resolve => setTimeout(resolve, 500));
+    // files_from grande: no necesitamos los tiempos por fichero aquí
+    j = await apiJson("GET", `/imports/jobs/${job.job_id}?session_id=${sid}&files_from=${j.total}`);
+  }
+
+  await refreshChart();
+
+  const r = j.result || { ok: j.ok, errors: [], skipped: j.skipped };
+  const skipped = r.skipped ? `, ya importados: ${r.skipped}` : "";
+  if(j.state === "failed"){
+    setStatus(false, statusEl, `Error importando (importados: ${r.ok})`);
+  } else if(r.errors && r.errors.length){
+    setStatus(false, statusEl, `Importado: ${r.ok}${skipped}, Errores: ${r.errors.length}`);
+  } else {
+    const cancelled = j.state === "cancelled" ? " (cancelado)" : "";
+    setStatus(true, statusEl, `Importado: ${r.ok}${skipped}${cancelled}`);
+  }
+}
+
 function bindTimelineCrud(){
   const btn = document.getElementById("btnTimeline");
   if(!btn) return;
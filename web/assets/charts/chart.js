@@ -6,7 +6,7 @@ import { staggerMarkLineLabels, buildLimitsMarkLine, mergeMarkLines } from "./ut
 import { toISODate, parseISODate } from "./utils/date.js"
 import { extentTs, pctToTs, tsToPct, percentToDate, computeExtentWithHorizon}  from "./utils/scale.js"
 import { renderTreatmentKpis } from "../kpis/treatment_kpis.js"
-import { fetchSeries, fetchParamLimits, fetchTimeline, getTimelineCache } from "./chart_api.js";
+import { fetchSeriesBatch, fetchParamLimits, fetchSummary, fetchTimeline, getTimelineCache } from "./chart_api.js";
 import { timelineStyle, groupTimelineEventsByDay, buildTimelineEvents, buildTimelineMarkLineData,
   buildGlobalTimelineMarkLine, buildTimelineMarkAreas, buildTimelineMarkAreaOption } from "../timeline/timeline_builders.js";
 import { detectCrossingsFlat, attachTreatmentDay } from "../clinical/clinical_crossings.js";
@@ -91,6 +91,27 @@ function outOfRangeFlag(value, low, high) {
   return null;
 }
 
+// KPI a partir de /summary (sin serie): mismos campos que los de refreshChart,
+// salvo las alertas recientes, que llegan con las series
+function kpiFromSummary(p, s) {
+  const rr = state.ranges && state.ranges[p] ? state.ranges[p] : null;
+  const low = s.range ? s.range.min : null;
+  const high = s.range ? s.range.max : null;
+  const statusByFlag = { below: "bajo", above: "alto" };
+  return {
+    name: labelOf(p),
+    unit: rr ? (rr.unit || "") : "",
+    lastValue: s.last_value,
+    delta: s.delta,
+    status: s.last_value == null ? "sin datos" : (statusByFlag[s.flag] || "en rango"),
+    statusKind: s.last_value == null ? "neutral" : (s.flag ? "bad" : "good"),
+    alerts: s.out_of_range,
+    lastDate: s.last_date,
+    rangeText: (low != null || high != null) ? `${low != null ? low : "—"} – ${high != null ? high : "—"}` : "—",
+    lastAlerts: [],
+  };
+}
+
 
 // -----------------------------
 // Init
@@ -147,6 +168,17 @@ export function initChart(dom) {
 export async function refreshChart() {
   if (!chart) return;
 
+  // 0) Cabecera de KPIs desde /summary (una lectura indexada), antes de
+  //    descargar ninguna serie; se repinta con el detalle más abajo
+  try {
+    const summary = await fetchSummary();
+    renderKpis(Array.from(state.enabledParams || [])
+      .filter((p) => summary.has(p))
+      .map((p) => kpiFromSummary(p, summary.get(p))));
+  } catch (e) {
+    console.warn("No se pudo cargar /summary:", e);
+  }
+
     // 1) Cargar timeline (no bloquea si falla; no queremos romper gráficas)
   let timeline = null;
   try {
@@ -168,10 +200,13 @@ export async function refreshChart() {
   const crossingsByParam = new Map();
   const limitByParam = new Map();
 
-
+  // 2) Todas las series de golpe (antes: una petición secuencial por parámetro),
+  //    con ~1 punto por píxel de ancho de la gráfica
+  const maxPoints = Math.max(200, Math.min(10000, chart.getWidth() || 0));
+  const seriesByParam = await fetchSeriesBatch(params, maxPoints);
 
   for (const p of params) {
-    const baseFlat = await fetchSeries(p);
+    const baseFlat = seriesByParam.get(p) || [];
     allFlats.push(baseFlat);
     let crossingsForParam = [];
     let limitValueForParam = null;
@@ -26,6 +26,46 @@ export async function fetchSeries(param) {
   return (data.points || []).map((p) => [p.date, p.value]);
 }
 
+// Todas las series en una sola petición (una consulta por tabla en el servidor).
+// maxPoints: el servidor reduce cada serie con LTTB (conserva fuera de rango).
+// Devuelve Map<param, [[date, value], ...]>
+export async function fetchSeriesBatch(params, maxPoints = null) {
+  const out = new Map();
+  if (!params || !params.length) return out;
+
+  const qs = new URLSearchParams({
+    params: params.join(","),
+    limit: "10000",
+  });
+
+  if (maxPoints) {
+    qs.set("max_points", String(Math.round(maxPoints)));
+  }
+
+  if (state.sessionId) {
+    qs.set("session_id", state.sessionId);
+  }
+
+  const data = await apiGet(
+    state.base,
+    `/series/batch?${qs.toString()}`
+  );
+
+  const series = (data && data.series) || {};
+  for (const p of params) {
+    const s = series[p];
+    out.set(p, ((s && s.points) || []).map((pt) => [pt.date, pt.value]));
+  }
+  return out;
+}
+
+// Resumen por parámetro (tabla param_summary): último valor, delta, alertas...
+// Devuelve Map<param, resumen>
+export async function fetchSummary() {
+  const data = await apiGet(state.base, "/summary");
+  return new Map(Object.entries((data && data.params) || {}));
+}
+
 export async function fetchParamLimits(baseUrl, paramKey){
   const sid = state.sessionId || null;
   const url = new URL(`${baseUrl}/param_limits`, window.location.origin);